@@ -41,6 +41,7 @@ class Variants(Enum):
     VERSION_DIJKSTRA_NO_HEURISTICS = variants.dijkstra_no_heuristics
     VERSION_DIJKSTRA_LESS_MEMORY = variants.dijkstra_less_memory
     VERSION_DISCOUNTED_A_STAR = variants.discounted_a_star
+    VERSION_PREFIX_SHARING_DIJKSTRA = variants.prefix_sharing_dijkstra
 
 class Parameters(Enum):
     PARAM_TRACE_COST_FUNCTION = 'trace_cost_function'
@@ -63,6 +64,8 @@ class Parameters(Enum):
     SYNCHRONOUS = "synchronous_dijkstra"
     EXPONENT="theta"
     ENABLE_BEST_WORST_COST = "enable_best_worst_cost"
+    MAX_SHARED_STATES = "max_shared_states"
+    FALLBACK_VARIANT = "fallback_variant"
 
 
 def __variant_mapper(variant):
@@ -75,6 +78,8 @@ def __variant_mapper(variant):
             variant = Variants.VERSION_DIJKSTRA_NO_HEURISTICS
         elif variant == "Variants.VERSION_DIJKSTRA_LESS_MEMORY":
             variant = Variants.VERSION_DIJKSTRA_LESS_MEMORY
+        elif variant == "Variants.VERSION_PREFIX_SHARING_DIJKSTRA":
+            variant = Variants.VERSION_PREFIX_SHARING_DIJKSTRA
 
     return variant
 
@@ -152,19 +157,22 @@ def apply_trace(trace, petri_net, initial_marking, final_marking, parameters=Non
     if enable_best_worst_cost:
         best_worst_cost = exec_utils.get_param_value(Parameters.BEST_WORST_COST_INTERNAL, parameters,
                                                      __get_best_worst_cost(petri_net, initial_marking, final_marking, variant, parameters))
+        __add_fitness(ali, trace_cost_function_sum, best_worst_cost)
 
-        if ali is not None and best_worst_cost is not None:
-            ltrace_bwc = trace_cost_function_sum + best_worst_cost
+    return ali
 
-            fitness_num = ali['cost'] // align_utils.STD_MODEL_LOG_MOVE_COST
-            fitness_den = ltrace_bwc // align_utils.STD_MODEL_LOG_MOVE_COST
-            fitness = 1 - fitness_num / fitness_den if fitness_den > 0 else 0
 
-            ali["fitness"] = fitness
-            # returning also the best worst cost, for log fitness computation
-            ali["bwc"] = ltrace_bwc
+def __add_fitness(ali, trace_cost_function_sum, best_worst_cost):
+    if ali is not None and best_worst_cost is not None:
+        ltrace_bwc = trace_cost_function_sum + best_worst_cost
 
-    return ali
+        fitness_num = ali['cost'] // align_utils.STD_MODEL_LOG_MOVE_COST
+        fitness_den = ltrace_bwc // align_utils.STD_MODEL_LOG_MOVE_COST
+        fitness = 1 - fitness_num / fitness_den if fitness_den > 0 else 0
+
+        ali["fitness"] = fitness
+        # returning also the best worst cost, for log fitness computation
+        ali["bwc"] = ltrace_bwc
 
 
 def apply_log(log, petri_net, initial_marking, final_marking, parameters=None, variant=DEFAULT_VARIANT):
@@ -217,6 +225,19 @@ def apply_log(log, petri_net, initial_marking, final_marking, parameters=None, v
         best_worst_cost = __get_best_worst_cost(petri_net, initial_marking, final_marking, variant, parameters)
         parameters[Parameters.BEST_WORST_COST_INTERNAL] = best_worst_cost
 
+    if variant == Variants.VERSION_PREFIX_SHARING_DIJKSTRA and \
+            Parameters.PARAM_TRACE_COST_FUNCTION not in parameters and \
+            Parameters.PARAM_TRACE_COST_FUNCTION.value not in parameters:
+        # all the variants are aligned together, sharing the search on their common prefixes
+        all_alignments = exec_utils.get_variant(variant).apply_variants(one_tr_per_var, petri_net, initial_marking,
+                                                                        final_marking, parameters=parameters)
+        if enable_best_worst_cost:
+            for trace, ali in zip(one_tr_per_var, all_alignments):
+                __add_fitness(ali, len(trace) * align_utils.STD_MODEL_LOG_MOVE_COST, best_worst_cost)
+        __close_progress_bar(progress)
+
+        return __form_alignments(variants_idxs, all_alignments)
+
     all_alignments = []
     for trace in one_tr_per_var:
         this_max_align_time = min(max_align_time_case, (max_align_time - (time.time() - start_time)) * 0.5)
@@ -0,0 +1,574 @@
+'''
+    This file is part of PM4Py (More Info: https://pm4py.fit.fraunhofer.de).
+
+    PM4Py is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    PM4Py is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with PM4Py.  If not, see <https://www.gnu.org/licenses/>.
+'''
+"""
+Alignments computed on the product between the Petri net and the prefix trie of the variants of the log.
+
+A state of the search is a couple (marking of the model, node of the trie). Since the path from the root of the trie
+to a node is unique, every alignment of a variant corresponds to exactly one path from (initial marking, root) to
+(final marking, node of the variant) in such product, and vice-versa. Hence, a single Dijkstra search started
+from (initial marking, root) provides the optimal alignment for every variant of the log, while the states
+corresponding to a shared prefix are expanded only once for all the variants sharing it.
+
+When the shared search cannot be completed within the given budget (maximum number of expanded states or
+maximum time), the variants that are not yet aligned fall back to the per-trace alignment.
+"""
+import heapq
+import sys
+import time
+from copy import copy
+from enum import Enum
+from typing import Optional, Dict, Any, Union, List, Tuple
+
+from pm4py.objects.log import obj as log_implementation
+from pm4py.objects.log.obj import Trace
+from pm4py.objects.petri_net.obj import PetriNet, Marking
+from pm4py.objects.petri_net.utils import align_utils
+from pm4py.objects.trie.obj import Trie
+from pm4py.util import exec_utils
+from pm4py.util import typing
+from pm4py.util import variants_util
+from pm4py.util.constants import PARAMETER_CONSTANT_ACTIVITY_KEY
+from pm4py.util.xes_constants import DEFAULT_NAME_KEY
+
+
+class Parameters(Enum):
+    PARAM_TRACE_COST_FUNCTION = 'trace_cost_function'
+    PARAM_MODEL_COST_FUNCTION = 'model_cost_function'
+    PARAM_SYNC_COST_FUNCTION = 'sync_cost_function'
+    PARAM_MAX_ALIGN_TIME_TRACE = "max_align_time_trace"
+    PARAM_MAX_ALIGN_TIME = "max_align_time"
+    PARAMETER_VARIANT_DELIMITER = "variant_delimiter"
+    PARAM_ALIGNMENT_RESULT_IS_SYNC_PROD_AWARE = 'ret_tuple_as_trans_desc'
+    ACTIVITY_KEY = PARAMETER_CONSTANT_ACTIVITY_KEY
+    MAX_SHARED_STATES = "max_shared_states"
+    FALLBACK_VARIANT = "fallback_variant"
+
+
+IS_SYNC_MOVE = 0
+IS_LOG_MOVE = 1
+IS_MODEL_MOVE = 2
+
+POSITION_TOTAL_COST = 0
+POSITION_DEPTH = 1
+POSITION_STATES_COUNT = 2
+POSITION_MARKING = 3
+POSITION_NODE = 4
+POSITION_TYPE_MOVE = 5
+POSITION_EN_T = 6
+POSITION_PARENT_STATE = 7
+
+
+def get_best_worst_cost(petri_net, initial_marking, final_marking, parameters=None):
+    """
+    Gets the best worst cost of an alignment
+
+    Parameters
+    -----------
+    petri_net
+        Petri net
+    initial_marking
+        Initial marking
+    final_marking
+        Final marking
+
+    Returns
+    -----------
+    best_worst_cost
+        Best worst cost of alignment
+    """
+    if parameters is None:
+        parameters = {}
+    trace = log_implementation.Trace()
+
+    best_worst = apply(trace, petri_net, initial_marking, final_marking, parameters=parameters)
+
+    if best_worst is not None:
+        return best_worst['cost']
+
+    return None
+
+
+def apply(trace: Trace, net: PetriNet, im: Marking, fm: Marking, parameters: Optional[Dict[Union[str, Parameters], Any]] = None) -> typing.AlignmentResult:
+    """
+    Performs the alignment of a single trace (the trie contains a single path).
+
+    Parameters
+    ----------
+    trace: :class:`list` input trace, assumed to be a list of events (i.e. the code will use the activity key
+    to get the attributes)
+    net: :class:`pm4py.objects.petri.net.PetriNet` the Petri net to use in the alignment
+    im: :class:`pm4py.objects.petri.net.Marking` initial marking in the Petri net
+    fm: :class:`pm4py.objects.petri.net.Marking` final marking in the Petri net
+    parameters: :class:`dict` (optional) dictionary containing one of the following:
+        Parameters.PARAM_TRACE_COST_FUNCTION: :class:`list` (parameter) mapping of each index of the trace to a positive cost value
+        Parameters.PARAM_MODEL_COST_FUNCTION: :class:`dict` (parameter) mapping of each transition in the model to corresponding
+        model cost
+        Parameters.PARAM_SYNC_COST_FUNCTION: :class:`dict` (parameter) mapping of each transition in the model to corresponding
+        synchronous costs
+        Parameters.ACTIVITY_KEY: :class:`str` (parameter) key to use to identify the activity described by the events
+
+    Returns
+    -------
+    dictionary: `dict` with keys **alignment**, **cost**, **visited_states**, **queued_states** and **traversed_arcs**
+    """
+    if parameters is None:
+        parameters = {}
+
+    activity_key = exec_utils.get_param_value(Parameters.ACTIVITY_KEY, parameters, DEFAULT_NAME_KEY)
+    trace_cost_function = exec_utils.get_param_value(Parameters.PARAM_TRACE_COST_FUNCTION, parameters, None)
+    max_align_time_trace = exec_utils.get_param_value(Parameters.PARAM_MAX_ALIGN_TIME_TRACE, parameters,
+                                                      sys.maxsize)
+
+    if trace_cost_function is None:
+        trace_cost_function = [align_utils.STD_MODEL_LOG_MOVE_COST] * len(trace)
+        parameters[Parameters.PARAM_TRACE_COST_FUNCTION] = trace_cost_function
+
+    variant = tuple(x[activity_key] for x in trace)
+
+    return __search([variant], net, im, fm, parameters=parameters, max_align_time=max_align_time_trace,
+                    trace_cost_function=trace_cost_function)[0]
+
+
+def apply_from_variant(variant, petri_net, initial_marking, final_marking, parameters=None):
+    """
+    Apply the alignments from the specification of a single variant
+
+    Parameters
+    -------------
+    variant
+        Variant (as string delimited by the "variant_delimiter" parameter)
+    petri_net
+        Petri net
+    initial_marking
+        Initial marking
+    final_marking
+        Final marking
+    parameters
+        Parameters of the algorithm (same as 'apply' method, plus 'variant_delimiter' that is , by default)
+
+    Returns
+    ------------
+    dictionary: `dict` with keys **alignment**, **cost**, **visited_states**, **queued_states**
+    """
+    if parameters is None:
+        parameters = {}
+    trace = variants_util.variant_to_trace(variant, parameters=parameters)
+    return apply(trace, petri_net, initial_marking, final_marking, parameters=parameters)
+
+
+def apply_variants(traces: List[Trace], net: PetriNet, im: Marking, fm: Marking, parameters: Optional[Dict[Union[str, Parameters], Any]] = None) -> typing.ListAlignments:
+    """
+    Aligns a list of traces (one per variant) against the Petri net, sharing the search
+    among the common prefixes of the traces.
+
+    Parameters
+    ----------------
+    traces
+        List of traces (one trace per variant)
+    net
+        Petri net
+    im
+        Initial marking
+    fm
+        Final marking
+    parameters
+        Parameters of the algorithm, including:
+        - Parameters.ACTIVITY_KEY => the attribute to use as activity
+        - Parameters.PARAM_MODEL_COST_FUNCTION => mapping of each transition in the model to its model cost
+        - Parameters.PARAM_SYNC_COST_FUNCTION => mapping of each transition in the model to its sync cost
+        - Parameters.PARAM_MAX_ALIGN_TIME => maximum time (in seconds) for the shared search
+        - Parameters.MAX_SHARED_STATES => maximum number of states expanded by the shared search
+        - Parameters.FALLBACK_VARIANT => alignment variant used for the traces that are not aligned
+                                            by the shared search (default: Dijkstra without heuristics)
+
+    Returns
+    ----------------
+    alignments
+        List of alignments (in the same order of the provided traces)
+    """
+    if parameters is None:
+        parameters = {}
+
+    activity_key = exec_utils.get_param_value(Parameters.ACTIVITY_KEY, parameters, DEFAULT_NAME_KEY)
+    max_align_time = exec_utils.get_param_value(Parameters.PARAM_MAX_ALIGN_TIME, parameters, sys.maxsize)
+    max_shared_states = exec_utils.get_param_value(Parameters.MAX_SHARED_STATES, parameters, sys.maxsize)
+
+    variants = [tuple(x[activity_key] for x in trace) for trace in traces]
+
+    start_time = time.time()
+    alignments = __search(variants, net, im, fm, parameters=parameters, max_align_time=max_align_time,
+                          max_shared_states=max_shared_states)
+
+    if any(x is None for x in alignments):
+        # the shared search has not been completed within the budget:
+        # the remaining variants are aligned separately
+        from pm4py.algo.conformance.alignments.petri_net.variants import dijkstra_no_heuristics
+        fallback_variant = exec_utils.get_param_value(Parameters.FALLBACK_VARIANT, parameters, dijkstra_no_heuristics)
+        remaining_time = max_align_time - (time.time() - start_time)
+        for i in range(len(alignments)):
+            if alignments[i] is None and remaining_time > 0:
+                fallback_parameters = copy(parameters)
+                fallback_parameters[Parameters.PARAM_MAX_ALIGN_TIME_TRACE] = remaining_time
+                alignments[i] = fallback_variant.apply(traces[i], net, im, fm, parameters=fallback_parameters)
+                remaining_time = max_align_time - (time.time() - start_time)
+
+    return alignments
+
+
+def __build_trie(variants: List[Tuple[str, ...]]) -> Tuple[List[Trie], List[Dict[str, int]], List[int]]:
+    """
+    Builds the prefix trie of the provided variants, assigning an integer index to each node
+
+    Parameters
+    ---------------
+    variants
+        List of variants
+
+    Returns
+    ---------------
+    nodes
+        Nodes of the trie (the root has index 0)
+    children
+        For each node, a dictionary associating the label of each child to its index
+    variant_nodes
+        For each variant, the index of the node in which the variant ends
+    """
+    root = Trie()
+    nodes = [root]
+    children = [{}]
+    variant_nodes = []
+
+    for variant in variants:
+        curr = 0
+        for activity in variant:
+            if activity not in children[curr]:
+                node = Trie(label=activity, parent=nodes[curr], depth=nodes[curr].depth + 1)
+                nodes[curr].children.append(node)
+                children[curr][activity] = len(nodes)
+                nodes.append(node)
+                children.append({})
+            curr = children[curr][activity]
+        nodes[curr].final = True
+        variant_nodes.append(curr)
+
+    return nodes, children, variant_nodes
+
+
+def __transform_model(net, im, fm, parameters=None):
+    """
+    Transforms the Petri net to a structure in which places and transitions are identified by integers
+
+    Parameters
+    --------------
+    net
+        Petri net
+    im
+        Initial marking
+    fm
+        Final marking
+    parameters
+        Parameters
+
+    Returns
+    --------------
+    transitions
+        List of the transitions of the net (the index of the list is the identifier of the transition)
+    trans_pre
+        For each transition, the preset as list of couples (place, weight)
+    trans_post
+        For each transition, the postset as list of couples (place, weight)
+    model_cost
+        For each transition, the cost of the move-on-model
+    sync_cost
+        For each transition, the cost of the synchronous move
+    places_trans
+        For each place, the transitions having the place in their preset
+    trans_empty_preset
+        Transitions with an empty preset
+    transf_im
+        Encoded initial marking
+    transf_fm
+        Encoded final marking
+    """
+    if parameters is None:
+        parameters = {}
+
+    model_cost_function = exec_utils.get_param_value(Parameters.PARAM_MODEL_COST_FUNCTION, parameters, None)
+    sync_cost_function = exec_utils.get_param_value(Parameters.PARAM_SYNC_COST_FUNCTION, parameters, None)
+
+    places = sorted(net.places, key=lambda x: x.name)
+    places_dict = {p: i for i, p in enumerate(places)}
+    transitions = sorted(net.transitions, key=lambda x: x.name)
+
+    trans_pre = []
+    trans_post = []
+    model_cost = []
+    sync_cost = []
+    places_trans = [[] for _ in places]
+    trans_empty_preset = []
+
+    for i, t in enumerate(transitions):
+        pre = sorted((places_dict[a.source], a.weight) for a in t.in_arcs)
+        post = sorted((places_dict[a.target], a.weight) for a in t.out_arcs)
+        trans_pre.append(pre)
+        trans_post.append(post)
+        for p, w in pre:
+            places_trans[p].append(i)
+        if not pre:
+            trans_empty_preset.append(i)
+        if model_cost_function is not None and t in model_cost_function:
+            model_cost.append(model_cost_function[t])
+        else:
+            model_cost.append(align_utils.STD_MODEL_LOG_MOVE_COST if t.label is not None else align_utils.STD_TAU_COST)
+        if sync_cost_function is not None and t in sync_cost_function:
+            sync_cost.append(sync_cost_function[t])
+        else:
+            sync_cost.append(align_utils.STD_SYNC_COST)
+
+    transf_im = __encode_marking({places_dict[p]: im[p] for p in im})
+    transf_fm = __encode_marking({places_dict[p]: fm[p] for p in fm})
+
+    return transitions, trans_pre, trans_post, model_cost, sync_cost, places_trans, trans_empty_preset, transf_im, \
+        transf_fm
+
+
+def __encode_marking(m_d):
+    """
+    Encodes a marking (dictionary place index -> tokens) as a sorted tuple of couples
+
+    Parameters
+    --------------
+    m_d
+        Marking (dictionary)
+
+    Returns
+    --------------
+    m_t
+        Marking (tuple)
+    """
+    return tuple(sorted((p, n) for p, n in m_d.items() if n > 0))
+
+
+def __fire(m_d, pre, post):
+    """
+    Fires a transition in the provided marking
+
+    Parameters
+    --------------
+    m_d
+        Marking (dictionary)
+    pre
+        Preset of the transition
+    post
+        Postset of the transition
+
+    Returns
+    --------------
+    new_m
+        Encoded marking after the firing
+    """
+    ret = dict(m_d)
+    for p, w in pre:
+        ret[p] = ret[p] - w
+    for p, w in post:
+        ret[p] = ret.get(p, 0) + w
+    return __encode_marking(ret)
+
+
+def __search(variants, net, im, fm, parameters=None, max_align_time=sys.maxsize, max_shared_states=sys.maxsize,
+             trace_cost_function=None):
+    """
+    Dijkstra search on the product of the Petri net and the prefix trie of the variants
+
+    Parameters
+    ---------------
+    variants
+        List of variants
+    net
+        Petri net
+    im
+        Initial marking
+    fm
+        Final marking
+    parameters
+        Parameters of the algorithm
+    max_align_time
+        Maximum time (in seconds) for the search
+    max_shared_states
+        Maximum number of expanded states
+    trace_cost_function
+        (if provided, only for a single variant) cost of the log move of each position of the trace
+
+    Returns
+    ---------------
+    alignments
+        List of alignments (one per variant); None is returned for the variants that could not be aligned
+        within the budget
+    """
+    if parameters is None:
+        parameters = {}
+
+    ret_tuple_as_trans_desc = exec_utils.get_param_value(Parameters.PARAM_ALIGNMENT_RESULT_IS_SYNC_PROD_AWARE,
+                                                         parameters, False)
+
+    start_time = time.time()
+
+    nodes, children, variant_nodes = __build_trie(variants)
+    transitions, trans_pre, trans_post, model_cost, sync_cost, places_trans, trans_empty_preset, transf_im, \
+        transf_fm = __transform_model(net, im, fm, parameters=parameters)
+
+    trans_labels = [t.label for t in transitions]
+
+    # nodes of the trie in which (at least) a variant ends, and that are not yet aligned
+    targets = {}
+    for i, n in enumerate(variant_nodes):
+        if n not in targets:
+            targets[n] = []
+        targets[n].append(i)
+    node_alignments = {}
+
+    # each state is characterized by:
+    # position 0 (POSITION_TOTAL_COST): total cost of the state
+    # position 1 (POSITION_DEPTH): the opposite of the depth of the node of the trie (deeper states are preferred)
+    # position 2 (POSITION_STATES_COUNT): counter of the inserted states (to break ties)
+    # position 3 (POSITION_MARKING): the marking of the model
+    # position 4 (POSITION_NODE): the node of the trie
+    # position 5 (POSITION_TYPE_MOVE): the type of the move that has been done to reach the state
+    # position 6 (POSITION_EN_T): if valued, the transition that has been fired to reach the state
+    # position 7 (POSITION_PARENT_STATE): if valued, the parent state of the current state
+    open_set = [(0, 0, 0, transf_im, 0, None, None, None)]
+    closed = set()
+    dummy_count = 0
+    visited = 0
+    traversed = 0
+
+    while open_set and targets:
+        if visited >= max_shared_states or (time.time() - start_time) > max_align_time:
+            break
+
+        curr = heapq.heappop(open_set)
+        curr_m = curr[POSITION_MARKING]
+        curr_n = curr[POSITION_NODE]
+
+        if (curr_m, curr_n) in closed:
+            continue
+        closed.add((curr_m, curr_n))
+        visited += 1
+
+        if curr_m == transf_fm and curr_n in targets:
+            node_alignments[curr_n] = __reconstruct_alignment(curr, variants[targets[curr_n][0]], transitions,
+                                                              visited, visited + len(open_set), traversed,
+                                                              ret_tuple_as_trans_desc=ret_tuple_as_trans_desc)
+            del targets[curr_n]
+            if not targets:
+                break
+
+        curr_m_d = dict(curr_m)
+        depth = -curr[POSITION_DEPTH]
+        curr_children = children[curr_n]
+
+        en_t = set(trans_empty_preset)
+        for p in curr_m_d:
+            for t in places_trans[p]:
+                if t not in en_t and all(curr_m_d.get(p1, 0) >= w for p1, w in trans_pre[t]):
+                    en_t.add(t)
+
+        for t in en_t:
+            new_m = __fire(curr_m_d, trans_pre[t], trans_post[t])
+            label = trans_labels[t]
+            if label is not None and label in curr_children:
+                # synchronous move
+                child = curr_children[label]
+                traversed += 1
+                if (new_m, child) not in closed:
+                    dummy_count += 1
+                    heapq.heappush(open_set, (curr[POSITION_TOTAL_COST] + sync_cost[t], -(depth + 1), dummy_count,
+                                              new_m, child, IS_SYNC_MOVE, t, curr))
+            # move-on-model
+            traversed += 1
+            if (new_m, curr_n) not in closed:
+                dummy_count += 1
+                heapq.heappush(open_set, (curr[POSITION_TOTAL_COST] + model_cost[t], curr[POSITION_DEPTH], dummy_count,
+                                          new_m, curr_n, IS_MODEL_MOVE, t, curr))
+
+        for label, child in curr_children.items():
+            # move-on-log
+            traversed += 1
+            if (curr_m, child) not in closed:
+                cost = trace_cost_function[depth] if trace_cost_function is not None else \
+                    align_utils.STD_MODEL_LOG_MOVE_COST
+                dummy_count += 1
+                heapq.heappush(open_set, (curr[POSITION_TOTAL_COST] + cost, -(depth + 1), dummy_count,
+                                          curr_m, child, IS_LOG_MOVE, None, curr))
+
+    return [node_alignments[n] if n in node_alignments else None for n in variant_nodes]
+
+
+def __reconstruct_alignment(curr, variant, transitions, visited, queued, traversed, ret_tuple_as_trans_desc=False):
+    """
+    Reconstruct the alignment from the state that reached the final marking at the end of the variant
+
+    Parameters
+    ----------------
+    curr
+        Current state (final state)
+    variant
+        Variant
+    transitions
+        List of the transitions of the net
+    visited
+        Number of visited states (shared among the variants)
+    queued
+        Number of queued states (shared among the variants)
+    traversed
+        Number of traversed arcs (shared among the variants)
+    ret_tuple_as_trans_desc
+        Says if the alignments shall be constructed including also
+        the name of the transition, or only the label (default=False includes only the label)
+
+    Returns
+    --------------
+    alignment
+        Alignment of the trace, including:
+            alignment: the sequence of moves
+            cost: the cost of the alignment
+            visited_states: the number of states that have been visited
+            queued_states: the number of states that have been queued
+            traversed_arcs: the number of arcs that have been traversed
+    """
+    alignment = []
+    cost = curr[POSITION_TOTAL_COST]
+
+    while curr[POSITION_PARENT_STATE] is not None:
+        m_name, m_label, t_name, t_label = ">>", ">>", ">>", ">>"
+        if curr[POSITION_TYPE_MOVE] == IS_SYNC_MOVE or curr[POSITION_TYPE_MOVE] == IS_LOG_MOVE:
+            name = variant[-curr[POSITION_DEPTH] - 1]
+            t_name, t_label = name, name
+        if curr[POSITION_TYPE_MOVE] == IS_SYNC_MOVE or curr[POSITION_TYPE_MOVE] == IS_MODEL_MOVE:
+            t = transitions[curr[POSITION_EN_T]]
+            m_name, m_label = t.name, t.label
+
+        if ret_tuple_as_trans_desc:
+            alignment.append(((t_name, m_name), (t_label, m_label)))
+        else:
+            alignment.append((t_label, m_label))
+        curr = curr[POSITION_PARENT_STATE]
+
+    alignment.reverse()
+
+    return {"alignment": alignment, "cost": cost, "visited_states": visited, "queued_states": queued,
+            "traversed_arcs": traversed}
@@ -17,7 +17,7 @@
 
 from pm4py.util import exec_utils
 from enum import Enum
-from pm4py.algo.conformance.declare.variants import classic
+from pm4py.algo.conformance.declare.variants import classic, vectorized
 from pm4py.objects.log.obj import EventLog
 import pandas as pd
 from typing import Union, Dict, Optional, Any, List
@@ -25,6 +25,7 @@ from typing import Union, Dict, Optional, Any, List
 
 class Variants(Enum):
     CLASSIC = classic
+    VECTORIZED = vectorized
 
 
 def apply(log: Union[EventLog, pd.DataFrame], model: Dict[str, Dict[Any, Dict[str, int]]], variant=Variants.CLASSIC,
@@ -41,6 +42,7 @@ def apply(log: Union[EventLog, pd.DataFrame], model: Dict[str, Dict[Any, Dict[st
     variant
         Variant to be used:
         - Variants.CLASSIC
+        - Variants.VECTORIZED
     parameters
         Variant-specific parameters
 
@@ -71,6 +73,7 @@ def get_diagnostics_dataframe(log, conf_result, variant=Variants.CLASSIC, parame
     variant
         Variant to be used:
         - Variants.CLASSIC
+        - Variants.VECTORIZED
     parameters
         Variant-specific parameters
 
@@ -16,3 +16,4 @@
 '''
 
 from pm4py.algo.conformance.declare.variants import classic
+from pm4py.algo.conformance.declare.variants import vectorized
@@ -118,7 +118,7 @@ def __check_alt_response(trace: List[str], model: Dict[str, Dict[Any, Dict[str,
                          trace_dict: Dict[str, List[Any]], act_idxs: Dict[str, List[int]],
                          parameters: Optional[Dict[Any, Any]] = None):
     if ALTRESPONSE in model:
-        for act_couple in model[RESPONSE]:
+        for act_couple in model[ALTRESPONSE]:
             spec_idxs = []
             if act_couple[0] in trace:
                 spec_idxs = spec_idxs + [(act_couple[0], i) for i in act_idxs[act_couple[0]]]
@@ -298,7 +298,6 @@ def apply_list(projected_log: List[List[str]], model: Dict[str, Dict[Any, Dict[s
         __check_alt_succession(trace, model, ret, act_idxs, parameters)
         __check_chain_succession(trace, model, ret, act_idxs, parameters)
         __check_absence(trace, model, ret, parameters)
-        __check_non_coexistence(trace, model, ret, parameters)
 
         ret["no_dev_total"] = len(ret["deviations"])
         ret["dev_fitness"] = 1.0 - ret["no_dev_total"] / ret["no_constr_total"] if ret["no_constr_total"] > 0 else 1.0
@@ -0,0 +1,288 @@
+'''
+    This file is part of PM4Py (More Info: https://pm4py.fit.fraunhofer.de).
+
+    PM4Py is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    PM4Py is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with PM4Py.  If not, see <https://www.gnu.org/licenses/>.
+'''
+from enum import Enum
+from pm4py.objects.log.obj import EventLog
+import pandas as pd
+import numpy as np
+from typing import Union, Dict, Optional, Any, List, Tuple
+from pm4py.algo.discovery.declare.templates import *
+from pm4py.algo.conformance.declare.variants import classic
+from pm4py.util import exec_utils, constants, xes_constants
+
+
+class Parameters(Enum):
+    CASE_ID_KEY = constants.PARAMETER_CONSTANT_CASEID_KEY
+    ACTIVITY_KEY = constants.PARAMETER_CONSTANT_ACTIVITY_KEY
+
+
+# templates checked by the classic variant, in the order in which the deviations are reported
+UNARY_TEMPLATES = [EXISTENCE, EXACTLY_ONE, INIT]
+COUNT_TEMPLATES = [RESPONDED_EXISTENCE, COEXISTENCE, NONCOEXISTENCE, RESPONSE, PRECEDENCE, SUCCESSION]
+ORDER_TEMPLATES = [ALTRESPONSE, CHAINRESPONSE, ALTPRECEDENCE, CHAINPRECEDENCE, ALTSUCCESSION, CHAINSUCCESSION]
+CHECKED_TEMPLATES = UNARY_TEMPLATES + COUNT_TEMPLATES + ORDER_TEMPLATES + [ABSENCE]
+
+
+class VariantsIndex(object):
+    """
+    Integer-coded index over the variants of a log.
+
+    For every variant and activity, the number of occurrences and the first/last position are stored
+    in (variants x activities) matrices. The events of all the variants are concatenated and, for every
+    activity, the (sorted) global indexes of its events are kept.
+    """
+
+    def __init__(self, variants: List[Tuple[str, ...]], activities: List[str]):
+        self.act_idx = {act: i for i, act in enumerate(activities)}
+        no_variants = len(variants)
+        no_acts = len(activities)
+
+        lengths = np.array([len(v) for v in variants], dtype=np.int64)
+        self.offsets = np.zeros(no_variants + 1, dtype=np.int64)
+        np.cumsum(lengths, out=self.offsets[1:])
+        no_events = int(self.offsets[-1])
+
+        self.ev_act = np.fromiter((self.act_idx[a] for v in variants for a in v), dtype=np.int64, count=no_events)
+        self.ev_var = np.repeat(np.arange(no_variants, dtype=np.int64), lengths)
+        self.ev_pos = np.arange(no_events, dtype=np.int64) - self.offsets[self.ev_var]
+
+        self.count = np.zeros((no_variants, no_acts), dtype=np.int64)
+        np.add.at(self.count, (self.ev_var, self.ev_act), 1)
+        self.first = np.full((no_variants, no_acts), np.iinfo(np.int64).max, dtype=np.int64)
+        np.minimum.at(self.first, (self.ev_var, self.ev_act), self.ev_pos)
+        self.last = np.full((no_variants, no_acts), -1, dtype=np.int64)
+        np.maximum.at(self.last, (self.ev_var, self.ev_act), self.ev_pos)
+        self.has = self.count > 0
+
+        order = np.argsort(self.ev_act, kind="stable")
+        act_counts = np.bincount(self.ev_act, minlength=no_acts)
+        self.act_events = np.split(order, np.cumsum(act_counts)[:-1])
+
+    def code(self, act: str) -> int:
+        return self.act_idx[act]
+
+
+def __unary_violations(index: VariantsIndex, template: str, acts: np.ndarray) -> np.ndarray:
+    if template == EXISTENCE:
+        return ~index.has[:, acts]
+    elif template == ABSENCE:
+        return index.has[:, acts]
+    elif template == EXACTLY_ONE:
+        return index.count[:, acts] != 1
+    elif template == INIT:
+        return index.first[:, acts] != 0
+
+
+def __count_violations(index: VariantsIndex, template: str, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    has_a = index.has[:, a]
+    has_b = index.has[:, b]
+    if template == RESPONDED_EXISTENCE:
+        return has_a & ~has_b
+    elif template == COEXISTENCE:
+        return has_a ^ has_b
+    elif template == NONCOEXISTENCE:
+        return has_a & has_b
+    elif template == RESPONSE:
+        return has_a & (~has_b | (index.last[:, a] > index.last[:, b]))
+    elif template == PRECEDENCE:
+        return has_b & (~has_a | (index.first[:, a] > index.first[:, b]))
+    elif template == SUCCESSION:
+        return ~has_a | ~has_b | (index.first[:, a] > index.first[:, b]) | (index.last[:, a] > index.last[:, b])
+
+
+def __order_violations(index: VariantsIndex, template: str, a: int, b: int) -> np.ndarray:
+    """
+    Checks an alternate/chain template on all the variants at once.
+
+    The occurrences of the two activities are merged (in order of position) and ranked inside each variant.
+    After dropping the prefix that the template does not constrain, the merged sequence must alternate
+    a, b, a, b, ... and have even length (for chain templates, every b must immediately follow its a).
+    """
+    no_variants = len(index.offsets) - 1
+    merged = np.concatenate((index.act_events[a], index.act_events[b]))
+    is_a = np.concatenate((np.ones(len(index.act_events[a]), dtype=bool),
+                           np.zeros(len(index.act_events[b]), dtype=bool)))
+    order = np.argsort(merged, kind="stable")
+    merged = merged[order]
+    is_a = is_a[order]
+
+    violated = np.zeros(no_variants, dtype=bool)
+    if len(merged) == 0:
+        return violated
+
+    var = index.ev_var[merged]
+    arange = np.arange(len(merged), dtype=np.int64)
+    group_start = np.r_[True, var[1:] != var[:-1]]
+    rank = arange - np.maximum.accumulate(np.where(group_start, arange, 0))
+    length = np.bincount(var, minlength=no_variants)
+
+    infinity = np.iinfo(np.int64).max
+    if template in [ALTRESPONSE, CHAINRESPONSE]:
+        # the elements before the first occurrence of a are dropped
+        start = np.full(no_variants, infinity, dtype=np.int64)
+        np.minimum.at(start, var[is_a], rank[is_a])
+        start = np.minimum(start, length)
+    elif template in [ALTPRECEDENCE, CHAINPRECEDENCE]:
+        # the list starts just before the first b which is not in first position;
+        # if there is no such b, only the last element is kept
+        mask = ~is_a & (rank >= 1)
+        start = np.full(no_variants, infinity, dtype=np.int64)
+        np.minimum.at(start, var[mask], rank[mask])
+        start = np.where(start < infinity, start - 1, np.maximum(length - 1, 0))
+    else:
+        start = np.zeros(no_variants, dtype=np.int64)
+
+    rank = rank - start[var]
+    kept = rank >= 0
+    even = (rank % 2) == 0
+    wrong = kept & np.where(even, ~is_a, is_a)
+    if template in [CHAINRESPONSE, CHAINPRECEDENCE, CHAINSUCCESSION]:
+        follows = np.r_[False, merged[1:] == merged[:-1] + 1]
+        wrong = wrong | (kept & ~even & ~follows)
+
+    violated[var[wrong]] = True
+    violated = violated | ((length - start) % 2 == 1)
+
+    return violated
+
+
+def apply_list(projected_log: List[List[str]], model: Dict[str, Dict[Any, Dict[str, int]]],
+               parameters: Optional[Dict[Any, Any]] = None) -> List[Dict[str, Any]]:
+    if parameters is None:
+        parameters = {}
+
+    total_num_constraints = 0
+    for k in model:
+        total_num_constraints += len(model[k])
+
+    variants = {}
+    case_variant = []
+    for trace in projected_log:
+        trace = tuple(trace)
+        if trace not in variants:
+            variants[trace] = len(variants)
+        case_variant.append(variants[trace])
+    variants = list(variants)
+
+    activities = set(y for x in variants for y in x)
+    for template in CHECKED_TEMPLATES:
+        if template in model:
+            for key in model[template]:
+                if template in UNARY_TEMPLATES or template == ABSENCE:
+                    activities.add(key)
+                else:
+                    activities.add(key[0])
+                    activities.add(key[1])
+
+    index = VariantsIndex(variants, sorted(activities, key=str))
+    variants_deviations = [[] for _ in range(len(variants))]
+
+    for template in CHECKED_TEMPLATES:
+        if template not in model or not model[template]:
+            continue
+        keys = list(model[template])
+
+        if template in UNARY_TEMPLATES or template == ABSENCE:
+            acts = np.array([index.code(k) for k in keys], dtype=np.int64)
+            violations = __unary_violations(index, template, acts)
+        elif template in COUNT_TEMPLATES:
+            a = np.array([index.code(k[0]) for k in keys], dtype=np.int64)
+            b = np.array([index.code(k[1]) for k in keys], dtype=np.int64)
+            violations = __count_violations(index, template, a, b)
+        else:
+            violations = np.column_stack([__order_violations(index, template, index.code(k[0]), index.code(k[1]))
+                                          for k in keys])
+
+        rows, cols = np.nonzero(violations)
+        for v, c in zip(rows.tolist(), cols.tolist()):
+            variants_deviations[v].append([template, keys[c]])
+
+    conf_cases = []
+    for v in case_variant:
+        ret = {}
+        ret["no_constr_total"] = total_num_constraints
+        ret["deviations"] = list(variants_deviations[v])
+        ret["no_dev_total"] = len(ret["deviations"])
+        ret["dev_fitness"] = 1.0 - ret["no_dev_total"] / ret["no_constr_total"] if ret["no_constr_total"] > 0 else 1.0
+        ret["is_fit"] = ret["no_dev_total"] == 0
+
+        conf_cases.append(ret)
+
+    return conf_cases
+
+
+def apply(log: Union[EventLog, pd.DataFrame], model: Dict[str, Dict[Any, Dict[str, int]]],
+          parameters: Optional[Dict[Any, Any]] = None) -> List[Dict[str, Any]]:
+    """
+    Applies conformance checking against a DECLARE model.
+
+    The log is reduced to its variants, and for every variant the occurrence counts and the first/last
+    positions of the activities are computed once. Then, all the constraints of a template are evaluated at
+    once as comparisons over such arrays, and the results are fanned out to the cases of each variant.
+    The output is the same as the one of the classic variant.
+
+    Parameters
+    --------------
+    log
+        Event log / Pandas dataframe
+    model
+        DECLARE model
+    parameters
+        Possible parameters of the algorithm, including:
+        - Parameters.ACTIVITY_KEY => the attribute to be used as activity
+        - Parameters.CASE_ID_KEY => the attribute to be used as case identifier
+
+    Returns
+    -------------
+    lst_conf_res
+        List containing for every case a dictionary with different keys:
+        - no_constr_total => the total number of constraints of the DECLARE model
+        - deviations => a list of deviations
+        - no_dev_total => the total number of deviations
+        - dev_fitness => the fitness (1 - no_dev_total / no_constr_total)
+        - is_fit => True if the case is perfectly fit
+    """
+    if parameters is None:
+        parameters = {}
+
+    activity_key = exec_utils.get_param_value(Parameters.ACTIVITY_KEY, parameters, xes_constants.DEFAULT_NAME_KEY)
+    case_id_key = exec_utils.get_param_value(Parameters.CASE_ID_KEY, parameters, constants.CASE_CONCEPT_NAME)
+
+    import pm4py
+
+    projected_log = pm4py.project_on_event_attribute(log, activity_key, case_id_key=case_id_key)
+
+    return apply_list(projected_log, model, parameters=parameters)
+
+
+def get_diagnostics_dataframe(log, conf_result, parameters=None) -> pd.DataFrame:
+    """
+    Gets the diagnostics dataframe from a log and the results
+    of DECLARE-based conformance checking
+
+    Parameters
+    --------------
+    log
+        Event log
+    conf_result
+        Results of conformance checking
+
+    Returns
+    --------------
+    diagn_dataframe
+        Diagnostics dataframe
+    """
+    return classic.get_diagnostics_dataframe(log, conf_result, parameters=parameters)
@@ -0,0 +1,566 @@
+'''
+    This file is part of PM4Py (More Info: https://pm4py.fit.fraunhofer.de).
+
+    PM4Py is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    PM4Py is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with PM4Py.  If not, see <https://www.gnu.org/licenses/>.
+'''
+"""
+Token-based replay executed in lock-step on all the variants of the log.
+
+The Petri net is compiled to its pre/post incidence arrays, and the markings of a batch of variants are kept in
+a (variants x places) matrix. At the i-th step, the i-th activity of every variant is replayed at once: the choice
+of the transition, the check of its enabling, the count of the missing/consumed/produced tokens and the firing are
+computed as array operations. The walk through hidden transitions (needed only by the variants in which the
+transition is not enabled) follows the recursion of the classic replay (token_replay.apply_hidden_trans) on the
+marking vector, using a lookup table of the shortest paths of hidden transitions between places, precomputed once
+for the net, and each walk is memoized on the couple (marking, transition).
+
+The results are the same of the classic token-based replay, with a single difference: when the final marking
+consists of a single place and is not reached by the shortest paths of hidden transitions, the paths connecting
+the marked places to it are tried (by length and then) in the order of the names of the places, while the
+classic replay follows the insertion order of the places in its marking.
+
+The output follows the format of the classic token-based replay (see token_replay.transcribe_result).
+Place/transition-level fitness and the cleaning of the token flood are not supported by this variant:
+when they are requested, the classic token-based replay is executed instead.
+"""
+from copy import copy
+from enum import Enum
+from typing import Optional, Dict, Any, Union, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from pm4py.algo.conformance.tokenreplay.variants import token_replay
+from pm4py.objects.conversion.log import converter as log_converter
+from pm4py.objects.log.obj import EventLog
+from pm4py.objects.petri_net import semantics
+from pm4py.objects.petri_net.obj import PetriNet, Marking
+from pm4py.objects.petri_net.utils.align_utils import get_visible_transitions_eventually_enabled_by_marking
+from pm4py.objects.petri_net.utils.petri_utils import get_places_shortest_path_by_hidden
+from pm4py.util import exec_utils, constants, xes_constants, pandas_utils
+from pm4py.util import typing
+
+
+class Parameters(Enum):
+    CASE_ID_KEY = constants.PARAMETER_CONSTANT_CASEID_KEY
+    ACTIVITY_KEY = constants.PARAMETER_CONSTANT_ACTIVITY_KEY
+    PLACES_SHORTEST_PATH_BY_HIDDEN = "places_shortest_path_by_hidden"
+    CLEANING_TOKEN_FLOOD = "cleaning_token_flood"
+    WALK_THROUGH_HIDDEN_TRANS = "walk_through_hidden_trans"
+    RETURN_NAMES = "return_names"
+    STOP_IMMEDIATELY_UNFIT = "stop_immediately_unfit"
+    TRY_TO_REACH_FINAL_MARKING_THROUGH_HIDDEN = "try_to_reach_final_marking_through_hidden"
+    CONSIDER_REMAINING_IN_FITNESS = "consider_remaining_in_fitness"
+    CONSIDER_ACTIVITIES_NOT_IN_MODEL_IN_FITNESS = "consider_activities_not_in_model_in_fitness"
+    ENABLE_PLTR_FITNESS = "enable_pltr_fitness"
+    BATCH_SIZE = "batch_size"
+
+
+NOT_IN_MODEL = -1
+PADDING = -2
+
+
+class CompiledNet(object):
+    """
+    Petri net compiled to integer arrays for the vectorized replay
+    """
+
+    def __init__(self, net: PetriNet, initial_marking: Marking, final_marking: Marking,
+                 places_shortest_path_by_hidden=None):
+        if places_shortest_path_by_hidden is None:
+            places_shortest_path_by_hidden = get_places_shortest_path_by_hidden(
+                net, token_replay.TechnicalParameters.MAX_REC_DEPTH.value)
+
+        self.net = net
+        self.places = sorted(net.places, key=lambda x: x.name)
+        self.transitions = sorted(net.transitions, key=lambda x: x.name)
+        places_dict = {p: i for i, p in enumerate(self.places)}
+        trans_dict = {t: i for i, t in enumerate(self.transitions)}
+        self.trans_dict = trans_dict
+
+        self.pre = np.zeros((len(self.transitions), len(self.places)), dtype=np.int64)
+        self.post = np.zeros((len(self.transitions), len(self.places)), dtype=np.int64)
+        for i, t in enumerate(self.transitions):
+            for a in t.in_arcs:
+                self.pre[i, places_dict[a.source]] += a.weight
+            for a in t.out_arcs:
+                self.post[i, places_dict[a.target]] += a.weight
+        self.change = self.post - self.pre
+        self.consumed = self.pre.sum(axis=1)
+        self.produced = self.post.sum(axis=1)
+
+        self.im = np.zeros(len(self.places), dtype=np.int64)
+        for p in initial_marking:
+            self.im[places_dict[p]] = initial_marking[p]
+        self.fm = np.zeros(len(self.places), dtype=np.int64)
+        for p in final_marking:
+            self.fm[places_dict[p]] = final_marking[p]
+        self.fm_places = np.nonzero(self.fm)[0]
+
+        # activities are mapped to integers; for each activity, the transitions having it as label
+        # (the last one, in the order of the names, is the one that the replay tries to enable when none is enabled,
+        # as in the classic token-based replay)
+        self.activities = {}
+        self.candidates = []
+        for i, t in enumerate(self.transitions):
+            if t.label is not None:
+                if t.label not in self.activities:
+                    self.activities[t.label] = len(self.activities)
+                    self.candidates.append([])
+                self.candidates[self.activities[t.label]].append(i)
+        self.default_trans = np.array([c[-1] for c in self.candidates], dtype=np.int64)
+        self.duplicate_activities = np.array([len(c) > 1 for c in self.candidates], dtype=bool)
+
+        # lookup table of the hidden transitions shortcuts: (source place, target place) -> transitions
+        self.hidden_paths = {}
+        for p1 in places_shortest_path_by_hidden:
+            for p2 in places_shortest_path_by_hidden[p1]:
+                self.hidden_paths[(places_dict[p1], places_dict[p2])] = [trans_dict[t] for t in
+                                                                         places_shortest_path_by_hidden[p1][p2]]
+
+        # memoization of the walks through hidden transitions:
+        # (marking, transition) -> (fired hidden transitions, change of the marking, consumed, produced)
+        self.hidden_walks = {}
+        # marking -> (fired hidden transitions, change of the marking, consumed, produced)
+        self.final_walks = {}
+
+    def encode_variants(self, variants: List[Tuple[str, ...]]) -> np.ndarray:
+        """
+        Encodes a list of variants as a (variants x max length) matrix of activity codes
+
+        Parameters
+        ---------------
+        variants
+            List of variants
+
+        Returns
+        ---------------
+        codes
+            Matrix of the activity codes (NOT_IN_MODEL for activities not in the model, PADDING after the end)
+        """
+        max_len = max((len(v) for v in variants), default=0)
+        codes = np.full((len(variants), max_len), PADDING, dtype=np.int64)
+        for i, v in enumerate(variants):
+            codes[i, :len(v)] = [self.activities.get(a, NOT_IN_MODEL) for a in v]
+        return codes
+
+    def to_marking(self, vec: np.ndarray) -> Marking:
+        """
+        Transforms a vector of tokens to a marking of the net
+        """
+        m = Marking()
+        for i in np.nonzero(vec)[0]:
+            m[self.places[i]] = int(vec[i])
+        return m
+
+
+def __is_enabled(cnet, m, t):
+    """
+    Checks if the transition t is enabled in the marking of a single variant
+    """
+    return bool(np.all(m >= cnet.pre[t]))
+
+
+def __fire(cnet, m, t, fired):
+    """
+    Fires the transition t on the marking of a single variant (changed in place)
+    """
+    m += cnet.change[t]
+    fired.append(t)
+
+
+def __get_hidden_sequences(cnet, m, target_places):
+    """
+    Gets the sequences of hidden transitions connecting the marked places to the target places,
+    sorted by length (lookup in the table of the shortcuts), as in token_replay.get_hidden_transitions_to_enable
+    """
+    seqs = []
+    for p1 in np.nonzero(m)[0]:
+        for p2 in target_places:
+            key = (p1, p2)
+            if key in cnet.hidden_paths:
+                seqs.append(cnet.hidden_paths[key])
+    return sorted(seqs, key=lambda x: len(x))
+
+
+def __enable_hidden_transitions(cnet, m, t, sequences, fired, visited):
+    """
+    Fires the hidden transitions of the provided sequences, in order, until the transition t is enabled or a
+    sequence does not fire any transition (see token_replay.enable_hidden_transitions)
+    """
+    for seq in sequences:
+        something_changed = False
+        for h in seq:
+            if h != t and h not in visited and __is_enabled(cnet, m, h):
+                __fire(cnet, m, h, fired)
+                visited.add(h)
+                something_changed = True
+            if __is_enabled(cnet, m, t):
+                break
+        if __is_enabled(cnet, m, t) or not something_changed:
+            break
+
+
+def __walk_hidden(cnet, m, t, fired, visited, rec_depth=0):
+    """
+    Tries to enable the transition t by firing hidden transitions on the marking of a single variant
+    (changed in place), following the recursion of token_replay.apply_hidden_trans
+    """
+    if rec_depth >= token_replay.TechnicalParameters.MAX_REC_DEPTH_HIDTRANSENABL.value or t in visited:
+        return
+    visited.add(t)
+    missing_places = np.nonzero(m < cnet.pre[t])[0]
+    seqs = __get_hidden_sequences(cnet, m, missing_places)
+    if seqs:
+        __enable_hidden_transitions(cnet, m, t, seqs, fired, visited)
+        if not __is_enabled(cnet, m, t):
+            for seq in __get_hidden_sequences(cnet, m, missing_places):
+                for h in seq:
+                    if h != t and h not in visited:
+                        if not __is_enabled(cnet, m, h):
+                            __walk_hidden(cnet, m, h, fired, visited, rec_depth=rec_depth + 1)
+                        if __is_enabled(cnet, m, h):
+                            __fire(cnet, m, h, fired)
+                            visited.add(h)
+
+
+def __reach_final_marking(cnet, m, fired):
+    """
+    Tries to reach the final marking by firing hidden transitions on the marking of a single variant
+    (changed in place), as in the final part of token_replay.apply_trace
+
+    Parameters
+    --------------
+    cnet
+        Compiled net
+    m
+        Marking of the variant
+    fired
+        List to which the fired hidden transitions are appended
+    """
+    for _ in range(token_replay.TechnicalParameters.MAX_IT_FINAL1.value):
+        if np.all(m[cnet.fm_places] > 0):
+            break
+        for seq in __get_hidden_sequences(cnet, m, cnet.fm_places):
+            for h in seq:
+                if __is_enabled(cnet, m, h):
+                    __fire(cnet, m, h, fired)
+            if np.all(m[cnet.fm_places] > 0):
+                break
+
+    if not np.all(m[cnet.fm_places] > 0) and len(cnet.fm_places) == 1:
+        sink = cnet.fm_places[0]
+        connections = sorted([cnet.hidden_paths[(p, sink)] for p in np.nonzero(m)[0] if (p, sink) in cnet.hidden_paths],
+                             key=lambda x: len(x))
+        for _ in range(token_replay.TechnicalParameters.MAX_IT_FINAL2.value):
+            for seq in connections:
+                for h in seq:
+                    if __is_enabled(cnet, m, h):
+                        __fire(cnet, m, h, fired)
+                    else:
+                        break
+
+
+def replay_variants(cnet: CompiledNet, variants: List[Tuple[str, ...]], walk_through_hidden_trans=True,
+                    reach_mark_through_hidden=True, stop_immediately_unfit=False) -> Dict[str, Any]:
+    """
+    Replays a batch of variants in lock-step on the compiled Petri net
+
+    Parameters
+    ---------------
+    cnet
+        Compiled Petri net
+    variants
+        List of variants
+    walk_through_hidden_trans
+        Boolean value that decides if we shall walk through hidden transitions in order to enable visible transitions
+    reach_mark_through_hidden
+        Boolean value that decides if we shall try to reach the final marking through hidden transitions
+    stop_immediately_unfit
+        Boolean value that decides if we shall stop immediately when a non-conformance is detected
+
+    Returns
+    ---------------
+    replay
+        Dictionary containing the arrays (one entry per variant) of the reached markings, of the
+        missing/consumed/remaining/produced tokens, and the lists of activated transitions and
+        transitions with problems
+    """
+    num_variants = len(variants)
+    codes = cnet.encode_variants(variants)
+
+    marking = np.tile(cnet.im, (num_variants, 1))
+    missing = np.zeros(num_variants, dtype=np.int64)
+    consumed = np.zeros(num_variants, dtype=np.int64)
+    produced = np.full(num_variants, cnet.im.sum(), dtype=np.int64)
+    not_in_model = np.zeros(num_variants, dtype=bool)
+    stopped = np.zeros(num_variants, dtype=bool)
+
+    # fired visible transitions (one column per step) and, for each variant, the hidden transitions
+    # fired before the given step
+    fired_visible = np.full(codes.shape, -1, dtype=np.int64)
+    fired_hidden = [{} for _ in range(num_variants)]
+    problems = [[] for _ in range(num_variants)]
+
+    for i in range(codes.shape[1]):
+        col = codes[:, i]
+        not_in_model |= (col == NOT_IN_MODEL) & ~stopped
+        rows = np.nonzero((col >= 0) & ~stopped)[0]
+        if len(rows) == 0:
+            continue
+        acts = col[rows]
+        trans = cnet.default_trans[acts]
+        m = marking[rows]
+
+        # for the activities corresponding to several transitions, pick an enabled one (in the same order
+        # of the classic token-based replay, which iterates over the set of the enabled transitions)
+        dup = np.nonzero(cnet.duplicate_activities[acts])[0]
+        for j in dup:
+            enabled_candidates = [t for t in cnet.candidates[acts[j]] if __is_enabled(cnet, m[j], t)]
+            if len(enabled_candidates) == 1:
+                trans[j] = enabled_candidates[0]
+            elif enabled_candidates:
+                label = cnet.transitions[enabled_candidates[0]].label
+                trans[j] = cnet.trans_dict[[x for x in semantics.enabled_transitions(cnet.net, cnet.to_marking(m[j]))
+                                            if x.label == label][0]]
+
+        enabled = np.all(m >= cnet.pre[trans], axis=1)
+
+        if walk_through_hidden_trans:
+            for j in np.nonzero(~enabled)[0]:
+                key = (m[j].tobytes(), trans[j])
+                if key not in cnet.hidden_walks:
+                    fired = []
+                    m0 = m[j].copy()
+                    __walk_hidden(cnet, m0, trans[j], fired, set())
+                    cnet.hidden_walks[key] = (fired, m0 - m[j], int(cnet.consumed[fired].sum()),
+                                              int(cnet.produced[fired].sum()))
+                fired, delta, c, p = cnet.hidden_walks[key]
+                if fired:
+                    m[j] += delta
+                    fired_hidden[rows[j]][i] = fired
+                    consumed[rows[j]] += c
+                    produced[rows[j]] += p
+                    enabled[j] = np.all(m[j] >= cnet.pre[trans[j]])
+
+        for j in np.nonzero(~enabled)[0]:
+            problems[rows[j]].append(trans[j])
+
+        if stop_immediately_unfit:
+            unfit = rows[~enabled]
+            missing[unfit] += 1
+            stopped[unfit] = True
+            marking[unfit] = m[~enabled]
+            rows = rows[enabled]
+            trans = trans[enabled]
+            m = m[enabled]
+        else:
+            pre = cnet.pre[trans]
+            lacking = m < pre
+            missing[rows] += np.where(lacking, pre - m, 0).sum(axis=1)
+            # as in the classic token-based replay, the tokens needed by the arc are inserted
+            m = m + np.where(lacking, pre, 0)
+
+        consumed[rows] += cnet.consumed[trans]
+        produced[rows] += cnet.produced[trans]
+        marking[rows] = m + cnet.change[trans]
+        fired_visible[rows, i] = trans
+
+    fired_final = [[] for _ in range(num_variants)]
+    if reach_mark_through_hidden:
+        for j in np.nonzero(~np.all(marking[:, cnet.fm_places] > 0, axis=1))[0]:
+            key = marking[j].tobytes()
+            if key not in cnet.final_walks:
+                fired = []
+                m0 = marking[j].copy()
+                __reach_final_marking(cnet, m0, fired)
+                cnet.final_walks[key] = (fired, m0 - marking[j], int(cnet.consumed[fired].sum()),
+                                         int(cnet.produced[fired].sum()))
+            fired, delta, c, p = cnet.final_walks[key]
+            fired_final[j] = fired
+            marking[j] += delta
+            consumed[j] += c
+            produced[j] += p
+
+    activated = []
+    for j in range(num_variants):
+        act = []
+        for i in range(codes.shape[1]):
+            if i in fired_hidden[j]:
+                act.extend(fired_hidden[j][i])
+            if fired_visible[j, i] >= 0:
+                act.append(fired_visible[j, i])
+        act.extend(fired_final[j])
+        activated.append(act)
+
+    reached = marking.copy()
+    diff_final = np.maximum(cnet.fm - marking, 0).sum(axis=1)
+    remaining = np.maximum(marking - cnet.fm, 0).sum(axis=1)
+
+    return {"reached_marking": reached, "missing": missing, "consumed": consumed + cnet.fm.sum(),
+            "remaining": remaining, "produced": produced, "missing_final": diff_final,
+            "activated_transitions": activated, "transitions_with_problems": problems,
+            "not_in_model": not_in_model}
+
+
+def apply(log: Union[EventLog, pd.DataFrame], net: PetriNet, initial_marking: Marking, final_marking: Marking, parameters: Optional[Dict[Union[str, Parameters], Any]] = None) -> typing.ListAlignments:
+    """
+    Applies the vectorized token-based replay
+
+    Parameters
+    -------------
+    log
+        Event log / Pandas dataframe
+    net
+        Petri net
+    initial_marking
+        Initial marking
+    final_marking
+        Final marking
+    parameters
+        Parameters of the algorithm, including:
+        - Parameters.ACTIVITY_KEY => the attribute to use as activity
+        - Parameters.CASE_ID_KEY => the attribute to use as case identifier (dataframe)
+        - Parameters.CONSIDER_REMAINING_IN_FITNESS => considers the remaining tokens in the fitness of the trace
+        - Parameters.CONSIDER_ACTIVITIES_NOT_IN_MODEL_IN_FITNESS => a trace containing activities not in the model
+                                                                        is not fit
+        - Parameters.WALK_THROUGH_HIDDEN_TRANS => walks through hidden transitions to enable visible transitions
+        - Parameters.TRY_TO_REACH_FINAL_MARKING_THROUGH_HIDDEN => tries to reach the final marking firing hidden
+                                                                    transitions
+        - Parameters.STOP_IMMEDIATELY_UNFIT => stops the replay of a trace at the first problem
+        - Parameters.RETURN_NAMES => returns the names of the transitions/places instead of the objects
+        - Parameters.BATCH_SIZE => number of variants replayed together (default: 10000)
+
+    Returns
+    -------------
+    replayed_traces
+        List of results (one per case), in the same format of the classic token-based replay
+    """
+    if parameters is None:
+        parameters = {}
+
+    enable_pltr_fitness = exec_utils.get_param_value(Parameters.ENABLE_PLTR_FITNESS, parameters, False)
+    cleaning_token_flood = exec_utils.get_param_value(Parameters.CLEANING_TOKEN_FLOOD, parameters, False)
+
+    if enable_pltr_fitness or cleaning_token_flood:
+        return token_replay.apply(log, net, initial_marking, final_marking, parameters=parameters)
+
+    activity_key = exec_utils.get_param_value(Parameters.ACTIVITY_KEY, parameters, xes_constants.DEFAULT_NAME_KEY)
+    case_id_key = exec_utils.get_param_value(Parameters.CASE_ID_KEY, parameters, constants.CASE_CONCEPT_NAME)
+    consider_remaining_in_fitness = exec_utils.get_param_value(Parameters.CONSIDER_REMAINING_IN_FITNESS, parameters,
+                                                               True)
+    consider_activities_not_in_model_in_fitness = exec_utils.get_param_value(
+        Parameters.CONSIDER_ACTIVITIES_NOT_IN_MODEL_IN_FITNESS, parameters, False)
+    walk_through_hidden_trans = exec_utils.get_param_value(Parameters.WALK_THROUGH_HIDDEN_TRANS, parameters, True)
+    reach_mark_through_hidden = exec_utils.get_param_value(Parameters.TRY_TO_REACH_FINAL_MARKING_THROUGH_HIDDEN,
+                                                           parameters, True)
+    stop_immediately_unfit = exec_utils.get_param_value(Parameters.STOP_IMMEDIATELY_UNFIT, parameters, False)
+    return_names = exec_utils.get_param_value(Parameters.RETURN_NAMES, parameters, False)
+    places_shortest_path_by_hidden = exec_utils.get_param_value(Parameters.PLACES_SHORTEST_PATH_BY_HIDDEN, parameters,
+                                                                None)
+    batch_size = exec_utils.get_param_value(Parameters.BATCH_SIZE, parameters, 10000)
+
+    if pandas_utils.check_is_pandas_dataframe(log):
+        traces = [tuple(x) for x in log.groupby(case_id_key)[activity_key].agg(list).to_dict().values()]
+    else:
+        log = log_converter.apply(log, variant=log_converter.Variants.TO_EVENT_LOG, parameters=parameters)
+        traces = [tuple(x[activity_key] for x in trace) for trace in log]
+
+    variants = {}
+    for i, trace in enumerate(traces):
+        if trace not in variants:
+            variants[trace] = []
+        variants[trace].append(i)
+    variants_list = list(variants)
+
+    cnet = CompiledNet(net, initial_marking, final_marking,
+                       places_shortest_path_by_hidden=places_shortest_path_by_hidden)
+
+    enabled_cache = {}
+    results = [None] * len(traces)
+
+    for start in range(0, len(variants_list), batch_size):
+        batch = variants_list[start:start + batch_size]
+        replay = replay_variants(cnet, batch, walk_through_hidden_trans=walk_through_hidden_trans,
+                                 reach_mark_through_hidden=reach_mark_through_hidden,
+                                 stop_immediately_unfit=stop_immediately_unfit)
+
+        missing = replay["missing"]
+        remaining = replay["remaining"]
+        consumed = replay["consumed"]
+        produced = replay["produced"]
+
+        # as in the classic replay, the fitness flag does not consider the tokens missing in the final marking
+        is_fit = (missing == 0) & (remaining == 0) if consider_remaining_in_fitness else (missing == 0)
+        if consider_activities_not_in_model_in_fitness:
+            is_fit &= ~replay["not_in_model"]
+
+        missing = missing + replay["missing_final"]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            fitness = np.where((consumed > 0) & (produced > 0),
+                               0.5 * (1.0 - missing / consumed) + 0.5 * (1.0 - remaining / produced), 1.0)
+
+        for j, variant in enumerate(batch):
+            reached_vec = replay["reached_marking"][j]
+            reached_key = reached_vec.tobytes()
+            reached_marking = cnet.to_marking(reached_vec)
+            if reached_key not in enabled_cache:
+                enabled_cache[reached_key] = get_visible_transitions_eventually_enabled_by_marking(net,
+                                                                                                   reached_marking)
+            activated = [cnet.transitions[t] for t in replay["activated_transitions"][j]]
+            problems = [cnet.transitions[t] for t in replay["transitions_with_problems"][j]]
+            enabled_trans = enabled_cache[reached_key]
+
+            corr_value = {"trace_is_fit": bool(is_fit[j]),
+                          "trace_fitness": float(fitness[j]),
+                          "activated_transitions": activated,
+                          "reached_marking": reached_marking,
+                          "enabled_transitions_in_marking": copy(enabled_trans),
+                          "transitions_with_problems": problems,
+                          "missing_tokens": int(missing[j]),
+                          "consumed_tokens": int(consumed[j]),
+                          "remaining_tokens": int(remaining[j]),
+                          "produced_tokens": int(produced[j])}
+
+            if return_names:
+                corr_value["activated_transitions_labels"] = [x.label for x in activated]
+                corr_value["activated_transitions"] = [x.name for x in activated]
+                corr_value["enabled_transitions_in_marking_labels"] = [x.label for x in enabled_trans]
+                corr_value["enabled_transitions_in_marking"] = [x.name for x in enabled_trans]
+                corr_value["transitions_with_problems"] = [x.name for x in problems]
+                corr_value["reached_marking"] = {x.name: y for x, y in reached_marking.items()}
+
+            for case_position in variants[variant]:
+                results[case_position] = copy(corr_value)
+
+    return results
+
+
+def get_diagnostics_dataframe(log: EventLog, tbr_output: typing.ListAlignments, parameters: Optional[Dict[Union[str, Parameters], Any]] = None) -> pd.DataFrame:
+    """
+    Gets the results of token-based replay in a dataframe
+
+    Parameters
+    --------------
+    log
+        Event log
+    tbr_output
+        Output of the token-based replay technique
+
+    Returns
+    --------------
+    dataframe
+        Diagnostics dataframe
+    """
+    return token_replay.get_diagnostics_dataframe(log, tbr_output, parameters=parameters)
@@ -0,0 +1,125 @@
+'''
+    This file is part of PM4Py (More Info: https://pm4py.fit.fraunhofer.de).
+
+    PM4Py is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    PM4Py is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with PM4Py.  If not, see <https://www.gnu.org/licenses/>.
+'''
+from typing import Iterable, List, Tuple, Set, Dict, Any
+
+import numpy as np
+
+
+def get_relation_matrix(relation: Iterable[Tuple[Any, Any]], codes: Dict[Any, int]) -> np.ndarray:
+    """
+    Encodes a relation between activities as a boolean matrix
+
+    Parameters
+    --------------
+    relation
+        Couples of activities belonging to the relation
+    codes
+        Dictionary associating to every activity its index in the matrix
+
+    Returns
+    --------------
+    matrix
+        Boolean matrix (the element (i, j) is True if the couple of activities (i, j) belongs to the relation)
+    """
+    matrix = np.zeros((len(codes), len(codes)), dtype=bool)
+    couples = [(codes[x], codes[y]) for x, y in relation]
+    if couples:
+        couples = np.array(couples, dtype=np.int64)
+        matrix[couples[:, 0], couples[:, 1]] = True
+    return matrix
+
+
+def __to_bitsets(matrix: np.ndarray) -> List[int]:
+    """
+    Transforms the rows of a boolean matrix into integer bitsets
+    """
+    packed = np.packbits(matrix, axis=1, bitorder="little")
+    return [int.from_bytes(row.tobytes(), "little") for row in packed]
+
+
+def __bits(bitset: int) -> List[int]:
+    """
+    Gets the indexes of the bits set in the given bitset
+    """
+    ret = []
+    while bitset:
+        low = bitset & -bitset
+        ret.append(low.bit_length() - 1)
+        bitset ^= low
+    return ret
+
+
+def get_maximal_pairs(causal: np.ndarray, unrelated: np.ndarray) -> List[Tuple[Set[int], Set[int]]]:
+    """
+    Gets the maximal pairs (A, B) of sets of activities such that every activity of A is in causal relation with
+    every activity of B, and the activities of A (respectively, of B) are pairwise unrelated (including every activity
+    with itself).
+
+    The pairs are the maximal bicliques of the causal relation whose sides are cliques of the unrelated relation,
+    i.e., the maximal cliques containing at least an activity on both sides of the graph having a vertex for every
+    activity on the input side and a vertex for every activity on the output side. The maximal cliques are enumerated
+    with the Bron-Kerbosch algorithm (with pivoting) on integer bitsets, pruning the branches that cannot reach
+    both sides.
+
+    Parameters
+    --------------
+    causal
+        Boolean matrix of the causal relation
+    unrelated
+        Boolean (symmetric) matrix of the unrelated relation
+
+    Returns
+    --------------
+    pairs
+        Maximal pairs (as sets of indexes of the activities), sorted by their sides
+    """
+    n = causal.shape[0]
+    if n == 0:
+        return []
+
+    allowed = np.diagonal(unrelated).copy()
+    causal = causal & allowed[:, None] & allowed[None, :]
+    unrelated = unrelated & ~np.eye(n, dtype=bool)
+
+    # vertex i < n represents the activity i on the input side, vertex n + i the activity i on the output side
+    neighbors = [x | (y << n) for x, y in zip(__to_bitsets(unrelated), __to_bitsets(causal))]
+    neighbors += [x | (y << n) for x, y in zip(__to_bitsets(causal.T), __to_bitsets(unrelated))]
+
+    left = __to_bitsets(np.any(causal, axis=1)[None, :])[0]
+    right = __to_bitsets(np.any(causal, axis=0)[None, :])[0] << n
+    left_mask = (1 << n) - 1
+
+    pairs = []
+    stack = [(0, left | right, 0)]
+    while stack:
+        clique, candidates, excluded = stack.pop()
+        reachable = clique | candidates
+        if not (reachable & left_mask) or not (reachable >> n):
+            continue
+        if not candidates:
+            if not excluded:
+                pairs.append((set(__bits(clique & left_mask)), set(__bits(clique >> n))))
+            continue
+        pivot = max(__bits(candidates | excluded), key=lambda u: bin(candidates & neighbors[u]).count("1"))
+        for v in __bits(candidates & ~neighbors[pivot]):
+            bit = 1 << v
+            stack.append((clique | bit, candidates & neighbors[v], excluded & neighbors[v]))
+            candidates &= ~bit
+            excluded |= bit
+
+    pairs.sort(key=lambda p: (sorted(p[0]), sorted(p[1])))
+    return pairs
@@ -30,11 +30,10 @@ References
 """
 
 import time
-from itertools import product
 
 from pm4py import util as pm_util
 from pm4py.algo.discovery.alpha.data_structures import alpha_classic_abstraction
-from pm4py.algo.discovery.alpha.utils import endpoints
+from pm4py.algo.discovery.alpha.utils import endpoints, maximal_pairs
 from pm4py.objects.dfg.utils import dfg_utils
 from pm4py.algo.discovery.dfg.variants import native as dfg_inst
 from pm4py.objects.petri_net.utils.petri_utils import add_arc_from_to
@@ -169,23 +168,13 @@ def apply_dfg_sa_ea(dfg: Dict[str, int], start_activities: Union[None, Dict[str,
 
     alpha_abstraction = alpha_classic_abstraction.ClassicAlphaAbstraction(start_activities, end_activities, dfg,
                                                                           activity_key=activity_key)
-    pairs = list(map(lambda p: ({p[0]}, {p[1]}),
-                     filter(lambda p: __initial_filter(alpha_abstraction.parallel_relation, p),
-                            alpha_abstraction.causal_relation)))
-    for i in range(0, len(pairs)):
-        t1 = pairs[i]
-        for j in range(i, len(pairs)):
-            t2 = pairs[j]
-            if t1 != t2:
-                if t1[0].issubset(t2[0]) or t1[1].issubset(t2[1]):
-                    if not (__check_is_unrelated(alpha_abstraction.parallel_relation, alpha_abstraction.causal_relation,
-                                                 t1[0], t2[0]) or __check_is_unrelated(
-                        alpha_abstraction.parallel_relation, alpha_abstraction.causal_relation, t1[1], t2[1])):
-                        new_alpha_pair = (t1[0] | t2[0], t1[1] | t2[1])
-                        if new_alpha_pair not in pairs:
-                            if __check_all_causal(alpha_abstraction.causal_relation, new_alpha_pair[0], new_alpha_pair[1]):
-                                pairs.append((t1[0] | t2[0], t1[1] | t2[1]))
-    internal_places = filter(lambda p: __pair_maximizer(pairs, p), pairs)
+    codes = {x: i for i, x in enumerate(labels)}
+    causal = maximal_pairs.get_relation_matrix(alpha_abstraction.causal_relation, codes)
+    parallel = maximal_pairs.get_relation_matrix(alpha_abstraction.parallel_relation, codes)
+    # two activities are unrelated if they are neither in causal nor in parallel relation
+    unrelated = ~(causal | causal.T | parallel | parallel.T)
+    internal_places = [({labels[i] for i in x}, {labels[j] for j in y}) for x, y in
+                       maximal_pairs.get_maximal_pairs(causal, unrelated)]
     net = PetriNet('alpha_classic_net_' + str(time.time()))
     label_transition_dict = {}
 
@@ -220,32 +209,3 @@ def __add_sink(net, end_activities, label_transition_dict):
     for e in end_activities:
         add_arc_from_to(label_transition_dict[e], end, net)
     return end
-
-
-def __initial_filter(parallel_relation, pair):
-    if (pair[0], pair[0]) in parallel_relation or (pair[1], pair[1]) in parallel_relation:
-        return False
-    return True
-
-
-def __pair_maximizer(alpha_pairs, pair):
-    for alt in alpha_pairs:
-        if pair != alt and pair[0].issubset(alt[0]) and pair[1].issubset(alt[1]):
-            return False
-    return True
-
-
-def __check_is_unrelated(parallel_relation, causal_relation, item_set_1, item_set_2):
-    S = set(product(item_set_1, item_set_2)).union(set(product(item_set_2, item_set_1)))
-    for pair in S:
-        if pair in parallel_relation or pair in causal_relation:
-            return True
-    return False
-
-
-def __check_all_causal(causal_relation, item_set_1, item_set_2):
-    S = set(product(item_set_1, item_set_2))
-    for pair in S:
-        if pair not in causal_relation:
-            return False
-    return True
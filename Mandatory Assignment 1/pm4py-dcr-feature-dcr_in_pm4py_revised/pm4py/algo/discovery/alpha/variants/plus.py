@@ -16,14 +16,16 @@
 '''
 import time
 
+import numpy as np
+
 from pm4py import util as pmutil
 from pm4py.objects.log.obj import Trace
 from pm4py.util import xes_constants as xes_util
 from pm4py.objects.petri_net.utils.petri_utils import add_arc_from_to, remove_place, remove_transition
+from pm4py.algo.discovery.alpha.utils import maximal_pairs
 from pm4py.util import exec_utils
 from enum import Enum
-from copy import deepcopy
-from typing import Optional, Dict, Any, Union, Tuple
+from typing import Optional, Dict, Any, Union, Tuple, List, Set
 from pm4py.objects.log.obj import EventLog
 from pm4py.objects.petri_net.obj import PetriNet, Marking
 
@@ -31,11 +33,69 @@ from pm4py.objects.petri_net.obj import PetriNet, Marking
 class Parameters(Enum):
     ACTIVITY_KEY = pmutil.constants.PARAMETER_CONSTANT_ACTIVITY_KEY
     REMOVE_UNCONNECTED = "remove_unconnected"
+    COMPLETE_PAIRS = "complete_pairs"
+
+
+def __encode_log(log: EventLog, activity_key: Optional[str] = None, artificial: bool = False) -> Tuple[
+    np.ndarray, np.ndarray, List[str]]:
+    """
+    Encodes the traces of the log as a flat array of integer codes of the activities
+
+    Parameters
+    -------------
+    log
+        Event log (or log whose traces contain directly the activities, if the activity key is None)
+    activity_key
+        Activity key
+    artificial
+        Inserts the artificial start and end activities in every trace
+
+    Returns
+    -------------
+    codes
+        Flat array of the codes of the activities of the traces
+    same_trace
+        Boolean array that is True at the position i if the positions i and i+1 of the flat array belong to the same
+        trace
+    labels
+        Activities (the index is the code)
+    """
+    lookup = {}
+    if artificial:
+        lookup["artificial_start"] = 0
+        lookup["artificial_end"] = 1
+    codes = []
+    lengths = []
+    for trace in log:
+        if artificial:
+            codes.append(0)
+        if activity_key is None:
+            codes.extend(lookup.setdefault(x, len(lookup)) for x in trace)
+        else:
+            codes.extend(lookup.setdefault(x[activity_key], len(lookup)) for x in trace)
+        if artificial:
+            codes.append(1)
+        lengths.append(len(trace) + 2 if artificial else len(trace))
+    codes = np.array(codes, dtype=np.int64)
+    same_trace = np.ones(max(len(codes) - 1, 0), dtype=bool)
+    ends = np.cumsum(lengths)[:-1] - 1
+    same_trace[ends[ends >= 0]] = False
+    return codes, same_trace, list(lookup)
+
+
+def __first_occurrences(values: np.ndarray) -> np.ndarray:
+    """
+    Gets the distinct values of the array, sorted by their first occurrence
+    """
+    distinct, first = np.unique(values, return_index=True)
+    return distinct[np.argsort(first, kind="stable")]
 
 
 def preprocessing(log: EventLog, parameters: Optional[Dict[Union[str, Parameters], Any]] = None) -> Any:
     """
     Preprocessing step for the Aplha+ algorithm. Removing all transitions from the log with a loop of length one.
+    The log (with artificial start and end activities) is encoded as a flat array of integer codes, and the
+    loops of length one, along with the activities before and after them, are detected shifting the array.
 
     Parameters
     ------------
@@ -59,83 +119,90 @@ def preprocessing(log: EventLog, parameters: Optional[Dict[Union[str, Parameters
     loops_in_last_place
         Loops in sink place
     """
-    loops_in_first_place = set()
-    loops_in_last_place = set()
-
     if parameters is None:
         parameters = {}
     activity_key = exec_utils.get_param_value(Parameters.ACTIVITY_KEY, parameters, xes_util.DEFAULT_NAME_KEY)
+    complete_pairs = exec_utils.get_param_value(Parameters.COMPLETE_PAIRS, parameters, False)
 
-    # List for values that have a loop of length one
-    loop_one_list = []
-    # Log without activities that have a loop of length one
-    filtered_log = EventLog()
-    # dictionary A: activity before the loop-length-one activity
-    A = {}
-    # dictionary B: activity after the loop-length-one activity
-    B = {}
-    A_filtered = {}
-    B_filtered = {}
     # inserting artificial start and end activity, since it is not allowed to have a loop at the source place
     # (according to paper)
-    for trace in log:
-        trace.insert(0, {activity_key: 'artificial_start'})
-        trace.append({activity_key: 'artificial_end'})
-    for trace in log:
-        i = 0
-        while i < len(trace) - 1:
-            test = trace[1]
-            current = trace[i][activity_key]
-            successor = trace[i + 1][activity_key]
-            if current == successor:
-                if current not in loop_one_list:
-                    loop_one_list.append(current)
-            i += 1
-    for trace in log:
-        i = 0
-        filtered_trace = Trace()
-        while i < len(trace) - 1:
-            current = trace[i][activity_key]
-            successor = trace[i + 1][activity_key]
-            if not current in loop_one_list:
-                filtered_trace.append(current)
-            if successor in loop_one_list:
-                if not current in loop_one_list:
-                    if current in A:
-                        A[successor].append(current)
-                    else:
-                        A[successor] = [current]
-            if current in loop_one_list:
-                if not successor in loop_one_list:
-                    if current in B:
-                        B[current].append(successor)
-                    else:
-                        B[current] = [successor]
-            if i == len(trace) - 2:
-                if not successor in loop_one_list:
-                    filtered_trace.append(successor)
-            i += 1
-        filtered_log.append(filtered_trace)
-    # Making sets instead of lists
-    for key, value in A.items():
-        A_filtered[key] = set(value)
-    # Making sets instead of lists
-    for key, value in B.items():
-        B_filtered[key] = set(value)
-    for trace in log:
-        if trace.__getitem__(0) in loop_one_list:
-            loops_in_first_place.add(trace.__getitem__(0))
-        if trace.__getitem__(len(trace) - 1) in loop_one_list:
-            loops_in_last_place.add(trace.__getitem__(len(trace) - 1))
-    loops_in_first_place = list(loops_in_first_place)
-    loops_in_last_place = list(loops_in_last_place)
+    codes, same_trace, labels = __encode_log(log, activity_key=activity_key, artificial=True)
+    current = codes[:-1]
+    successor = codes[1:]
+
+    # activities that have a loop of length one
+    loops = __first_occurrences(current[same_trace & (current == successor)])
+    loop_one_list = [labels[x] for x in loops]
+    is_loop = np.zeros(len(labels), dtype=bool)
+    is_loop[loops] = True
+
+    # log without activities that have a loop of length one
+    kept = ~is_loop[codes]
+    traces = np.concatenate(([0], np.cumsum(~same_trace)))[:len(codes)]
+    kept_labels = [labels[x] for x in codes[kept].tolist()]
+    bounds = np.searchsorted(traces[kept], np.arange(len(log) + 1)).tolist()
+    filtered_log = EventLog([Trace(kept_labels[bounds[i]:bounds[i + 1]]) for i in range(len(bounds) - 1)])
+
+    # dictionary A: activity before the loop-length-one activity (as in the original implementation, the last
+    # occurrence is kept, unless all the activities are requested)
+    # dictionary B: activities after the loop-length-one activity
+    A_filtered = {}
+    B_filtered = {}
+    before = same_trace & ~is_loop[current] & is_loop[successor]
+    for x, y in zip(successor[before].tolist(), current[before].tolist()):
+        if complete_pairs:
+            A_filtered.setdefault(labels[x], set()).add(labels[y])
+        else:
+            A_filtered[labels[x]] = {labels[y]}
+    after = same_trace & is_loop[current] & ~is_loop[successor]
+    for x, y in zip(current[after].tolist(), successor[after].tolist()):
+        B_filtered.setdefault(labels[x], set()).add(labels[y])
+
+    # the artificial start and end activities cannot be loops of length one
+    loops_in_first_place = []
+    loops_in_last_place = []
 
     return (filtered_log, loop_one_list, A_filtered, B_filtered, loops_in_first_place, loops_in_last_place)
 
 
+def __get_follows_matrix(log: EventLog) -> Tuple[np.ndarray, np.ndarray, Dict[str, Set[str]], List[str]]:
+    """
+    Gets the boolean matrices of the follows relation (a > b) and of the triangle relation (a b a) of a log
+    whose traces contain directly the activities, along with the follows relation as dictionary (the activities
+    are inserted in order of first occurrence)
+    """
+    codes, same_trace, labels = __encode_log(log)
+    n = len(labels)
+    follows = np.zeros((n, n), dtype=bool)
+    follows[codes[:-1][same_trace], codes[1:][same_trace]] = True
+    triangle = np.zeros((n, n), dtype=bool)
+    if len(codes) > 2:
+        pattern = same_trace[:-1] & same_trace[1:] & (codes[:-2] == codes[2:])
+        triangle[codes[:-2][pattern], codes[1:-1][pattern]] = True
+    follows_dict = {}
+    for x in __first_occurrences(codes[:-1][same_trace] * n + codes[1:][same_trace]).tolist():
+        follows_dict.setdefault(labels[x // n], []).append(labels[x % n])
+    follows_dict = {x: set(y) for x, y in follows_dict.items()}
+    return follows, triangle, follows_dict, labels
+
+
+def __filter_relation(relation: Dict[str, Set[str]], matrix: np.ndarray, codes: Dict[str, int]) -> Dict[str, Set[str]]:
+    """
+    Restricts a relation (dictionary associating to every activity the set of activities related to it)
+    to the couples of activities for which the boolean matrix holds
+    """
+    ret = {}
+    for x, y in relation.items():
+        related = [z for z in y if matrix[codes[x], codes[z]]]
+        if related:
+            ret[x] = set(related)
+    return ret
+
+
 def get_relations(log: EventLog):
     """
-    Applying the classic Alpha Algorithm
+    Applying the classic Alpha Algorithm.
+    The ordering relations are computed as boolean matrices on the integer-coded traces of the log.
 
     Parameters
     --------------
@@ -151,138 +218,26 @@ def get_relations(log: EventLog):
     follows
         Follows relations
     """
+    follows, triangle, follows_dict, labels = __get_follows_matrix(log)
+    codes = {x: i for i, x in enumerate(labels)}
     # finding loops of length two
-    # ordering relations
-    triangle = {}
-    for trace in log:
-        i = 0
-        while i < len(trace) - 2:
-            current = trace.__getitem__(i)
-            successor = trace.__getitem__(i + 1)
-            successor2 = trace.__getitem__(i + 2)
-            if current == successor2:
-                if current in triangle:
-                    triangle[current].append(successor)
-                else:
-                    triangle[current] = [successor]
-            i += 1
-    for key, value in triangle.items():
-        triangle[key] = set(value)
-    square = {}
-    for key in triangle:
-        for element in triangle[key]:
-            if element in triangle:
-                if key in triangle[element]:
-                    if key in square and element in square:
-                        square[key].append(element)
-                        square[element].append(key)
-                    elif key in square and element not in square:
-                        square[key].append(element)
-                        square[element] = [key]
-                    elif key not in square and element in square:
-                        square[key] = [element]
-                        square[element].append(key)
-                    else:
-                        square[key] = [element]
-                        square[element] = [key]
-    for key, value in square.items():
-        square[key] = set(value)
-    # ordering relation following
-    follows = {}
-    for trace in log:
-        i = 0
-        while i < len(trace) - 1:
-            current = trace.__getitem__(i)
-            successor = trace.__getitem__(i + 1)
-            if current in follows:
-                if successor not in follows[current]:
-                    follows[current].append(successor)
-            else:
-                follows[current] = [successor]
-            i += 1
-    # transforming list to set
-    for key, value in follows.items():
-        follows[key] = set(value)
+    square = triangle & triangle.T
     # ordering relation causal
-    causal = {}
-    if len(square) != 0:
-        for key in follows:
-            for element in follows[key]:
-                if element in follows:
-                    if key in square:
-                        if (not (key in follows[element])) or (element in square[key]):
-                            if key in causal:
-                                causal[key].append(element)
-                            else:
-                                causal[key] = [element]
-                    else:
-                        if (not (key in follows[element])):
-                            if key in causal:
-                                causal[key].append(element)
-                            else:
-                                causal[key] = [element]
-                else:
-                    if key in causal:
-                        causal[key].append(element)
-                    else:
-                        causal[key] = [element]
-    else:
-        for key in follows:
-            for element in follows[key]:
-                if element in follows:
-                    if (not (key in follows[element])):
-                        if key in causal:
-                            causal[key].append(element)
-                        else:
-                            causal[key] = [element]
-                else:
-                    if key in causal:
-                        causal[key].append(element)
-                    else:
-                        causal[key] = [element]
-
-    for key, value in causal.items():
-        causal[key] = set(value)
+    causal = follows & (~follows.T | square)
     # ordering relation unrelated if no other ordering is applied
     # ordering relation parallel
-    parallel = {}
-    if len(square) != 0:
-        for key in follows:
-            for element in follows[key]:
-                if element in follows:
-                    if key in follows[element]:
-                        if element in follows[key]:
-                            if key in square:
-                                if not element in square[key]:
-                                    if key in parallel:
-                                        parallel[key].append(element)
-                                    else:
-                                        parallel[key] = [element]
-                            else:
-                                if key in parallel:
-                                    parallel[key].append(element)
-                                else:
-                                    parallel[key] = [element]
+    parallel = follows & follows.T & ~square
 
-    else:
-        for key in follows:
-            for element in follows[key]:
-                if element in follows:
-                    if key in follows[element]:
-                        if element in follows[key]:
-                            if key in parallel:
-                                parallel[key].append(element)
-                            else:
-                                parallel[key] = [element]
+    return __filter_relation(follows_dict, causal, codes), __filter_relation(follows_dict, parallel, codes), follows_dict
 
-    for key, value in parallel.items():
-        parallel[key] = set(value)
-    return causal, parallel, follows
 
-
-def processing(log: EventLog, causal: Tuple[str, str], follows: Tuple[str, str]):
+def processing(log: EventLog, causal: Tuple[str, str], follows: Tuple[str, str],
+               parameters: Optional[Dict[Union[str, Parameters], Any]] = None):
     """
-    Applying the Alpha Miner with the new relations
+    Applying the Alpha Miner with the new relations.
+    The pairs are combined and maximized representing the sets of activities as bitsets.
+    If Parameters.COMPLETE_PAIRS is set, all the maximal pairs are found as maximal bicliques of the causal
+    relation instead (see pm4py.algo.discovery.alpha.utils.maximal_pairs).
 
     Parameters
     -------------
@@ -292,6 +247,8 @@ def processing(log: EventLog, causal: Tuple[str, str], follows: Tuple[str, str])
         Pairs that have a causal relation (->)
     follows
         Pairs that have a follow relation (>)
+    parameters
+        Parameters of the algorithm
 
     Returns
     -------------
@@ -302,6 +259,10 @@ def processing(log: EventLog, causal: Tuple[str, str], follows: Tuple[str, str])
     fm
         Final marking
     """
+    if parameters is None:
+        parameters = {}
+    complete_pairs = exec_utils.get_param_value(Parameters.COMPLETE_PAIRS, parameters, False)
+
     # create list of all events
     labels = set()
     start_activities = set()
@@ -312,29 +273,31 @@ def processing(log: EventLog, causal: Tuple[str, str], follows: Tuple[str, str])
         for events in trace:
             labels.add(events)
     labels = list(labels)
-    pairs = []
 
-    for key, element in causal.items():
-        for item in element:
-            if get_sharp_relation(follows, key, key):
-                if get_sharp_relation(follows, item, item):
-                    pairs.append(({key}, {item}))
+    codes = {x: i for i, x in enumerate(labels)}
+    follows_matrix = maximal_pairs.get_relation_matrix(((x, y) for x in follows for y in follows[x]), codes)
+    # see get_sharp_relation
+    has_follows = np.any(follows_matrix, axis=1)
+    sharp = (~follows_matrix & ~follows_matrix.T & has_follows[:, None] & has_follows[None, :]) | (
+            ~has_follows[:, None] & ~has_follows[None, :])
+
+    if complete_pairs:
+        causal_matrix = maximal_pairs.get_relation_matrix(((x, y) for x in causal for y in causal[x]), codes)
+        cleaned_pairs = [({labels[i] for i in x}, {labels[j] for j in y}) for x, y in
+                         maximal_pairs.get_maximal_pairs(causal_matrix, sharp)]
+    else:
+        # bitset of the activities which are not in sharp relation with the given one
+        not_sharp = [sum(1 << j for j in np.flatnonzero(~row).tolist()) for row in sharp]
+
+        pairs = []
+        for key, element in causal.items():
+            for item in element:
+                if sharp[codes[key], codes[key]] and sharp[codes[item], codes[item]]:
+                    pairs.append((1 << codes[key], 1 << codes[item]))
+
+        cleaned_pairs = [(__bitset_to_set(x, labels), __bitset_to_set(y, labels)) for x, y in
+                         __pair_maximizer(__combine_pairs(pairs, not_sharp))]
 
-    # combining pairs
-    for i in range(0, len(pairs)):
-        t1 = pairs[i]
-        for j in range(i, len(pairs)):
-            t2 = pairs[j]
-            if t1 != t2:
-                if t1[0].issubset(t2[0]) or t1[1].issubset(t2[1]):
-                    if get_sharp_relations_for_sets(follows, t1[0], t2[0]) and get_sharp_relations_for_sets(follows,
-                                                                                                            t1[1],
-                                                                                                            t2[1]):
-                        new_alpha_pair = (t1[0] | t2[0], t1[1] | t2[1])
-                        if new_alpha_pair not in pairs:
-                            pairs.append((t1[0] | t2[0], t1[1] | t2[1]))
-    # maximize pairs
-    cleaned_pairs = list(filter(lambda p: __pair_maximizer(pairs, p), pairs))
     # create transitions
     net = PetriNet('alpha_plus_net_' + str(time.time()))
     label_transition_dict = {}
@@ -360,6 +323,63 @@ def processing(log: EventLog, causal: Tuple[str, str], follows: Tuple[str, str])
     return net, Marking({src: 1}), Marking({sink: 1}), cleaned_pairs
 
 
+def __bitset_to_set(bitset: int, labels: List[str]) -> Set[str]:
+    """
+    Gets the set of activities contained in a bitset
+    """
+    ret = set()
+    while bitset:
+        low = bitset & -bitset
+        ret.add(labels[low.bit_length() - 1])
+        bitset ^= low
+    return ret
+
+
+def __combine_pairs(pairs: List[Tuple[int, int]], not_sharp: List[int]) -> List[Tuple[int, int]]:
+    """
+    Combines the pairs (of bitsets of activities): every pair is combined with the following ones
+    (including the combinations already found), if the input or the output set of the first pair is
+    contained in the one of the second pair, and the sets of the two pairs are in sharp relation
+    """
+    # bitset of the activities which are not in sharp relation with some activity of the given bitset
+    not_sharp_sets = {}
+
+    def get_not_sharp(bitset):
+        if bitset not in not_sharp_sets:
+            ret = 0
+            rest = bitset
+            while rest:
+                low = rest & -rest
+                ret |= not_sharp[low.bit_length() - 1]
+                rest ^= low
+            not_sharp_sets[bitset] = ret
+        return not_sharp_sets[bitset]
+
+    pairs = list(pairs)
+    found = set(pairs)
+    for i in range(0, len(pairs)):
+        t1 = pairs[i]
+        not_sharp_1 = (get_not_sharp(t1[0]), get_not_sharp(t1[1]))
+        for j in range(i, len(pairs)):
+            t2 = pairs[j]
+            if t1 != t2:
+                if t1[0] & t2[0] == t1[0] or t1[1] & t2[1] == t1[1]:
+                    if not not_sharp_1[0] & t2[0] and not not_sharp_1[1] & t2[1]:
+                        new_alpha_pair = (t1[0] | t2[0], t1[1] | t2[1])
+                        if new_alpha_pair not in found:
+                            found.add(new_alpha_pair)
+                            pairs.append(new_alpha_pair)
+    return pairs
+
+
+def __pair_maximizer(pairs: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """
+    Keeps the pairs (of bitsets of activities) which are not contained in other pairs
+    """
+    return [p for p in pairs if not any(
+        p != alt and p[0] & alt[0] == p[0] and p[1] & alt[1] == p[1] for alt in pairs)]
+
+
 def get_sharp_relation(follows, instance_one, instance_two):
     """
     Returns true if sharp relations holds
@@ -417,9 +437,12 @@ def get_sharp_relations_for_sets(follows, set_1, set_2):
     return True
 
 
-def postprocessing(net: PetriNet, initial_marking: Marking, final_marking: Marking, A, B, pairs, loop_one_list) -> Tuple[PetriNet, Marking, Marking]:
+def postprocessing(net: PetriNet, initial_marking: Marking, final_marking: Marking, A, B, pairs, loop_one_list,
+                   parameters: Optional[Dict[Union[str, Parameters], Any]] = None) -> Tuple[PetriNet, Marking, Marking]:
     """
-    Adding the filtered transitions to the Petri net
+    Adding the filtered transitions to the Petri net.
+    If Parameters.COMPLETE_PAIRS is set, the loops are connected to the existing places of the pairs
+    (otherwise, as in the original implementation, a new place is added for every pair)
 
     Parameters
     ------------
@@ -431,6 +454,8 @@ def postprocessing(net: PetriNet, initial_marking: Marking, final_marking: Marki
         See Paper for definition
     B
         See Paper for definition
+    parameters
+        Parameters of the algorithm
 
     Returns
     ------------
@@ -441,11 +466,22 @@ def postprocessing(net: PetriNet, initial_marking: Marking, final_marking: Marki
     fm
         Final marking
     """
+    if parameters is None:
+        parameters = {}
+    complete_pairs = exec_utils.get_param_value(Parameters.COMPLETE_PAIRS, parameters, False)
+
     label_transition_dict = {}
     for label in loop_one_list:
         label_transition_dict[label] = PetriNet.Transition(label, label)
         net.transitions.add(label_transition_dict[label])
 
+    # places of the net created for the pairs, identified by their input and output transitions
+    pairs_places = {}
+    if complete_pairs:
+        for place in net.places:
+            pairs_places[(frozenset(x.source.name for x in place.in_arcs),
+                          frozenset(x.target.name for x in place.out_arcs))] = place
+
     # F L1L
     # Key is specific loop element
     for key, value in A.items():
@@ -457,8 +493,13 @@ def postprocessing(net: PetriNet, initial_marking: Marking, final_marking: Marki
                 in_part = pair_try[0]
                 out_part = pair_try[1]
                 if pair[0].issubset(in_part) and pair[1].issubset(out_part):
-                    pair_try_place = PetriNet.Place(str(pair_try))
-                    net.places.add(pair_try_place)
+                    pair_key = (frozenset(in_part), frozenset(out_part))
+                    pair_try_place = pairs_places.get(pair_key)
+                    if pair_try_place is None:
+                        pair_try_place = PetriNet.Place(str(pair_try))
+                        net.places.add(pair_try_place)
+                        if complete_pairs:
+                            pairs_places[pair_key] = pair_try_place
                     add_arc_from_to(label_transition_dict[key], pair_try_place, net)
                     add_arc_from_to(pair_try_place, label_transition_dict[key], net)
     return net, initial_marking, final_marking
@@ -473,7 +514,12 @@ def apply(trace_log: EventLog, parameters: Optional[Dict[Union[str, Parameters],
     trace_log
         Log
     parameters
-        Possible parameters of the algorithm
+        Possible parameters of the algorithm, including:
+        - Parameters.ACTIVITY_KEY => the activity
+        - Parameters.REMOVE_UNCONNECTED => removes the unconnected transitions (default: False)
+        - Parameters.COMPLETE_PAIRS => finds all the maximal pairs of the causal relation, considers all the
+        activities before the loops of length one, and connects the loops to the existing places of the pairs
+        (default: False, which reproduces the nets of the original implementation)
 
     Returns
     ------------
@@ -487,18 +533,14 @@ def apply(trace_log: EventLog, parameters: Optional[Dict[Union[str, Parameters],
     if parameters is None:
         parameters = {}
 
-    # deep copy the log object because otherwise the original log would be modified with
-    # artificial start/end activities
-    trace_log = deepcopy(trace_log)
-
     remove_unconnected = exec_utils.get_param_value(Parameters.REMOVE_UNCONNECTED, parameters, False)
 
     filtered_log, loop_one_list, A_filtered, B_filtered, loops_in_first, loops_in_last = preprocessing(trace_log,
                                                                                                        parameters=parameters)
     causal, parallel, follows = get_relations(filtered_log)
-    net, initial_marking, final_marking, pairs = processing(filtered_log, causal, follows)
+    net, initial_marking, final_marking, pairs = processing(filtered_log, causal, follows, parameters=parameters)
     net, initial_marking, final_marking = postprocessing(net, initial_marking, final_marking, A_filtered, B_filtered,
-                                                         pairs, loop_one_list)
+                                                         pairs, loop_one_list, parameters=parameters)
 
     net, initial_marking = remove_initial_hidden_if_possible(net, initial_marking)
     net = remove_final_hidden_if_possible(net, final_marking)
@@ -508,16 +550,6 @@ def apply(trace_log: EventLog, parameters: Optional[Dict[Union[str, Parameters],
     return net, initial_marking, final_marking
 
 
-def __pair_maximizer(alpha_pairs, pair):
-    """
-    Helping method, maximizing pairs
-    """
-    for alt in alpha_pairs:
-        if pair != alt and pair[0].issubset(alt[0]) and pair[1].issubset(alt[1]):
-            return False
-    return True
-
-
 def add_source(net, start_activities, label_transition_dict):
     """
     Adding source pe
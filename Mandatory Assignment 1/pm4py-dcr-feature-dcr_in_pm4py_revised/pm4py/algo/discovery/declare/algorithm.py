@@ -17,7 +17,7 @@
 
 from pm4py.util import exec_utils
 from enum import Enum
-from pm4py.algo.discovery.declare.variants import classic
+from pm4py.algo.discovery.declare.variants import classic, vectorized
 from pm4py.objects.log.obj import EventLog
 import pandas as pd
 from typing import Union, Dict, Optional, Any
@@ -25,6 +25,7 @@ from typing import Union, Dict, Optional, Any
 
 class Variants(Enum):
     CLASSIC = classic
+    VECTORIZED = vectorized
 
 
 def apply(log: Union[EventLog, pd.DataFrame], variant=Variants.CLASSIC, parameters: Optional[Dict[Any, Any]] = None) -> Dict[str, Dict[Any, Dict[str, int]]]:
@@ -38,6 +39,7 @@ def apply(log: Union[EventLog, pd.DataFrame], variant=Variants.CLASSIC, paramete
     variant
         Variant of the algorithm to be used, including:
         - Variants.CLASSIC
+        - Variants.VECTORIZED
     parameters
         Variant-specific parameters
 
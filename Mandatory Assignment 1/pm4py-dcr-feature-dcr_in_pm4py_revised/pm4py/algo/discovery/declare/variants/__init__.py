@@ -16,3 +16,4 @@
 '''
 
 from pm4py.algo.discovery.declare.variants import classic
+from pm4py.algo.discovery.declare.variants import vectorized
@@ -0,0 +1,380 @@
+'''
+    This file is part of PM4Py (More Info: https://pm4py.fit.fraunhofer.de).
+
+    PM4Py is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    PM4Py is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with PM4Py.  If not, see <https://www.gnu.org/licenses/>.
+'''
+from enum import Enum
+from pm4py.objects.log.obj import EventLog
+from pm4py.algo.discovery.declare.templates import *
+import pandas as pd
+from typing import Union, Dict, Optional, Any, Tuple, List, Iterator
+from pm4py.util import exec_utils, constants, xes_constants
+from collections import Counter
+import numpy as np
+
+
+class Parameters(Enum):
+    ACTIVITY_KEY = constants.PARAMETER_CONSTANT_ACTIVITY_KEY
+    CASE_ID_KEY = constants.PARAMETER_CONSTANT_CASEID_KEY
+    CONSIDERED_ACTIVITIES = "considered_activities"
+    MIN_SUPPORT_RATIO = "min_support_ratio"
+    MIN_CONFIDENCE_RATIO = "min_confidence_ratio"
+    AUTO_SELECTION_MULTIPLIER = "auto_selection_multiplier"
+    ALLOWED_TEMPLATES = "allowed_templates"
+    MAX_PAIRS_PER_BATCH = "max_pairs_per_batch"
+
+
+UNARY_TEMPLATES = [EXISTENCE, ABSENCE, EXACTLY_ONE, INIT]
+ALT_TEMPLATES = [ALTRESPONSE, ALTPRECEDENCE, ALTSUCCESSION]
+CHAIN_TEMPLATES = [CHAINRESPONSE, CHAINPRECEDENCE, CHAINSUCCESSION, NONCHAINSUCCESSION]
+
+
+class VariantsPositions(object):
+    """
+    Position arrays of the activities in the variants of a log.
+
+    Every (variant, activity) couple with at least one occurrence is an entry, storing the number of occurrences,
+    the first and last position, and the offset of its (sorted) positions in a shared array. The entries are grouped
+    by variant, and the weights are the number of cases of each variant.
+    """
+
+    def __init__(self, variants: List[Tuple[int, ...]], weights: List[int], no_acts: int):
+        self.no_variants = len(variants)
+        self.no_acts = no_acts
+        self.weights = np.array(weights, dtype=np.int64)
+
+        lengths = np.array([len(v) for v in variants], dtype=np.int64)
+        ev_var = np.repeat(np.arange(self.no_variants, dtype=np.int64), lengths)
+        ev_act = np.fromiter((a for v in variants for a in v), dtype=np.int64, count=int(lengths.sum()))
+        offsets = np.concatenate(([0], np.cumsum(lengths)[:-1])).astype(np.int64)
+        ev_pos = np.arange(len(ev_act), dtype=np.int64) - np.repeat(offsets, lengths)
+
+        keys = ev_var * no_acts + ev_act
+        order = np.argsort(keys, kind="stable")
+        self.positions = ev_pos[order]
+        entries, self.e_off, self.e_cnt = np.unique(keys[order], return_index=True, return_counts=True)
+        self.e_var = entries // no_acts
+        self.e_act = entries % no_acts
+        self.e_first = self.positions[self.e_off]
+        self.e_last = self.positions[self.e_off + self.e_cnt - 1]
+
+        self.k = np.bincount(self.e_var, minlength=self.no_variants)
+        self.v_start = np.concatenate(([0], np.cumsum(self.k)[:-1])).astype(np.int64)
+
+    def unary_counts(self, mask: np.ndarray) -> np.ndarray:
+        """
+        Number of cases (weighted) for every activity among the entries satisfying the mask
+        """
+        return np.bincount(self.e_act[mask], weights=self.weights[self.e_var[mask]],
+                           minlength=self.no_acts).astype(np.int64)
+
+    def pairs(self, max_pairs: int) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Yields (in batches of variants) the couples of entries of different activities belonging to the same variant
+        """
+        sq = self.k * self.k
+        v = 0
+        while v < self.no_variants:
+            cum = np.cumsum(sq[v:])
+            w = max(1, int(np.searchsorted(cum, max_pairs, side="right")))
+            e_from = self.v_start[v]
+            e_to = self.v_start[v + w - 1] + self.k[v + w - 1]
+            left_entries = np.arange(e_from, e_to, dtype=np.int64)
+            reps = self.k[self.e_var[left_entries]]
+            left = np.repeat(left_entries, reps)
+            within = np.arange(len(left), dtype=np.int64) - np.repeat(np.cumsum(reps) - reps, reps)
+            right = self.v_start[self.e_var[left]] + within
+            mask = left != right
+            yield left[mask], right[mask]
+            v += w
+
+    def pair_index(self, left: np.ndarray, right: np.ndarray) -> np.ndarray:
+        return self.e_act[left] * self.no_acts + self.e_act[right]
+
+    def alternating(self, left: np.ndarray, right: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Checks, for couples of entries with the same number of occurrences, if the occurrences of the left activity
+        alternate with the ones of the right activity (a1 < b1 < a2 < b2 ...), and if every occurrence of the
+        right activity directly follows the corresponding occurrence of the left activity.
+        """
+        n = self.e_cnt[left]
+        t = np.repeat(np.arange(len(left), dtype=np.int64), n)
+        i = np.arange(len(t), dtype=np.int64) - np.repeat(np.cumsum(n) - n, n)
+        off_a = self.e_off[left][t] + i
+        pa = self.positions[off_a]
+        pb = self.positions[self.e_off[right][t] + i]
+        has_next = i < n[t] - 1
+        pa_next = self.positions[np.where(has_next, off_a + 1, off_a)]
+        alt_fail = (pa >= pb) | (has_next & (pb >= pa_next))
+        chain_fail = alt_fail | (pb != pa + 1)
+        is_alt = np.bincount(t[alt_fail], minlength=len(left)) == 0
+        is_chain = np.bincount(t[chain_fail], minlength=len(left)) == 0
+        return is_alt, is_chain
+
+
+def __weighted_pair_counts(vp: VariantsPositions, left: np.ndarray, right: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    return np.bincount(vp.pair_index(left[mask], right[mask]), weights=vp.weights[vp.e_var[left[mask]]],
+                       minlength=vp.no_acts * vp.no_acts).astype(np.int64)
+
+
+def __evaluate_alternating(vp: VariantsPositions, candidates: np.ndarray, evaluated: np.ndarray,
+                           stats: Dict[str, np.ndarray], max_pairs: int):
+    """
+    Computes the (weighted) number of cases satisfying the alternate and chain conditions for the candidate
+    couples of activities which have not been evaluated yet
+    """
+    to_evaluate = candidates & ~evaluated
+    if not np.any(to_evaluate):
+        return
+    to_evaluate_flat = to_evaluate.ravel()
+    for left, right in vp.pairs(max_pairs):
+        pidx = vp.pair_index(left, right)
+        mask = to_evaluate_flat[pidx] & (vp.e_cnt[left] == vp.e_cnt[right]) & (vp.e_first[left] < vp.e_first[right]) & (
+                vp.e_last[left] < vp.e_last[right])
+        left = left[mask]
+        right = right[mask]
+        if len(left) == 0:
+            continue
+        is_alt, is_chain = vp.alternating(left, right)
+        weights = vp.weights[vp.e_var[left]]
+        stats["alt"] += np.bincount(pidx[mask], weights=weights * is_alt,
+                                    minlength=vp.no_acts * vp.no_acts).astype(np.int64).reshape(vp.no_acts, vp.no_acts)
+        stats["chain"] += np.bincount(pidx[mask], weights=weights * is_chain,
+                                      minlength=vp.no_acts * vp.no_acts).astype(np.int64).reshape(vp.no_acts,
+                                                                                                  vp.no_acts)
+    evaluated |= to_evaluate
+
+
+def __effective_templates(allowed_templates: set) -> List[str]:
+    """
+    Gets the templates for which a column would be formed by the classic variant, given the allowed templates
+    """
+    dependencies = {EXISTENCE: [EXISTENCE], ABSENCE: [ABSENCE, EXISTENCE], EXACTLY_ONE: [EXACTLY_ONE], INIT: [INIT],
+                    RESPONDED_EXISTENCE: [RESPONDED_EXISTENCE], RESPONSE: [RESPONSE], PRECEDENCE: [PRECEDENCE],
+                    SUCCESSION: [SUCCESSION, RESPONSE, PRECEDENCE], ALTRESPONSE: [ALTRESPONSE],
+                    ALTPRECEDENCE: [ALTPRECEDENCE], ALTSUCCESSION: [ALTSUCCESSION, ALTRESPONSE, ALTPRECEDENCE],
+                    CHAINRESPONSE: [CHAINRESPONSE], CHAINPRECEDENCE: [CHAINPRECEDENCE],
+                    CHAINSUCCESSION: [CHAINSUCCESSION, CHAINRESPONSE, CHAINPRECEDENCE],
+                    COEXISTENCE: [COEXISTENCE, RESPONDED_EXISTENCE],
+                    NONCOEXISTENCE: [NONCOEXISTENCE, COEXISTENCE, RESPONDED_EXISTENCE],
+                    NONSUCCESSION: [NONSUCCESSION, SUCCESSION, RESPONSE, PRECEDENCE],
+                    NONCHAINSUCCESSION: [NONCHAINSUCCESSION, CHAINSUCCESSION, CHAINRESPONSE, CHAINPRECEDENCE]}
+    return [t for t, deps in dependencies.items() if all(d in allowed_templates for d in deps)]
+
+
+def __support_confidence(template: str, stats: Dict[str, np.ndarray], no_cases: int) -> Tuple[
+    np.ndarray, np.ndarray]:
+    """
+    Gets the support (number of cases in which the rule is activated) and the confidence (number of cases in which
+    the rule is satisfied) of all the rules of a template
+    """
+    n_a = stats["n_a"]
+    n_ab = stats["n_ab"]
+    row = n_a[:, np.newaxis] + np.zeros_like(n_ab)
+    if template == EXISTENCE:
+        return np.full_like(n_a, no_cases), n_a
+    elif template == ABSENCE:
+        return np.full_like(n_a, no_cases), no_cases - n_a
+    elif template == EXACTLY_ONE:
+        return n_a, stats["one"]
+    elif template == INIT:
+        return np.full_like(n_a, no_cases), stats["init"]
+    elif template == RESPONDED_EXISTENCE:
+        return row, n_ab
+    elif template == RESPONSE:
+        return row, stats["last_lt"]
+    elif template == PRECEDENCE:
+        return n_ab, stats["first_lt"]
+    elif template == SUCCESSION:
+        return row, stats["succ"]
+    elif template in [ALTRESPONSE, ALTSUCCESSION]:
+        return row, stats["alt"]
+    elif template == ALTPRECEDENCE:
+        return n_ab, stats["alt"]
+    elif template in [CHAINRESPONSE, CHAINSUCCESSION]:
+        return row, stats["chain"]
+    elif template == CHAINPRECEDENCE:
+        return n_ab, stats["chain"]
+    elif template == COEXISTENCE:
+        return row + row.T - n_ab, n_ab
+    elif template == NONCOEXISTENCE:
+        return row + row.T - n_ab, row + row.T - 2 * n_ab
+    elif template == NONSUCCESSION:
+        return row, row - stats["succ"]
+    elif template == NONCHAINSUCCESSION:
+        return row, row - stats["chain"]
+
+
+def __confidence_upper_bound(template: str, stats: Dict[str, np.ndarray]) -> np.ndarray:
+    """
+    Upper bound of the confidence of the rules of an alternate/chain template, obtained from the cases in which
+    the two activities occur the same number of times, in the order required by the template
+    """
+    if template == NONCHAINSUCCESSION:
+        return stats["n_a"][:, np.newaxis] + np.zeros_like(stats["n_ab"])
+    return stats["candidates"]
+
+
+def __column_name(template: str, acts: List[Any], i: int, j: Optional[int] = None) -> Tuple:
+    if j is None:
+        return (template, acts[i])
+    return (template, acts[i], acts[j])
+
+
+def apply(log: Union[EventLog, pd.DataFrame], parameters: Optional[Dict[Any, Any]] = None) -> Dict[
+    str, Dict[Any, Dict[str, int]]]:
+    """
+    Discovers a DECLARE model from the provided event log.
+
+    Instead of forming a (cases x rules) table, the activities of every variant are summarized by
+    their number of occurrences, first/last position and position arrays. Then, the support and confidence
+    of all the rules are counted (weighting every variant by its number of cases) considering only the couples
+    of activities which co-occur in some variant. The expensive alternate/chain templates are evaluated
+    only for the couples of activities which can pass the support and confidence thresholds (Apriori-style pruning).
+    The resulting model is the same as the one of the classic variant.
+
+    Parameters
+    ---------------
+    log
+        Log object (EventLog, Pandas table)
+    parameters
+        Possible parameters of the algorithm, including:
+        - Parameters.ACTIVITY_KEY
+        - Parameters.CONSIDERED_ACTIVITIES
+        - Parameters.MIN_SUPPORT_RATIO
+        - Parameters.MIN_CONFIDENCE_RATIO
+        - Parameters.AUTO_SELECTION_MULTIPLIER
+        - Parameters.ALLOWED_TEMPLATES: collection of templates to consider (see the classic variant)
+        - Parameters.MAX_PAIRS_PER_BATCH: maximum number of couples of activities materialized at once
+
+    Returns
+    -------------
+    declare_model
+        DECLARE model (as Python dictionary), where each template is associated with its own rules
+    """
+    if parameters is None:
+        parameters = {}
+
+    activity_key = exec_utils.get_param_value(Parameters.ACTIVITY_KEY, parameters, xes_constants.DEFAULT_NAME_KEY)
+    case_id_key = exec_utils.get_param_value(Parameters.CASE_ID_KEY, parameters, constants.CASE_CONCEPT_NAME)
+    allowed_templates = exec_utils.get_param_value(Parameters.ALLOWED_TEMPLATES, parameters, None)
+    min_support_ratio = exec_utils.get_param_value(Parameters.MIN_SUPPORT_RATIO, parameters, None)
+    min_confidence_ratio = exec_utils.get_param_value(Parameters.MIN_CONFIDENCE_RATIO, parameters, None)
+    max_pairs = exec_utils.get_param_value(Parameters.MAX_PAIRS_PER_BATCH, parameters, 10000000)
+
+    if allowed_templates is None:
+        allowed_templates = {EXISTENCE, EXACTLY_ONE, INIT, RESPONDED_EXISTENCE, RESPONSE, PRECEDENCE, SUCCESSION,
+                             ALTRESPONSE, ALTPRECEDENCE, ALTSUCCESSION, CHAINRESPONSE, CHAINPRECEDENCE, CHAINSUCCESSION,
+                             ABSENCE, COEXISTENCE}
+
+    import pm4py
+
+    projected_log = pm4py.project_on_event_attribute(log, activity_key, case_id_key=case_id_key)
+    activities = exec_utils.get_param_value(Parameters.CONSIDERED_ACTIVITIES, parameters, None)
+
+    if activities is None:
+        activities = set(y for x in projected_log for y in x)
+
+    activities = sorted(set(activities))
+    templates = __effective_templates(set(allowed_templates))
+    act_idx = {act: i for i, act in enumerate(activities)}
+    no_acts = len(activities)
+
+    vars = Counter([tuple([act_idx[y] for y in x if y in act_idx]) for x in projected_log])
+    no_cases = sum(vars.values())
+    if no_cases == 0 or no_acts == 0:
+        return {}
+
+    vp = VariantsPositions(list(vars.keys()), list(vars.values()), no_acts)
+
+    stats = {"n_a": vp.unary_counts(np.ones(len(vp.e_act), dtype=bool)), "one": vp.unary_counts(vp.e_cnt == 1),
+             "init": vp.unary_counts(vp.e_first == 0)}
+    for key in ["n_ab", "first_lt", "last_lt", "succ", "candidates", "alt", "chain"]:
+        stats[key] = np.zeros(no_acts * no_acts, dtype=np.int64)
+    for left, right in vp.pairs(max_pairs):
+        first_lt = vp.e_first[left] < vp.e_first[right]
+        last_lt = vp.e_last[left] < vp.e_last[right]
+        stats["n_ab"] += __weighted_pair_counts(vp, left, right, np.ones(len(left), dtype=bool))
+        stats["first_lt"] += __weighted_pair_counts(vp, left, right, first_lt)
+        stats["last_lt"] += __weighted_pair_counts(vp, left, right, last_lt)
+        stats["succ"] += __weighted_pair_counts(vp, left, right, first_lt & last_lt)
+        stats["candidates"] += __weighted_pair_counts(vp, left, right, first_lt & last_lt & (
+                vp.e_cnt[left] == vp.e_cnt[right]))
+    for key in ["n_ab", "first_lt", "last_lt", "succ", "candidates", "alt", "chain"]:
+        stats[key] = stats[key].reshape(no_acts, no_acts)
+
+    off_diagonal = ~np.eye(no_acts, dtype=bool)
+    evaluated = np.zeros((no_acts, no_acts), dtype=bool)
+    alternating_templates = [t for t in templates if t in ALT_TEMPLATES or t in CHAIN_TEMPLATES]
+
+    if min_support_ratio is None and min_confidence_ratio is None:
+        # auto determine the minimum support and confidence ratio by identifying the values for the best feature.
+        # the product of the support and confidence ratios is (up to rounding) the confidence divided by the number
+        # of cases, so the alternate/chain rules need to be evaluated only when they could reach the best confidence
+        # among the other rules
+        auto_selection_multiplier = exec_utils.get_param_value(Parameters.AUTO_SELECTION_MULTIPLIER, parameters, 0.8)
+        best_conf = 0
+        for template in templates:
+            if template not in alternating_templates:
+                supp, conf = __support_confidence(template, stats, no_cases)
+                if supp.ndim == 2:
+                    conf = conf[off_diagonal & (supp > 0)]
+                best_conf = max(best_conf, int(conf.max()) if conf.size > 0 else 0)
+        candidates = np.zeros((no_acts, no_acts), dtype=bool)
+        for template in alternating_templates:
+            candidates |= (__confidence_upper_bound(template, stats) >= best_conf) & (stats["candidates"] > 0)
+        __evaluate_alternating(vp, candidates & off_diagonal, evaluated, stats, max_pairs)
+
+        best = None
+        for template in templates:
+            supp, conf = __support_confidence(template, stats, no_cases)
+            valid = supp > 0
+            if supp.ndim == 2:
+                valid = valid & off_diagonal
+            supp_ratio = supp.astype(np.float64) / float(no_cases)
+            conf_ratio = conf.astype(np.float64) / np.where(valid, supp, 1).astype(np.float64)
+            prod = np.where(valid, supp_ratio * conf_ratio, -1.0)
+            max_prod = prod.max()
+            if max_prod < 0:
+                continue
+            for idx in zip(*np.nonzero(prod == max_prod)):
+                col_name = __column_name(template, activities, *[int(i) for i in idx])
+                candidate = (float(max_prod), col_name, int(supp[idx]), int(conf[idx]))
+                if best is None or candidate[:2] > best[:2]:
+                    best = candidate
+        min_support_ratio = float(best[2]) / float(no_cases) * auto_selection_multiplier
+        min_confidence_ratio = float(best[3]) / float(best[2]) * auto_selection_multiplier
+
+    # Apriori-style pruning: the alternate/chain templates are evaluated only on the couples of activities
+    # passing the support threshold, which could also pass the confidence threshold
+    candidates = np.zeros((no_acts, no_acts), dtype=bool)
+    for template in alternating_templates:
+        supp, conf = __support_confidence(template, stats, no_cases)
+        candidates |= (supp > no_cases * min_support_ratio) & (
+                __confidence_upper_bound(template, stats) > supp * min_confidence_ratio) & (stats["candidates"] > 0)
+    __evaluate_alternating(vp, candidates & off_diagonal, evaluated, stats, max_pairs)
+
+    rules = {}
+    for template in templates:
+        supp, conf = __support_confidence(template, stats, no_cases)
+        selected = (supp > no_cases * min_support_ratio) & (conf > supp * min_confidence_ratio)
+        if supp.ndim == 2:
+            selected = selected & off_diagonal
+        for idx in zip(*np.nonzero(selected)):
+            if template not in rules:
+                rules[template] = {}
+            key = activities[idx[0]] if len(idx) == 1 else (activities[idx[0]], activities[idx[1]])
+            rules[template][key] = {"support": int(supp[idx]), "confidence": int(conf[idx])}
+
+    return rules
@@ -15,7 +15,7 @@
     along with PM4Py.  If not, see <https://www.gnu.org/licenses/>.
 '''
 from pm4py.util import xes_constants, pandas_utils, constants
-from pm4py.util.business_hours import soj_time_business_hours_diff
+from pm4py.util.business_hours import BusinessCalendar
 
 
 def get_dfg_graph(df, measure="frequency", activity_key="concept:name", case_id_glue="case:concept:name",
@@ -123,8 +123,7 @@ def get_dfg_graph(df, measure="frequency", activity_key="concept:name", case_id_
         if business_hours:
             if business_hours_slot is None:
                 business_hours_slot = constants.DEFAULT_BUSINESS_HOUR_SLOTS
-            df_successive_rows[constants.DEFAULT_FLOW_TIME] = df_successive_rows.apply(
-            lambda x: soj_time_business_hours_diff(x[timestamp_key], x[start_timestamp_key + '_2'], business_hours_slot, workcalendar), axis=1)
+            df_successive_rows[constants.DEFAULT_FLOW_TIME] = BusinessCalendar(business_hours_slot, workcalendar).get_seconds(df_successive_rows[timestamp_key], df_successive_rows[start_timestamp_key + '_2'])
         else:
             difference = df_successive_rows[start_timestamp_key + '_2'] - df_successive_rows[timestamp_key]
             df_successive_rows[constants.DEFAULT_FLOW_TIME] = pandas_utils.get_total_seconds(difference)
@@ -243,8 +242,7 @@ def get_partial_order_dataframe(df, start_timestamp_key=None, timestamp_key="tim
     if business_hours:
         if business_hours_slot is None:
             business_hours_slot = constants.DEFAULT_BUSINESS_HOUR_SLOTS
-        df[constants.DEFAULT_FLOW_TIME] = df.apply(
-            lambda x: soj_time_business_hours_diff(x[timestamp_key], x[start_timestamp_key + '_2'], business_hours_slot, workcalendar), axis=1)
+        df[constants.DEFAULT_FLOW_TIME] = BusinessCalendar(business_hours_slot, workcalendar).get_seconds(df[timestamp_key], df[start_timestamp_key + '_2'])
     else:
         df[constants.DEFAULT_FLOW_TIME] = pandas_utils.get_total_seconds(df[start_timestamp_key + "_2"] - df[timestamp_key])
 
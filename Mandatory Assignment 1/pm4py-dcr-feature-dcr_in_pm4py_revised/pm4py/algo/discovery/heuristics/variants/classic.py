@@ -14,13 +14,17 @@
     You should have received a copy of the GNU General Public License
     along with PM4Py.  If not, see <https://www.gnu.org/licenses/>.
 '''
-from copy import deepcopy
+from collections import Counter
 from enum import Enum
 
+import numpy as np
+
 from pm4py.algo.discovery.dfg import algorithm as dfg_alg
 from pm4py.algo.filtering.dfg.dfg_filtering import clean_dfg_based_on_noise_thresh
 from pm4py.objects.conversion.heuristics_net import converter as hn_conv_alg
+from pm4py.objects.conversion.log import converter as log_converter
 from pm4py.objects.heuristics_net import defaults
+from pm4py.objects.heuristics_net.matrix import HeuristicsMatrix, count_windows
 from pm4py.objects.heuristics_net.node import Node
 from pm4py.statistics.attributes.log import get as log_attributes
 from pm4py.statistics.end_activities.log import get as log_ea_filter
@@ -204,11 +208,7 @@ def apply_heu(log: EventLog, parameters: Optional[Dict[Any, Any]] = None) -> Heu
     end_activities = log_ea_filter.get_end_activities(log, parameters=parameters)
     activities_occurrences = log_attributes.get_attribute_values(log, activity_key, parameters=parameters)
     activities = list(activities_occurrences.keys())
-    dfg = dfg_alg.apply(log, parameters=parameters)
-    parameters_w2 = deepcopy(parameters)
-    parameters_w2["window"] = 2
-    dfg_window_2 = dfg_alg.apply(log, parameters=parameters_w2)
-    freq_triples = dfg_alg.apply(log, parameters=parameters, variant=dfg_alg.Variants.FREQ_TRIPLES)
+    dfg, dfg_window_2, freq_triples = discover_windows_log(log, parameters=parameters)
     performance_dfg = None
     if heu_net_decoration == "performance":
         performance_dfg = dfg_alg.apply(log, variant=dfg_alg.Variants.PERFORMANCE, parameters=parameters)
@@ -302,6 +302,57 @@ def apply_heu_pandas(df: pd.DataFrame, parameters: Optional[Dict[Union[str, Para
     return heu_net
 
 
+def discover_windows_log(log: EventLog, parameters: Optional[Dict[Union[str, Parameters], Any]] = None) -> Tuple[
+    Dict[Tuple[str, str], int], Dict[Tuple[str, str], int], Dict[Tuple[str, str, str], int]]:
+    """
+    Discovers the directly-follows graph, the directly-follows graph of window 2 and the frequency triples of an
+    event log in a single pass, shifting the integer-coded activities of the traces
+
+    Parameters
+    ------------
+    log
+        Event log
+    parameters
+        Parameters of the algorithm, including:
+            - Parameters.ACTIVITY_KEY
+
+    Returns
+    ------------
+    dfg
+        Directly-Follows Graph
+    dfg_window_2
+        Directly-Follows Graph of window 2
+    freq_triples
+        Frequency triples
+    """
+    if parameters is None:
+        parameters = {}
+
+    activity_key = exec_utils.get_param_value(Parameters.ACTIVITY_KEY, parameters, xes.DEFAULT_NAME_KEY)
+    log = log_converter.apply(log, variant=log_converter.Variants.TO_EVENT_LOG, parameters=parameters)
+
+    lookup = {}
+    codes = [lookup.setdefault(ev[activity_key], len(lookup)) for trace in log for ev in trace]
+    lengths = [len(trace) for trace in log]
+    labels = list(lookup)
+
+    couples, counts = count_windows(codes, lengths, 2)
+    dfg = Counter({(labels[x[0]], labels[x[1]]): y for x, y in zip(couples.tolist(), counts.tolist())})
+
+    triples, counts = count_windows(codes, lengths, 3)
+    freq_triples = {(labels[x[0]], labels[x[1]], labels[x[2]]): y for x, y in zip(triples.tolist(), counts.tolist())}
+
+    # the couples of window 2 are the first and the last activity of the triples (kept in order of first occurrence)
+    _, first, inverse = np.unique(triples[:, 0] * len(labels) + triples[:, 2], return_index=True,
+                                  return_inverse=True)
+    counts_window_2 = np.bincount(inverse.ravel(), weights=counts, minlength=len(first)).astype(np.int64)
+    order = np.argsort(first, kind="stable")
+    dfg_window_2 = Counter({(labels[triples[i, 0]], labels[triples[i, 2]]): y for i, y in
+                            zip(first[order].tolist(), counts_window_2[order].tolist())})
+
+    return dfg, dfg_window_2, freq_triples
+
+
 def apply_heu_dfg(dfg, activities=None, activities_occurrences=None, start_activities=None, end_activities=None,
                   dfg_window_2=None, freq_triples=None, performance_dfg=None, parameters=None) -> HeuristicsNet:
     """
@@ -425,59 +476,58 @@ def calculate(heu_net, dependency_thresh=defaults.DEFAULT_DEPENDENCY_THRESH,
                 if act1 not in heu_net.freq_triples_matrix:
                     heu_net.freq_triples_matrix[act1] = {}
                 heu_net.freq_triples_matrix[act1][act2] = value
-    for el in heu_net.dfg:
+    matrix = HeuristicsMatrix(heu_net.dfg)
+    values = matrix.values
+    inverse_values = matrix.inverse_values()
+    # dependency measure of all the couples: (|a>b| - |b>a|) / (|a>b| + |b>a| + 1), and |a>a| / (|a>a| + 1)
+    # for the self-loops
+    dependency = np.where(matrix.src == matrix.dst, values / (values + 1),
+                          (values - inverse_values) / (values + inverse_values + 1))
+    for el, value, dep in zip(heu_net.dfg, heu_net.dfg.values(), dependency.tolist()):
         act1 = el[0]
         act2 = el[1]
-        value = heu_net.dfg[el]
-        perf_value = heu_net.performance_dfg[el] if heu_net.performance_dfg is not None else heu_net.dfg[el]
+        perf_value = heu_net.performance_dfg[el] if heu_net.performance_dfg is not None else value
         if act1 not in heu_net.dependency_matrix:
             heu_net.dependency_matrix[act1] = {}
             heu_net.dfg_matrix[act1] = {}
             heu_net.performance_matrix[act1] = {}
         heu_net.dfg_matrix[act1][act2] = value
         heu_net.performance_matrix[act1][act2] = perf_value
-        if not act1 == act2:
-            inv_couple = (act2, act1)
-            c1 = value
-            if inv_couple in heu_net.dfg:
-                c2 = heu_net.dfg[inv_couple]
-                dep = (c1 - c2) / (c1 + c2 + 1)
-            else:
-                dep = c1 / (c1 + 1)
-        else:
-            dep = value / (value + 1)
         heu_net.dependency_matrix[act1][act2] = dep
-    for n1 in heu_net.dependency_matrix:
-        for n2 in heu_net.dependency_matrix[n1]:
-            condition1 = n1 in heu_net.activities_occurrences and heu_net.activities_occurrences[n1] >= min_act_count
-            condition2 = n2 in heu_net.activities_occurrences and heu_net.activities_occurrences[n2] >= min_act_count
-            condition3 = heu_net.dfg_matrix[n1][n2] >= min_dfg_occurrences
-            condition4 = heu_net.dependency_matrix[n1][n2] >= dependency_thresh
-            condition = condition1 and condition2 and condition3 and condition4
-            if condition:
-                if n1 not in heu_net.nodes:
-                    heu_net.nodes[n1] = Node(heu_net, n1, heu_net.activities_occurrences[n1],
-                                             is_start_node=(n1 in heu_net.start_activities),
-                                             is_end_node=(n1 in heu_net.end_activities),
-                                             default_edges_color=heu_net.default_edges_color[0],
-                                             node_type=heu_net.node_type, net_name=heu_net.net_name[0],
-                                             nodes_dictionary=heu_net.nodes)
-                if n2 not in heu_net.nodes:
-                    heu_net.nodes[n2] = Node(heu_net, n2, heu_net.activities_occurrences[n2],
-                                             is_start_node=(n2 in heu_net.start_activities),
-                                             is_end_node=(n2 in heu_net.end_activities),
-                                             default_edges_color=heu_net.default_edges_color[0],
-                                             node_type=heu_net.node_type, net_name=heu_net.net_name[0],
-                                             nodes_dictionary=heu_net.nodes)
-
-                repr_value = heu_net.performance_matrix[n1][n2]
-                heu_net.nodes[n1].add_output_connection(heu_net.nodes[n2], heu_net.dependency_matrix[n1][n2],
-                                                        heu_net.dfg_matrix[n1][n2], repr_value=repr_value)
-                heu_net.nodes[n2].add_input_connection(heu_net.nodes[n1], heu_net.dependency_matrix[n1][n2],
-                                                       heu_net.dfg_matrix[n1][n2], repr_value=repr_value)
+    frequent = np.array([x in heu_net.activities_occurrences and heu_net.activities_occurrences[x] >= min_act_count
+                         for x in matrix.labels] + [False], dtype=bool)
+    condition = frequent[matrix.src] & frequent[matrix.dst] & (values >= min_dfg_occurrences) & (
+            dependency >= dependency_thresh)
+    selected = np.nonzero(condition)[0]
+    # the codes of the matrix are assigned following the first occurrence of the activities as source of a couple,
+    # hence sorting on the source visits the couples in the order of the dependency matrix
+    selected = selected[np.argsort(matrix.src[selected], kind="stable")]
+    for i in selected.tolist():
+        n1 = matrix.labels[matrix.src[i]]
+        n2 = matrix.labels[matrix.dst[i]]
+        if n1 not in heu_net.nodes:
+            heu_net.nodes[n1] = Node(heu_net, n1, heu_net.activities_occurrences[n1],
+                                     is_start_node=(n1 in heu_net.start_activities),
+                                     is_end_node=(n1 in heu_net.end_activities),
+                                     default_edges_color=heu_net.default_edges_color[0],
+                                     node_type=heu_net.node_type, net_name=heu_net.net_name[0],
+                                     nodes_dictionary=heu_net.nodes)
+        if n2 not in heu_net.nodes:
+            heu_net.nodes[n2] = Node(heu_net, n2, heu_net.activities_occurrences[n2],
+                                     is_start_node=(n2 in heu_net.start_activities),
+                                     is_end_node=(n2 in heu_net.end_activities),
+                                     default_edges_color=heu_net.default_edges_color[0],
+                                     node_type=heu_net.node_type, net_name=heu_net.net_name[0],
+                                     nodes_dictionary=heu_net.nodes)
+
+        repr_value = heu_net.performance_matrix[n1][n2]
+        heu_net.nodes[n1].add_output_connection(heu_net.nodes[n2], heu_net.dependency_matrix[n1][n2],
+                                                heu_net.dfg_matrix[n1][n2], repr_value=repr_value)
+        heu_net.nodes[n2].add_input_connection(heu_net.nodes[n1], heu_net.dependency_matrix[n1][n2],
+                                               heu_net.dfg_matrix[n1][n2], repr_value=repr_value)
     for node in heu_net.nodes:
-        heu_net.nodes[node].calculate_and_measure_out(and_measure_thresh=and_measure_thresh)
-        heu_net.nodes[node].calculate_and_measure_in(and_measure_thresh=and_measure_thresh)
+        heu_net.nodes[node].calculate_and_measure_out(and_measure_thresh=and_measure_thresh, matrix=matrix)
+        heu_net.nodes[node].calculate_and_measure_in(and_measure_thresh=and_measure_thresh, matrix=matrix)
         heu_net.nodes[node].calculate_loops_length_two(heu_net.dfg_matrix, heu_net.freq_triples_matrix,
                                                        loops_length_two_thresh=loops_length_two_thresh)
     nodes = list(heu_net.nodes.keys())
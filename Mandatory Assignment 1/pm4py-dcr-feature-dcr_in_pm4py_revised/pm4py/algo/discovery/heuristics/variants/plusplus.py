@@ -18,6 +18,7 @@ from copy import copy
 from enum import Enum
 from typing import Optional, Dict, Any, Tuple
 
+import numpy as np
 import pandas as pd
 
 from pm4py.algo.discovery.dfg import algorithm as dfg_alg
@@ -25,6 +26,7 @@ from pm4py.algo.discovery.dfg.adapters.pandas import df_statistics
 from pm4py.objects.conversion.heuristics_net import converter as hn_conv_alg
 from pm4py.objects.conversion.log import converter as log_converter
 from pm4py.objects.heuristics_net import defaults
+from pm4py.objects.heuristics_net.matrix import HeuristicsMatrix, add_upper_couples
 from pm4py.objects.heuristics_net.obj import HeuristicsNet
 from pm4py.objects.heuristics_net.node import Node
 from pm4py.objects.log.obj import EventLog
@@ -436,16 +438,46 @@ def calculate(heu_net: HeuristicsNet, dependency_thresh: float, and_measure_thre
         heu_net.performance_matrix[act1][act2] = heu_net.performance_dfg[el] if heu_net.performance_dfg and el in heu_net.performance_dfg else 0.0
     for act1 in heu_net.activities:
         heu_net.nodes[act1] = Node(heu_net, act1, heu_net.activities_occurrences[act1], node_type=heu_net.node_type)
+    # integer-coded matrices of the DFG and of the concurrent activities (the activities of the net get the first
+    # codes, following their order)
+    matrix = HeuristicsMatrix(heu_net.dfg, activities=heu_net.activities)
+    concurrency = get_concurrency_matrix(heu_net, matrix)
     # calculates the dependencies between the activities
-    heu_net = calculate_dependency(heu_net, dependency_thresh, heu_net_decoration)
+    heu_net = calculate_dependency(heu_net, dependency_thresh, heu_net_decoration, matrix=matrix,
+                                   concurrency=concurrency)
     # calculates the AND measure for outgoing edges (e.g. which activities happen in parallel after a given activity)
-    heu_net = calculate_and_out_measure(heu_net, and_measure_thresh)
+    heu_net = calculate_and_out_measure(heu_net, and_measure_thresh, matrix=matrix, concurrency=concurrency)
     # calculates the AND measure for ingoing edges (e.g. which activities happen in parallel before a given activity)
-    heu_net = calculate_and_in_measure(heu_net, and_measure_thresh)
+    heu_net = calculate_and_in_measure(heu_net, and_measure_thresh, matrix=matrix, concurrency=concurrency)
     return heu_net
 
 
-def calculate_dependency(heu_net: HeuristicsNet, dependency_thresh: float, heu_net_decoration: str) -> HeuristicsNet:
+def get_concurrency_matrix(heu_net: HeuristicsNet, matrix: HeuristicsMatrix) -> HeuristicsMatrix:
+    """
+    Gets the (symmetric) integer-coded matrix of the concurrent activities of the heuristics net, sharing the codes of
+    the activities of the provided DFG matrix
+
+    Parameters
+    --------------
+    heu_net
+        Heuristics net
+    matrix
+        Integer-coded DFG matrix
+
+    Returns
+    --------------
+    concurrency_matrix
+        Integer-coded matrix of the concurrent activities
+    """
+    couples = dict(heu_net.concurrent_activities)
+    for (act1, act2), value in heu_net.concurrent_activities.items():
+        couples[(act2, act1)] = value
+    return HeuristicsMatrix(couples, activities=matrix.labels)
+
+
+def calculate_dependency(heu_net: HeuristicsNet, dependency_thresh: float, heu_net_decoration: str,
+                         matrix: Optional[HeuristicsMatrix] = None,
+                         concurrency: Optional[HeuristicsMatrix] = None) -> HeuristicsNet:
     """
     Calculates the dependency matrix using the Heuristics Miner ++ formula
 
@@ -457,31 +489,43 @@ def calculate_dependency(heu_net: HeuristicsNet, dependency_thresh: float, heu_n
         Dependency threshold
     heu_net_decoration
         Decoration to include (frequency/performance)
+    matrix
+        (If provided) integer-coded DFG matrix, giving the first codes to the activities of the net
+    concurrency
+        (If provided) integer-coded matrix of the concurrent activities
 
     Returns
     ---------------
     heu_net
         Heuristics net (enriched)
     """
-    for act1 in heu_net.activities:
-        if act1 in heu_net.dfg_matrix:
-            for act2 in heu_net.dfg_matrix[act1]:
-                v1 = heu_net.dfg_matrix[act1][act2]
-                v2 = heu_net.dfg_matrix[act2][act1] if act2 in heu_net.dfg_matrix and act1 in heu_net.dfg_matrix[
-                    act2] else 0.0
-                tup = tuple(sorted((act1, act2)))
-                # added term for Heuristics Miner ++
-                v3 = heu_net.concurrent_activities[tup] if tup in heu_net.concurrent_activities else 0.0
-                dep = (v1 - v2) / (v1 + v2 + v3)
-                heu_net.dependency_matrix[act1][act2] = dep
-                if dep > dependency_thresh:
-                    repr_value = v1 if heu_net_decoration == "frequency" else heu_net.performance_matrix[act1][act2]
-                    heu_net.nodes[act1].add_output_connection(heu_net.nodes[act2], dep, v1, repr_value=repr_value)
-                    heu_net.nodes[act2].add_input_connection(heu_net.nodes[act1], dep, v1, repr_value=repr_value)
+    if matrix is None:
+        # the activities of the net get the first codes, following their order
+        matrix = HeuristicsMatrix(heu_net.dfg, activities=heu_net.activities)
+    if concurrency is None:
+        concurrency = get_concurrency_matrix(heu_net, matrix)
+    v1 = matrix.values
+    v2 = matrix.inverse_values()
+    # added term for Heuristics Miner ++
+    v3 = concurrency.get(matrix.src, matrix.dst)
+    dependency = (v1 - v2) / (v1 + v2 + v3)
+    selected = np.nonzero(matrix.src < len(set(heu_net.activities)))[0]
+    selected = selected[np.argsort(matrix.src[selected], kind="stable")]
+    for i, dep in zip(selected.tolist(), dependency[selected].tolist()):
+        act1 = matrix.labels[matrix.src[i]]
+        act2 = matrix.labels[matrix.dst[i]]
+        heu_net.dependency_matrix[act1][act2] = dep
+        if dep > dependency_thresh:
+            value = heu_net.dfg_matrix[act1][act2]
+            repr_value = value if heu_net_decoration == "frequency" else heu_net.performance_matrix[act1][act2]
+            heu_net.nodes[act1].add_output_connection(heu_net.nodes[act2], dep, value, repr_value=repr_value)
+            heu_net.nodes[act2].add_input_connection(heu_net.nodes[act1], dep, value, repr_value=repr_value)
     return heu_net
 
 
-def calculate_and_out_measure(heu_net: HeuristicsNet, and_measure_thresh: float) -> HeuristicsNet:
+def calculate_and_out_measure(heu_net: HeuristicsNet, and_measure_thresh: float,
+                              matrix: Optional[HeuristicsMatrix] = None,
+                              concurrency: Optional[HeuristicsMatrix] = None) -> HeuristicsNet:
     """
     Calculates the AND measure for outgoing edges using the Heuristics Miner ++ formula
 
@@ -491,38 +535,40 @@ def calculate_and_out_measure(heu_net: HeuristicsNet, and_measure_thresh: float)
         Heuristics net
     and_measure_thresh
         And measure threshold
+    matrix
+        (If provided) integer-coded DFG matrix
+    concurrency
+        (If provided) integer-coded matrix of the concurrent activities
 
     Returns
     ---------------
     heu_net
         Heuristics net (enriched)
     """
+    if matrix is None:
+        matrix = HeuristicsMatrix(heu_net.dfg)
+    if concurrency is None:
+        concurrency = get_concurrency_matrix(heu_net, matrix)
     for act in heu_net.nodes:
         nodes = sorted(x.node_name for x in heu_net.nodes[act].output_connections)
-        i = 0
-        while i < len(nodes):
-            n1 = nodes[i]
-            v3 = heu_net.dfg_matrix[act][n1] if act in heu_net.dfg_matrix and n1 in heu_net.dfg_matrix[act] else 0.0
-            j = i + 1
-            while j < len(nodes):
-                n2 = nodes[j]
-                tup = tuple(sorted((n1, n2)))
-                v1 = heu_net.dfg_matrix[n1][n2] if n1 in heu_net.dfg_matrix and n2 in heu_net.dfg_matrix[n1] else 0.0
-                v2 = heu_net.dfg_matrix[n2][n1] if n2 in heu_net.dfg_matrix and n1 in heu_net.dfg_matrix[n2] else 0.0
-                v4 = heu_net.dfg_matrix[act][n2] if act in heu_net.dfg_matrix and n2 in heu_net.dfg_matrix[act] else 0.0
-                # added term for Heuristics Miner ++
-                v5 = heu_net.concurrent_activities[tup] if tup in heu_net.concurrent_activities else 0.0
-                this_value = (v1 + v2 + v5) / (v3 + v4)
-                if this_value > and_measure_thresh:
-                    if n1 not in heu_net.nodes[act].and_measures_out:
-                        heu_net.nodes[act].and_measures_out[n1] = {}
-                    heu_net.nodes[act].and_measures_out[n1][n2] = this_value
-                j = j + 1
-            i = i + 1
+        if len(nodes) < 2:
+            continue
+        # the first row/column of the submatrix refers to the activity
+        codes = matrix.codes([act] + nodes)
+        submatrix = matrix.submatrix(codes, codes)
+        between = submatrix[1:, 1:]
+        from_act = submatrix[0, 1:]
+        # added term for Heuristics Miner ++
+        concurrency_codes = concurrency.codes(nodes)
+        concurrent = concurrency.submatrix(concurrency_codes, concurrency_codes)
+        values = (between + between.T + concurrent) / (from_act[:, None] + from_act[None, :])
+        add_upper_couples(heu_net.nodes[act].and_measures_out, nodes, values, values > and_measure_thresh)
     return heu_net
 
 
-def calculate_and_in_measure(heu_net: HeuristicsNet, and_measure_thresh: float) -> HeuristicsNet:
+def calculate_and_in_measure(heu_net: HeuristicsNet, and_measure_thresh: float,
+                             matrix: Optional[HeuristicsMatrix] = None,
+                             concurrency: Optional[HeuristicsMatrix] = None) -> HeuristicsNet:
     """
     Calculates the AND measure for incoming edges using the Heuristics Miner ++ formula
 
@@ -532,34 +578,34 @@ def calculate_and_in_measure(heu_net: HeuristicsNet, and_measure_thresh: float)
         Heuristics net
     and_measure_thresh
         And measure threshold
+    matrix
+        (If provided) integer-coded DFG matrix
+    concurrency
+        (If provided) integer-coded matrix of the concurrent activities
 
     Returns
     ---------------
     heu_net
         Heuristics net (enriched)
     """
+    if matrix is None:
+        matrix = HeuristicsMatrix(heu_net.dfg)
+    if concurrency is None:
+        concurrency = get_concurrency_matrix(heu_net, matrix)
     for act in heu_net.nodes:
         nodes = sorted(x.node_name for x in heu_net.nodes[act].input_connections)
-        i = 0
-        while i < len(nodes):
-            n1 = nodes[i]
-            v3 = heu_net.dfg_matrix[n1][act] if n1 in heu_net.dfg_matrix and act in heu_net.dfg_matrix[n1] else 0.0
-            j = i + 1
-            while j < len(nodes):
-                n2 = nodes[j]
-                tup = tuple(sorted((n1, n2)))
-                v1 = heu_net.dfg_matrix[n1][n2] if n1 in heu_net.dfg_matrix and n2 in heu_net.dfg_matrix[n1] else 0.0
-                v2 = heu_net.dfg_matrix[n2][n1] if n2 in heu_net.dfg_matrix and n1 in heu_net.dfg_matrix[n2] else 0.0
-                v4 = heu_net.dfg_matrix[n2][act] if n2 in heu_net.dfg_matrix and act in heu_net.dfg_matrix[n2] else 0.0
-                # added term for Heuristics Miner ++
-                v5 = heu_net.concurrent_activities[tup] if tup in heu_net.concurrent_activities else 0.0
-                this_value = (v1 + v2 + v5) / (v3 + v4)
-                if this_value > and_measure_thresh:
-                    if n1 not in heu_net.nodes[act].and_measures_in:
-                        heu_net.nodes[act].and_measures_in[n1] = {}
-                    heu_net.nodes[act].and_measures_in[n1][n2] = this_value
-                j = j + 1
-            i = i + 1
+        if len(nodes) < 2:
+            continue
+        # the first row/column of the submatrix refers to the activity
+        codes = matrix.codes([act] + nodes)
+        submatrix = matrix.submatrix(codes, codes)
+        between = submatrix[1:, 1:]
+        to_act = submatrix[1:, 0]
+        # added term for Heuristics Miner ++
+        concurrency_codes = concurrency.codes(nodes)
+        concurrent = concurrency.submatrix(concurrency_codes, concurrency_codes)
+        values = (between + between.T + concurrent) / (to_act[:, None] + to_act[None, :])
+        add_upper_couples(heu_net.nodes[act].and_measures_in, nodes, values, values > and_measure_thresh)
     return heu_net
 
 
@@ -29,12 +29,14 @@ from pm4py.objects.log.util import filtering_utils
 from pm4py.util.lp import solver as lp_solver
 from pm4py.objects.petri_net.utils import petri_utils
 from pm4py.objects.log.util import artificial
-from copy import copy, deepcopy
+from copy import deepcopy
 from pm4py.algo.discovery.causal import algorithm as causal_discovery
 from pm4py.algo.discovery.dfg import algorithm as dfg_discovery
 from pm4py.objects.petri_net.utils import murata
 from pm4py.objects.petri_net.utils import reduction
 import importlib.util
+import os
+from scipy import sparse
 
 
 class Parameters(Enum):
@@ -44,26 +46,54 @@ class Parameters(Enum):
     CAUSAL_RELATION = "causal_relation"
     SHOW_PROGRESS_BAR = "show_progress_bar"
     ALPHA = "alpha"
+    MULTIPROCESSING = "multiprocessing"
+    CORES = "cores"
+
+
+# base linear problem shared by the worker processes searching the places
+_base_problem = None
 
 
 def __transform_log_to_matrix(log: EventLog, activities: List[str], activity_key: str):
     """
     Internal method
-    Transforms the event log in a numeric matrix that is used to construct the linear problem.
+    Transforms the event log in a numeric matrix that is used to construct the linear problem
+    (for every trace, the Parikh vectors of its prefixes).
     """
+    activities_idx = {act: i for i, act in enumerate(activities)}
+    identity = np.eye(len(activities), dtype=int)
     matr = []
     for trace in log:
-        vect = []
-        rep = np.array([0] * len(activities))
-        for i in range(len(trace)):
-            repi = rep.copy()
-            repi[activities.index(trace[i][activity_key])] += 1
-            vect.append(repi)
-            rep = repi
-        matr.append(vect)
+        codes = [activities_idx[ev[activity_key]] for ev in trace]
+        matr.append(list(np.cumsum(identity[codes], axis=0)))
     return matr
 
 
+def _set_base_problem(base_problem):
+    """
+    Internal method.
+    Sets the base linear problem in a worker process
+    """
+    global _base_problem
+    _base_problem = base_problem
+
+
+def _solve_candidate(ca_indexes: Tuple[int, int]):
+    """
+    Internal method.
+    Solves the linear problem associated to a causal relation (given as indexes of the source/target activities),
+    extending the equality constraints of the base linear problem by fixing the arc from the source activity
+    and the arc to the target activity
+    """
+    c, Aub, bub, Aeq, beq, integrality = _base_problem
+    num_variables = Aub.shape[1]
+    num_activities = (num_variables - 1) // 2
+    Aeq1 = sparse.vstack([Aeq, sparse.csr_matrix(([1, 1], ([0, 1], [ca_indexes[0], num_activities + ca_indexes[1]])),
+                                                 shape=(2, num_variables))], format="csr")
+    beq1 = np.concatenate((beq, [1, 1]))
+    return lp_solver.apply(c, Aub, bub, Aeq1, beq1, variant=lp_solver.SCIPY, parameters={"integrality": integrality})
+
+
 def __manage_solution(sol, added_places, explored_solutions, net, activities, trans_map):
     """
     Internal method.
@@ -118,6 +148,8 @@ def apply(log0: Union[EventLog, EventStream, pd.DataFrame], parameters: Optional
         Parameters of the algorithm, including:
         - Parameters.ACTIVITY_KEY => the attribute to be used as activity
         - Parameters.SHOW_PROGRESS_BAR => decides if the progress bar should be shown
+        - Parameters.MULTIPROCESSING => solves the linear problems of the causal relations in a pool of processes
+        - Parameters.CORES => number of processes of the pool (default: number of CPUs - 2)
 
     Returns
     ---------------
@@ -137,6 +169,8 @@ def apply(log0: Union[EventLog, EventStream, pd.DataFrame], parameters: Optional
     artificial_end_activity = exec_utils.get_param_value(Parameters.PARAM_ARTIFICIAL_END_ACTIVITY, parameters,
                                                          constants.DEFAULT_ARTIFICIAL_END_ACTIVITY)
     show_progress_bar = exec_utils.get_param_value(Parameters.SHOW_PROGRESS_BAR, parameters, constants.SHOW_PROGRESS_BAR)
+    enable_multiprocessing = exec_utils.get_param_value(Parameters.MULTIPROCESSING, parameters, constants.ENABLE_MULTIPROCESSING_DEFAULT)
+    num_cores = exec_utils.get_param_value(Parameters.CORES, parameters, max(1, os.cpu_count() - 2))
 
     log0 = log_converter.apply(log0, variant=log_converter.Variants.TO_EVENT_LOG, parameters=parameters)
     log0 = filtering_utils.keep_one_trace_per_variant(log0, parameters=parameters)
@@ -202,68 +236,54 @@ def apply(log0: Union[EventLog, EventStream, pd.DataFrame], parameters: Optional
             seq_enc_graph[prev][curr] += trace_occ
     max_child_seq_enc_graph = {x: max(y.values()) for x, y in seq_enc_graph.items()}
 
-    # STEP C) construction of the base linear problem
+    # STEP C) construction of the base linear problem (in sparse form, without repeated constraints)
     # which will be 'extended' in each step
+    num_variables = 2 * len(activities) + 1
     c = np.zeros(2*len(activities))
-    Aub = []
-    bub = []
-    Aeq = []
-    beq = []
-
-    added_rows_Aub = set()
-    added_rows_Aeq = set()
+    # the dictionaries keep the rows in order of insertion
+    rows_Aub = {}
+    rows_Aeq = {}
 
     for trace in matr:
         for i in range(len(trace)):
-            row1 = -trace[i-1] if i > 0 else np.zeros(len(activities))
+            row1 = -trace[i-1] if i > 0 else np.zeros(len(activities), dtype=int)
             row2 = trace[i]
             prev = tuple(row1)
             curr = tuple(row2)
 
             if seq_enc_graph[prev][curr] >= (1-alpha) * max_child_seq_enc_graph[prev]:
-                row = row1.tolist() + row2.tolist() + [-1]
+                row = tuple(row1.tolist() + row2.tolist() + [-1])
                 if i < len(trace)-1:
-                    if tuple(row) not in added_rows_Aub:
-                        added_rows_Aub.add(tuple(row))
-                        Aub.append(row)
-                        bub.append(0)
+                    rows_Aub[row] = None
                 else:
-                    if tuple(row) not in added_rows_Aeq:
-                        # deviation 1: impose that the place is empty at the end of every trace of the log
-                        added_rows_Aeq.add(tuple(row))
-                        Aeq.append(row)
-                        beq.append(0)
-
-                crow = row2.tolist() + (-row2).tolist()
-                c += crow
+                    # deviation 1: impose that the place is empty at the end of every trace of the log
+                    rows_Aeq[row] = None
+
+                c[:len(activities)] += row2
+                c[len(activities):] -= row2
             else:
                 # break not only the current node but all his children
                 break
 
-    Aub.append([-1] * (2*len(activities)) + [0])
-    bub.append(-1)
-
-    for i in range(2*len(activities)+1):
-        row1 = [0] * (2*len(activities)+1)
-        row1[i] = -1
-        Aub.append(row1)
-        bub.append(0)
-        row2 = [0] * (2*len(activities)+1)
-        row2[i] = 1
-        Aub.append(row2)
-        bub.append(1)
-
+    # every variable is binary
+    bounds = np.zeros((2 * num_variables, num_variables), dtype=int)
+    bounds[0::2] = -np.eye(num_variables, dtype=int)
+    bounds[1::2] = np.eye(num_variables, dtype=int)
     # deviation 2: seek only for places that contains initially 0 tokens
     const = [0] * (2 * len(activities)) + [1]
-    Aub.append(const)
-    bub.append(0)
+
+    Aub = sparse.vstack([sparse.csr_matrix(np.array(list(rows_Aub), dtype=int).reshape(-1, num_variables)),
+                         sparse.csr_matrix([[-1] * (2*len(activities)) + [0]]), sparse.csr_matrix(bounds),
+                         sparse.csr_matrix([const])], format="csr")
+    bub = np.array([0] * len(rows_Aub) + [-1] + [0, 1] * num_variables + [0])
+    Aeq = sparse.csr_matrix(np.array(list(rows_Aeq), dtype=int).reshape(-1, num_variables))
+    beq = np.zeros(len(rows_Aeq))
 
     c = c.tolist()
     c.append(1)
 
     integrality = [1] * (2*len(activities)+1)
 
-    ite = 0
     added_places = set()
     explored_solutions = set()
 
@@ -273,28 +293,26 @@ def apply(log0: Union[EventLog, EventStream, pd.DataFrame], parameters: Optional
         progress = tqdm(total=len(causal), desc="discovering Petri net using ILP miner, completed causal relations :: ")
 
     # STEP D) explore all the causal relations in the log
-    # to find places
-    for ca in causal:
-        Aeq1 = copy(Aeq)
-        beq1 = copy(beq)
-
-        const1 = [0] * (2*len(activities) + 1)
-        const1[activities.index(ca[0])] = 1
-        Aeq1.append(const1)
-        beq1.append(1)
-
-        const2 = [0] * (2*len(activities) + 1)
-        const2[len(activities) + activities.index(ca[1])] = 1
-        Aeq1.append(const2)
-        beq1.append(1)
-
-        sol = lp_solver.apply(c, Aub, bub, Aeq1, beq1, variant=lp_solver.SCIPY, parameters={"integrality": integrality})
-        __manage_solution(sol, added_places, explored_solutions, net, activities, trans_map)
-
-        ite += 1
-
-        if progress is not None:
-            progress.update()
+    # to find places. The linear problems of the causal relations are independent, hence they can be solved
+    # in parallel, while their solutions are managed in the order of the causal relations
+    base_problem = (c, Aub, bub, Aeq, beq, integrality)
+    candidates = [(activities.index(ca[0]), activities.index(ca[1])) for ca in causal]
+    if enable_multiprocessing and len(candidates) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=num_cores, initializer=_set_base_problem,
+                                 initargs=(base_problem,)) as executor:
+            for sol in executor.map(_solve_candidate, candidates):
+                __manage_solution(sol, added_places, explored_solutions, net, activities, trans_map)
+                if progress is not None:
+                    progress.update()
+    else:
+        _set_base_problem(base_problem)
+        for ca_indexes in candidates:
+            sol = _solve_candidate(ca_indexes)
+            __manage_solution(sol, added_places, explored_solutions, net, activities, trans_map)
+            if progress is not None:
+                progress.update()
+        _set_base_problem(None)
 
     # gracefully close progress bar
     if progress is not None:
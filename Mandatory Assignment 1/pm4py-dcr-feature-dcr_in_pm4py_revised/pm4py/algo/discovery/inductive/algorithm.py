@@ -43,6 +43,9 @@ class Parameters(Enum):
     ACTIVITY_KEY = constants.PARAMETER_CONSTANT_ACTIVITY_KEY
     TIMESTAMP_KEY = constants.PARAMETER_CONSTANT_TIMESTAMP_KEY
     CASE_ID_KEY = constants.PARAMETER_CONSTANT_CASEID_KEY
+    RECURSION_MULTIPROCESSING = "recursion_multiprocessing"
+    RECURSION_CORES = "recursion_cores"
+    RECURSION_MIN_SIZE = "recursion_min_size"
 
 
 class Variants(Enum):
@@ -74,10 +77,16 @@ def apply(obj: Union[EventLog, pd.DataFrame, DFG, UVCL], parameters: Optional[Di
 
         if variant is Variants.IM:
             im = IMUVCL(parameters)
-            process_tree = im.apply(IMDataStructureUVCL(uvcl), parameters)
+            try:
+                process_tree = im.apply(IMDataStructureUVCL(uvcl), parameters)
+            finally:
+                im.shutdown()
         if variant is Variants.IMf:
             imf = IMFUVCL(parameters)
-            process_tree = imf.apply(IMDataStructureUVCL(uvcl), parameters)
+            try:
+                process_tree = imf.apply(IMDataStructureUVCL(uvcl), parameters)
+            finally:
+                imf.shutdown()
         if variant is Variants.IMd:
             imd = IMD(parameters)
             idfg = InductiveDFG(dfg=comut.discover_dfg_uvcl(uvcl), skip=() in uvcl)
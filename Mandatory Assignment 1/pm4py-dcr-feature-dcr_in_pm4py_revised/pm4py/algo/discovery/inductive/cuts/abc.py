@@ -38,7 +38,12 @@ class Cut(ABC, Generic[T]):
     @classmethod
     def apply(cls, obj: T, parameters: Optional[Dict[str, Any]] = None) -> Optional[Tuple[ProcessTree, List[T]]]:
         g = cls.holds(obj, parameters)
-        return (cls.operator(), cls.project(obj, g, parameters)) if g is not None else g
+        if g is None:
+            return g
+        children = cls.project(obj, g, parameters)
+        for child in children:
+            child.inherit_bit_matrix(obj)
+        return cls.operator(), children
 
     @classmethod
     @abstractmethod
@@ -15,13 +15,13 @@
     along with PM4Py.  If not, see <https://www.gnu.org/licenses/>.
 '''
 from abc import ABC
-from collections import Counter
 from typing import List, Collection, Any, Optional, Generic, Dict
 
+import numpy as np
+
 from pm4py.algo.discovery.inductive.cuts.abc import Cut, T
 from pm4py.algo.discovery.inductive.dtypes.im_dfg import InductiveDFG
 from pm4py.algo.discovery.inductive.dtypes.im_ds import IMDataStructureUVCL, IMDataStructureDFG
-from pm4py.objects.dfg import util as dfu
 from pm4py.objects.dfg.obj import DFG
 from pm4py.objects.process_tree.obj import Operator, ProcessTree
 
@@ -35,37 +35,14 @@ class ConcurrencyCut(Cut[T], ABC, Generic[T]):
     @classmethod
     def holds(cls, obj: T, parameters: Optional[Dict[str, Any]] = None) -> Optional[List[Collection[Any]]]:
         dfg = obj.dfg
-        alphabet = dfu.get_vertices(dfg)
-        alphabet = sorted(list(alphabet))
-        edges = dfu.get_edges(dfg)
-        edges = sorted(list(edges))
-
-        groups = [{a} for a in alphabet]
-        if len(groups) == 0:
+        m = obj.bit_matrix
+        if len(m) == 0:
             return None
 
-        cont = True
-        while cont:
-            cont = False
-            i = 0
-            while i < len(groups):
-                j = i + 1
-                while j < len(groups):
-                    for act1 in groups[i]:
-                        for act2 in groups[j]:
-                            if (act1, act2) not in edges or (act2, act1) not in edges:
-                                groups[i] = groups[i].union(groups[j])
-                                del groups[j]
-                                cont = True
-                                break
-                        if cont:
-                            break
-                    if cont:
-                        break
-                    j = j + 1
-                if cont:
-                    break
-                i = i + 1
+        # two activities are merged unless they directly follow each other in both directions (the merges are
+        # transitive, so the groups are the connected components of this relation, seeded in alphabetical order)
+        order = np.array(sorted(range(len(m)), key=lambda i: m.vertices[i]), dtype=np.int64)
+        groups = [m.activities(c) for c in m.components(~(m.adjacency & m.adjacency.T), order=order)]
 
         groups = list(sorted(groups, key=lambda g: len(g)))
         i = 0
@@ -88,13 +65,17 @@ class ConcurrencyCutUVCL(ConcurrencyCut[IMDataStructureUVCL]):
 
     @classmethod
     def project(cls, obj: IMDataStructureUVCL, groups: List[Collection[Any]], parameters: Optional[Dict[str, Any]] = None) -> List[IMDataStructureUVCL]:
+        lookup, encoded, lengths, counts = obj.encoding
+        variant = np.repeat(np.arange(len(lengths)), lengths)
+        event_groups = obj.get_event_groups(groups)
         r = list()
-        for g in groups:
-            c = Counter()
-            for t in obj.data_structure:
-                c[tuple(filter(lambda e: e in g, t))] = obj.data_structure[t]
-            r.append(c)
-        return list(map(lambda l: IMDataStructureUVCL(l), r))
+        for i in range(len(groups)):
+            keep = event_groups == i
+            # the count of a projected variant is the one of the last variant projected on it
+            r.append(IMDataStructureUVCL.from_encoding(lookup, encoded[keep],
+                                                       np.bincount(variant[keep], minlength=len(lengths)), counts,
+                                                       accumulate=False))
+        return r
 
 
 class ConcurrencyCutDFG(ConcurrencyCut[IMDataStructureDFG]):
@@ -15,18 +15,16 @@
     along with PM4Py.  If not, see <https://www.gnu.org/licenses/>.
 '''
 from abc import ABC
-from collections import Counter
-from typing import List, Optional, Collection, Any, Tuple, Generic, Dict
+from typing import List, Optional, Collection, Any, Generic, Dict
 
-from pm4py.util import nx_utils
+import numpy as np
 
 from pm4py.algo.discovery.inductive.cuts.abc import Cut, T
+from pm4py.algo.discovery.inductive.dtypes.im_bitmatrix import IMBitMatrix
 from pm4py.algo.discovery.inductive.dtypes.im_dfg import InductiveDFG
 from pm4py.algo.discovery.inductive.dtypes.im_ds import IMDataStructureUVCL, IMDataStructureDFG
-from pm4py.objects.dfg import util as dfu
 from pm4py.objects.dfg.obj import DFG
 from pm4py.objects.process_tree.obj import Operator, ProcessTree
-from pm4py.util.compression.dtypes import UVCL
 
 
 class LoopCut(Cut[T], ABC, Generic[T]):
@@ -56,14 +54,14 @@ class LoopCut(Cut[T], ABC, Generic[T]):
         if len(dfg.graph) == 0:
             return None
 
+        m = obj.bit_matrix
         groups = [start_activities.union(end_activities)]
-        for c in cls._compute_connected_components(dfg, start_activities, end_activities):
-            groups.append(set(c.nodes))
+        groups.extend(cls._compute_connected_components(dfg, start_activities, end_activities, matrix=m))
 
         groups = cls._exclude_sets_non_reachable_from_start(dfg, start_activities, end_activities, groups)
         groups = cls._exclude_sets_no_reachable_from_end(dfg, start_activities, end_activities, groups)
-        groups = cls._check_start_completeness(dfg, start_activities, end_activities, groups)
-        groups = cls._check_end_completeness(dfg, start_activities, end_activities, groups)
+        groups = cls._check_start_completeness(dfg, start_activities, end_activities, groups, matrix=m)
+        groups = cls._check_end_completeness(dfg, start_activities, end_activities, groups, matrix=m)
 
         groups = list(filter(lambda g: len(g) > 0, groups))
 
@@ -71,18 +69,16 @@ class LoopCut(Cut[T], ABC, Generic[T]):
 
     @classmethod
     def _check_start_completeness(cls, dfg: DFG, start_activities: Collection[Any], end_activities: Collection[Any],
-                                  groups: List[Collection[Any]], parameters: Optional[Dict[str, Any]] = None) -> List[Collection[Any]]:
+                                  groups: List[Collection[Any]], parameters: Optional[Dict[str, Any]] = None,
+                                  matrix: Optional[IMBitMatrix] = None) -> List[Collection[Any]]:
+        if matrix is None:
+            matrix = IMBitMatrix.from_dfg(dfg)
+        # edges from every activity to the start activities
+        to_start = matrix.adjacency[:, matrix.mask(start_activities)]
+        incomplete = to_start.any(axis=1) & ~to_start.all(axis=1)
         i = 1
         while i < len(groups):
-            merge = False
-            for a in groups[i]:
-                if merge:
-                    break
-                for (x, b) in dfg.graph:
-                    if x == a and b in start_activities:
-                        for s in start_activities:
-                            if not (a, s) in dfg.graph:
-                                merge = True
+            merge = (incomplete & matrix.mask(groups[i])).any()
             if merge:
                 groups[0] = set(groups[0]).union(groups[i])
                 del groups[i]
@@ -92,18 +88,16 @@ class LoopCut(Cut[T], ABC, Generic[T]):
 
     @classmethod
     def _check_end_completeness(cls, dfg: DFG, start_activities: Collection[Any], end_activities: Collection[Any],
-                                groups: List[Collection[Any]], parameters: Optional[Dict[str, Any]] = None) -> List[Collection[Any]]:
+                                groups: List[Collection[Any]], parameters: Optional[Dict[str, Any]] = None,
+                                matrix: Optional[IMBitMatrix] = None) -> List[Collection[Any]]:
+        if matrix is None:
+            matrix = IMBitMatrix.from_dfg(dfg)
+        # edges from the end activities to every activity
+        from_end = matrix.adjacency[matrix.mask(end_activities)]
+        incomplete = from_end.any(axis=0) & ~from_end.all(axis=0)
         i = 1
         while i < len(groups):
-            merge = False
-            for a in groups[i]:
-                if merge:
-                    break
-                for (b, x) in dfg.graph:
-                    if x == a and b in end_activities:
-                        for e in end_activities:
-                            if not (e, a) in dfg.graph:
-                                merge = True
+            merge = (incomplete & matrix.mask(groups[i])).any()
             if merge:
                 groups[0] = set(groups[0]).union(groups[i])
                 del groups[i]
@@ -144,56 +138,63 @@ class LoopCut(Cut[T], ABC, Generic[T]):
 
     @classmethod
     def _compute_connected_components(cls, dfg: DFG, start_activities: Collection[Any],
-                                      end_activities: Collection[Any], parameters: Optional[Dict[str, Any]] = None):
-        nxd = dfu.as_nx_graph(dfg)
-        [nxd.remove_edge(a, b) for (a, b) in dfg.graph if
-         a in start_activities or a in end_activities or b in start_activities or b in end_activities]
-        [nxd.remove_node(a) for a in start_activities if nxd.has_node(a)]
-        [nxd.remove_node(a) for a in end_activities if nxd.has_node(a)]
-        nxu = nxd.to_undirected()
-        return [nxd.subgraph(c).copy() for c in nx_utils.connected_components(nxu)]
+                                      end_activities: Collection[Any], parameters: Optional[Dict[str, Any]] = None,
+                                      matrix: Optional[IMBitMatrix] = None) -> List[Collection[Any]]:
+        """
+        Connected components (sets of activities) of the undirected DFG without the start/end activities
+        """
+        if matrix is None:
+            matrix = IMBitMatrix.from_dfg(dfg)
+        inner = ~(matrix.mask(start_activities) | matrix.mask(end_activities))
+        return [matrix.activities(c) for c in
+                matrix.components(matrix.adjacency | matrix.adjacency.T, mask=inner)]
 
 
 class LoopCutUVCL(LoopCut[IMDataStructureUVCL]):
 
     @classmethod
     def project(cls, obj: IMDataStructureUVCL, groups: List[Collection[Any]], parameters: Optional[Dict[str, Any]] = None) -> List[IMDataStructureUVCL]:
-        do = groups[0]
-        redo = groups[1:]
-        redo_activities = [y for x in redo for y in x]
-        do_log = Counter()
-        redo_logs = [Counter() for i in range(len(redo))]
-        for t in obj.data_structure:
-            do_trace = tuple()
-            redo_trace = tuple()
-            for e in t:
-                if e in do:
-                    do_trace = do_trace + (e,)
-                    if len(redo_trace) > 0:
-                        redo_logs = cls._append_trace_to_redo_log(redo_trace, redo_logs, redo, obj.data_structure[t])
-                        redo_trace = tuple()
-                else:
-                    if e in redo_activities:
-                        redo_trace = redo_trace + (e,)
-                        if len(do_trace) > 0:
-                            do_log.update({do_trace: obj.data_structure[t]})
-                            do_trace = tuple()
-            if len(redo_trace) > 0:
-                redo_logs = cls._append_trace_to_redo_log(redo_trace, redo_logs, redo)
-            do_log.update({do_trace: obj.data_structure[t]})
-        logs = [do_log]
-        logs.extend(redo_logs)
-        return list(map(lambda l: IMDataStructureUVCL(l), logs))
-
-    @classmethod
-    def _append_trace_to_redo_log(cls, redo_trace: Tuple, redo_logs: List[UVCL], redo_groups: List[Collection[Any]],
-                                  cardinality, parameters: Optional[Dict[str, Any]] = None) -> \
-            List[UVCL]:
-        activities = set(x for x in redo_trace)
-        inte = [(i, len(activities.intersection(redo_groups[i]))) for i in range(len(redo_groups))]
-        inte = sorted(inte, key=lambda x: (x[1], x[0]), reverse=True)
-        redo_logs[inte[0][0]].update({redo_trace: cardinality})
-        return redo_logs
+        lookup, encoded, lengths, counts = obj.encoding
+        variant = np.repeat(np.arange(len(lengths)), lengths)
+        event_groups = obj.get_event_groups(groups)
+        # the events not belonging to any group are ignored
+        kept = event_groups >= 0
+        variant, event_groups, encoded = variant[kept], event_groups[kept], encoded[kept]
+        is_do = event_groups == 0
+        # maximal runs of events of the do part (resp. of the redo part) in the same variant
+        boundary = np.ones(len(encoded), dtype=bool)
+        boundary[1:] = (variant[1:] != variant[:-1]) | (is_do[1:] != is_do[:-1])
+        run = np.cumsum(boundary) - 1
+        run_starts = np.flatnonzero(boundary)
+        run_variant = variant[run_starts]
+        run_do = is_do[run_starts]
+        run_lengths = np.diff(np.append(run_starts, len(encoded)))
+
+        # every run of the do part is a trace of the do log, and every variant not ending with the do part
+        # adds an empty trace (after its runs)
+        variant_lengths = np.bincount(variant, minlength=len(lengths))
+        ends_with_do = np.zeros(len(lengths), dtype=bool)
+        ends_with_do[variant_lengths > 0] = is_do[np.cumsum(variant_lengths)[variant_lengths > 0] - 1]
+        empty_variants = np.flatnonzero(~ends_with_do)
+        do_variants = np.concatenate((run_variant[run_do], empty_variants))
+        do_positions = np.concatenate((run_starts[run_do], np.full(len(empty_variants), len(encoded))))
+        do_lengths = np.concatenate((run_lengths[run_do], np.zeros(len(empty_variants), dtype=np.int64)))
+        order = np.lexsort((do_positions, do_variants))
+        logs = [IMDataStructureUVCL.from_encoding(lookup, encoded[is_do], do_lengths[order],
+                                                  counts[do_variants[order]])]
+
+        # every run of the redo part goes to the redo group sharing most activities with it (the last one in case
+        # of ties)
+        redo_events = np.flatnonzero(~is_do)
+        pairs, first = np.unique(run[redo_events] * len(lookup) + encoded[redo_events], return_index=True)
+        intersection = np.zeros((len(run_starts), len(groups) - 1), dtype=np.int64)
+        np.add.at(intersection, (pairs // len(lookup), event_groups[redo_events[first]] - 1), 1)
+        chosen = len(groups) - 1 - np.argmax(intersection[:, ::-1], axis=1)
+        for i in range(1, len(groups)):
+            selected = ~run_do & (chosen == i)
+            logs.append(IMDataStructureUVCL.from_encoding(lookup, encoded[selected[run]], run_lengths[selected],
+                                                          counts[run_variant[selected]]))
+        return logs
 
 
 class LoopCutDFG(LoopCut[IMDataStructureDFG]):
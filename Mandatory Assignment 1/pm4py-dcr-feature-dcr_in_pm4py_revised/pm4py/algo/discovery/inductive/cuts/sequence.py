@@ -14,15 +14,16 @@
     You should have received a copy of the GNU General Public License
     along with PM4Py.  If not, see <https://www.gnu.org/licenses/>.
 '''
-import itertools
 import sys
 from abc import ABC
 from collections import Counter
 from typing import Collection, Any, List, Optional, Generic, Dict
-from typing import Tuple
+
+import numpy as np
 
 from pm4py.algo.discovery.inductive.cuts.abc import Cut
 from pm4py.algo.discovery.inductive.cuts.abc import T
+from pm4py.algo.discovery.inductive.dtypes.im_bitmatrix import IMBitMatrix
 from pm4py.algo.discovery.inductive.dtypes.im_dfg import InductiveDFG
 from pm4py.algo.discovery.inductive.dtypes.im_ds import IMDataStructureUVCL, IMDataStructureDFG
 from pm4py.objects.dfg import util as dfu
@@ -71,20 +72,20 @@ class SequenceCut(Cut[T], ABC, Generic[T]):
         3. merge pairwise unreachable nodes (based on transitive relations)
         4. sort the groups based on their reachability
         '''
-        dfg = obj.dfg
-        alphabet = dfu.get_vertices(dfg)
-        transitive_predecessors, transitive_successors = dfu.get_transitive_relations(dfg)
-        groups = [{a} for a in alphabet]
-        if len(groups) == 0:
+        m = obj.bit_matrix
+        n = len(m)
+        if n == 0:
             return None
 
-        old_size = None
-        while old_size != len(groups):
-            old_size = len(groups)
-            groups = SequenceCut.merge_groups(groups, transitive_successors)
+        # the merges of steps 2-3 are transitive, so the groups are the connected components of the relation
+        # 'pairwise reachable or pairwise unreachable', computed on the bit-matrix of the transitive closure
+        succ = m.transitive_successors
+        groups = [m.activities(c) for c in m.components((succ & succ.T) | ~(succ | succ.T))]
 
-        groups = list(sorted(groups, key=lambda g: len(
-            transitive_predecessors[next(iter(g))]) + (len(alphabet) - len(transitive_successors[next(iter(g))]))))
+        num_pred = succ.sum(axis=0)
+        num_succ = succ.sum(axis=1)
+        groups = list(sorted(groups, key=lambda g: int(num_pred[m.index[next(iter(g))]]) + (
+                n - int(num_succ[m.index[next(iter(g))]]))))
 
         return groups if len(groups) > 1 else None
 
@@ -93,25 +94,24 @@ class StrictSequenceCut(SequenceCut[T], ABC, Generic[T]):
 
     @classmethod
     def _skippable(cls, p: int, dfg: DFG, start: Collection[Any], end: Collection[Any],
-                   groups: List[Collection[Any]], parameters: Optional[Dict[str, Any]] = None) -> bool:
+                   groups: List[Collection[Any]], parameters: Optional[Dict[str, Any]] = None,
+                   matrix: Optional[IMBitMatrix] = None) -> bool:
         """
         This method implements the function SKIPPABLE as defined on page 233 of
         "Robust Process Mining with Guarantees" by Sander J.J. Leemans (ISBN: 978-90-386-4257-4)
         The function is used as a helper function for the strict sequence cut detection mechanism, which detects
         larger groups of skippable activities.
         """
-        for i, j in itertools.product(range(0, p), range(p + 1, len(groups))):
-            for a, b in itertools.product(groups[i], groups[j]):
-                if (a, b) in dfg.graph:
-                    return True
-        for i in range(p + 1, len(groups)):
-            for a in groups[i]:
-                if a in start:
-                    return True
-        for i in range(0, p):
-            for a in groups[i]:
-                if a in end:
-                    return True
+        if matrix is None:
+            matrix = IMBitMatrix.from_dfg(dfg)
+        before = matrix.mask(set().union(*groups[:p]))
+        after = matrix.mask(set().union(*groups[p + 1:]))
+        if matrix.adjacency[before][:, after].any():
+            return True
+        if (matrix.mask(start) & after).any():
+            return True
+        if (matrix.mask(end) & before).any():
+            return True
         return False
 
     @classmethod
@@ -134,7 +134,7 @@ class StrictSequenceCut(SequenceCut[T], ABC, Generic[T]):
                 mt[cmap[a]] = max(mt[cmap[a]], cmap[b])
 
             for p in range(0, len(c)):
-                if cls._skippable(p, dfg, start, end, c):
+                if cls._skippable(p, dfg, start, end, c, matrix=obj.bit_matrix):
                     q = p - 1
                     while q >= 0 and mt[q] <= p:
                         c[p] = c[p].union(c[q])
@@ -161,45 +161,36 @@ class SequenceCutUVCL(SequenceCut[IMDataStructureUVCL]):
 
     @classmethod
     def project(cls, obj: IMDataStructureUVCL, groups: List[Collection[Any]], parameters: Optional[Dict[str, Any]] = None) -> List[IMDataStructureUVCL]:
-        logs = [Counter() for g in groups]
-        for t in obj.data_structure:
-            i = 0
-            split_point = 0
-            act_union = set()
-            while i < len(groups):
-                new_split_point = cls._find_split_point(
-                    t, groups[i], split_point, act_union)
-                trace_i = tuple()
-                j = split_point
-                while j < new_split_point:
-                    if t[j] in groups[i]:
-                        trace_i = trace_i + (t[j],)
-                    j = j + 1
-                logs[i].update({trace_i: obj.data_structure[t]})
-                split_point = new_split_point
-                act_union = act_union.union(set(groups[i]))
-                i = i + 1
-        return list(map(lambda l: IMDataStructureUVCL(l), logs))
-
-    @classmethod
-    def _find_split_point(cls, t: Tuple[Any], group: Collection[Any], start: int, ignore: Collection[Any], parameters: Optional[Dict[str, Any]] = None) -> int:
-        least_cost = 0
-        position_with_least_cost = start
-        cost = 0
-        i = start
-        while i < len(t):
-            if t[i] in group:
-                cost = cost - 1
-            elif t[i] not in ignore:
-                cost = cost + 1
-
-            if cost < least_cost:
-                least_cost = cost
-                position_with_least_cost = i + 1
-
-            i = i + 1
-
-        return position_with_least_cost
+        lookup, encoded, lengths, counts = obj.encoding
+        variant = np.repeat(np.arange(len(lengths)), lengths)
+        starts = np.cumsum(lengths) - lengths
+        nonempty = lengths > 0
+        position = np.arange(len(encoded)) - starts[variant]
+        event_groups = obj.get_event_groups(groups)
+        split_point = np.zeros(len(lengths), dtype=np.int64)
+        logs = []
+        for i in range(len(groups)):
+            # the cost of splitting a variant after an event (from the split point of the previous group) decreases
+            # with the events of the group and increases with the events not belonging to the previous groups.
+            # the new split point follows the first event reaching the least (negative) cost
+            active = position >= split_point[variant]
+            delta = np.where(event_groups == i, -1, np.where((event_groups > i) | (event_groups < 0), 1, 0))
+            delta[~active] = 0
+            cost = np.cumsum(delta)
+            cost -= np.concatenate(([0], cost))[starts][variant]
+            least_cost = np.zeros(len(lengths), dtype=np.int64)
+            if len(cost):
+                least_cost[nonempty] = np.minimum(np.minimum.reduceat(cost, starts[nonempty]), 0)
+            reached = np.flatnonzero((cost == least_cost[variant]) & (least_cost[variant] < 0))
+            reached_variants, first = np.unique(variant[reached], return_index=True)
+            new_split_point = split_point.copy()
+            new_split_point[reached_variants] = position[reached[first]] + 1
+            keep = active & (position < new_split_point[variant]) & (event_groups == i)
+            logs.append(IMDataStructureUVCL.from_encoding(lookup, encoded[keep],
+                                                          np.bincount(variant[keep], minlength=len(lengths)),
+                                                          counts))
+            split_point = new_split_point
+        return logs
 
 
 class StrictSequenceCutUVCL(StrictSequenceCut[IMDataStructureUVCL], SequenceCutUVCL):
@@ -15,15 +15,13 @@
     along with PM4Py.  If not, see <https://www.gnu.org/licenses/>.
 '''
 from abc import ABC
-from collections import Counter
 from typing import Optional, List, Collection, Any, Generic, Dict
 
-from pm4py.util import nx_utils
+import numpy as np
 
 from pm4py.algo.discovery.inductive.cuts.abc import Cut, T
 from pm4py.algo.discovery.inductive.dtypes.im_dfg import InductiveDFG
 from pm4py.algo.discovery.inductive.dtypes.im_ds import IMDataStructureUVCL, IMDataStructureDFG
-from pm4py.objects.dfg import util as dfu
 from pm4py.objects.dfg.obj import DFG
 from pm4py.objects.process_tree.obj import Operator, ProcessTree
 
@@ -46,14 +44,10 @@ class ExclusiveChoiceCut(Cut[T], ABC, Generic[T]):
         2.) we detect the connected components in the graph.
         3.) if there are more than one connected components, the cut exists and is non-minimal.
         '''
-        nx_dfg = dfu.as_nx_graph(obj.dfg)
-        nx_und = nx_dfg.to_undirected()
-        conn_comps = [nx_und.subgraph(c).copy() for c in nx_utils.connected_components(nx_und)]
+        m = obj.bit_matrix
+        conn_comps = m.components(m.adjacency | m.adjacency.T)
         if len(conn_comps) > 1:
-            cuts = list()
-            for comp in conn_comps:
-                cuts.append(set(comp.nodes))
-            return cuts
+            return [m.activities(comp) for comp in conn_comps]
         else:
             return None
 
@@ -61,20 +55,22 @@ class ExclusiveChoiceCut(Cut[T], ABC, Generic[T]):
 class ExclusiveChoiceCutUVCL(ExclusiveChoiceCut[IMDataStructureUVCL]):
     @classmethod
     def project(cls, obj: IMDataStructureUVCL, groups: List[Collection[Any]], parameters: Optional[Dict[str, Any]] = None) -> List[IMDataStructureUVCL]:
-        logs = [Counter() for g in groups]
-        for t in obj.data_structure:
-            count = {i: 0 for i in range(len(groups))}
-            for index, group in enumerate(groups):
-                for e in t:
-                    if e in group:
-                        count[index] += 1
-            count = sorted(list((x, y) for x, y in count.items()), key=lambda x: (x[1], x[0]), reverse=True)
-            new_trace = tuple()
-            for e in t:
-                if e in groups[count[0][0]]:
-                    new_trace = new_trace + (e,)
-            logs[count[0][0]].update({new_trace: obj.data_structure[t]})
-        return list(map(lambda l: IMDataStructureUVCL(l), logs))
+        lookup, encoded, lengths, counts = obj.encoding
+        variant = np.repeat(np.arange(len(lengths)), lengths)
+        event_groups = obj.get_event_groups(groups)
+        # every variant goes to the group containing most of its events (the last one in case of ties)
+        group_counts = np.zeros((len(lengths), len(groups)), dtype=np.int64)
+        in_group = event_groups >= 0
+        np.add.at(group_counts, (variant[in_group], event_groups[in_group]), 1)
+        chosen = len(groups) - 1 - np.argmax(group_counts[:, ::-1], axis=1)
+        keep = event_groups == chosen[variant]
+        new_lengths = np.bincount(variant[keep], minlength=len(lengths))
+        logs = []
+        for i in range(len(groups)):
+            selected = chosen == i
+            logs.append(IMDataStructureUVCL.from_encoding(lookup, encoded[keep & selected[variant]],
+                                                          new_lengths[selected], counts[selected]))
+        return logs
 
 
 class ExclusiveChoiceCutDFG(ExclusiveChoiceCut[IMDataStructureDFG]):
@@ -0,0 +1,151 @@
+'''
+    This file is part of PM4Py (More Info: https://pm4py.fit.fraunhofer.de).
+
+    PM4Py is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    PM4Py is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with PM4Py.  If not, see <https://www.gnu.org/licenses/>.
+'''
+from typing import Any, Collection, Dict, List, Optional, Set
+
+import numpy as np
+
+from pm4py.objects.dfg import util as dfu
+from pm4py.objects.dfg.obj import DFG
+
+
+class IMBitMatrix(object):
+    """
+    Adjacency bit-matrix of the DFG of a (sub-)log of the Inductive Miner, over integer identifiers of the activities.
+    The identifiers follow the order in which the activities are returned by pm4py.objects.dfg.util.get_vertices,
+    i.e., the order in which the nodes are inserted in the NetworkX representation of the DFG, so the connected
+    components are returned in the same order as NetworkX would.
+    The transitive closure is computed (lazily) once, and shared by all the cuts that are checked on the same node.
+    """
+
+    def __init__(self, vertices: List[Any], adjacency: np.ndarray, start: np.ndarray, end: np.ndarray):
+        self.vertices = vertices
+        self.index = {a: i for i, a in enumerate(vertices)}
+        self.adjacency = adjacency
+        self.start = start
+        self.end = end
+        self._closure = None
+
+    @classmethod
+    def from_dfg(cls, dfg: DFG) -> "IMBitMatrix":
+        """
+        Builds the bit-matrix from the edges of a DFG
+        """
+        vertices = list(dfu.get_vertices(dfg))
+        index = {a: i for i, a in enumerate(vertices)}
+        adjacency = np.zeros((len(vertices), len(vertices)), dtype=bool)
+        if dfg.graph:
+            edges = np.array([(index[a], index[b]) for (a, b) in dfg.graph], dtype=np.int64)
+            adjacency[edges[:, 0], edges[:, 1]] = True
+        return cls(vertices, adjacency, cls.__mask(index, dfg.start_activities, len(vertices)),
+                   cls.__mask(index, dfg.end_activities, len(vertices)))
+
+    def project(self, dfg: DFG) -> "IMBitMatrix":
+        """
+        Projects the bit-matrix on the activities of a DFG whose edges are the restriction of the edges of the
+        current DFG to its activities (as it happens for the projections of the cuts on DFGs), without going
+        through its edges
+        """
+        vertices = list(dfu.get_vertices(dfg))
+        idx = np.array([self.index[a] for a in vertices], dtype=np.int64)
+        index = {a: i for i, a in enumerate(vertices)}
+        return IMBitMatrix(vertices, self.adjacency[np.ix_(idx, idx)],
+                           self.__mask(index, dfg.start_activities, len(vertices)),
+                           self.__mask(index, dfg.end_activities, len(vertices)))
+
+    @staticmethod
+    def __mask(index: Dict[Any, int], activities: Collection[Any], n: int) -> np.ndarray:
+        mask = np.zeros(n, dtype=bool)
+        mask[[index[a] for a in activities if a in index]] = True
+        return mask
+
+    def __len__(self) -> int:
+        return len(self.vertices)
+
+    @property
+    def closure(self) -> np.ndarray:
+        """
+        Transitive closure of the adjacency matrix (Warshall), i.e., closure[i, j] is True iff there is a non-empty
+        path from i to j (the diagonal is True only for the activities lying on a cycle)
+        """
+        if self._closure is None:
+            closure = self.adjacency.copy()
+            for k in range(len(self.vertices)):
+                rows = closure[:, k]
+                if rows.any():
+                    closure[rows] |= closure[k]
+            self._closure = closure
+        return self._closure
+
+    @property
+    def transitive_successors(self) -> np.ndarray:
+        """
+        Transitive successors of the activities, excluding the activity itself (as in get_transitive_relations)
+        """
+        return self.closure & ~np.eye(len(self.vertices), dtype=bool)
+
+    def mask(self, activities: Collection[Any]) -> np.ndarray:
+        """
+        Bit-vector of the given activities
+        """
+        return self.__mask(self.index, activities, len(self.vertices))
+
+    def activities(self, indices: Collection[int]) -> Set[Any]:
+        """
+        Set of the activities having the given identifiers
+        """
+        return {self.vertices[i] for i in indices}
+
+    def components(self, relation: np.ndarray, mask: Optional[np.ndarray] = None,
+                   order: Optional[np.ndarray] = None) -> List[np.ndarray]:
+        """
+        Connected components of a symmetric relation over the activities, obtained expanding the frontier of every
+        component with bitwise ops
+
+        Parameters
+        ---------------
+        relation
+            Symmetric boolean matrix
+        mask
+            (if provided) restricts the components to the given activities
+        order
+            (if provided) order of the identifiers in which the components are seeded (default: identifiers order)
+
+        Returns
+        ---------------
+        components
+            List of the identifiers of the activities of every component, in the order of their seeds
+        """
+        n = len(self.vertices)
+        remaining = np.ones(n, dtype=bool) if mask is None else mask.copy()
+        if order is None:
+            order = np.arange(n)
+        components = []
+        for seed in order:
+            if not remaining[seed]:
+                continue
+            comp = np.zeros(n, dtype=bool)
+            comp[seed] = True
+            frontier = comp
+            while True:
+                reached = relation[frontier].any(axis=0) & remaining & ~comp
+                if not reached.any():
+                    break
+                comp = comp | reached
+                frontier = reached
+            remaining &= ~comp
+            components.append(np.flatnonzero(comp))
+        return components
@@ -15,8 +15,11 @@
     along with PM4Py.  If not, see <https://www.gnu.org/licenses/>.
 '''
 from abc import ABC
-from typing import TypeVar, Generic, Optional
+from typing import TypeVar, Generic, Optional, Tuple, List, Collection, Any
 
+import numpy as np
+
+from pm4py.algo.discovery.inductive.dtypes.im_bitmatrix import IMBitMatrix
 from pm4py.algo.discovery.inductive.dtypes.im_dfg import InductiveDFG
 from pm4py.objects.dfg.obj import DFG
 from pm4py.util.compression import util as comut
@@ -35,6 +38,7 @@ class IMDataStructure(ABC, Generic[T]):
 
     def __init__(self, obj: T):
         self._obj = obj
+        self._bit_matrix = None
 
     @property
     def dfg(self) -> DFG:
@@ -44,6 +48,23 @@ class IMDataStructure(ABC, Generic[T]):
     def data_structure(self) -> T:
         return self._obj
 
+    @property
+    def bit_matrix(self) -> IMBitMatrix:
+        """
+        Adjacency bit-matrix of the DFG, built once and shared by the cuts checked on the data structure
+        """
+        if self._bit_matrix is None:
+            self._bit_matrix = IMBitMatrix.from_dfg(self.dfg)
+        return self._bit_matrix
+
+    def inherit_bit_matrix(self, parent: "IMDataStructure"):
+        """
+        Reuses the bit-matrix of the data structure from which the current one is projected, when the projection
+        preserves the directly-follows relations. This is not the case for logs, since removing activities from the
+        traces creates new directly-follows relations.
+        """
+        pass
+
 
 class IMDataStructureLog(IMDataStructure[T], ABC, Generic[T]):
     """
@@ -53,26 +74,75 @@ class IMDataStructureLog(IMDataStructure[T], ABC, Generic[T]):
 
 class IMDataStructureUVCL(IMDataStructureLog[UVCL]):
     """
-    Log-Based data structure class that represents the event log as a 'Univariate Variant Compressed Log (UVCL)'
+    Log-Based data structure class that represents the event log as a 'Univariate Variant Compressed Log (UVCL)'.
+    Along with the UVCL, the data structure keeps its compact integer form (lookup table of the activities,
+    concatenated activity codes, lengths and counts of the variants, see comut.encode_uvcl), on which the cuts project
+    the log and the DFG is discovered.
     """
 
-    def __init__(self, obj: UVCL, dfg: Optional[DFG] = None):
+    def __init__(self, obj: UVCL, dfg: Optional[DFG] = None,
+                 encoding: Optional[Tuple[List[Any], np.ndarray, np.ndarray, np.ndarray]] = None):
         super().__init__(obj)
+        self._encoding = encoding
         if dfg is None:
-            self._dfg = comut.discover_dfg_uvcl(self._obj)
+            self._dfg = comut.discover_dfg_encoded(*self.encoding)
         else:
             self._dfg = dfg
 
+    @classmethod
+    def from_encoding(cls, lookup: List[Any], encoded: np.ndarray, lengths: np.ndarray, counts: np.ndarray,
+                      accumulate: bool = True) -> "IMDataStructureUVCL":
+        """
+        Builds the data structure from (possibly repeated) variants in compact integer form, e.g., obtained masking
+        the events of the encoding of another data structure. The counts of the repeated variants are summed
+        (accumulate=True) or the last count is kept (accumulate=False).
+        """
+        log, encoding = comut.uvcl_from_encoded(lookup, encoded, lengths, counts, accumulate=accumulate)
+        return cls(log, encoding=encoding)
+
     @property
     def dfg(self) -> DFG:
         return self._dfg
 
+    @property
+    def encoding(self) -> Tuple[List[Any], np.ndarray, np.ndarray, np.ndarray]:
+        if self._encoding is None:
+            self._encoding = comut.encode_uvcl(self._obj)
+        return self._encoding
+
+    def get_event_groups(self, groups: List[Collection[Any]]) -> np.ndarray:
+        """
+        Gets, for every event of the encoding, the index of the group containing its activity (-1 if none)
+        """
+        lookup, encoded = self.encoding[0], self.encoding[1]
+        index = {a: i for i, a in enumerate(lookup)}
+        code_groups = np.full(len(lookup), -1, dtype=np.int64)
+        for i, g in enumerate(groups):
+            code_groups[[index[a] for a in g if a in index]] = i
+        return code_groups[encoded]
+
 
 class IMDataStructureDFG(IMDataStructure[InductiveDFG]):
     """
     DFG-Based data structure class
     """
 
+    def __init__(self, obj: InductiveDFG):
+        super().__init__(obj)
+        self._parent_bit_matrix = None
+
     @property
     def dfg(self) -> DFG:
         return self._obj.dfg
+
+    @property
+    def bit_matrix(self) -> IMBitMatrix:
+        if self._bit_matrix is None and self._parent_bit_matrix is not None:
+            self._bit_matrix = self._parent_bit_matrix.project(self.dfg)
+            self._parent_bit_matrix = None
+        return super().bit_matrix
+
+    def inherit_bit_matrix(self, parent: IMDataStructure):
+        # the projections of the cuts on DFGs keep the edges of the parent DFG among the activities of the group
+        if isinstance(parent, IMDataStructureDFG) and parent._bit_matrix is not None:
+            self._parent_bit_matrix = parent._bit_matrix
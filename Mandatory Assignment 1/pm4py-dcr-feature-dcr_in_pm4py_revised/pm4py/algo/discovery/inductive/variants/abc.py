@@ -16,16 +16,18 @@
 '''
 import os
 from abc import abstractmethod, ABC
+from copy import copy
 from typing import Optional, Tuple, List, TypeVar, Generic, Dict, Any
 
 from pm4py.algo.discovery.inductive.base_case.factory import BaseCaseFactory
 from pm4py.algo.discovery.inductive.cuts.factory import CutFactory
-from pm4py.algo.discovery.inductive.dtypes.im_ds import IMDataStructure
+from pm4py.algo.discovery.inductive.dtypes.im_ds import IMDataStructure, IMDataStructureUVCL
 from pm4py.algo.discovery.inductive.fall_through.factory import FallThroughFactory
 from pm4py.algo.discovery.inductive.variants.instances import IMInstance
 from pm4py.objects.process_tree.obj import ProcessTree
 from enum import Enum
 from pm4py.util import exec_utils, constants
+from pm4py.util.compression import util as comut
 
 
 T = TypeVar('T', bound=IMDataStructure)
@@ -33,6 +35,21 @@ T = TypeVar('T', bound=IMDataStructure)
 
 class Parameters(Enum):
     MULTIPROCESSING = "multiprocessing"
+    RECURSION_MULTIPROCESSING = "recursion_multiprocessing"
+    RECURSION_CORES = "recursion_cores"
+    RECURSION_MIN_SIZE = "recursion_min_size"
+
+
+def _apply_uvcl_child(miner_class, encoded_uvcl, parameters: Dict[Any, Any]) -> ProcessTree:
+    """
+    Applies the inductive miner on a sub-log (received in compact integer form) in a worker process.
+    The recursion inside the worker is local.
+    """
+    parameters = copy(parameters)
+    parameters[Parameters.MULTIPROCESSING] = False
+    parameters[Parameters.RECURSION_MULTIPROCESSING] = False
+    return miner_class(parameters).apply(IMDataStructureUVCL(comut.decode_uvcl(*encoded_uvcl), encoding=encoded_uvcl),
+                                         parameters)
 
 
 class InductiveMinerFramework(ABC, Generic[T]):
@@ -61,6 +78,13 @@ class InductiveMinerFramework(ABC, Generic[T]):
             self._pool = None
             self._manager = None
 
+        # the recursion on the sub-logs (UVCL) containing at least recursion_min_size events (counting the events
+        # of the distinct variants) is dispatched to a pool of processes, created at the first dispatch
+        self._recursion_multiprocessing = exec_utils.get_param_value(Parameters.RECURSION_MULTIPROCESSING, parameters, False)
+        self._recursion_cores = exec_utils.get_param_value(Parameters.RECURSION_CORES, parameters, max(1, os.cpu_count() - 1))
+        self._recursion_min_size = exec_utils.get_param_value(Parameters.RECURSION_MIN_SIZE, parameters, 10000)
+        self._recursion_executor = None
+
     def apply_base_cases(self, obj: T, parameters: Optional[Dict[str, Any]] = None) -> Optional[ProcessTree]:
         return BaseCaseFactory.apply_base_cases(obj, self.instance(), parameters=parameters)
 
@@ -82,12 +106,35 @@ class InductiveMinerFramework(ABC, Generic[T]):
         return tree
 
     def _recurse(self, tree: ProcessTree, objs: List[T], parameters: Optional[Dict[str, Any]] = None):
-        children = [self.apply(obj, parameters=parameters) for obj in objs]
+        if self._recursion_multiprocessing:
+            # the sub-logs are independent: the large ones are mined in the pool, while the small ones are mined
+            # locally. The children are kept in the order of the sub-logs, hence the tree is the same.
+            futures = {}
+            for i, obj in enumerate(objs):
+                if type(obj) is IMDataStructureUVCL and len(obj.encoding[1]) >= self._recursion_min_size:
+                    if self._recursion_executor is None:
+                        from concurrent.futures import ProcessPoolExecutor
+                        self._recursion_executor = ProcessPoolExecutor(max_workers=self._recursion_cores)
+                    futures[i] = self._recursion_executor.submit(_apply_uvcl_child, type(self),
+                                                                 obj.encoding, parameters)
+            children = [self.apply(obj, parameters=parameters) if i not in futures else None for i, obj in enumerate(objs)]
+            for i, future in futures.items():
+                children[i] = future.result()
+        else:
+            children = [self.apply(obj, parameters=parameters) for obj in objs]
         for c in children:
             c.parent = tree
         tree.children.extend(children)
         return tree
 
+    def shutdown(self):
+        """
+        Releases the pool of processes used by the recursion (if any)
+        """
+        if self._recursion_executor is not None:
+            self._recursion_executor.shutdown()
+            self._recursion_executor = None
+
     @abstractmethod
     def instance(self) -> IMInstance:
         pass
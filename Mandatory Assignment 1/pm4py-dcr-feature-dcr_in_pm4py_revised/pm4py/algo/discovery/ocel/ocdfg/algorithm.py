@@ -16,13 +16,14 @@
 '''
 from pm4py.objects.ocel.obj import OCEL
 from typing import Optional, Dict, Any
-from pm4py.algo.discovery.ocel.ocdfg.variants import classic
+from pm4py.algo.discovery.ocel.ocdfg.variants import classic, vectorized
 from enum import Enum
 from pm4py.util import exec_utils
 
 
 class Variants(Enum):
     CLASSIC = classic
+    VECTORIZED = vectorized
 
 
 def apply(ocel: OCEL, variant=Variants.CLASSIC, parameters: Optional[Dict[Any, Any]] = None) -> Dict[str, Any]:
@@ -38,6 +39,7 @@ def apply(ocel: OCEL, variant=Variants.CLASSIC, parameters: Optional[Dict[Any, A
     variant
         Variant of the algorithm to use:
         - Variants.CLASSIC
+        - Variants.VECTORIZED
     parameters
         Variant-specific parameters
 
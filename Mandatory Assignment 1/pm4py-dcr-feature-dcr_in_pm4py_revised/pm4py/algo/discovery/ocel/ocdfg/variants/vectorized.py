@@ -0,0 +1,277 @@
+'''
+    This file is part of PM4Py (More Info: https://pm4py.fit.fraunhofer.de).
+
+    PM4Py is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    PM4Py is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with PM4Py.  If not, see <https://www.gnu.org/licenses/>.
+'''
+from enum import Enum
+from typing import Optional, Dict, Any, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from pm4py.algo.discovery.ocel.ocdfg.variants import classic
+from pm4py.objects.ocel import constants as ocel_constants
+from pm4py.objects.ocel.obj import OCEL
+from pm4py.statistics.ocel import edge_metrics
+from pm4py.util import exec_utils, pandas_utils
+
+
+class Parameters(Enum):
+    EVENT_ID = ocel_constants.PARAM_EVENT_ID
+    OBJECT_ID = ocel_constants.PARAM_OBJECT_ID
+    EVENT_ACTIVITY = ocel_constants.PARAM_EVENT_ACTIVITY
+    EVENT_TIMESTAMP = ocel_constants.PARAM_EVENT_TIMESTAMP
+    OBJECT_TYPE = ocel_constants.PARAM_OBJECT_TYPE
+    COMPUTE_EDGES_PERFORMANCE = "compute_edges_performance"
+    BUSINESS_HOURS = "business_hours"
+
+
+def __groups(keys: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Sorts (stably) the given integer keys, returning the order along with the start/end positions of every group
+    """
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+    starts = np.concatenate(([0], np.flatnonzero(sorted_keys[1:] != sorted_keys[:-1]) + 1)) if len(keys) else np.zeros(0, dtype=np.int64)
+    ends = np.concatenate((starts[1:], [len(keys)])) if len(keys) else np.zeros(0, dtype=np.int64)
+    return order, starts, ends
+
+
+def __activity_metrics(rows: np.ndarray, act_codes: np.ndarray, activities: List[str], eids: np.ndarray,
+                       oids: np.ndarray) -> Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]:
+    """
+    Computes the events/unique objects/total objects metrics per activity on the given rows of the relations table
+    """
+    events = {}
+    unique_objects = {}
+    total_objects = {}
+    order, starts, ends = __groups(act_codes[rows])
+    rows = rows[order]
+    rows_eids = eids[rows].tolist()
+    rows_oids = oids[rows].tolist()
+    for s, e in zip(starts.tolist(), ends.tolist()):
+        act = activities[act_codes[rows[s]]]
+        events[act] = set(rows_eids[s:e])
+        unique_objects[act] = set(rows_oids[s:e])
+        total_objects[act] = list(zip(rows_eids[s:e], rows_oids[s:e]))
+    return events, unique_objects, total_objects
+
+
+def __activity_metrics_ot(rows: np.ndarray, ot_codes: np.ndarray, object_types: List[str], act_codes: np.ndarray,
+                          activities: List[str], eids: np.ndarray, oids: np.ndarray) -> Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]:
+    """
+    Computes the events/unique objects/total objects metrics per object type and activity
+    on the given rows of the relations table
+    """
+    events = {}
+    unique_objects = {}
+    total_objects = {}
+    order, starts, ends = __groups(ot_codes[rows])
+    rows = rows[order]
+    for s, e in zip(starts.tolist(), ends.tolist()):
+        ot = object_types[ot_codes[rows[s]]]
+        events[ot], unique_objects[ot], total_objects[ot] = __activity_metrics(rows[s:e], act_codes, activities, eids, oids)
+    return events, unique_objects, total_objects
+
+
+def __sorted_lists(keys: np.ndarray, values: np.ndarray) -> Dict[int, List[float]]:
+    """
+    Associates to every key the sorted list of the associated values
+    """
+    order = np.lexsort((values, keys))
+    keys = keys[order]
+    values = values[order]
+    _, starts, ends = __groups(keys)
+    values = values.tolist()
+    return {int(keys[s]): values[s:e] for s, e in zip(starts.tolist(), ends.tolist())}
+
+
+def __unique_rows(*columns: np.ndarray) -> np.ndarray:
+    """
+    Gets a mask selecting the first occurrence of every distinct combination of the given integer columns
+    """
+    order = np.lexsort(columns[::-1])
+    mask = np.ones(len(order), dtype=bool)
+    if len(order) > 1:
+        different = np.zeros(len(order) - 1, dtype=bool)
+        for col in columns:
+            c = col[order]
+            different |= c[1:] != c[:-1]
+        mask[order[1:]] = different
+    return mask
+
+
+def apply(ocel: OCEL, parameters: Optional[Dict[Any, Any]] = None) -> Dict[str, Any]:
+    """
+    Discovers an OC-DFG model from an object-centric event log, computing all the metrics from integer-coded arrays.
+
+    The activities, object types, objects and events of the relations table are integer-coded once. Then:
+    - the metrics of the activities (overall, per object type, start and end activities) are obtained by
+    sorting the rows of the relations table on integer keys and splitting them in groups;
+    - the relations table is sorted once by (object, position of the event in the events table), and the
+    directly-follows couples of all the object types are obtained comparing the sorted array with its shifted copy;
+    - the performance of the edges is calculated on the arrays of the timestamps of the couples, after
+    removing the duplicate couples/triples.
+
+    The result is the same as the one of the CLASSIC variant (see its documentation for the structure of the OC-DFG).
+    When business hours are requested, the performance of the edges is calculated as in the CLASSIC variant.
+
+    Parameters
+    -----------------
+    ocel
+        Object-centric event log
+    parameters
+        Parameters of the algorithm, including:
+        - Parameters.EVENT_ID => the attribute to be used as event identifier
+        - Parameters.OBJECT_ID => the attribute to be used as object identifier
+        - Parameters.EVENT_ACTIVITY => the attribute to be used as activity
+        - Parameters.EVENT_TIMESTAMP => the attribute to be used as timestamp
+        - Parameters.OBJECT_TYPE => the attribute to be used as object type
+        - Parameters.COMPUTE_EDGES_PERFORMANCE => (boolean) enables/disables the computation of the performance on the edges
+        - Parameters.BUSINESS_HOURS => (boolean) enables/disables the business hours in the performance of the edges
+
+    Returns
+    -----------------
+    ocdfg
+        Object-centric directly-follows graph
+    """
+    if parameters is None:
+        parameters = {}
+
+    event_id = exec_utils.get_param_value(Parameters.EVENT_ID, parameters, ocel.event_id_column)
+    object_id = exec_utils.get_param_value(Parameters.OBJECT_ID, parameters, ocel.object_id_column)
+    event_activity = exec_utils.get_param_value(Parameters.EVENT_ACTIVITY, parameters, ocel.event_activity)
+    timestamp_key = exec_utils.get_param_value(Parameters.EVENT_TIMESTAMP, parameters, ocel.event_timestamp)
+    object_type = exec_utils.get_param_value(Parameters.OBJECT_TYPE, parameters, ocel.object_type_column)
+    compute_edges_performance = exec_utils.get_param_value(Parameters.COMPUTE_EDGES_PERFORMANCE, parameters, True)
+    business_hours = exec_utils.get_param_value(Parameters.BUSINESS_HOURS, parameters, False)
+
+    events_eids = ocel.events[event_id]
+    if events_eids.duplicated().any():
+        # the directly-follows couples are defined on the order of the events table, which should be unique
+        return classic.apply(ocel, parameters=parameters)
+
+    relations = ocel.relations.dropna(subset=[event_id, object_id, event_activity, object_type])
+    eids = relations[event_id].to_numpy(dtype=object)
+    oids = relations[object_id].to_numpy(dtype=object)
+    rel_act_codes, rel_activities = pd.factorize(relations[event_activity], sort=True)
+    rel_ot_codes, rel_object_types = pd.factorize(relations[object_type], sort=True)
+    obj_codes, obj_uniques = pd.factorize(relations[object_id], sort=True)
+    rel_activities = list(rel_activities)
+    rel_object_types = list(rel_object_types)
+    no_objects = len(obj_uniques)
+
+    ret = {}
+    ret["activities"] = set(pandas_utils.format_unique(ocel.events[event_activity].unique()))
+    ret["object_types"] = set(pandas_utils.format_unique(ocel.objects[object_type].unique()))
+
+    all_rows = np.arange(len(relations), dtype=np.int64)
+
+    ret["activities_indep"] = {}
+    ret["activities_indep"]["events"], ret["activities_indep"]["unique_objects"], ret["activities_indep"][
+        "total_objects"] = __activity_metrics(all_rows, rel_act_codes, rel_activities, eids, oids)
+
+    ret["activities_ot"] = {}
+    ret["activities_ot"]["events"], ret["activities_ot"]["unique_objects"], ret["activities_ot"][
+        "total_objects"] = __activity_metrics_ot(all_rows, rel_ot_codes, rel_object_types, rel_act_codes,
+                                                 rel_activities, eids, oids)
+
+    # first and last relation of every object (per object type), sorted by object identifier
+    order, starts, ends = __groups(rel_ot_codes.astype(np.int64) * max(no_objects, 1) + obj_codes)
+    first_rows = order[starts]
+    last_rows = order[ends - 1]
+
+    ret["start_activities"] = {}
+    ret["start_activities"]["events"], ret["start_activities"]["unique_objects"], ret["start_activities"][
+        "total_objects"] = __activity_metrics_ot(first_rows, rel_ot_codes, rel_object_types, rel_act_codes,
+                                                 rel_activities, eids, oids)
+
+    ret["end_activities"] = {}
+    ret["end_activities"]["events"], ret["end_activities"]["unique_objects"], ret["end_activities"][
+        "total_objects"] = __activity_metrics_ot(last_rows, rel_ot_codes, rel_object_types, rel_act_codes,
+                                                 rel_activities, eids, oids)
+
+    # edges: the events are coded by their position in the events table, with their activity
+    ev_act_codes, ev_activities = pd.factorize(ocel.events[event_activity], sort=True)
+    ev_activities = list(ev_activities)
+    no_acts = max(len(ev_activities), 1)
+    rel_ev = pd.Index(events_eids).get_indexer(relations[event_id])
+    # the type of the objects is read from the objects table (from the relations table if the object is missing)
+    objects_types = ocel.objects.drop_duplicates(subset=[object_id]).set_index(object_id)[object_type]
+    obj_types = pd.Series(obj_uniques).map(objects_types)
+    missing = obj_types.isna().to_numpy()
+    if missing.any():
+        rel_types = pd.Series(rel_object_types, dtype=object).to_numpy()[rel_ot_codes]
+        fallback = pd.Series(rel_types).groupby(obj_codes).first()
+        obj_types[missing] = fallback.reindex(np.flatnonzero(missing)).to_numpy()
+    obj_type_codes, edge_object_types = pd.factorize(obj_types, sort=True)
+    edge_object_types = list(edge_object_types)
+
+    in_table = np.flatnonzero(rel_ev >= 0)
+    seq = in_table[np.lexsort((rel_ev[in_table], obj_codes[in_table]))]
+    seq_objs = obj_codes[seq]
+    same = seq_objs[1:] == seq_objs[:-1]
+    prev_rows = seq[:-1][same]
+    cur_rows = seq[1:][same]
+    prev_ev = rel_ev[prev_rows]
+    cur_ev = rel_ev[cur_rows]
+    edge_objs = obj_codes[cur_rows]
+    edge_keys = (obj_type_codes[edge_objs].astype(np.int64) * no_acts + ev_act_codes[prev_ev]) * no_acts + ev_act_codes[cur_ev]
+
+    ev_ids = events_eids.to_numpy(dtype=object)
+    ret["edges"] = {}
+    ret["edges"]["event_couples"] = {}
+    ret["edges"]["unique_objects"] = {}
+    ret["edges"]["total_objects"] = {}
+    order, starts, ends = __groups(edge_keys)
+    prev_ids = ev_ids[prev_ev[order]].tolist()
+    cur_ids = ev_ids[cur_ev[order]].tolist()
+    obj_ids = obj_uniques.to_numpy(dtype=object)[edge_objs[order]].tolist()
+    sorted_keys = edge_keys[order]
+    edge_labels = {}
+    for s, e in zip(starts.tolist(), ends.tolist()):
+        key = int(sorted_keys[s])
+        ot = edge_object_types[key // (no_acts * no_acts)]
+        acttup = (ev_activities[(key // no_acts) % no_acts], ev_activities[key % no_acts])
+        edge_labels[key] = (ot, acttup)
+        if ot not in ret["edges"]["event_couples"]:
+            ret["edges"]["event_couples"][ot] = {}
+            ret["edges"]["unique_objects"][ot] = {}
+            ret["edges"]["total_objects"][ot] = {}
+        ret["edges"]["event_couples"][ot][acttup] = set(zip(prev_ids[s:e], cur_ids[s:e]))
+        ret["edges"]["unique_objects"][ot][acttup] = set(obj_ids[s:e])
+        ret["edges"]["total_objects"][ot][acttup] = set(zip(prev_ids[s:e], cur_ids[s:e], obj_ids[s:e]))
+
+    ret["edges_performance"] = {}
+    ret["edges_performance"]["event_couples"] = {}
+    ret["edges_performance"]["total_objects"] = {}
+
+    if compute_edges_performance:
+        timestamps = ocel.events[timestamp_key]
+        if business_hours or not pd.api.types.is_datetime64_any_dtype(timestamps):
+            ret["edges_performance"]["event_couples"] = edge_metrics.performance_calculation_ocel_aggregation(ocel, ret["edges"]["event_couples"], parameters=parameters)
+            ret["edges_performance"]["total_objects"] = edge_metrics.performance_calculation_ocel_aggregation(ocel, ret["edges"]["total_objects"], parameters=parameters)
+        else:
+            timestamps = pd.to_datetime(timestamps, utc=True).dt.tz_localize(None).to_numpy(dtype="datetime64[ns]")
+            diffs = (timestamps[cur_ev] - timestamps[prev_ev]) / np.timedelta64(1, 's')
+            for metric, mask in [("event_couples", __unique_rows(edge_keys, prev_ev, cur_ev)),
+                                 ("total_objects", __unique_rows(edge_keys, prev_ev, cur_ev, edge_objs))]:
+                perf = ret["edges_performance"][metric]
+                for key, values in __sorted_lists(edge_keys[mask], diffs[mask]).items():
+                    ot, acttup = edge_labels[key]
+                    if ot not in perf:
+                        perf[ot] = {}
+                    perf[ot][acttup] = values
+
+    return ret
@@ -578,9 +578,16 @@ def clean_dfg_based_on_noise_thresh(dfg, activities, noise_threshold, parameters
         most_common_paths = []
 
     new_dfg = None
-    activ_max_count = {}
-    for act in activities:
-        activ_max_count[act] = dfg_utils.get_max_activity_count(dfg, act)
+    # maximum count of an ingoing/outgoing edge of every activity, computed in a single pass on the DFG
+    activ_max_count = {act: -1 for act in activities}
+    for el in dfg:
+        if type(el[0]) is str:
+            couple, val = el, dfg[el]
+        else:
+            couple, val = el[0], el[1]
+        for act in couple:
+            if act in activ_max_count and val > activ_max_count[act]:
+                activ_max_count[act] = val
 
     for el in dfg:
         if type(el[0]) is str:
@@ -15,4 +15,4 @@
     along with PM4Py.  If not, see <https://www.gnu.org/licenses/>.
 '''
 from pm4py.algo.filtering.pandas import start_activities, end_activities, attributes, cases, \
-    pd_filtering_constants, variants, paths, timestamp, ltl
+    pd_filtering_constants, variants, paths, timestamp, ltl, lazy
@@ -21,6 +21,7 @@ import numpy as np
 import pandas as pd
 
 from pm4py.util import exec_utils, constants, xes_constants
+from pm4py.objects.log.util import log_index
 
 
 class Parameters(Enum):
@@ -64,10 +65,22 @@ def apply(df: pd.DataFrame, act1: Union[str, List[str]], act2: Union[str, List[s
     act1_comparison = lambda x: (x == act1) if type(act1) is str else (x in act1)
     act2_comparison = lambda x: (x == act2) if type(act2) is str else (x in act2)
 
+    index = log_index.get(df, parameters=parameters)
+    if index is not None and index.contiguous:
+        # reuse the case boundaries and the activity codes of the index
+        c_unq = index.cases
+        c_ind = index.case_offsets[:-1]
+        c_counts = np.diff(index.case_offsets)
+        is_act1 = np.array([act1_comparison(x) for x in index.activities], dtype=bool)[index.activity_codes]
+        is_act2 = np.array([act2_comparison(x) for x in index.activities], dtype=bool)[index.activity_codes]
+    else:
+        cases = df[case_id_key].to_numpy()
+        activities = df[activity_key].to_numpy()
+        c_unq, c_ind, c_counts = np.unique(cases, return_index=True, return_counts=True)
+        is_act1 = [act1_comparison(x) for x in activities]
+        is_act2 = [act2_comparison(x) for x in activities]
+
     df = df.copy()
-    cases = df[case_id_key].to_numpy()
-    activities = df[activity_key].to_numpy()
-    c_unq, c_ind, c_counts = np.unique(cases, return_index=True, return_counts=True)
     res = [np.nan for i in range(len(df))]
 
     i = 0
@@ -76,7 +89,7 @@ def apply(df: pd.DataFrame, act1: Union[str, List[str]], act2: Union[str, List[s
         occ_A = -1
         j = 0
         while j < c_counts[i]:
-            if act2_comparison(activities[c_ind[i] + j]) and occ_A >= 0:
+            if is_act2[c_ind[i] + j] and occ_A >= 0:
                 z = occ_A
                 this_case = str(c_unq[i]) + subcase_concat_str + str(rel_count)
                 while z <= j:
@@ -90,7 +103,7 @@ def apply(df: pd.DataFrame, act1: Union[str, List[str]], act2: Union[str, List[s
                 else:
                     # otherwise, if A = B, then it continues outputting the events to a new subcase
                     occ_A = j
-            elif act1_comparison(activities[c_ind[i] + j]) and occ_A == -1:
+            elif is_act1[c_ind[i] + j] and occ_A == -1:
                 occ_A = j
             j = j + 1
         i = i + 1
@@ -20,7 +20,7 @@ from pm4py.util import exec_utils
 from copy import copy
 from typing import Optional, Dict, Any, Union
 import pandas as pd
-from pm4py.util.business_hours import soj_time_business_hours_diff
+from pm4py.util.business_hours import BusinessCalendar
 
 
 class Parameters(Enum):
@@ -120,8 +120,7 @@ def filter_on_case_performance(df: pd.DataFrame, case_id_glue: str = constants.C
     end_events.columns = [str(col) + '_2' for col in end_events.columns]
     stacked_df = pandas_utils.concat([start_events, end_events], axis=1)
     if business_hours:
-        stacked_df['caseDuration'] = stacked_df.apply(
-            lambda x: soj_time_business_hours_diff(x[timestamp_key], x[timestamp_key + "_2"], business_hours_slots), axis=1)
+        stacked_df['caseDuration'] = BusinessCalendar(business_hours_slots).get_seconds(stacked_df[timestamp_key], stacked_df[timestamp_key + "_2"])
     else:
         stacked_df['caseDuration'] = stacked_df[timestamp_key + "_2"] - stacked_df[timestamp_key]
         stacked_df['caseDuration'] = pandas_utils.get_total_seconds(stacked_df['caseDuration'])
@@ -0,0 +1,341 @@
+'''
+    This file is part of PM4Py (More Info: https://pm4py.fit.fraunhofer.de).
+
+    PM4Py is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    PM4Py is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with PM4Py.  If not, see <https://www.gnu.org/licenses/>.
+'''
+import datetime
+from copy import copy
+from enum import Enum
+from typing import Optional, Dict, Any, Union, List, Tuple, Collection
+
+import numpy as np
+import pandas as pd
+
+from pm4py.algo.filtering.common.timestamp.timestamp_common import get_dt_from_string
+from pm4py.objects.log.util import log_index
+from pm4py.util import constants, xes_constants, exec_utils, pandas_utils
+from pm4py.util.business_hours import BusinessCalendar
+
+
+class Parameters(Enum):
+    CASE_ID_KEY = constants.PARAMETER_CONSTANT_CASEID_KEY
+    ACTIVITY_KEY = constants.PARAMETER_CONSTANT_ACTIVITY_KEY
+    TIMESTAMP_KEY = constants.PARAMETER_CONSTANT_TIMESTAMP_KEY
+    BUSINESS_HOURS = "business_hours"
+    BUSINESS_HOUR_SLOTS = "business_hour_slots"
+
+
+# filters evaluated on the single events (fused in a single boolean mask)
+EVENT_LEVEL_FILTERS = {"event_attribute_values", "time_range_events"}
+
+
+class LazyFilter(object):
+    """
+    Lazy filtering of a dataframe.
+
+    The filters are not applied when they are invoked, but recorded in a plan. When the result is requested
+    (collect() or get_mask()), the case and activity columns are integer-coded once (reusing the index attached
+    to the dataframe by pm4py.objects.log.util.log_index, if available), the consecutive event-level filters
+    are fused in a single boolean mask over the rows, and the case-level filters compute their aggregations
+    (first/last event, size, variant, directly-follows relations of every case) on the codes of the events
+    retained so far. The filtered dataframe is materialized only once, at the end.
+
+    The result is the same as the one obtained applying sequentially the corresponding filters of
+    pm4py.algo.filtering.pandas (also the order of the rows: when the plan contains a filter on the
+    directly-follows relations, the rows are sorted by case identifier and timestamp).
+    """
+
+    def __init__(self, df: pd.DataFrame, parameters: Optional[Dict[Any, Any]] = None):
+        if parameters is None:
+            parameters = {}
+
+        self.df = df
+        self.parameters = parameters
+        self.case_id_key = exec_utils.get_param_value(Parameters.CASE_ID_KEY, parameters, constants.CASE_CONCEPT_NAME)
+        self.activity_key = exec_utils.get_param_value(Parameters.ACTIVITY_KEY, parameters, xes_constants.DEFAULT_NAME_KEY)
+        self.timestamp_key = exec_utils.get_param_value(Parameters.TIMESTAMP_KEY, parameters, xes_constants.DEFAULT_TIMESTAMP_KEY)
+        self.business_hours = exec_utils.get_param_value(Parameters.BUSINESS_HOURS, parameters, False)
+        self.business_hour_slots = exec_utils.get_param_value(Parameters.BUSINESS_HOUR_SLOTS, parameters, constants.DEFAULT_BUSINESS_HOUR_SLOTS)
+        self.plan = []
+
+        self.__index = None
+        self.__sorted_rows = None
+
+    def __add_step(self, name: str, **arguments) -> "LazyFilter":
+        self.plan.append((name, arguments))
+        return self
+
+    def filter_start_activities(self, activities: Collection[str], retain: bool = True) -> "LazyFilter":
+        """
+        Keeps (retain=True) or removes (retain=False) the cases starting with one of the provided activities
+        """
+        return self.__add_step("start_activities", activities=list(activities), retain=retain)
+
+    def filter_end_activities(self, activities: Collection[str], retain: bool = True) -> "LazyFilter":
+        """
+        Keeps (retain=True) or removes (retain=False) the cases ending with one of the provided activities
+        """
+        return self.__add_step("end_activities", activities=list(activities), retain=retain)
+
+    def filter_event_attribute_values(self, attribute_key: str, values: Collection[Any], level: str = "case", retain: bool = True) -> "LazyFilter":
+        """
+        Filters on the values of an attribute of the events: if level="event", keeps (retain=True) or removes
+        (retain=False) the events having one of the provided values; if level="case", keeps or removes
+        the cases having at least one event with one of the provided values
+        """
+        if level == "event":
+            return self.__add_step("event_attribute_values", attribute_key=attribute_key, values=list(values), retain=retain)
+        elif level == "case":
+            return self.__add_step("case_attribute_values", attribute_key=attribute_key, values=list(values), retain=retain)
+        raise Exception("level provided: " + str(level) + " is not recognized")
+
+    def filter_case_size(self, min_size: int, max_size: Optional[int] = None) -> "LazyFilter":
+        """
+        Keeps the cases having a number of events between min_size and max_size
+        """
+        return self.__add_step("case_size", min_size=min_size, max_size=max_size)
+
+    def filter_time_range(self, dt1: Union[str, datetime.datetime], dt2: Union[str, datetime.datetime], mode: str = "events") -> "LazyFilter":
+        """
+        Filters on the given time range: if mode="events", keeps the events contained in the time range;
+        if mode="traces_contained", keeps the cases completely contained in the time range; if
+        mode="traces_intersecting", keeps the cases intersecting the time range
+        """
+        dt1 = get_dt_from_string(dt1)
+        dt2 = get_dt_from_string(dt2)
+        if mode == "events":
+            return self.__add_step("time_range_events", dt1=dt1, dt2=dt2)
+        elif mode in ["traces_contained", "traces_intersecting"]:
+            return self.__add_step("time_range_" + mode, dt1=dt1, dt2=dt2)
+        raise Exception("mode provided: " + str(mode) + " is not recognized")
+
+    def filter_case_performance(self, min_performance: float, max_performance: float) -> "LazyFilter":
+        """
+        Keeps the cases having a duration (in seconds) between min_performance and max_performance
+        """
+        return self.__add_step("case_performance", min_performance=min_performance, max_performance=max_performance)
+
+    def filter_variants(self, variants: Collection[Tuple[str, ...]], retain: bool = True) -> "LazyFilter":
+        """
+        Keeps (retain=True) or removes (retain=False) the cases belonging to the provided variants
+        """
+        return self.__add_step("variants", variants=[tuple(v) for v in variants], retain=retain)
+
+    def filter_variants_top_k(self, k: int) -> "LazyFilter":
+        """
+        Keeps the cases belonging to the top-k variants
+        """
+        return self.__add_step("variants_top_k", k=k)
+
+    def filter_directly_follows_relation(self, relations: Collection[Tuple[str, str]], retain: bool = True) -> "LazyFilter":
+        """
+        Keeps (retain=True) or removes (retain=False) the cases in which at least one of the provided
+        directly-follows relations occurs
+        """
+        return self.__add_step("directly_follows_relation", relations=[tuple(r) for r in relations], retain=retain)
+
+    def __get_index(self) -> log_index.EventLogIndex:
+        if self.__index is None:
+            self.__index = log_index.get(self.df, parameters=self.parameters)
+            if self.__index is None:
+                self.__index = log_index.EventLogIndex(self.df, self.case_id_key, self.activity_key, self.timestamp_key)
+        return self.__index
+
+    def __get_sorted_rows(self) -> np.ndarray:
+        # rows of the dataframe sorted by case identifier and timestamp
+        if self.__sorted_rows is None:
+            self.__sorted_rows = self.df[[self.case_id_key, self.timestamp_key]].reset_index(drop=True).sort_values(
+                [self.case_id_key, self.timestamp_key], kind="mergesort").index.to_numpy()
+        return self.__sorted_rows
+
+    def __values_mask(self, attribute_key: str, values: List[Any]) -> np.ndarray:
+        if attribute_key == self.activity_key:
+            index = self.__get_index()
+            return np.isin(index.activity_codes, index.get_activity_codes(values))
+        return self.df[attribute_key].isin(values).to_numpy()
+
+    def __boundaries(self, mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Gets, for every case having at least one of the selected rows, the first and the last selected row
+        """
+        index = self.__get_index()
+        rows = index.order[mask[index.order]]
+        cases = index.case_codes[rows]
+        if len(rows) == 0:
+            return cases, rows, rows
+        start = np.concatenate(([True], cases[1:] != cases[:-1]))
+        end = np.concatenate((cases[1:] != cases[:-1], [True]))
+        return cases[start], rows[start], rows[end]
+
+    def __variants(self, mask: np.ndarray) -> Tuple[np.ndarray, List[Tuple[Any, ...]], np.ndarray]:
+        """
+        Gets the cases having at least one of the selected rows, the variants and the variant of every such case
+        """
+        index = self.__get_index()
+        rows = index.order[mask[index.order]]
+        counts = np.bincount(index.case_codes[rows], minlength=len(index.cases))
+        cases = np.flatnonzero(counts)
+        offsets = np.concatenate(([0], np.cumsum(counts[cases]))).astype(np.int64)
+        variants, variant_ids = log_index.get_variants_from_codes(index.activity_codes[rows], offsets, index.activities)
+        return cases, variants, variant_ids
+
+    def __case_filter(self, name: str, arguments: Dict[str, Any], mask: np.ndarray) -> np.ndarray:
+        """
+        Evaluates a case-level filter on the rows retained so far, returning the selected cases
+        """
+        index = self.__get_index()
+        selected = np.zeros(len(index.cases), dtype=bool)
+
+        if name in ["start_activities", "end_activities"]:
+            cases, first_rows, last_rows = self.__boundaries(mask & index.activity_notna[index.activity_codes])
+            rows = first_rows if name == "start_activities" else last_rows
+            selected[cases] = np.isin(index.activity_codes[rows], index.get_activity_codes(arguments["activities"]))
+        elif name == "case_attribute_values":
+            selected[index.case_codes[mask & self.__values_mask(arguments["attribute_key"], arguments["values"])]] = True
+        elif name == "case_size":
+            counts = np.bincount(index.case_codes[mask], minlength=len(index.cases))
+            selected = counts >= arguments["min_size"]
+            if arguments["max_size"] is not None:
+                selected = selected & (counts <= arguments["max_size"])
+        elif name in ["time_range_traces_contained", "time_range_traces_intersecting", "case_performance"]:
+            timestamps = self.df[self.timestamp_key]
+            cases, first_rows, last_rows = self.__boundaries(mask & timestamps.notna().to_numpy())
+            first = timestamps.iloc[first_rows].reset_index(drop=True)
+            last = timestamps.iloc[last_rows].reset_index(drop=True)
+            if name == "case_performance":
+                if self.business_hours:
+                    duration = BusinessCalendar(self.business_hour_slots).get_seconds(first, last)
+                else:
+                    duration = pandas_utils.get_total_seconds(last - first).to_numpy()
+                selected[cases] = (duration <= arguments["max_performance"]) & (duration >= arguments["min_performance"])
+            else:
+                dt1, dt2 = arguments["dt1"], arguments["dt2"]
+                if name == "time_range_traces_contained":
+                    selected[cases] = ((first >= dt1) & (last <= dt2)).to_numpy()
+                else:
+                    selected[cases] = (((first > dt1) & (first < dt2)) | ((last > dt1) & (last < dt2)) | (
+                            (first < dt1) & (last > dt2))).to_numpy()
+        elif name in ["variants", "variants_top_k"]:
+            cases, variants, variant_ids = self.__variants(mask)
+            if name == "variants":
+                admitted = set(arguments["variants"])
+            else:
+                counts = np.bincount(variant_ids, minlength=len(variants))
+                variant_count = sorted([[variants[i], int(counts[i])] for i in range(len(variants))],
+                                       key=lambda x: (x[1], x[0]), reverse=True)
+                admitted = set(x[0] for x in variant_count[:min(arguments["k"], len(variant_count))])
+            admitted_ids = np.array([v in admitted for v in variants], dtype=bool)
+            selected[cases] = admitted_ids[variant_ids]
+        elif name == "directly_follows_relation":
+            activities = pd.Index(index.activities)
+            num_activities = len(index.activities)
+            relations = arguments["relations"]
+            sources = activities.get_indexer(pd.Index([r[0] for r in relations], dtype=object))
+            targets = activities.get_indexer(pd.Index([r[1] for r in relations], dtype=object))
+            valid = (sources >= 0) & (targets >= 0)
+            rows = self.__get_sorted_rows()
+            rows = rows[mask[rows]]
+            same_case = index.case_codes[rows[1:]] == index.case_codes[rows[:-1]]
+            codes = index.activity_codes[rows[:-1]] * num_activities + index.activity_codes[rows[1:]]
+            hits = np.flatnonzero(same_case & np.isin(codes, sources[valid] * num_activities + targets[valid]))
+            selected[index.case_codes[rows[hits]]] = True
+
+        # the events without case identifier are never selected (as in the grouping of the dataframe)
+        selected[pd.isna(index.cases)] = False
+        return selected
+
+    def __event_filter(self, name: str, arguments: Dict[str, Any]) -> np.ndarray:
+        """
+        Evaluates an event-level filter on all the rows of the dataframe
+        """
+        if name == "event_attribute_values":
+            ret = self.__values_mask(arguments["attribute_key"], arguments["values"])
+            return ret if arguments["retain"] else ~ret
+        timestamps = self.df[self.timestamp_key]
+        return ((timestamps >= arguments["dt1"]) & (timestamps <= arguments["dt2"])).to_numpy()
+
+    def get_mask(self) -> np.ndarray:
+        """
+        Executes the plan, returning the boolean mask of the rows of the dataframe that are retained
+        """
+        mask = np.ones(len(self.df), dtype=bool)
+        events_mask = None
+        for name, arguments in self.plan:
+            if name in EVENT_LEVEL_FILTERS:
+                # fuses the consecutive event-level filters
+                step_mask = self.__event_filter(name, arguments)
+                events_mask = step_mask if events_mask is None else events_mask & step_mask
+                continue
+            if events_mask is not None:
+                mask &= events_mask
+                events_mask = None
+            selected = self.__case_filter(name, arguments, mask)
+            if arguments.get("retain", True):
+                mask &= selected[self.__get_index().case_codes]
+            else:
+                mask &= ~selected[self.__get_index().case_codes]
+        if events_mask is not None:
+            mask &= events_mask
+        return mask
+
+    def collect(self) -> pd.DataFrame:
+        """
+        Executes the plan, materializing the filtered dataframe
+        """
+        mask = self.get_mask()
+        if any(name == "directly_follows_relation" for name, arguments in self.plan):
+            rows = self.__get_sorted_rows()
+            ret = self.df.iloc[rows[mask[rows]]]
+        else:
+            ret = self.df[mask]
+        ret.attrs = copy(self.df.attrs) if hasattr(self.df, 'attrs') else {}
+        return ret
+
+
+def apply(df: pd.DataFrame, parameters: Optional[Dict[Any, Any]] = None) -> LazyFilter:
+    """
+    Starts a lazy filtering plan on the provided dataframe. The filters are chained on the returned object,
+    and the filtered dataframe is materialized only when collect() is invoked.
+
+    Minimum viable example:
+
+        import pm4py
+        from pm4py.algo.filtering.pandas.lazy import lazy_filter
+
+        dataframe = pm4py.read_xes('tests/input_data/running-example.xes')
+        filtered_dataframe = lazy_filter.apply(dataframe).filter_start_activities(['register request']) \\
+            .filter_case_size(3, 10).filter_time_range('2010-12-30 00:00:00', '2011-01-31 00:00:00', mode='events') \\
+            .filter_variants_top_k(3).collect()
+
+    Parameters
+    ------------------
+    df
+        Dataframe
+    parameters
+        Parameters of the algorithm, including:
+        - Parameters.CASE_ID_KEY => the case identifier
+        - Parameters.ACTIVITY_KEY => the activity
+        - Parameters.TIMESTAMP_KEY => the timestamp
+        - Parameters.BUSINESS_HOURS => enables the business hours in the filter on the case performance
+        - Parameters.BUSINESS_HOUR_SLOTS => business hour slots (used when the business hours are enabled)
+
+    Returns
+    ------------------
+    lazy_filter
+        Lazy filtering plan
+    """
+    if parameters is None:
+        parameters = {}
+
+    return LazyFilter(df, parameters=parameters)
@@ -16,13 +16,15 @@
 '''
 from enum import Enum
 
-from pm4py.util import exec_utils, pandas_utils, constants
+from pm4py.objects.log.util import log_index
+from pm4py.util import exec_utils
 from pm4py.util.constants import CASE_CONCEPT_NAME
 from pm4py.util.constants import PARAMETER_CONSTANT_ATTRIBUTE_KEY, PARAMETER_CONSTANT_CASEID_KEY, \
     PARAMETER_CONSTANT_RESOURCE_KEY, PARAMETER_CONSTANT_TIMESTAMP_KEY
 from pm4py.util.xes_constants import DEFAULT_NAME_KEY, DEFAULT_RESOURCE_KEY, DEFAULT_TIMESTAMP_KEY
 from copy import copy
-from typing import Optional, Dict, Any, Union, List
+from typing import Optional, Dict, Any, Union, List, Tuple
+import numpy as np
 import pandas as pd
 
 
@@ -41,6 +43,128 @@ ENABLE_TIMESTAMP = Parameters.ENABLE_TIMESTAMP
 TIMESTAMP_DIFF_BOUNDARIES = Parameters.TIMESTAMP_DIFF_BOUNDARIES
 
 
+def __get_index(df: pd.DataFrame, case_id_glue: str, attribute_key: str, timestamp_key: str) -> Tuple[log_index.EventLogIndex, bool]:
+    """
+    Gets the integer-coded index of the dataframe (with the attribute as activity), along with a boolean
+    that is True if the index is attached to the dataframe (hence, its variants are computed only once)
+    """
+    index = log_index.get(df, parameters={log_index.Parameters.CASE_ID_KEY: case_id_glue, log_index.Parameters.ACTIVITY_KEY: attribute_key})
+    if index is not None:
+        return index, True
+    return log_index.EventLogIndex(df, case_id_glue, attribute_key, timestamp_key), False
+
+
+def __get_sequences(index: log_index.EventLogIndex, per_variant: bool) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Gets the sequences on which the control-flow templates are evaluated: either the cases, or the variants
+    of the log (evaluating the template once per variant).
+
+    Returns
+    ---------------
+    codes
+        Attribute codes of the events of the sequences (concatenated, in order)
+    sequence
+        Sequence of every element of codes
+    case_sequence
+        Sequence associated to every case
+    """
+    if per_variant:
+        variants, variant_ids = index.get_variants()
+        representatives = np.unique(variant_ids, return_index=True)[1]
+        lengths = np.diff(index.case_offsets)[representatives]
+        offsets = np.concatenate(([0], np.cumsum(lengths))).astype(np.int64)
+        positions = np.repeat(index.case_offsets[representatives] - offsets[:-1], lengths) + np.arange(offsets[-1])
+        return index.activity_codes[index.order[positions]], np.repeat(np.arange(len(representatives)), lengths), variant_ids
+    return index.activity_codes[index.order], index.case_codes[index.order], np.arange(len(index.cases))
+
+
+def __get_timestamps(df: pd.DataFrame, timestamp_key: str) -> np.ndarray:
+    """
+    Gets the timestamps of the events (in nanoseconds)
+    """
+    timestamps = df[timestamp_key]
+    if pd.api.types.is_datetime64_any_dtype(timestamps):
+        return timestamps.array.asi8
+    return pd.to_datetime(timestamps).array.asi8
+
+
+def __first_per_sequence(elements: np.ndarray, sequence: np.ndarray, num_sequences: int, default: int) -> np.ndarray:
+    """
+    Gets, for every sequence, the first of the provided (sorted) elements belonging to it
+    """
+    ret = np.full(num_sequences, default, dtype=np.int64)
+    sequences, first = np.unique(sequence[elements], return_index=True)
+    ret[sequences] = elements[first]
+    return ret
+
+
+def __eventually_follows_sequences(codes: np.ndarray, sequence: np.ndarray, num_sequences: int, values_codes: List[np.ndarray],
+                                   valid: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Evaluates a chain of eventually-follows relations on the sequences, greedily matching the first
+    occurrence of every value after the occurrence matched for the previous value
+    """
+    num_elements = len(codes)
+    elements = np.arange(num_elements)
+    reached = np.full(num_sequences, -1, dtype=np.int64)
+    for value_codes in values_codes:
+        candidates = np.isin(codes, value_codes) & (elements > reached[sequence])
+        if valid is not None:
+            candidates &= valid
+        reached = __first_per_sequence(np.flatnonzero(candidates), sequence, num_sequences, num_elements)
+    return reached < num_elements
+
+
+def __eventually_follows_timed(codes: np.ndarray, sequence: np.ndarray, num_sequences: int, values_codes: List[np.ndarray],
+                               valid: np.ndarray, timestamps: np.ndarray, timestamp_diff_boundaries: List[Tuple[float, float]]) -> np.ndarray:
+    """
+    Evaluates a chain of eventually-follows relations with constraints on the time passed between
+    the occurrences of consecutive values. For every value, the set of occurrences that can be reached
+    by a valid chain is kept, and the next set is computed pairing them with the later occurrences of the
+    next value in the same sequence (hence, the pairs are never combined across the steps of the chain)
+    """
+    reached = np.flatnonzero(np.isin(codes, values_codes[0]) & valid)
+    for i in range(1, len(values_codes)):
+        candidates = np.flatnonzero(np.isin(codes, values_codes[i]) & valid)
+        if len(reached) == 0 or len(candidates) == 0:
+            reached = candidates[:0]
+            break
+        reached_offsets = np.concatenate(([0], np.cumsum(np.bincount(sequence[reached], minlength=num_sequences)))).astype(np.int64)
+        # the reached occurrences preceding every candidate (in the same sequence)
+        counts = np.searchsorted(reached, candidates) - reached_offsets[sequence[candidates]]
+        targets = np.repeat(candidates, counts)
+        sources = reached[np.repeat(reached_offsets[sequence[candidates]] - np.concatenate(([0], np.cumsum(counts)[:-1])), counts) + np.arange(len(targets))]
+        if timestamp_diff_boundaries:
+            diff = (timestamps[targets] - timestamps[sources]) / 10**9
+            targets = targets[(diff >= timestamp_diff_boundaries[i - 1][0]) & (diff <= timestamp_diff_boundaries[i - 1][1])]
+        reached = np.unique(targets)
+    ret = np.zeros(num_sequences, dtype=bool)
+    ret[sequence[reached]] = True
+    return ret
+
+
+def __filter_cases(df0: pd.DataFrame, index: log_index.EventLogIndex, selected_cases: np.ndarray, positive: bool) -> pd.DataFrame:
+    """
+    Keeps (positive=True) or removes (positive=False) the selected cases from the dataframe
+    """
+    # the events without case identifier are never selected
+    selected_cases[pd.isna(index.cases)] = False
+    mask = selected_cases[index.case_codes]
+    ret = df0[mask] if positive else df0[~mask]
+    ret.attrs = copy(df0.attrs) if hasattr(df0, 'attrs') else {}
+    return ret
+
+
+def __resource_pairs(df: pd.DataFrame, index: log_index.EventLogIndex, resource_key: str, value: str) -> Tuple[np.ndarray, int]:
+    """
+    Gets the distinct couples (case, resource) of the events having the given value (and a resource), coded as integers
+    """
+    resources, labels = pd.factorize(df[resource_key])
+    rows = np.isin(index.activity_codes, index.get_activity_codes([value])) & (resources >= 0)
+    num_resources = max(len(labels), 1)
+    return np.unique(index.case_codes[rows] * num_resources + resources[rows]), num_resources
+
+
 def eventually_follows(df0: pd.DataFrame, attribute_values: List[str], parameters: Optional[Dict[Union[str, Parameters], Any]] = None) -> pd.DataFrame:
     """
     Applies the eventually follows rule
@@ -73,44 +197,24 @@ def eventually_follows(df0: pd.DataFrame, attribute_values: List[str], parameter
     timestamp_diff_boundaries = exec_utils.get_param_value(Parameters.TIMESTAMP_DIFF_BOUNDARIES, parameters, [])
     enable_timestamp = exec_utils.get_param_value(Parameters.ENABLE_TIMESTAMP, parameters, len(timestamp_diff_boundaries) > 0)
 
-    colset = [case_id_glue, attribute_key]
-    if enable_timestamp:
-        colset.append(timestamp_key)
-
-    df = df0.copy()
-    df = df[colset]
-    df = pandas_utils.insert_index(df)
-
-    df_a = [df[df[attribute_key] == attribute_value].copy() for attribute_value in attribute_values]
-
-    df_join = df_a[0].merge(df_a[1], on=case_id_glue, suffixes=('_0', "_1")).dropna()
-    df_join[constants.DEFAULT_INDEX_KEY] = df_join[constants.DEFAULT_INDEX_KEY + "_0"]
-    df_join["@@diffindex0"] = df_join[constants.DEFAULT_INDEX_KEY + "_1"] - df_join[constants.DEFAULT_INDEX_KEY + "_0"]
-    df_join = df_join[df_join["@@diffindex0"] > 0]
-
-    for i in range(2, len(df_a)):
-        df_join = df_join.merge(df_a[i], on=case_id_glue, suffixes=('', "_%d" % i)).dropna()
-        df_join["@@diffindex%d" % (i - 1)] = df_join[constants.DEFAULT_INDEX_KEY + "_%d" % i] - df_join[
-            constants.DEFAULT_INDEX_KEY + "_%d" % (i - 1)]
-        df_join = df_join[df_join["@@diffindex%d" % (i - 1)] > 0]
+    index, attached = __get_index(df0, case_id_glue, attribute_key, timestamp_key)
+    values_codes = [index.get_activity_codes([value]) for value in attribute_values]
 
     if enable_timestamp:
-        for i in range(1, len(df_a)):
-            df_join["@@difftimestamp%d" % (i - 1)] = pandas_utils.get_total_seconds(df_join[timestamp_key + "_%d" % i] - df_join[timestamp_key + '_%d' % (i-1)])
-
-            if timestamp_diff_boundaries:
-                df_join = df_join[df_join["@@difftimestamp%d" % (i-1)] >= timestamp_diff_boundaries[i-1][0]]
-                df_join = df_join[df_join["@@difftimestamp%d" % (i-1)] <= timestamp_diff_boundaries[i-1][1]]
-
-    i1 = df.set_index(case_id_glue).index
-    i2 = df_join.set_index(case_id_glue).index
-    if positive:
-        ret = df0[i1.isin(i2)]
+        timestamps = __get_timestamps(df0, timestamp_key)[index.order]
+        valid = timestamps != np.iinfo(np.int64).min
+        codes, sequence, case_sequence = __get_sequences(index, False)
+        if timestamp_diff_boundaries:
+            selected_sequences = __eventually_follows_timed(codes, sequence, len(case_sequence), values_codes, valid,
+                                                            timestamps, timestamp_diff_boundaries)
+        else:
+            selected_sequences = __eventually_follows_sequences(codes, sequence, len(case_sequence), values_codes, valid=valid)
     else:
-        ret = df0[~i1.isin(i2)]
+        # pure control-flow: evaluated once per variant, if the variants are available on the attached index
+        codes, sequence, case_sequence = __get_sequences(index, attached)
+        selected_sequences = __eventually_follows_sequences(codes, sequence, int(case_sequence.max(initial=-1)) + 1, values_codes)
 
-    ret.attrs = copy(df0.attrs) if hasattr(df0, 'attrs') else {}
-    return ret
+    return __filter_cases(df0, index, selected_sequences[case_sequence], positive)
 
 
 def A_next_B_next_C(df0: pd.DataFrame, A: str, B: str, C: str, parameters: Optional[Dict[Union[str, Parameters], Any]] = None) -> pd.DataFrame:
@@ -145,33 +249,16 @@ def A_next_B_next_C(df0: pd.DataFrame, A: str, B: str, C: str, parameters: Optio
     attribute_key = exec_utils.get_param_value(Parameters.ATTRIBUTE_KEY, parameters, DEFAULT_NAME_KEY)
     positive = exec_utils.get_param_value(Parameters.POSITIVE, parameters, True)
 
-    df = df0.copy()
-    df = df[[case_id_glue, attribute_key]]
-    df = pandas_utils.insert_index(df)
-    df_A = df[df[attribute_key] == A].copy()
-    df_B = df[df[attribute_key] == B].copy()
-    df_C = df[df[attribute_key] == C].copy()
-    df_B["@@conceptname"] = df_B[case_id_glue]
-    df_B = df_B.groupby(case_id_glue).last().set_index("@@conceptname")
-    df_C["@@conceptname"] = df_C[case_id_glue]
-    df_C = df_C.groupby(case_id_glue).last().set_index("@@conceptname")
-
-    df_join = df_A.join(df_B, on=case_id_glue, rsuffix="_2").dropna().join(df_C, on=case_id_glue, rsuffix="_3").dropna()
-    df_join["@@diffindex"] = df_join[constants.DEFAULT_INDEX_KEY + "_2"] - df_join[constants.DEFAULT_INDEX_KEY]
-    df_join["@@diffindex2"] = df_join[constants.DEFAULT_INDEX_KEY + "_3"] - df_join[constants.DEFAULT_INDEX_KEY + "_2"]
-    df_join = df_join[df_join["@@diffindex"] == 1]
-    df_join = df_join[df_join["@@diffindex2"] == 1]
-
-    i1 = df.set_index(case_id_glue).index
-    i2 = df_join.set_index(case_id_glue).index
+    index, attached = __get_index(df0, case_id_glue, attribute_key, DEFAULT_TIMESTAMP_KEY)
+    codes, sequence, case_sequence = __get_sequences(index, attached)
+    is_a, is_b, is_c = [np.isin(codes, index.get_activity_codes([value])) for value in [A, B, C]]
 
-    if positive:
-        ret = df0[i1.isin(i2)]
-    else:
-        ret = df0[~i1.isin(i2)]
+    # occurrences of A directly followed by B, and B directly followed by C, in the same sequence
+    matches = is_a[:-2] & is_b[1:-1] & is_c[2:] & (sequence[:-2] == sequence[2:])
+    selected_sequences = np.zeros(int(case_sequence.max(initial=-1)) + 1, dtype=bool)
+    selected_sequences[sequence[:-2][matches]] = True
 
-    ret.attrs = copy(df0.attrs) if hasattr(df0, 'attrs') else {}
-    return ret
+    return __filter_cases(df0, index, selected_sequences[case_sequence], positive)
 
 
 def four_eyes_principle(df0: pd.DataFrame, A: str, B: str, parameters: Optional[Dict[Union[str, Parameters], Any]] = None) -> pd.DataFrame:
@@ -206,29 +293,22 @@ def four_eyes_principle(df0: pd.DataFrame, A: str, B: str, parameters: Optional[
     resource_key = exec_utils.get_param_value(Parameters.RESOURCE_KEY, parameters, DEFAULT_RESOURCE_KEY)
     positive = exec_utils.get_param_value(Parameters.POSITIVE, parameters, True)
 
-    df = df0.copy()
-    df = df[[case_id_glue, attribute_key, resource_key]]
+    index = __get_index(df0, case_id_glue, attribute_key, DEFAULT_TIMESTAMP_KEY)[0]
+    pairs_a, num_resources = __resource_pairs(df0, index, resource_key, A)
+    pairs_b, num_resources = __resource_pairs(df0, index, resource_key, B)
 
-    df_A = df[df[attribute_key] == A].copy()
-    df_B = df[df[attribute_key] == B].copy()
-    df_B["@@conceptname"] = df_B[case_id_glue]
-    df_B = df_B.groupby(case_id_glue).last().set_index("@@conceptname")
-
-    df_join = df_A.join(df_B, on=case_id_glue, rsuffix="_2").dropna()
-    df_join_pos = df_join[df_join[resource_key] == df_join[resource_key + "_2"]]
-    df_join_neg = df_join[df_join[resource_key] != df_join[resource_key + "_2"]]
-
-    i1 = df.set_index(case_id_glue).index
-    i2 = df_join_pos.set_index(case_id_glue).index
-    i3 = df_join_neg.set_index(case_id_glue).index
+    # cases in which at least one resource performs both A and B
+    shared = np.zeros(len(index.cases), dtype=bool)
+    shared[pairs_a[np.isin(pairs_a, pairs_b)] // num_resources] = True
 
     if positive:
-        ret = df0[i1.isin(i3) & ~i1.isin(i2)]
+        selected_cases = np.zeros(len(index.cases), dtype=bool)
+        selected_cases[np.intersect1d(pairs_a // num_resources, pairs_b // num_resources)] = True
+        selected_cases &= ~shared
     else:
-        ret = df0[i1.isin(i2)]
+        selected_cases = shared
 
-    ret.attrs = copy(df0.attrs) if hasattr(df0, 'attrs') else {}
-    return ret
+    return __filter_cases(df0, index, selected_cases, True)
 
 
 def attr_value_different_persons(df0: pd.DataFrame, A: str, parameters: Optional[Dict[Union[str, Parameters], Any]] = None) -> pd.DataFrame:
@@ -259,24 +339,10 @@ def attr_value_different_persons(df0: pd.DataFrame, A: str, parameters: Optional
     resource_key = exec_utils.get_param_value(Parameters.RESOURCE_KEY, parameters, DEFAULT_RESOURCE_KEY)
     positive = exec_utils.get_param_value(Parameters.POSITIVE, parameters, True)
 
-    df = df0.copy()
-    df = df[[case_id_glue, attribute_key, resource_key]]
+    index = __get_index(df0, case_id_glue, attribute_key, DEFAULT_TIMESTAMP_KEY)[0]
+    pairs, num_resources = __resource_pairs(df0, index, resource_key, A)
 
-    df_A = df[df[attribute_key] == A].copy()
-    df_B = df[df[attribute_key] == A].copy()
-    df_B["@@conceptname"] = df_B[case_id_glue]
-    df_B = df_B.groupby(case_id_glue).last().set_index("@@conceptname")
+    # cases in which A is performed by more than one resource
+    selected_cases = np.bincount(pairs // num_resources, minlength=len(index.cases)) > 1
 
-    df_join = df_A.join(df_B, on=case_id_glue, rsuffix="_2").dropna()
-    df_join_neg = df_join[df_join[resource_key] != df_join[resource_key + "_2"]]
-
-    i1 = df.set_index(case_id_glue).index
-    i2 = df_join_neg.set_index(case_id_glue).index
-
-    if positive:
-        ret = df0[i1.isin(i2)]
-    else:
-        ret = df0[~i1.isin(i2)]
-
-    ret.attrs = copy(df0.attrs) if hasattr(df0, 'attrs') else {}
-    return ret
+    return __filter_cases(df0, index, selected_cases, positive)
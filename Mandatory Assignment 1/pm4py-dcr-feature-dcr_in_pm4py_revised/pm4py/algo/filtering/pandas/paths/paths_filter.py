@@ -23,6 +23,7 @@ from pm4py.util.constants import PARAMETER_CONSTANT_TIMESTAMP_KEY
 from pm4py.util.constants import DEFAULT_VARIANT_SEP
 from enum import Enum
 from pm4py.util import exec_utils, pandas_utils
+from pm4py.objects.log.util import log_index
 from copy import copy
 from typing import Optional, Dict, Any, Union, Tuple, List
 import pandas as pd
@@ -69,6 +70,16 @@ def apply(df: pd.DataFrame, paths: List[Tuple[str, str]], parameters: Optional[D
     target_attribute_key = exec_utils.get_param_value(Parameters.TARGET_ATTRIBUTE_KEY, parameters, attribute_key)
 
     positive = exec_utils.get_param_value(Parameters.POSITIVE, parameters, True)
+
+    index = log_index.get(df, parameters={log_index.Parameters.CASE_ID_KEY: case_id_glue, log_index.Parameters.ACTIVITY_KEY: attribute_key})
+    sorted_rows = index.get_sorted_rows() if index is not None and target_attribute_key == attribute_key and index.timestamp_key == timestamp_key else None
+    if sorted_rows is not None:
+        # the events of every case are already sorted by timestamp
+        mask = index.paths_mask(paths)
+        ret = df.iloc[sorted_rows[mask[sorted_rows]]] if positive else df.iloc[sorted_rows[~mask[sorted_rows]]]
+        ret.attrs = copy(df.attrs) if hasattr(df, 'attrs') else {}
+        return ret
+
     paths = [path[0] + DEFAULT_VARIANT_SEP + path[1] for path in paths]
     df = df.sort_values([case_id_glue, timestamp_key])
     filt_df = df[list({case_id_glue, attribute_key, target_attribute_key})]
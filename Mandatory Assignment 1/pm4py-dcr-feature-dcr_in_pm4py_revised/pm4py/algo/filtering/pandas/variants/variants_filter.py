@@ -20,6 +20,7 @@ from pm4py.statistics.variants.pandas import get as variants_get
 from pm4py.util.constants import PARAMETER_CONSTANT_CASEID_KEY, PARAMETER_CONSTANT_ACTIVITY_KEY
 from enum import Enum
 from pm4py.util import exec_utils
+from pm4py.objects.log.util import log_index
 from copy import copy
 from typing import Optional, Dict, Any, Union, List
 import pandas as pd
@@ -60,6 +61,14 @@ def apply(df: pd.DataFrame, admitted_variants: List[List[str]], parameters: Opti
 
     case_id_glue = exec_utils.get_param_value(Parameters.CASE_ID_KEY, parameters, CASE_CONCEPT_NAME)
     positive = exec_utils.get_param_value(Parameters.POSITIVE, parameters, True)
+
+    index = log_index.get(df, parameters=parameters) if "variants_df" not in parameters else None
+    if index is not None:
+        mask = index.variants_mask(admitted_variants)
+        ret = df[mask] if positive else df[~mask]
+        ret.attrs = copy(df.attrs) if hasattr(df, 'attrs') else {}
+        return ret
+
     variants_df = parameters["variants_df"] if "variants_df" in parameters else get_variants_df(df,
                                                                                                 parameters=parameters)
     variants_df = variants_df[variants_df["variant"].isin(admitted_variants)]
@@ -19,7 +19,7 @@ from pm4py.util import exec_utils
 from pm4py.util import xes_constants, constants, pandas_utils
 import pandas as pd
 from typing import Dict, Optional, Any, Tuple
-from pm4py.util.business_hours import soj_time_business_hours_diff
+from pm4py.util.business_hours import BusinessCalendar
 from pm4py.algo.discovery.ocel.link_analysis.variants import classic as link_analysis
 
 
@@ -94,9 +94,7 @@ Dict[Tuple[str, str], Dict[str, Any]]:
     edges = {}
 
     if business_hours:
-        merged_df[timestamp_diff_column] = merged_df.apply(
-            lambda x: soj_time_business_hours_diff(x[timestamp_column + "_out"], x[timestamp_column + "_in"],
-                                                   business_hours_slots), axis=1)
+        merged_df[timestamp_diff_column] = BusinessCalendar(business_hours_slots).get_seconds(merged_df[timestamp_column + "_out"], merged_df[timestamp_column + "_in"])
 
     else:
         merged_df[timestamp_diff_column] = pandas_utils.get_total_seconds(merged_df[timestamp_column + "_in"] - merged_df[timestamp_column + "_out"])
@@ -19,7 +19,10 @@ from typing import Optional, Dict, Any, List
 from enum import Enum
 from pm4py.util import exec_utils
 import time
-from pm4py.algo.transformation.ocel.features.objects import object_lifecycle_length, object_lifecycle_duration, object_degree_centrality, object_general_descendants_graph, object_general_interaction_graph, object_general_inheritance_graph, object_cobirth_graph, object_codeath_graph, object_lifecycle_activities, object_str_attributes, object_num_attributes, objects_interaction_graph_ot, object_work_in_progress, related_events_features, related_activities_features, obj_con_in_graph_features, object_lifecycle_unq_act, object_lifecycle_paths
+from copy import copy
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+import numpy as np
+from pm4py.algo.transformation.ocel.features.objects import shared_structures, object_lifecycle_length, object_lifecycle_duration, object_degree_centrality, object_general_descendants_graph, object_general_interaction_graph, object_general_inheritance_graph, object_cobirth_graph, object_codeath_graph, object_lifecycle_activities, object_str_attributes, object_num_attributes, objects_interaction_graph_ot, object_work_in_progress, related_events_features, related_activities_features, obj_con_in_graph_features, object_lifecycle_unq_act, object_lifecycle_paths
 
 
 class Parameters(Enum):
@@ -45,6 +48,24 @@ class Parameters(Enum):
     ENABLE_RELATED_ACTIVITIES_FEATURES = "enable_related_activities_features"
     ENABLE_OBJ_CON_IN_GRAPH_FEATURES = "enable_obj_con_in_graph_features"
     FILTER_PER_TYPE = "filter_per_type"
+    ENABLE_SHARED_STRUCTURES = "enable_shared_structures"
+    CORES = "cores"
+    ENABLE_MULTIPROCESSING = "enable_multiprocessing"
+    RETURN_NUMPY = "return_numpy"
+
+
+def __compute_features(name, func, ocel: OCEL, parameters: Dict[Any, Any], debug: bool):
+    """
+    Computes the features of a module of the feature extraction (possibly, in a worker of a pool)
+    """
+    if debug:
+        print("computing " + name)
+    t0 = time.time_ns()
+    data, feature_names = func(ocel, parameters=parameters)
+    t1 = time.time_ns()
+    if debug:
+        print("computed " + name, "%.4f" % ((t1-t0)/10**9))
+    return data, feature_names
 
 
 def apply(ocel: OCEL, parameters: Optional[Dict[Any, Any]] = None):
@@ -88,6 +109,12 @@ def apply(ocel: OCEL, parameters: Optional[Dict[Any, Any]] = None):
                                                         objects.
         - Parameters.ENABLE_OBJECT_LIFECYCLE_PATHS => enables the features associated to the paths in the
                                                             lifecycle of an object
+        - Parameters.ENABLE_SHARED_STRUCTURES => computes once the structures shared by the features (lifecycle of
+                                                the objects, object interaction graph) (default: True)
+        - Parameters.CORES => number of workers computing the features in parallel (default: 1, i.e., serial)
+        - Parameters.ENABLE_MULTIPROCESSING => uses a pool of processes instead of a pool of threads when
+                                                Parameters.CORES > 1 (default: False)
+        - Parameters.RETURN_NUMPY => returns the values of the features as a NumPy matrix (default: False)
 
     Returns
     ------------------
@@ -122,236 +149,72 @@ def apply(ocel: OCEL, parameters: Optional[Dict[Any, Any]] = None):
     enable_object_lifecycle_paths = exec_utils.get_param_value(Parameters.ENABLE_OBJECT_LIFECYCLE_PATHS, parameters, False)
 
     filter_per_type = exec_utils.get_param_value(Parameters.FILTER_PER_TYPE, parameters, None)
+    enable_shared_structures = exec_utils.get_param_value(Parameters.ENABLE_SHARED_STRUCTURES, parameters, True)
+    cores = exec_utils.get_param_value(Parameters.CORES, parameters, 1)
+    enable_multiprocessing = exec_utils.get_param_value(Parameters.ENABLE_MULTIPROCESSING, parameters, False)
+    return_numpy = exec_utils.get_param_value(Parameters.RETURN_NUMPY, parameters, False)
 
     T0 = time.time_ns()
 
     ordered_objects = ocel.objects[ocel.object_id_column].to_numpy()
     parameters["ordered_objects"] = ordered_objects
 
-    datas = [[] for x in ordered_objects]
-    feature_namess = []
-
-    if enable_object_lifecycle_length:
-        if debug:
-            print("computing enable_object_lifecycle_length")
-        t0 = time.time_ns()
-        data, feature_names = object_lifecycle_length.apply(ocel, parameters=parameters)
-        t1 = time.time_ns()
-        if debug:
-            print("computed enable_object_lifecycle_length", "%.4f" % ((t1-t0)/10**9))
-        feature_namess = feature_namess + feature_names
-        for i in range(len(data)):
-            datas[i] = datas[i] + data[i]
-
-    if enable_object_lifecycle_duration:
-        if debug:
-            print("computing enable_object_lifecycle_duration")
-        t0 = time.time_ns()
-        data, feature_names = object_lifecycle_duration.apply(ocel, parameters=parameters)
-        t1 = time.time_ns()
-        if debug:
-            print("computed enable_object_lifecycle_duration", "%.4f" % ((t1-t0)/10**9))
-        feature_namess = feature_namess + feature_names
-        for i in range(len(data)):
-            datas[i] = datas[i] + data[i]
-
-    if enable_object_degree_centrality:
-        if debug:
-            print("computing enable_object_degree_centrality")
-        t0 = time.time_ns()
-        data, feature_names = object_degree_centrality.apply(ocel, parameters=parameters)
-        t1 = time.time_ns()
-        if debug:
-            print("computed enable_object_degree_centrality", "%.4f" % ((t1-t0)/10**9))
-        feature_namess = feature_namess + feature_names
-        for i in range(len(data)):
-            datas[i] = datas[i] + data[i]
-
-    if enable_object_general_interaction_graph:
-        if debug:
-            print("computing enable_object_general_interaction_graph")
-        t0 = time.time_ns()
-        data, feature_names = object_general_interaction_graph.apply(ocel, parameters=parameters)
-        t1 = time.time_ns()
-        if debug:
-            print("computed enable_object_general_interaction_graph", "%.4f" % ((t1-t0)/10**9))
-        feature_namess = feature_namess + feature_names
-        for i in range(len(data)):
-            datas[i] = datas[i] + data[i]
-
-    if enable_object_general_descendants_graph:
-        if debug:
-            print("computing enable_object_general_descendants_graph")
-        t0 = time.time_ns()
-        data, feature_names = object_general_descendants_graph.apply(ocel, parameters=parameters)
-        t1 = time.time_ns()
-        if debug:
-            print("computed enable_object_general_descendants_graph", "%.4f" % ((t1-t0)/10**9))
-        feature_namess = feature_namess + feature_names
-        for i in range(len(data)):
-            datas[i] = datas[i] + data[i]
-
-    if enable_object_general_inheritance_graph:
-        if debug:
-            print("computing enable_object_general_inheritance_graph")
-        t0 = time.time_ns()
-        data, feature_names = object_general_inheritance_graph.apply(ocel, parameters=parameters)
-        t1 = time.time_ns()
-        if debug:
-            print("computed enable_object_general_inheritance_graph", "%.4f" % ((t1-t0)/10**9))
-        feature_namess = feature_namess + feature_names
-        for i in range(len(data)):
-            datas[i] = datas[i] + data[i]
-
-    if enable_object_cobirth_graph:
-        if debug:
-            print("computing enable_object_cobirth_graph")
-        t0 = time.time_ns()
-        data, feature_names = object_cobirth_graph.apply(ocel, parameters=parameters)
-        t1 = time.time_ns()
-        if debug:
-            print("computed enable_object_cobirth_graph", "%.4f" % ((t1-t0)/10**9))
-        feature_namess = feature_namess + feature_names
-        for i in range(len(data)):
-            datas[i] = datas[i] + data[i]
-
-    if enable_object_codeath_graph:
-        if debug:
-            print("computing enable_object_codeath_graph")
-        t0 = time.time_ns()
-        data, feature_names = object_codeath_graph.apply(ocel, parameters=parameters)
-        t1 = time.time_ns()
-        if debug:
-            print("computed enable_object_codeath_graph", "%.4f" % ((t1-t0)/10**9))
-        feature_namess = feature_namess + feature_names
-        for i in range(len(data)):
-            datas[i] = datas[i] + data[i]
-
-    if enable_object_lifecycle_activities:
-        if debug:
-            print("computing enable_object_lifecycle_activities")
-        t0 = time.time_ns()
-        data, feature_names = object_lifecycle_activities.apply(ocel, parameters=parameters)
-        t1 = time.time_ns()
-        if debug:
-            print("computed enable_object_lifecycle_activities", "%.4f" % ((t1-t0)/10**9))
-        feature_namess = feature_namess + feature_names
-        for i in range(len(data)):
-            datas[i] = datas[i] + data[i]
-
-    if enable_object_str_attributes:
-        if debug:
-            print("computing enable_object_str_attributes")
-        t0 = time.time_ns()
-        data, feature_names = object_str_attributes.apply(ocel, parameters=parameters)
-        t1 = time.time_ns()
-        if debug:
-            print("computed enable_object_str_attributes", "%.4f" % ((t1-t0)/10**9))
-        feature_namess = feature_namess + feature_names
-        for i in range(len(data)):
-            datas[i] = datas[i] + data[i]
-
-    if enable_object_num_attributes:
-        if debug:
-            print("computing enable_object_num_attributes")
-        t0 = time.time_ns()
-        data, feature_names = object_num_attributes.apply(ocel, parameters=parameters)
-        t1 = time.time_ns()
-        if debug:
-            print("computed enable_object_num_attributes", "%.4f" % ((t1-t0)/10**9))
-        feature_namess = feature_namess + feature_names
-        for i in range(len(data)):
-            datas[i] = datas[i] + data[i]
-
-    if enable_object_interaction_graph_ot:
-        if debug:
-            print("computing enable_object_interaction_graph_ot")
+    features = [(enable_object_lifecycle_length, "enable_object_lifecycle_length", object_lifecycle_length),
+                (enable_object_lifecycle_duration, "enable_object_lifecycle_duration", object_lifecycle_duration),
+                (enable_object_degree_centrality, "enable_object_degree_centrality", object_degree_centrality),
+                (enable_object_general_interaction_graph, "enable_object_general_interaction_graph", object_general_interaction_graph),
+                (enable_object_general_descendants_graph, "enable_object_general_descendants_graph", object_general_descendants_graph),
+                (enable_object_general_inheritance_graph, "enable_object_general_inheritance_graph", object_general_inheritance_graph),
+                (enable_object_cobirth_graph, "enable_object_cobirth_graph", object_cobirth_graph),
+                (enable_object_codeath_graph, "enable_object_codeath_graph", object_codeath_graph),
+                (enable_object_lifecycle_activities, "enable_object_lifecycle_activities", object_lifecycle_activities),
+                (enable_object_str_attributes, "enable_object_str_attributes", object_str_attributes),
+                (enable_object_num_attributes, "enable_object_num_attributes", object_num_attributes),
+                (enable_object_interaction_graph_ot, "enable_object_interaction_graph_ot", objects_interaction_graph_ot),
+                (enable_work_in_progress, "enable_work_in_progress", object_work_in_progress),
+                (enable_object_lifecycle_unq_act, "enable_object_lifecycle_unq_act", object_lifecycle_unq_act),
+                (enable_related_events_features, "enable_related_events_features", related_events_features),
+                (enable_related_activities_features, "enable_related_activities_features", related_activities_features),
+                (enable_obj_con_in_graph_features, "enable_obj_con_in_graph_features", obj_con_in_graph_features),
+                (enable_object_lifecycle_paths, "enable_object_lifecycle_paths", object_lifecycle_paths)]
+    features = [(name, module.apply) for enabled, name, module in features if enabled]
+
+    # the structures that are needed by more than one feature are computed once
+    # and provided to the features through the parameters
+    features_parameters = copy(parameters)
+    if enable_shared_structures:
         t0 = time.time_ns()
-        data, feature_names = objects_interaction_graph_ot.apply(ocel, parameters=parameters)
+        features_parameters.update(shared_structures.apply(ocel, lifecycle=enable_object_lifecycle_length or enable_object_lifecycle_activities or enable_object_lifecycle_unq_act or enable_object_lifecycle_paths,
+                                                           lifecycle_timestamps=enable_object_lifecycle_duration or enable_work_in_progress,
+                                                           interaction_graph=enable_object_degree_centrality or enable_object_general_interaction_graph or enable_object_interaction_graph_ot or (enable_obj_con_in_graph_features and obj_con_in_graph_features.Parameters.GRAPH not in parameters and obj_con_in_graph_features.Parameters.GRAPH.value not in parameters),
+                                                           parameters=parameters))
         t1 = time.time_ns()
         if debug:
-            print("computed enable_object_interaction_graph_ot", "%.4f" % ((t1-t0)/10**9))
-        feature_namess = feature_namess + feature_names
-        for i in range(len(data)):
-            datas[i] = datas[i] + data[i]
+            print("computed shared structures", "%.4f" % ((t1-t0)/10**9))
 
-    if enable_work_in_progress:
-        if debug:
-            print("computing enable_work_in_progress")
-        t0 = time.time_ns()
-        data, feature_names = object_work_in_progress.apply(ocel, parameters=parameters)
-        t1 = time.time_ns()
-        if debug:
-            print("computed enable_work_in_progress", "%.4f" % ((t1-t0)/10**9))
-        feature_namess = feature_namess + feature_names
-        for i in range(len(data)):
-            datas[i] = datas[i] + data[i]
+    if cores > 1 and len(features) > 1:
+        executor = ProcessPoolExecutor if enable_multiprocessing else ThreadPoolExecutor
+        with executor(max_workers=cores) as pool:
+            futures = [pool.submit(__compute_features, name, func, ocel, features_parameters, debug) for name, func in features]
+            results = [future.result() for future in futures]
+    else:
+        results = [__compute_features(name, func, ocel, features_parameters, debug) for name, func in features]
 
-    if enable_object_lifecycle_unq_act:
-        if debug:
-            print("computing enable_object_lifecycle_unq_act")
-        t0 = time.time_ns()
-        data, feature_names = object_lifecycle_unq_act.apply(ocel, parameters=parameters)
-        t1 = time.time_ns()
-        if debug:
-            print("computed enable_object_lifecycle_unq_act", "%.4f" % ((t1-t0)/10**9))
-        feature_namess = feature_namess + feature_names
-        for i in range(len(data)):
-            datas[i] = datas[i] + data[i]
-
-    if enable_related_events_features:
-        if debug:
-            print("computing enable_related_events_features")
-        t0 = time.time_ns()
-        data, feature_names = related_events_features.apply(ocel, parameters=parameters)
-        t1 = time.time_ns()
-        if debug:
-            print("computed enable_related_events_features", "%.4f" % ((t1-t0)/10**9))
-        feature_namess = feature_namess + feature_names
-        for i in range(len(data)):
-            datas[i] = datas[i] + data[i]
-
-    if enable_related_activities_features:
-        if debug:
-            print("computing enable_related_activities_features")
-        t0 = time.time_ns()
-        data, feature_names = related_activities_features.apply(ocel, parameters=parameters)
-        t1 = time.time_ns()
-        if debug:
-            print("computed enable_related_activities_features", "%.4f" % ((t1-t0)/10**9))
-        feature_namess = feature_namess + feature_names
-        for i in range(len(data)):
-            datas[i] = datas[i] + data[i]
-
-    if enable_obj_con_in_graph_features:
-        if debug:
-            print("computing enable_obj_con_in_graph_features")
-        t0 = time.time_ns()
-        data, feature_names = obj_con_in_graph_features.apply(ocel, parameters=parameters)
-        t1 = time.time_ns()
-        if debug:
-            print("computed enable_obj_con_in_graph_features", "%.4f" % ((t1-t0)/10**9))
-        feature_namess = feature_namess + feature_names
-        for i in range(len(data)):
-            datas[i] = datas[i] + data[i]
-
-    if enable_object_lifecycle_paths:
-        if debug:
-            print("computing enable_object_lifecycle_paths")
-        t0 = time.time_ns()
-        data, feature_names = object_lifecycle_paths.apply(ocel, parameters=parameters)
-        t1 = time.time_ns()
-        if debug:
-            print("computed enable_object_lifecycle_paths", "%.4f" % ((t1-t0)/10**9))
-        feature_namess = feature_namess + feature_names
-        for i in range(len(data)):
-            datas[i] = datas[i] + data[i]
+    # the values are assembled column-wise in a matrix (one row per object)
+    matrix = np.empty((len(ordered_objects), 0), dtype=float)
+    feature_namess = []
+    if results:
+        matrix = np.hstack([np.asarray(data, dtype=float).reshape((len(ordered_objects), len(feature_names))) for data, feature_names in results])
+        for data, feature_names in results:
+            feature_namess = feature_namess + feature_names
 
     if filter_per_type is not None:
         object_type = ocel.objects[[ocel.object_id_column, ocel.object_type_column]].to_dict("records")
         object_type = {x[ocel.object_id_column]: x[ocel.object_type_column] for x in object_type}
         idxs = [i for i in range(len(ordered_objects)) if object_type[ordered_objects[i]] == filter_per_type]
-        datas = [datas[i] for i in idxs]
+        matrix = matrix[idxs]
+
+    datas = matrix if return_numpy else matrix.tolist()
 
     T1 = time.time_ns()
     if debug:
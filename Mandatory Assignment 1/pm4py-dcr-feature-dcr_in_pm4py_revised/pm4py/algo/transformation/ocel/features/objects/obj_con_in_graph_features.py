@@ -20,6 +20,7 @@ from typing import Optional, Dict, Any
 from enum import Enum
 from pm4py.util import exec_utils
 from pm4py.algo.transformation.ocel.graphs import object_interaction_graph, object_cobirth_graph, object_codeath_graph
+from pm4py.algo.transformation.ocel.features.objects import shared_structures
 
 
 class Parameters(Enum):
@@ -53,7 +54,10 @@ def apply(ocel: OCEL, parameters: Optional[Dict[Any, Any]] = None):
     dct_dct_objects = object_based_features.transform_features_to_dict_dict(ocel, data_objects, feature_names_objects)
 
     graph_to_retrieve = exec_utils.get_param_value(Parameters.GRAPH, parameters, object_interaction_graph)
-    graph0 = graph_to_retrieve.apply(ocel, parameters=parameters)
+    if graph_to_retrieve is object_interaction_graph:
+        graph0 = shared_structures.get_object_interaction_graph(ocel, parameters=parameters)
+    else:
+        graph0 = graph_to_retrieve.apply(ocel, parameters=parameters)
     graph = {}
     for el in graph0:
         if not el[0] in graph:
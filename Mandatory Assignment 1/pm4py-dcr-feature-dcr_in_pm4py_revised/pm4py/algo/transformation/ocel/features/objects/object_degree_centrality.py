@@ -17,7 +17,7 @@
 from pm4py.objects.ocel.obj import OCEL
 from pm4py.util import nx_utils
 from typing import Optional, Dict, Any
-from pm4py.algo.transformation.ocel.graphs import object_interaction_graph
+from pm4py.algo.transformation.ocel.features.objects import shared_structures
 
 
 def apply(ocel: OCEL, parameters: Optional[Dict[Any, Any]] = None):
@@ -44,7 +44,7 @@ def apply(ocel: OCEL, parameters: Optional[Dict[Any, Any]] = None):
     ordered_objects = parameters["ordered_objects"] if "ordered_objects" in parameters else ocel.objects[
         ocel.object_id_column].to_numpy()
 
-    g0 = object_interaction_graph.apply(ocel, parameters=parameters)
+    g0 = shared_structures.get_object_interaction_graph(ocel, parameters=parameters)
     g = nx_utils.Graph()
     for edge in g0:
         g.add_edge(edge[0], edge[1])
@@ -16,7 +16,7 @@
 '''
 from pm4py.objects.ocel.obj import OCEL
 from typing import Optional, Dict, Any
-from pm4py.algo.transformation.ocel.graphs import object_interaction_graph
+from pm4py.algo.transformation.ocel.features.objects import shared_structures
 
 
 def apply(ocel: OCEL, parameters: Optional[Dict[Any, Any]] = None):
@@ -43,15 +43,7 @@ def apply(ocel: OCEL, parameters: Optional[Dict[Any, Any]] = None):
     ordered_objects = parameters["ordered_objects"] if "ordered_objects" in parameters else ocel.objects[
         ocel.object_id_column].to_numpy()
 
-    g0 = object_interaction_graph.apply(ocel, parameters=parameters)
-    conn = {}
-
-    for obj in ordered_objects:
-        conn[obj] = set()
-
-    for el in g0:
-        conn[el[0]].add(el[1])
-        conn[el[1]].add(el[0])
+    conn = shared_structures.get_object_adjacency(ocel, ordered_objects, parameters=parameters)
 
     data = []
     feature_names = ["@@object_general_interaction_graph"]
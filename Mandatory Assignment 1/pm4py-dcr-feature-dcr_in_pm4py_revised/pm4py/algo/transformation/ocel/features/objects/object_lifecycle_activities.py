@@ -17,6 +17,7 @@
 from pm4py.objects.ocel.obj import OCEL
 from typing import Optional, Dict, Any
 from pm4py.util import pandas_utils
+from pm4py.algo.transformation.ocel.features.objects import shared_structures
 
 
 def apply(ocel: OCEL, parameters: Optional[Dict[Any, Any]] = None):
@@ -44,7 +45,7 @@ def apply(ocel: OCEL, parameters: Optional[Dict[Any, Any]] = None):
         ocel.object_id_column].to_numpy()
 
     activities = pandas_utils.format_unique(ocel.events[ocel.event_activity].unique())
-    lifecycle = ocel.relations.groupby(ocel.object_id_column)[ocel.event_activity].agg(list).to_dict()
+    lifecycle = shared_structures.get_object_lifecycle(ocel, parameters=parameters)
 
     data = []
     feature_names = ["@@ocel_lif_activity_"+str(x) for x in activities]
@@ -16,6 +16,7 @@
 '''
 from pm4py.objects.ocel.obj import OCEL
 from typing import Optional, Dict, Any
+from pm4py.algo.transformation.ocel.features.objects import shared_structures
 
 
 def apply(ocel: OCEL, parameters: Optional[Dict[Any, Any]] = None):
@@ -45,8 +46,7 @@ def apply(ocel: OCEL, parameters: Optional[Dict[Any, Any]] = None):
     ordered_objects = parameters["ordered_objects"] if "ordered_objects" in parameters else ocel.objects[
         ocel.object_id_column].to_numpy()
 
-    first_object_timestamp = ocel.relations.groupby(ocel.object_id_column).first()[ocel.event_timestamp].to_dict()
-    last_object_timestamp = ocel.relations.groupby(ocel.object_id_column).last()[ocel.event_timestamp].to_dict()
+    first_object_timestamp, last_object_timestamp = shared_structures.get_object_lifecycle_timestamps(ocel, parameters=parameters)
 
     data = []
     feature_names = ["@@object_lifecycle_duration", "@@object_lifecycle_start_timestamp", "@@object_lifecycle_end_timestamp"]
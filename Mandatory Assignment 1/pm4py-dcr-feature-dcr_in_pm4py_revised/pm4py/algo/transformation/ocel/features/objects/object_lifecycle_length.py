@@ -16,6 +16,7 @@
 '''
 from pm4py.objects.ocel.obj import OCEL
 from typing import Optional, Dict, Any
+from pm4py.algo.transformation.ocel.features.objects import shared_structures
 
 
 def apply(ocel: OCEL, parameters: Optional[Dict[Any, Any]] = None):
@@ -41,7 +42,7 @@ def apply(ocel: OCEL, parameters: Optional[Dict[Any, Any]] = None):
 
     ordered_objects = parameters["ordered_objects"] if "ordered_objects" in parameters else ocel.objects[ocel.object_id_column].to_numpy()
 
-    lifecycle_length = ocel.relations.groupby(ocel.object_id_column).size().to_dict()
+    lifecycle_length = {obj: len(lif) for obj, lif in shared_structures.get_object_lifecycle(ocel, parameters=parameters).items()}
 
     data = []
     feature_names = ["@@object_lifecycle_length"]
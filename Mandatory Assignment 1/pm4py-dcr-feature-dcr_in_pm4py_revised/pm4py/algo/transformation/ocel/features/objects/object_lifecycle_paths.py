@@ -16,6 +16,7 @@
 '''
 from pm4py.objects.ocel.obj import OCEL
 from typing import Optional, Dict, Any
+from pm4py.algo.transformation.ocel.features.objects import shared_structures
 
 
 def apply(ocel: OCEL, parameters: Optional[Dict[Any, Any]] = None):
@@ -42,7 +43,7 @@ def apply(ocel: OCEL, parameters: Optional[Dict[Any, Any]] = None):
     ordered_objects = parameters["ordered_objects"] if "ordered_objects" in parameters else ocel.objects[
         ocel.object_id_column].to_numpy()
 
-    lifecycle = ocel.relations.groupby(ocel.object_id_column)[ocel.event_activity].agg(list).to_dict()
+    lifecycle = shared_structures.get_object_lifecycle(ocel, parameters=parameters)
 
     data = []
     paths = {}
@@ -17,6 +17,8 @@
 
 from pm4py.objects.ocel.obj import OCEL
 from typing import Optional, Dict, Any
+from pm4py.algo.transformation.ocel.features.objects import shared_structures
+import pandas as pd
 
 
 def apply(ocel: OCEL, parameters: Optional[Dict[Any, Any]] = None):
@@ -43,8 +45,8 @@ def apply(ocel: OCEL, parameters: Optional[Dict[Any, Any]] = None):
     ordered_objects = parameters["ordered_objects"] if "ordered_objects" in parameters else ocel.objects[
         ocel.object_id_column].to_numpy()
 
-    lifecycle_unq = ocel.relations.groupby([ocel.object_id_column, ocel.event_activity]).first().reset_index()
-    lifecycle_unq = lifecycle_unq.groupby(ocel.object_id_column).size().to_dict()
+    lifecycle = shared_structures.get_object_lifecycle(ocel, parameters=parameters)
+    lifecycle_unq = {obj: len(set(act for act in lif if not pd.isna(act))) for obj, lif in lifecycle.items()}
 
     data = []
     feature_names = ["@@object_lifecycle_unq_act"]
@@ -16,7 +16,7 @@
 '''
 from pm4py.objects.ocel.obj import OCEL
 from typing import Optional, Dict, Any
-from pm4py.algo.transformation.ocel.graphs import object_interaction_graph
+from pm4py.algo.transformation.ocel.features.objects import shared_structures
 from pm4py.util import pandas_utils
 
 
@@ -49,15 +49,7 @@ def apply(ocel: OCEL, parameters: Optional[Dict[Any, Any]] = None):
     object_type_association = ocel.objects[[ocel.object_id_column, ocel.object_type_column]].to_dict("records")
     object_type_association = {x[ocel.object_id_column]: x[ocel.object_type_column] for x in object_type_association}
 
-    g0 = object_interaction_graph.apply(ocel, parameters=parameters)
-    conn = {}
-
-    for obj in ordered_objects:
-        conn[obj] = set()
-
-    for el in g0:
-        conn[el[0]].add(el[1])
-        conn[el[1]].add(el[0])
+    conn = shared_structures.get_object_adjacency(ocel, ordered_objects, parameters=parameters)
 
     data = []
     feature_names = ["@@object_interaction_graph_"+ot for ot in object_types]
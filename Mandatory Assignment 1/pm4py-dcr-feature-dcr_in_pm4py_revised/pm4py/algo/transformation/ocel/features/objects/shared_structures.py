@@ -0,0 +1,162 @@
+'''
+    This file is part of PM4Py (More Info: https://pm4py.fit.fraunhofer.de).
+
+    PM4Py is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    PM4Py is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with PM4Py.  If not, see <https://www.gnu.org/licenses/>.
+'''
+from pm4py.objects.ocel.obj import OCEL
+from typing import Optional, Dict, Any, List, Set, Tuple
+from pm4py.algo.transformation.ocel.graphs import object_interaction_graph
+
+
+OBJECT_LIFECYCLE = "@@shared_object_lifecycle"
+OBJECT_LIFECYCLE_TIMESTAMPS = "@@shared_object_lifecycle_timestamps"
+OBJECT_INTERACTION_GRAPH = "@@shared_object_interaction_graph"
+
+
+def get_object_lifecycle(ocel: OCEL, parameters: Optional[Dict[Any, Any]] = None) -> Dict[str, List[str]]:
+    """
+    Gets the lifecycle of the objects (for every object, the list of the activities of the related events).
+    If the structure has already been computed (and stored in the parameters), it is not computed again.
+
+    Parameters
+    -----------------
+    ocel
+        OCEL
+    parameters
+        Parameters of the algorithm
+
+    Returns
+    -----------------
+    lifecycle
+        Dictionary associating to every object the activities of its lifecycle
+    """
+    if parameters is not None and OBJECT_LIFECYCLE in parameters:
+        return parameters[OBJECT_LIFECYCLE]
+
+    return ocel.relations.groupby(ocel.object_id_column)[ocel.event_activity].agg(list).to_dict()
+
+
+def get_object_lifecycle_timestamps(ocel: OCEL, parameters: Optional[Dict[Any, Any]] = None) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Gets the first and the last timestamp of the lifecycle of the objects.
+    If the structure has already been computed (and stored in the parameters), it is not computed again.
+
+    Parameters
+    -----------------
+    ocel
+        OCEL
+    parameters
+        Parameters of the algorithm
+
+    Returns
+    -----------------
+    first_object_timestamp
+        Dictionary associating to every object the timestamp of the first related event
+    last_object_timestamp
+        Dictionary associating to every object the timestamp of the last related event
+    """
+    if parameters is not None and OBJECT_LIFECYCLE_TIMESTAMPS in parameters:
+        return parameters[OBJECT_LIFECYCLE_TIMESTAMPS]
+
+    timestamps = ocel.relations.groupby(ocel.object_id_column)[ocel.event_timestamp].agg(["first", "last"])
+    return timestamps["first"].to_dict(), timestamps["last"].to_dict()
+
+
+def get_object_interaction_graph(ocel: OCEL, parameters: Optional[Dict[Any, Any]] = None) -> Set[Tuple[str, str]]:
+    """
+    Gets the object interaction graph (see pm4py.algo.transformation.ocel.graphs.object_interaction_graph).
+    If the structure has already been computed (and stored in the parameters), it is not computed again.
+
+    Parameters
+    -----------------
+    ocel
+        OCEL
+    parameters
+        Parameters of the algorithm
+
+    Returns
+    -----------------
+    object_interaction_graph
+        Object interaction graph (as set of tuples; undirected)
+    """
+    if parameters is not None and OBJECT_INTERACTION_GRAPH in parameters:
+        return parameters[OBJECT_INTERACTION_GRAPH]
+
+    return object_interaction_graph.apply(ocel, parameters=parameters)
+
+
+def get_object_adjacency(ocel: OCEL, ordered_objects, parameters: Optional[Dict[Any, Any]] = None) -> Dict[str, Set[str]]:
+    """
+    Gets, for every object, the set of the objects interacting with it (in the object interaction graph)
+
+    Parameters
+    -----------------
+    ocel
+        OCEL
+    ordered_objects
+        Objects of the OCEL
+    parameters
+        Parameters of the algorithm
+
+    Returns
+    -----------------
+    conn
+        Dictionary associating to every object the set of its interacting objects
+    """
+    conn = {obj: set() for obj in ordered_objects}
+
+    for el in get_object_interaction_graph(ocel, parameters=parameters):
+        conn[el[0]].add(el[1])
+        conn[el[1]].add(el[0])
+
+    return conn
+
+
+def apply(ocel: OCEL, lifecycle: bool = True, lifecycle_timestamps: bool = True, interaction_graph: bool = True,
+          parameters: Optional[Dict[Any, Any]] = None) -> Dict[str, Any]:
+    """
+    Computes once the structures that are shared between the object-based features
+    (lifecycle of the objects, first/last timestamps of the lifecycle, object interaction graph).
+    The returned dictionary can be merged into the parameters of the feature extraction.
+
+    Parameters
+    -----------------
+    ocel
+        OCEL
+    lifecycle
+        Computes the lifecycle of the objects
+    lifecycle_timestamps
+        Computes the first/last timestamps of the lifecycle of the objects
+    interaction_graph
+        Computes the object interaction graph
+    parameters
+        Parameters of the algorithm
+
+    Returns
+    -----------------
+    shared_structures
+        Dictionary containing the requested shared structures
+    """
+    if parameters is None:
+        parameters = {}
+
+    ret = {}
+    if lifecycle:
+        ret[OBJECT_LIFECYCLE] = get_object_lifecycle(ocel, parameters=parameters)
+    if lifecycle_timestamps:
+        ret[OBJECT_LIFECYCLE_TIMESTAMPS] = get_object_lifecycle_timestamps(ocel, parameters=parameters)
+    if interaction_graph:
+        ret[OBJECT_INTERACTION_GRAPH] = get_object_interaction_graph(ocel, parameters=parameters)
+
+    return ret
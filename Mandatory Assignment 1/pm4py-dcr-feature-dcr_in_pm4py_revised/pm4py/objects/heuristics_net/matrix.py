@@ -0,0 +1,156 @@
+'''
+    This file is part of PM4Py (More Info: https://pm4py.fit.fraunhofer.de).
+
+    PM4Py is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    PM4Py is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with PM4Py.  If not, see <https://www.gnu.org/licenses/>.
+'''
+from typing import Optional, Dict, Any, Tuple, Collection, List
+
+import numpy as np
+
+
+class HeuristicsMatrix(object):
+    def __init__(self, couples: Dict[Tuple[Any, Any], Any], activities: Optional[Collection[Any]] = None):
+        """
+        Integer-coded sparse matrix of a dictionary associating couples of activities to a numeric value
+        (e.g., the frequency directly-follows graph).
+
+        The couples are kept (as arrays of codes) in the insertion order of the dictionary, and the values are
+        looked up with a binary search on the sorted keys (row * width + column) of the couples. The activities
+        that do not belong to the index are mapped to an additional (empty) code.
+
+        Parameters
+        ---------------
+        couples
+            Dictionary associating couples of activities to a numeric value
+        activities
+            (If provided) activities to insert first in the index
+        """
+        index = {}
+        if activities is not None:
+            for act in activities:
+                index.setdefault(act, len(index))
+        src = [index.setdefault(x[0], len(index)) for x in couples]
+        dst = [index.setdefault(x[1], len(index)) for x in couples]
+        self.index = index
+        self.labels = list(index)
+        self.src = np.array(src, dtype=np.int64)
+        self.dst = np.array(dst, dtype=np.int64)
+        self.values = np.array(list(couples.values()), dtype=np.float64)
+        self.width = len(index) + 1
+        keys = self.src * self.width + self.dst
+        order = np.argsort(keys, kind="stable")
+        self.sorted_keys = keys[order]
+        self.sorted_values = self.values[order]
+
+    @classmethod
+    def from_nested(cls, nested: Dict[Any, Dict[Any, Any]]) -> "HeuristicsMatrix":
+        """
+        Builds the matrix from a nested dictionary (e.g., the DFG matrix of an heuristics net)
+        """
+        return cls({(x, y): v for x, row in nested.items() for y, v in row.items()})
+
+    def codes(self, activities: Collection[Any]) -> np.ndarray:
+        """
+        Gets the codes of the provided activities (the activities outside the index are mapped to the empty code)
+        """
+        n = len(self.index)
+        return np.array([self.index.get(x, n) for x in activities], dtype=np.int64)
+
+    def get(self, rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+        """
+        Gets the values of the given couples of codes (0 for the couples not in the matrix); the arrays of the rows
+        and of the columns are broadcast together
+        """
+        keys = rows * self.width + cols
+        if len(self.sorted_keys) == 0:
+            return np.zeros(np.shape(keys), dtype=np.float64)
+        positions = np.minimum(np.searchsorted(self.sorted_keys, keys), len(self.sorted_keys) - 1)
+        return np.where(self.sorted_keys[positions] == keys, self.sorted_values[positions], 0.0)
+
+    def inverse_values(self) -> np.ndarray:
+        """
+        Gets, for every couple (a, b) of the matrix, the value of the couple (b, a) (0 if it does not exist)
+        """
+        return self.get(self.dst, self.src)
+
+    def submatrix(self, rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+        """
+        Gets the dense submatrix of the given rows and columns
+        """
+        return self.get(rows[:, None], cols[None, :])
+
+
+def count_windows(codes: np.ndarray, lengths: np.ndarray, width: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Counts the windows of consecutive activities (e.g., the directly-follows relations for a width of 2), shifting
+    the integer-coded activities of the traces
+
+    Parameters
+    ---------------
+    codes
+        Integer-coded activities of the events (concatenation of the traces)
+    lengths
+        Lengths of the traces
+    width
+        Width of the window
+
+    Returns
+    ---------------
+    windows
+        Matrix of the different windows (a row for each window, containing the codes of its activities), in order
+        of first occurrence in the log
+    counts
+        Number of occurrences of the windows
+    """
+    codes = np.asarray(codes, dtype=np.int64)
+    lengths = np.asarray(lengths, dtype=np.int64)
+    starts = np.cumsum(lengths) - lengths
+    positions = np.arange(len(codes), dtype=np.int64) - np.repeat(starts, lengths)
+    ends = np.nonzero(positions >= width - 1)[0]
+    if len(ends) == 0:
+        return np.zeros((0, width), dtype=np.int64), np.zeros(0, dtype=np.int64)
+    windows = np.stack([codes[ends - width + 1 + k] for k in range(width)], axis=1)
+    num_codes = int(codes.max()) + 1
+    keys = np.zeros(len(ends), dtype=np.int64)
+    for k in range(width):
+        keys = keys * num_codes + windows[:, k]
+    _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+    counts = np.bincount(inverse.ravel())
+    order = np.argsort(first, kind="stable")
+    return windows[first[order]], counts[order]
+
+
+def add_upper_couples(target: Dict[Any, Dict[Any, float]], names: List[Any], values: np.ndarray,
+                      mask: np.ndarray):
+    """
+    Inserts in a nested dictionary the values of the couples (names[i], names[j]), with i < j, satisfying the mask,
+    in the order of the indexes
+
+    Parameters
+    ---------------
+    target
+        Nested dictionary (e.g., the AND measures of a node)
+    names
+        Names associated to the rows/columns of the matrices
+    values
+        (Dense) matrix of values
+    mask
+        (Dense) boolean matrix
+    """
+    rows, cols = np.nonzero(np.triu(mask, 1))
+    for i, j, value in zip(rows.tolist(), cols.tolist(), values[rows, cols].tolist()):
+        n1 = names[i]
+        if n1 not in target:
+            target[n1] = {}
+        target[n1][names[j]] = value
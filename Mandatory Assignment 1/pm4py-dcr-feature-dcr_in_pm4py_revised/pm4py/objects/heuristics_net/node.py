@@ -16,6 +16,7 @@
 '''
 from pm4py.objects.heuristics_net import defaults
 from pm4py.objects.heuristics_net.edge import Edge
+from pm4py.objects.heuristics_net.matrix import HeuristicsMatrix, add_upper_couples
 
 
 class Node:
@@ -115,7 +116,7 @@ class Node:
             self.input_connections[other_node] = []
         self.input_connections[other_node].append(edge)
 
-    def calculate_and_measure_out(self, and_measure_thresh=defaults.AND_MEASURE_THRESH):
+    def calculate_and_measure_out(self, and_measure_thresh=defaults.AND_MEASURE_THRESH, matrix=None):
         """
         Calculate AND measure for output relations (as couples)
 
@@ -123,29 +124,23 @@ class Node:
         -------------
         and_measure_thresh
             AND measure threshold
-        """
-        out_nodes = sorted(list(self.output_connections), key=lambda x: x.node_name)
-        i = 0
-        while i < len(out_nodes):
-            n1 = out_nodes[i].node_name
-            j = i + 1
-            while j < len(out_nodes):
-                n2 = out_nodes[j].node_name
-                c1 = self.heuristics_net.dfg_matrix[n1][n2] if n1 in self.heuristics_net.dfg_matrix and n2 in \
-                                                               self.heuristics_net.dfg_matrix[n1] else 0
-                c2 = self.heuristics_net.dfg_matrix[n2][n1] if n2 in self.heuristics_net.dfg_matrix and n1 in \
-                                                               self.heuristics_net.dfg_matrix[n2] else 0
-                c3 = self.heuristics_net.dfg_matrix[self.node_name][n1] if self.node_name in self.heuristics_net.dfg_matrix and n1 in self.heuristics_net.dfg_matrix[self.node_name] else 0
-                c4 = self.heuristics_net.dfg_matrix[self.node_name][n2] if self.node_name in self.heuristics_net.dfg_matrix and n2 in self.heuristics_net.dfg_matrix[self.node_name] else 0
-                value = (c1 + c2) / (c3 + c4 + 1)
-                if value >= and_measure_thresh:
-                    if n1 not in self.and_measures_out:
-                        self.and_measures_out[n1] = {}
-                    self.and_measures_out[n1][n2] = value
-                j = j + 1
-            i = i + 1
-
-    def calculate_and_measure_in(self, and_measure_thresh=defaults.AND_MEASURE_THRESH):
+        matrix
+            (If provided) integer-coded DFG matrix of the heuristics net (HeuristicsMatrix)
+        """
+        out_nodes = [x.node_name for x in sorted(list(self.output_connections), key=lambda x: x.node_name)]
+        if len(out_nodes) < 2:
+            return
+        if matrix is None:
+            matrix = HeuristicsMatrix.from_nested(self.heuristics_net.dfg_matrix)
+        # the first row/column of the submatrix refers to the current node
+        codes = matrix.codes([self.node_name] + out_nodes)
+        submatrix = matrix.submatrix(codes, codes)
+        between = submatrix[1:, 1:]
+        from_node = submatrix[0, 1:]
+        values = (between + between.T) / (from_node[:, None] + from_node[None, :] + 1)
+        add_upper_couples(self.and_measures_out, out_nodes, values, values >= and_measure_thresh)
+
+    def calculate_and_measure_in(self, and_measure_thresh=defaults.AND_MEASURE_THRESH, matrix=None):
         """
         Calculate AND measure for input relations (as couples)
 
@@ -153,27 +148,20 @@ class Node:
         --------------
         and_measure_thresh
             AND measure threshold
-        """
-        in_nodes = sorted(list(self.input_connections), key=lambda x: x.node_name)
-        i = 0
-        while i < len(in_nodes):
-            n1 = in_nodes[i].node_name
-            j = i + 1
-            while j < len(in_nodes):
-                n2 = in_nodes[j].node_name
-                c1 = self.heuristics_net.dfg_matrix[n1][n2] if n1 in self.heuristics_net.dfg_matrix and n2 in \
-                                                               self.heuristics_net.dfg_matrix[n1] else 0
-                c2 = self.heuristics_net.dfg_matrix[n2][n1] if n2 in self.heuristics_net.dfg_matrix and n1 in \
-                                                               self.heuristics_net.dfg_matrix[n2] else 0
-                c3 = self.heuristics_net.dfg_matrix[n1][self.node_name] if n1 in self.heuristics_net.dfg_matrix and self.node_name in self.heuristics_net.dfg_matrix[n1] else 0
-                c4 = self.heuristics_net.dfg_matrix[n2][self.node_name] if n2 in self.heuristics_net.dfg_matrix and self.node_name in self.heuristics_net.dfg_matrix[n2] else 0
-                value = (c1 + c2) / (c3 + c4 + 1)
-                if value >= and_measure_thresh:
-                    if n1 not in self.and_measures_in:
-                        self.and_measures_in[n1] = {}
-                    self.and_measures_in[n1][n2] = value
-                j = j + 1
-            i = i + 1
+        matrix
+            (If provided) integer-coded DFG matrix of the heuristics net (HeuristicsMatrix)
+        """
+        in_nodes = [x.node_name for x in sorted(list(self.input_connections), key=lambda x: x.node_name)]
+        if len(in_nodes) < 2:
+            return
+        if matrix is None:
+            matrix = HeuristicsMatrix.from_nested(self.heuristics_net.dfg_matrix)
+        codes = matrix.codes([self.node_name] + in_nodes)
+        submatrix = matrix.submatrix(codes, codes)
+        between = submatrix[1:, 1:]
+        to_node = submatrix[1:, 0]
+        values = (between + between.T) / (to_node[:, None] + to_node[None, :] + 1)
+        add_upper_couples(self.and_measures_in, in_nodes, values, values >= and_measure_thresh)
 
     def calculate_loops_length_two(self, dfg_matrix, freq_triples_matrix,
                                    loops_length_two_thresh=defaults.DEFAULT_LOOP_LENGTH_TWO_THRESH):
@@ -0,0 +1,369 @@
+'''
+    This file is part of PM4Py (More Info: https://pm4py.fit.fraunhofer.de).
+
+    PM4Py is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    PM4Py is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with PM4Py.  If not, see <https://www.gnu.org/licenses/>.
+'''
+import weakref
+from enum import Enum
+from typing import Optional, Dict, Any, List, Tuple, Collection
+
+import numpy as np
+import pandas as pd
+
+from pm4py.util import constants, xes_constants, exec_utils
+
+
+class Parameters(Enum):
+    CASE_ID_KEY = constants.PARAMETER_CONSTANT_CASEID_KEY
+    ACTIVITY_KEY = constants.PARAMETER_CONSTANT_ACTIVITY_KEY
+    TIMESTAMP_KEY = constants.PARAMETER_CONSTANT_TIMESTAMP_KEY
+
+
+# for every registered dataframe (by its id): weak reference to the dataframe and its indexes (by the used columns)
+_REGISTRY = {}
+
+
+def _factorize(values: np.ndarray, sort: bool) -> Tuple[np.ndarray, np.ndarray]:
+    try:
+        codes, labels = pd.factorize(values, sort=sort, use_na_sentinel=False)
+    except TypeError:
+        # labels of mixed types (not sortable)
+        codes, labels = pd.factorize(values, sort=False, use_na_sentinel=False)
+    return codes.astype(np.int64), np.asarray(labels, dtype=object)
+
+
+def _column_values(column: pd.Series) -> np.ndarray:
+    """
+    Gets the array backing a column of the dataframe (without copying it)
+    """
+    values = column.array
+    if isinstance(values, pd.Categorical):
+        return values.codes
+    if pd.api.types.is_datetime64_any_dtype(column):
+        # nanoseconds since the epoch (avoids the conversion of timezone-aware columns to objects)
+        return values.asi8
+    return column.to_numpy()
+
+
+def get_variants_from_codes(ordered_codes: np.ndarray, case_offsets: np.ndarray, activities: np.ndarray) -> Tuple[List[Tuple[Any, ...]], np.ndarray]:
+    """
+    Gets the variants (as tuples of activities) and the variant identifier of every case, starting from the activity
+    codes of the events grouped by case. The cases are grouped by their length, and the activity codes of the cases
+    having the same length are deduplicated as the rows of a matrix.
+
+    Parameters
+    ----------------
+    ordered_codes
+        Activity codes of the events, grouped by case
+    case_offsets
+        Boundaries of the cases (the events of the i-th case are ordered_codes[case_offsets[i]:case_offsets[i+1]])
+    activities
+        Activities (the i-th activity is associated to the code i)
+
+    Returns
+    ----------------
+    variants
+        List of variants
+    variant_ids
+        Variant identifier of every case
+    """
+    lengths = np.diff(case_offsets)
+    variant_ids = np.zeros(len(lengths), dtype=np.int64)
+    variants = []
+    for length in np.unique(lengths):
+        cases = np.flatnonzero(lengths == length)
+        matrix = ordered_codes[case_offsets[cases][:, None] + np.arange(length)]
+        unique_rows, inverse = np.unique(matrix, axis=0, return_inverse=True)
+        variant_ids[cases] = len(variants) + inverse.reshape(-1)
+        variants.extend(tuple(activities[row]) for row in unique_rows)
+    return variants, variant_ids
+
+
+class EventLogIndex(object):
+    """
+    Integer-coded index over the events of a dataframe.
+
+    - The cases are integer-coded (in order of first occurrence); order contains the rows of the dataframe grouped
+      by case (keeping the order of the dataframe inside each case), and case_offsets the boundaries of the cases
+      in order (the events of the i-th case are the rows order[case_offsets[i]:case_offsets[i+1]]).
+    - The activities are integer-coded (activity_codes contains the code of every row of the dataframe).
+    - The variants are computed on request, and coded as well (variant_ids contains the variant of every case).
+
+    The index keeps a reference to the arrays of the columns from which it was built; it is considered valid as long
+    as the dataframe still holds the same arrays (so the index is discarded after the columns are re-assigned or the
+    dataframe is sorted in-place). After changing single values of the columns in-place, please call invalidate().
+    """
+
+    def __init__(self, df: pd.DataFrame, case_id_key: str, activity_key: str, timestamp_key: str):
+        self.case_id_key = case_id_key
+        self.activity_key = activity_key
+        self.timestamp_key = timestamp_key
+        self.num_events = len(df)
+        self.columns = {key: _column_values(df[key]) for key in (case_id_key, activity_key, timestamp_key) if key in df.columns}
+
+        self.case_codes, self.cases = _factorize(df[case_id_key].to_numpy(), sort=False)
+        self.order = np.argsort(self.case_codes, kind="stable")
+        self.case_offsets = np.concatenate(([0], np.cumsum(np.bincount(self.case_codes, minlength=len(self.cases))))).astype(np.int64)
+        self.contiguous = bool(np.all(self.order == np.arange(self.num_events)))
+
+        self.activity_codes, self.activities = _factorize(df[activity_key].to_numpy(), sort=True)
+        self.activity_notna = ~pd.isna(self.activities)
+
+        self.timestamps = None
+        self.sorted_by_timestamp = False
+        if timestamp_key in df.columns:
+            timestamps = df[timestamp_key]
+            self.timestamps = self.columns[timestamp_key]
+            comparable = not pd.api.types.is_datetime64_any_dtype(timestamps) or not timestamps.isna().any()
+            ordered_timestamps = self.timestamps[self.order]
+            same_case = self.case_codes[self.order[1:]] == self.case_codes[self.order[:-1]]
+            try:
+                self.sorted_by_timestamp = comparable and bool(np.all((ordered_timestamps[1:] >= ordered_timestamps[:-1])[same_case]))
+            except TypeError:
+                self.sorted_by_timestamp = False
+
+        self.__sorted_rows = None
+        self.__variants = None
+        self.__variant_ids = None
+
+    def is_valid(self, df: pd.DataFrame) -> bool:
+        """
+        Checks if the index is still aligned with the given dataframe (i.e., the dataframe still holds the arrays
+        of the case identifier, activity and timestamp columns from which the index was built)
+        """
+        if len(df) != self.num_events or self.case_id_key not in df.columns or self.activity_key not in df.columns:
+            return False
+        for key, values in self.columns.items():
+            if key not in df.columns:
+                return False
+            if self.num_events > 0 and not np.shares_memory(_column_values(df[key]), values):
+                return False
+        return True
+
+    def get_sorted_rows(self) -> Optional[np.ndarray]:
+        """
+        Gets the rows of the dataframe sorted by case identifier and timestamp (as done by sort_values),
+        provided that the events of every case are already sorted by timestamp (None otherwise)
+        """
+        if self.__sorted_rows is None and self.sorted_by_timestamp and not pd.isna(self.cases).any():
+            try:
+                cases_order = np.argsort(self.cases, kind="stable")
+            except TypeError:
+                return None
+            cases_rank = np.empty(len(self.cases), dtype=np.int64)
+            cases_rank[cases_order] = np.arange(len(self.cases))
+            self.__sorted_rows = np.argsort(cases_rank[self.case_codes], kind="stable")
+        return self.__sorted_rows
+
+    def get_variants(self) -> Tuple[List[Tuple[Any, ...]], np.ndarray]:
+        """
+        Gets the variants of the log (as tuples of activities) and the variant identifier of every case
+        """
+        if self.__variants is None:
+            self.__variants, self.__variant_ids = get_variants_from_codes(self.activity_codes[self.order],
+                                                                          self.case_offsets, self.activities)
+        return self.__variants, self.__variant_ids
+
+    def get_variants_count(self) -> Dict[Tuple[Any, ...], int]:
+        """
+        Gets the number of cases of every variant of the log
+        """
+        variants, variant_ids = self.get_variants()
+        counts = np.bincount(variant_ids, minlength=len(variants))
+        return {variants[i]: int(counts[i]) for i in range(len(variants))}
+
+    def get_case_variant(self) -> Dict[Any, Tuple[Any, ...]]:
+        """
+        Gets the variant of every case of the log
+        """
+        variants, variant_ids = self.get_variants()
+        return {self.cases[i]: variants[variant_ids[i]] for i in range(len(self.cases))}
+
+    def __boundary_activities(self, end: bool) -> Dict[Any, int]:
+        rows = self.order[self.activity_notna[self.activity_codes[self.order]]]
+        cases = self.case_codes[rows]
+        if end:
+            boundary = np.concatenate((cases[1:] != cases[:-1], [True])) if len(cases) else np.zeros(0, dtype=bool)
+        else:
+            boundary = np.concatenate(([True], cases[1:] != cases[:-1])) if len(cases) else np.zeros(0, dtype=bool)
+        counts = np.bincount(self.activity_codes[rows[boundary]], minlength=len(self.activities))
+        return {self.activities[i]: int(counts[i]) for i in np.flatnonzero(counts)}
+
+    def get_start_activities(self) -> Dict[Any, int]:
+        """
+        Gets the start activities of the log (the first non-empty activity of every case), along with their count
+        """
+        return self.__boundary_activities(False)
+
+    def get_end_activities(self) -> Dict[Any, int]:
+        """
+        Gets the end activities of the log (the last non-empty activity of every case), along with their count
+        """
+        return self.__boundary_activities(True)
+
+    def get_activity_codes(self, activities: Collection[Any]) -> np.ndarray:
+        """
+        Gets the codes of the provided activities (the activities which are not in the log are ignored)
+        """
+        codes = pd.Index(self.activities).get_indexer(pd.Index(list(activities), dtype=object))
+        return codes[codes >= 0]
+
+    def get_rework_cases_per_activity(self) -> Dict[Any, int]:
+        """
+        Gets, for every activity, the number of cases in which the activity is repeated
+        """
+        num_activities = len(self.activities)
+        valid = self.activity_notna[self.activity_codes]
+        pairs, counts = np.unique(self.case_codes[valid] * num_activities + self.activity_codes[valid], return_counts=True)
+        rework = np.bincount(pairs[counts > 1] % num_activities, minlength=num_activities) if num_activities else np.zeros(0, dtype=np.int64)
+        return {self.activities[i]: int(rework[i]) for i in np.flatnonzero(rework)}
+
+    def cases_mask(self, cases_mask: np.ndarray) -> np.ndarray:
+        """
+        Transforms a boolean mask over the cases to a boolean mask over the rows of the dataframe
+        """
+        return cases_mask[self.case_codes]
+
+    def variants_mask(self, admitted_variants: Collection[Any]) -> np.ndarray:
+        """
+        Gets a boolean mask over the rows of the dataframe, selecting the cases belonging to the admitted variants
+        """
+        variants, variant_ids = self.get_variants()
+        admitted = set(tuple(v) if isinstance(v, list) else v for v in admitted_variants)
+        admitted_ids = np.array([v in admitted for v in variants], dtype=bool)
+        return self.cases_mask(admitted_ids[variant_ids])
+
+    def paths_mask(self, paths: Collection[Tuple[Any, Any]]) -> np.ndarray:
+        """
+        Gets a boolean mask over the rows of the dataframe, selecting the cases in which at least one of the
+        provided paths (couple of activities that directly-follow each other) occur
+        """
+        activities = pd.Index(self.activities)
+        num_activities = len(self.activities)
+        sources = activities.get_indexer(pd.Index([p[0] for p in paths], dtype=object))
+        targets = activities.get_indexer(pd.Index([p[1] for p in paths], dtype=object))
+        valid = (sources >= 0) & (targets >= 0)
+        paths_codes = sources[valid] * num_activities + targets[valid]
+
+        rows = self.order
+        same_case = self.case_codes[rows[1:]] == self.case_codes[rows[:-1]]
+        codes = self.activity_codes[rows[:-1]] * num_activities + self.activity_codes[rows[1:]]
+        hits = np.flatnonzero(same_case & np.isin(codes, paths_codes))
+        cases_mask = np.zeros(len(self.cases), dtype=bool)
+        cases_mask[self.case_codes[rows[hits]]] = True
+        return self.cases_mask(cases_mask)
+
+
+def __get_keys(parameters: Optional[Dict[Any, Any]]) -> Tuple[str, str]:
+    if parameters is None:
+        parameters = {}
+
+    case_id_key = exec_utils.get_param_value(Parameters.CASE_ID_KEY, parameters, constants.CASE_CONCEPT_NAME)
+    activity_key = exec_utils.get_param_value(Parameters.ACTIVITY_KEY, parameters, xes_constants.DEFAULT_NAME_KEY)
+
+    return case_id_key, activity_key
+
+
+def apply(df: pd.DataFrame, parameters: Optional[Dict[Any, Any]] = None) -> EventLogIndex:
+    """
+    Builds the integer-coded index of the provided dataframe, and attaches it to the dataframe.
+    The statistics and the filters on the dataframe (variants, start/end activities, rework,
+    filtering on variants, paths and between activities) reuse the attached index instead
+    of re-grouping the dataframe by case.
+
+    Minimum viable example:
+
+        import pm4py
+        from pm4py.objects.log.util import log_index
+
+        dataframe = pm4py.read_xes('tests/input_data/running-example.xes')
+        log_index.apply(dataframe)
+        variants = pm4py.get_variants(dataframe)
+        start_activities = pm4py.get_start_activities(dataframe)
+
+    Parameters
+    ------------------
+    df
+        Dataframe
+    parameters
+        Parameters of the algorithm, including:
+        - Parameters.CASE_ID_KEY => the case identifier
+        - Parameters.ACTIVITY_KEY => the activity
+        - Parameters.TIMESTAMP_KEY => the timestamp
+
+    Returns
+    ------------------
+    index
+        Index of the dataframe
+    """
+    if parameters is None:
+        parameters = {}
+
+    keys = __get_keys(parameters)
+    timestamp_key = exec_utils.get_param_value(Parameters.TIMESTAMP_KEY, parameters, xes_constants.DEFAULT_TIMESTAMP_KEY)
+    index = EventLogIndex(df, keys[0], keys[1], timestamp_key)
+
+    entry = _REGISTRY.get(id(df))
+    if entry is None or entry[0]() is not df:
+        df_id = id(df)
+        entry = (weakref.ref(df), {})
+        _REGISTRY[df_id] = entry
+        weakref.finalize(df, _REGISTRY.pop, df_id, None)
+    entry[1][keys] = index
+
+    return index
+
+
+def get(df: pd.DataFrame, parameters: Optional[Dict[Any, Any]] = None) -> Optional[EventLogIndex]:
+    """
+    Gets the index attached to the provided dataframe (for the case identifier and activity columns
+    specified in the parameters), if it exists and it is still valid
+
+    Parameters
+    ------------------
+    df
+        Dataframe
+    parameters
+        Parameters of the algorithm, including:
+        - Parameters.CASE_ID_KEY => the case identifier
+        - Parameters.ACTIVITY_KEY => the activity
+
+    Returns
+    ------------------
+    index
+        Index of the dataframe (None if no valid index is attached to the dataframe)
+    """
+    entry = _REGISTRY.get(id(df))
+    if entry is None or entry[0]() is not df:
+        return None
+
+    index = entry[1].get(__get_keys(parameters))
+    if index is None or not index.is_valid(df):
+        return None
+
+    return index
+
+
+def invalidate(df: pd.DataFrame):
+    """
+    Removes the indexes attached to the provided dataframe (to be called after in-place modifications of the dataframe)
+
+    Parameters
+    ------------------
+    df
+        Dataframe
+    """
+    entry = _REGISTRY.get(id(df))
+    if entry is not None and entry[0]() is df:
+        entry[1].clear()
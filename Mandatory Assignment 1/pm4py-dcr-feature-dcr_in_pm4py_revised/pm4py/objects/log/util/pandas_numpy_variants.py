@@ -17,6 +17,7 @@
 import pandas as pd
 from enum import Enum
 from pm4py.util import constants, xes_constants, pandas_utils, exec_utils
+from pm4py.objects.log.util import log_index
 import numpy as np
 from collections import Counter
 from typing import Tuple, Dict, Collection
@@ -71,6 +72,10 @@ def apply(dataframe: pd.DataFrame, parameters=None) -> Tuple[Dict[Collection[str
     timestamp_key = exec_utils.get_param_value(Parameters.TIMESTAMP_KEY, parameters, xes_constants.DEFAULT_TIMESTAMP_KEY)
     index_key = exec_utils.get_param_value(Parameters.INDEX_KEY, parameters, constants.DEFAULT_INDEX_KEY)
 
+    index = log_index.get(dataframe, parameters=parameters)
+    if index is not None:
+        return index.get_variants_count(), index.get_case_variant()
+
     if not (hasattr(dataframe, "attrs") and dataframe.attrs):
         # dataframe has not been initialized through format_dataframe
         dataframe = pandas_utils.insert_index(dataframe, index_key)
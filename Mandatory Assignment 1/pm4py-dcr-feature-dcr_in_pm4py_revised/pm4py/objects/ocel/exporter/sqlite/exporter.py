@@ -17,7 +17,7 @@
 
 from enum import Enum
 from pm4py.util import exec_utils
-from pm4py.objects.ocel.exporter.sqlite.variants import pandas_exporter, ocel20
+from pm4py.objects.ocel.exporter.sqlite.variants import pandas_exporter, ocel20, ocel20_append
 from pm4py.objects.ocel.obj import OCEL
 from typing import Optional, Dict, Any
 
@@ -25,6 +25,7 @@ from typing import Optional, Dict, Any
 class Variants(Enum):
     PANDAS_EXPORTER = pandas_exporter
     OCEL20 = ocel20
+    OCEL20_APPEND = ocel20_append
 
 
 def apply(ocel: OCEL, target_path: str, variant=Variants.PANDAS_EXPORTER, parameters: Optional[Dict[Any, Any]] = None):
@@ -40,6 +41,8 @@ def apply(ocel: OCEL, target_path: str, variant=Variants.PANDAS_EXPORTER, parame
     variant
         Variant to use. Possible values:
         - Variants.PANDAS_EXPORTER => Pandas exporter
+        - Variants.OCEL20 => OCEL 2.0 relational schema
+        - Variants.OCEL20_APPEND => appends to an (existing) OCEL 2.0 relational database
     parameters
         Variant-specific parameters
     """
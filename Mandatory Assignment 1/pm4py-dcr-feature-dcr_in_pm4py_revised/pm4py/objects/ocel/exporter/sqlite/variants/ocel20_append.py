@@ -0,0 +1,340 @@
+'''
+    This file is part of PM4Py (More Info: https://pm4py.fit.fraunhofer.de).
+
+    PM4Py is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    PM4Py is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with PM4Py.  If not, see <https://www.gnu.org/licenses/>.
+'''
+import datetime
+from enum import Enum
+from typing import Optional, Dict, Any, List, Collection, Set
+
+import numpy as np
+import pandas as pd
+
+from pm4py.objects.ocel.obj import OCEL
+from pm4py.objects.ocel.util import filtering_utils
+from pm4py.objects.ocel.util import names_stripping
+from pm4py.objects.ocel.util import ocel_consistency
+from pm4py.util import exec_utils, pandas_utils
+
+
+class Parameters(Enum):
+    ENABLE_NAMES_STRIPPING = "enable_names_stripping"
+    JOURNAL_MODE = "journal_mode"
+    CREATE_INDEXES = "create_indexes"
+    BATCH_SIZE = "batch_size"
+
+
+CORE_TABLES = [
+    "CREATE TABLE IF NOT EXISTS event_map_type (ocel_type TEXT, ocel_type_map TEXT, PRIMARY KEY(ocel_type))",
+    "CREATE TABLE IF NOT EXISTS object_map_type (ocel_type TEXT, ocel_type_map TEXT, PRIMARY KEY(ocel_type))",
+    "CREATE TABLE IF NOT EXISTS event (ocel_id TEXT, ocel_type TEXT, PRIMARY KEY(ocel_id), FOREIGN KEY(ocel_type) REFERENCES event_map_type(ocel_type))",
+    "CREATE TABLE IF NOT EXISTS object (ocel_id TEXT, ocel_type TEXT, PRIMARY KEY(ocel_id), FOREIGN KEY(ocel_type) REFERENCES object_map_type(ocel_type))",
+    "CREATE TABLE IF NOT EXISTS event_object (ocel_event_id TEXT, ocel_object_id TEXT, ocel_qualifier TEXT, PRIMARY KEY(ocel_event_id, ocel_object_id, ocel_qualifier), FOREIGN KEY(ocel_event_id) REFERENCES event(ocel_id), FOREIGN KEY(ocel_object_id) REFERENCES object(ocel_id))",
+    "CREATE TABLE IF NOT EXISTS object_object (ocel_source_id TEXT, ocel_target_id TEXT, ocel_qualifier TEXT, PRIMARY KEY(ocel_source_id, ocel_target_id, ocel_qualifier), FOREIGN KEY(ocel_source_id) REFERENCES object(ocel_id), FOREIGN KEY(ocel_target_id) REFERENCES object(ocel_id))"
+]
+
+CORE_INDEXES = [
+    ("event_object", "ocel_object_id"),
+    ("object_object", "ocel_target_id")
+]
+
+# indexes which are created only when the table has no primary key (e.g., databases created by the OCEL20 variant)
+CORE_PK_INDEXES = [
+    ("event", "ocel_id"),
+    ("object", "ocel_id"),
+    ("event_object", "ocel_event_id"),
+    ("object_object", "ocel_source_id")
+]
+
+
+def _quote_identifier(name: str) -> str:
+    return "\"" + str(name).replace("\"", "\"\"") + "\""
+
+
+def _sql_type(series: pd.Series) -> str:
+    dtype = str(series.dtype)
+    if "date" in dtype or "time" in dtype:
+        return "TIMESTAMP"
+    elif "int" in dtype or "bool" in dtype:
+        return "INTEGER"
+    elif "float" in dtype:
+        return "REAL"
+    return "TEXT"
+
+
+def _to_sql_value(x):
+    if isinstance(x, datetime.datetime):
+        return str(x)
+    elif isinstance(x, np.generic):
+        return x.item()
+    return x
+
+
+def _to_records(df: pd.DataFrame) -> List[tuple]:
+    """
+    Transforms a dataframe into a list of tuples of values that can be bound by SQLite
+    (timestamps are written as strings, missing values as NULL)
+    """
+    columns = []
+    for col in df.columns:
+        series = df[col]
+        dtype = str(series.dtype)
+        mask = series.isna().to_numpy()
+        if "date" in dtype or "time" in dtype:
+            values = series.astype(str).to_numpy(dtype=object)
+        else:
+            values = series.to_numpy(dtype=object)
+            if "obj" in dtype and pd.api.types.infer_dtype(values, skipna=True) not in ("string", "empty"):
+                values = np.array([_to_sql_value(x) for x in values], dtype=object)
+        if mask.any():
+            values = values.copy()
+            values[mask] = None
+        columns.append(values)
+    return list(zip(*columns)) if columns else []
+
+
+def _executemany(curs, table: str, columns: Collection[str], records: List[tuple], batch_size: int, or_ignore: bool = False):
+    if not records:
+        return
+    query = "INSERT " + ("OR IGNORE " if or_ignore else "") + "INTO " + _quote_identifier(table) + " (" + ", ".join(
+        _quote_identifier(c) for c in columns) + ") VALUES (" + ", ".join("?" for c in columns) + ")"
+    for i in range(0, len(records), batch_size):
+        curs.executemany(query, records[i:i + batch_size])
+
+
+def _get_existing_ids(curs, table: str, ids: Collection[str], batch_size: int) -> Set[str]:
+    """
+    Gets the identifiers, among the provided ones, which are already contained in the given table
+    (using a temporary table joined with the table of the database)
+    """
+    curs.execute("CREATE TEMP TABLE IF NOT EXISTS pm4py_batch_ids (ocel_id TEXT PRIMARY KEY)")
+    curs.execute("DELETE FROM pm4py_batch_ids")
+    _executemany(curs, "pm4py_batch_ids", ["ocel_id"], [(x,) for x in ids], batch_size, or_ignore=True)
+    curs.execute("SELECT b.ocel_id FROM pm4py_batch_ids b JOIN " + table + " t ON t.ocel_id = b.ocel_id")
+    ret = {x[0] for x in curs.fetchall()}
+    curs.execute("DELETE FROM pm4py_batch_ids")
+    return ret
+
+
+def _get_existing_rows(curs, table: str, id_column: str, columns: List[str], ids: Collection[str], batch_size: int) -> Set[tuple]:
+    """
+    Gets the values of the given columns for the rows of the table having the identifier column among
+    the provided identifiers (an empty set is returned if the table does not contain the columns)
+    """
+    curs.execute("SELECT name FROM pragma_table_info(?)", (table,))
+    table_columns = {x[0] for x in curs.fetchall()}
+    if id_column not in table_columns or not table_columns.issuperset(columns):
+        return set()
+    curs.execute("DELETE FROM pm4py_batch_ids")
+    _executemany(curs, "pm4py_batch_ids", ["ocel_id"], [(x,) for x in ids], batch_size, or_ignore=True)
+    curs.execute("SELECT " + ", ".join("t." + _quote_identifier(c) for c in columns) + " FROM pm4py_batch_ids b JOIN " + _quote_identifier(table) + " t ON t." + _quote_identifier(id_column) + " = b.ocel_id")
+    ret = set(curs.fetchall())
+    curs.execute("DELETE FROM pm4py_batch_ids")
+    return ret
+
+
+def _get_type_map(curs, map_table: str, types: Collection[str], enable_names_stripping: bool) -> Dict[str, str]:
+    """
+    Gets the names of the type-specific tables of the given types, registering the new types in the mapping table
+    """
+    curs.execute("SELECT ocel_type, ocel_type_map FROM " + map_table)
+    type_map = {x[0]: x[1] for x in curs.fetchall()}
+    used = set(type_map.values())
+    new_types = []
+    for typ in types:
+        if typ not in type_map:
+            typ_red = names_stripping.apply(typ) if enable_names_stripping else typ
+            base, i = typ_red, 1
+            while typ_red in used:
+                typ_red = base + str(i)
+                i += 1
+            used.add(typ_red)
+            type_map[typ] = typ_red
+            new_types.append((typ, typ_red))
+    if new_types:
+        curs.executemany("INSERT INTO " + map_table + " (ocel_type, ocel_type_map) VALUES (?, ?)", new_types)
+    return type_map
+
+
+def _ensure_type_table(curs, table: str, df: pd.DataFrame, key_columns: List[str], parent: str, primary_key: bool):
+    """
+    Creates the type-specific table if it does not exist, otherwise adds the columns that are not contained
+    in the table
+    """
+    curs.execute("SELECT name FROM pragma_table_info(?)", (table,))
+    existing = [x[0] for x in curs.fetchall()]
+    attributes = [c for c in df.columns if c not in key_columns]
+    if not existing:
+        fields = [_quote_identifier(c) + " " + ("TIMESTAMP" if c == "ocel_time" else "TEXT") for c in key_columns]
+        fields += [_quote_identifier(c) + " " + _sql_type(df[c]) for c in attributes]
+        if primary_key:
+            fields.append("PRIMARY KEY(ocel_id)")
+        fields.append("FOREIGN KEY(ocel_id) REFERENCES " + parent + "(ocel_id)")
+        curs.execute("CREATE TABLE " + _quote_identifier(table) + " (" + ", ".join(fields) + ")")
+    else:
+        for c in key_columns + attributes:
+            if c not in existing:
+                curs.execute("ALTER TABLE " + _quote_identifier(table) + " ADD COLUMN " + _quote_identifier(c) + " " + _sql_type(df[c]))
+
+
+def apply(ocel: OCEL, file_path: str, parameters: Optional[Dict[Any, Any]] = None):
+    """
+    Appends the contents of an OCEL to an (existing or new) OCEL 2.0 SQLite database.
+
+    The events, objects, relationships and object changes are written with batched executemany inserts inside
+    a single transaction (which is rolled back if an error occurs), using WAL journaling.
+    The tables of new activities/object types are created (and registered in the type-mapping tables),
+    while the new attributes of existing types are added as columns of the type-specific tables.
+    Events and objects whose identifier is already contained in the database are not inserted again
+    (the new relationships and changes of already existing events/objects are appended), hence appending the same
+    data twice does not alter the database. The indexes are created at the end of the insertion.
+
+    Parameters
+    ---------------
+    ocel
+        Object-centric event log (containing the new data)
+    file_path
+        Path to the SQLite database
+    parameters
+        Parameters of the exporter, including:
+        - Parameters.ENABLE_NAMES_STRIPPING => strips the names of the new types in the names of the tables
+        (default: True)
+        - Parameters.JOURNAL_MODE => journal mode of the database (default: WAL)
+        - Parameters.CREATE_INDEXES => creates the indexes on the identifiers at the end of the insertion
+        (default: True)
+        - Parameters.BATCH_SIZE => number of rows inserted by every executemany call (default: 10000)
+    """
+    if parameters is None:
+        parameters = {}
+
+    enable_names_stripping = exec_utils.get_param_value(Parameters.ENABLE_NAMES_STRIPPING, parameters, True)
+    journal_mode = exec_utils.get_param_value(Parameters.JOURNAL_MODE, parameters, "WAL")
+    create_indexes = exec_utils.get_param_value(Parameters.CREATE_INDEXES, parameters, True)
+    batch_size = exec_utils.get_param_value(Parameters.BATCH_SIZE, parameters, 10000)
+
+    import sqlite3
+
+    ocel = ocel_consistency.apply(ocel, parameters=parameters)
+    ocel = filtering_utils.propagate_relations_filtering(ocel, parameters=parameters)
+
+    event_id = ocel.event_id_column
+    event_activity = ocel.event_activity
+    event_timestamp = ocel.event_timestamp
+    object_id = ocel.object_id_column
+    object_type = ocel.object_type_column
+    qualifier = ocel.qualifier
+    changed_field = ocel.changed_field
+
+    conn = sqlite3.connect(file_path, isolation_level=None)
+    if journal_mode is not None:
+        conn.execute("PRAGMA journal_mode=" + journal_mode)
+    curs = conn.cursor()
+    curs.execute("BEGIN IMMEDIATE")
+
+    try:
+        for query in CORE_TABLES:
+            curs.execute(query)
+
+        existing_events = _get_existing_ids(curs, "event", pandas_utils.format_unique(ocel.events[event_id].unique()), batch_size)
+        existing_objects = _get_existing_ids(curs, "object", pandas_utils.format_unique(ocel.objects[object_id].unique()), batch_size)
+
+        events = ocel.events[~ocel.events[event_id].isin(existing_events)]
+        objects = ocel.objects[~ocel.objects[object_id].isin(existing_objects)]
+        object_changes = ocel.object_changes
+
+        EVENTS = events[[event_id, event_activity]].drop_duplicates(subset=[event_id])
+        _executemany(curs, "event", ["ocel_id", "ocel_type"], _to_records(EVENTS), batch_size, or_ignore=True)
+
+        OBJECTS = objects[[object_id, object_type]].drop_duplicates(subset=[object_id])
+        _executemany(curs, "object", ["ocel_id", "ocel_type"], _to_records(OBJECTS), batch_size, or_ignore=True)
+
+        E2O = ocel.relations[[event_id, object_id, qualifier]]
+        if existing_events:
+            # the relationships of the existing events that are already contained in the database are not inserted again
+            existing_e2o = _get_existing_rows(curs, "event_object", "ocel_event_id", ["ocel_event_id", "ocel_object_id", "ocel_qualifier"], existing_events, batch_size)
+            if existing_e2o:
+                E2O = E2O[[k not in existing_e2o for k in _to_records(E2O)]]
+        _executemany(curs, "event_object", ["ocel_event_id", "ocel_object_id", "ocel_qualifier"], _to_records(E2O), batch_size, or_ignore=True)
+
+        if len(ocel.o2o) > 0:
+            O2O = ocel.o2o[[object_id, object_id + "_2", qualifier]]
+            existing_o2o = _get_existing_rows(curs, "object_object", "ocel_source_id", ["ocel_source_id", "ocel_target_id", "ocel_qualifier"], pandas_utils.format_unique(O2O[object_id].unique()), batch_size)
+            if existing_o2o:
+                O2O = O2O[[k not in existing_o2o for k in _to_records(O2O)]]
+            _executemany(curs, "object_object", ["ocel_source_id", "ocel_target_id", "ocel_qualifier"], _to_records(O2O), batch_size, or_ignore=True)
+
+        e_types = sorted(pandas_utils.format_unique(events[event_activity].unique()))
+        events_map = _get_type_map(curs, "event_map_type", e_types, enable_names_stripping)
+
+        for act in e_types:
+            df = events[events[event_activity] == act].dropna(how="all", axis="columns")
+            del df[event_activity]
+            df = df.rename(columns={event_id: "ocel_id", event_timestamp: "ocel_time"})
+            df = df.drop_duplicates(subset=["ocel_id"])
+            table = "event_" + events_map[act]
+            _ensure_type_table(curs, table, df, ["ocel_id", "ocel_time"], "event", True)
+            _executemany(curs, table, list(df.columns), _to_records(df), batch_size, or_ignore=True)
+
+        o_types = set(pandas_utils.format_unique(objects[object_type].unique()))
+        if object_changes is not None and len(object_changes) > 0:
+            o_types = o_types.union(pandas_utils.format_unique(object_changes[object_type].unique()))
+        o_types = sorted(o_types)
+        curs.execute("SELECT ocel_type FROM object_map_type")
+        existing_types = {x[0] for x in curs.fetchall()}
+        objects_map = _get_type_map(curs, "object_map_type", o_types, enable_names_stripping)
+
+        for ot in o_types:
+            df = objects[objects[object_type] == ot].drop(columns=[object_type]).dropna(how="all", axis="columns")
+            df = df.rename(columns={object_id: "ocel_id"})
+            df["ocel_time"] = pd.NaT
+            df["ocel_changed_field"] = None
+
+            if object_changes is not None and len(object_changes) > 0:
+                df2 = object_changes[object_changes[object_type] == ot].drop(columns=[object_type]).dropna(how="all", axis="columns")
+                if len(df2) > 0:
+                    df2 = df2.rename(columns={object_id: "ocel_id", event_timestamp: "ocel_time", changed_field: "ocel_changed_field"})
+                    if ot in existing_types:
+                        # the changes that have already been appended are not inserted again
+                        existing_changes = _get_existing_rows(curs, "object_" + objects_map[ot], "ocel_id", ["ocel_id", "ocel_time", "ocel_changed_field"], pandas_utils.format_unique(df2["ocel_id"].unique()), batch_size)
+                        if existing_changes:
+                            keys = _to_records(df2[["ocel_id", "ocel_time", "ocel_changed_field"]])
+                            df2 = df2[[k not in existing_changes for k in keys]]
+                    df = pandas_utils.concat([df, df2], axis=0)
+
+            if len(df) == 0:
+                continue
+
+            table = "object_" + objects_map[ot]
+            _ensure_type_table(curs, table, df, ["ocel_id", "ocel_time", "ocel_changed_field"], "object", False)
+            _executemany(curs, table, list(df.columns), _to_records(df), batch_size)
+
+        if create_indexes:
+            curs.execute("SELECT 'event_' || ocel_type_map FROM event_map_type")
+            tables = [x[0] for x in curs.fetchall()]
+            curs.execute("SELECT 'object_' || ocel_type_map FROM object_map_type")
+            tables += [x[0] for x in curs.fetchall()]
+            indexes = list(CORE_INDEXES)
+            for table, column in CORE_PK_INDEXES:
+                curs.execute("SELECT Count(*) FROM pragma_table_info(?) WHERE pk > 0", (table,))
+                if curs.fetchone()[0] == 0:
+                    indexes.append((table, column))
+            for table, column in indexes + [(t, "ocel_id") for t in tables]:
+                curs.execute("CREATE INDEX IF NOT EXISTS " + _quote_identifier("pm4py_idx_" + table + "_" + column) + " ON " + _quote_identifier(table) + " (" + _quote_identifier(column) + ")")
+
+        curs.execute("COMMIT")
+    except BaseException:
+        curs.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
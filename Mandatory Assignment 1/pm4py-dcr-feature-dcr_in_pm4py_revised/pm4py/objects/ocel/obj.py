@@ -79,6 +79,28 @@ class OCEL(object):
         self.object_changes = object_changes
 
         self.parameters = parameters
+        self._index = None
+
+    def get_index(self):
+        """
+        Gets the (lazily built) index of the current OCEL, containing integer-coded event/object identifiers
+        and the event-to-object and object-to-event adjacency arrays.
+
+        The index is rebuilt when the events, objects or relations tables are replaced or change their number
+        of rows. After in-place modifications of the tables, please call <THIS>.invalidate_index().
+        """
+        index = getattr(self, "_index", None)
+        if index is None or not index.is_valid(self):
+            from pm4py.objects.ocel.util import indexing
+            index = indexing.build(self)
+            self._index = index
+        return index
+
+    def invalidate_index(self):
+        """
+        Invalidates the index of the current OCEL (to be called after in-place modifications of the tables)
+        """
+        self._index = None
 
     def get_extended_table(self, ot_prefix=constants.DEFAULT_OBJECT_TYPE_PREFIX_EXTENDED) -> pd.DataFrame:
         """
@@ -17,6 +17,7 @@
 from enum import Enum
 from typing import Optional, Dict, Any
 
+import numpy as np
 import pandas as pd
 
 from pm4py.objects.ocel import constants as ocel_constants
@@ -60,6 +61,31 @@ def flatten(ocel: OCEL, ot: str, parameters: Optional[Dict[Any, Any]] = None) ->
     event_timestamp = exec_utils.get_param_value(Parameters.EVENT_TIMESTAMP, parameters,
                                                  ocel.event_timestamp)
 
+    object_columns = [xes_constants.DEFAULT_TRACEID_KEY if x == ocel.object_id_column else x for x in ocel.objects.columns]
+    object_columns = [constants.CASE_ATTRIBUTE_PREFIX + x for x in object_columns]
+
+    index = ocel.get_index()
+    type_code = index.get_type_code(ot)
+    if index.unique_events and index.unique_objects and type_code >= 0 and not set(object_columns).intersection(
+            ocel.events.columns):
+        # uses the event-to-object adjacency of the index instead of joining the tables
+        rel_rows = np.flatnonzero(index.rel_type == type_code)
+        rel_objects = index.rel_object[rel_rows]
+        rel_events = index.rel_event[rel_rows]
+        objects_rows = index.objects_rows[rel_objects]
+        keep = (objects_rows >= 0) & (index.object_type_codes[rel_objects] == type_code) & (
+                rel_events < index.no_table_events)
+        rel_rows, objects_rows, rel_events = rel_rows[keep], objects_rows[keep], rel_events[keep]
+        order = np.lexsort((rel_rows, objects_rows, rel_events))
+
+        events = ocel.events.iloc[index.events_rows[rel_events[order]]].reset_index(drop=True)
+        objects = ocel.objects.iloc[objects_rows[order]].reset_index(drop=True)
+        objects.columns = object_columns
+        events = pd.concat([events, objects], axis=1).rename(
+            columns={event_activity: xes_constants.DEFAULT_NAME_KEY, event_timestamp: xes_constants.DEFAULT_TIMESTAMP_KEY})
+
+        return events
+
     objects = ocel.objects[ocel.objects[ocel.object_type_column] == ot]
     objects = objects.rename(columns={ocel.object_id_column: xes_constants.DEFAULT_TRACEID_KEY})
     objects = objects.rename(columns={x: constants.CASE_ATTRIBUTE_PREFIX + x for x in objects.columns})
@@ -0,0 +1,200 @@
+'''
+    This file is part of PM4Py (More Info: https://pm4py.fit.fraunhofer.de).
+
+    PM4Py is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    PM4Py is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with PM4Py.  If not, see <https://www.gnu.org/licenses/>.
+'''
+from typing import Optional, Dict, Any, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+class OCELIndex(object):
+    """
+    Integer-coded index over the events, objects and event-to-object relationships of an OCEL.
+
+    - Events are coded in the order of the events table (followed by the identifiers which only appear in the
+      relations table), objects are coded grouping them by object type (objects of the i-th type have codes in
+      the range type_offsets[i] ... type_offsets[i+1]).
+    - The relationships are stored as CSR adjacency arrays in both directions (e2o_indptr/e2o_indices and
+      o2e_indptr/o2e_indices). The e2o_rel/o2e_rel arrays contain the corresponding rows of the relations table.
+      Inside each adjacency list, the order of the relations table is kept.
+
+    The index keeps a reference to the tables from which it was built; it is considered valid as long as
+    the tables of the OCEL are the same objects with the same number of rows.
+    """
+
+    def __init__(self, ocel):
+        self.events_table = ocel.events
+        self.objects_table = ocel.objects
+        self.relations_table = ocel.relations
+        self.lengths = (len(ocel.events), len(ocel.objects), len(ocel.relations))
+        self.event_id_column = ocel.event_id_column
+        self.object_id_column = ocel.object_id_column
+
+        events_eids = ocel.events[ocel.event_id_column]
+        self.unique_events = not events_eids.duplicated().any()
+        objects_oids = ocel.objects[ocel.object_id_column]
+        self.unique_objects = not objects_oids.duplicated().any()
+
+        rel_eids = ocel.relations[ocel.event_id_column]
+        rel_oids = ocel.relations[ocel.object_id_column]
+        rel_ots = ocel.relations[ocel.object_type_column]
+
+        # events
+        first_events = ~events_eids.duplicated()
+        event_ids = events_eids[first_events].to_numpy()
+        self.events_rows = np.flatnonzero(first_events.to_numpy())
+        extra_events = pd.unique(rel_eids[~rel_eids.isin(event_ids)])
+        self.no_table_events = len(event_ids)
+        self.event_ids = np.concatenate((event_ids, extra_events)).astype(object)
+        self.event_index = pd.Index(self.event_ids)
+        act_codes, activities = pd.factorize(ocel.events[ocel.event_activity][first_events], sort=True)
+        self.activities = list(activities)
+        self.event_activity_codes = np.concatenate((act_codes, np.full(len(extra_events), -1))).astype(np.int64)
+
+        # objects (grouped by object type)
+        first_objects = ~objects_oids.duplicated()
+        object_ids = objects_oids[first_objects].to_numpy()
+        object_types = ocel.objects[ocel.object_type_column][first_objects].to_numpy()
+        objects_rows = np.flatnonzero(first_objects.to_numpy())
+        extra_mask = ~rel_oids.isin(object_ids) & ~rel_oids.duplicated()
+        all_object_ids = np.concatenate((object_ids, rel_oids[extra_mask].to_numpy())).astype(object)
+        all_object_types = np.concatenate((object_types, rel_ots[extra_mask].to_numpy())).astype(object)
+        all_objects_rows = np.concatenate((objects_rows, np.full(int(extra_mask.sum()), -1))).astype(np.int64)
+        type_codes, types = pd.factorize(pd.Series(np.concatenate((all_object_types, rel_ots.to_numpy())),
+                                                   dtype=object), sort=True)
+        self.object_types = list(types)
+        type_codes_objects = type_codes[:len(all_object_ids)]
+        order = np.argsort(type_codes_objects, kind="stable")
+        self.object_ids = all_object_ids[order]
+        self.object_type_codes = type_codes_objects[order].astype(np.int64)
+        self.objects_rows = all_objects_rows[order]
+        self.object_index = pd.Index(self.object_ids)
+        self.type_offsets = np.searchsorted(self.object_type_codes, np.arange(len(self.object_types) + 1))
+
+        # relations
+        self.rel_event = self.event_index.get_indexer(rel_eids).astype(np.int64)
+        self.rel_object = self.object_index.get_indexer(rel_oids).astype(np.int64)
+        self.rel_type = type_codes[len(all_object_ids):].astype(np.int64)
+
+        self.e2o_rel = np.argsort(self.rel_event, kind="stable")
+        self.e2o_indices = self.rel_object[self.e2o_rel]
+        self.e2o_indptr = np.concatenate(([0], np.cumsum(np.bincount(self.rel_event, minlength=len(self.event_ids)))))
+
+        self.o2e_rel = np.argsort(self.rel_object, kind="stable")
+        self.o2e_indices = self.rel_event[self.o2e_rel]
+        self.o2e_indptr = np.concatenate(([0], np.cumsum(np.bincount(self.rel_object,
+                                                                     minlength=len(self.object_ids)))))
+
+    def is_valid(self, ocel) -> bool:
+        """
+        Checks if the index is still aligned with the tables of the given OCEL
+        """
+        return self.events_table is ocel.events and self.objects_table is ocel.objects and \
+            self.relations_table is ocel.relations and \
+            self.lengths == (len(ocel.events), len(ocel.objects), len(ocel.relations))
+
+    def get_type_code(self, object_type: str) -> int:
+        """
+        Gets the integer code of the given object type (-1 if the object type does not exist)
+        """
+        try:
+            return self.object_types.index(object_type)
+        except ValueError:
+            return -1
+
+    def objects_of_type(self, object_type: str) -> np.ndarray:
+        """
+        Gets the codes of the objects of the given type
+        """
+        t = self.get_type_code(object_type)
+        if t < 0:
+            return np.zeros(0, dtype=np.int64)
+        return np.arange(self.type_offsets[t], self.type_offsets[t + 1], dtype=np.int64)
+
+    def related_objects(self, event: int) -> np.ndarray:
+        """
+        Gets the codes of the objects related to the event with the given code
+        """
+        return self.e2o_indices[self.e2o_indptr[event]:self.e2o_indptr[event + 1]]
+
+    def related_events(self, obj: int) -> np.ndarray:
+        """
+        Gets the codes of the events related to the object with the given code
+        """
+        return self.o2e_indices[self.o2e_indptr[obj]:self.o2e_indptr[obj + 1]]
+
+    def __adjacency_dict(self, rel_rows: np.ndarray, keys: np.ndarray, key_ids: np.ndarray, values: pd.Series,
+                         object_type: Optional[str]) -> Dict[Any, List[Any]]:
+        if object_type is not None:
+            rel_rows = rel_rows[self.rel_type[rel_rows] == self.get_type_code(object_type)]
+        if len(rel_rows) == 0:
+            return {}
+        grouped_keys = keys[rel_rows]
+        boundaries = np.flatnonzero(grouped_keys[1:] != grouped_keys[:-1]) + 1
+        starts = np.concatenate(([0], boundaries))
+        lists = np.split(values.to_numpy()[rel_rows], boundaries)
+        return {k: v.tolist() for k, v in zip(key_ids[grouped_keys[starts]].tolist(), lists)}
+
+    def event_to_objects_dict(self, object_type: Optional[str] = None) -> Dict[Any, List[Any]]:
+        """
+        Associates each event identifier (having at least one related object, of the given type if specified)
+        to the list of related object identifiers
+        """
+        return self.__adjacency_dict(self.e2o_rel, self.rel_event, self.event_ids,
+                                     self.relations_table[self.object_id_column], object_type)
+
+    def object_to_events_dict(self, object_type: Optional[str] = None) -> Dict[Any, List[Any]]:
+        """
+        Associates each object identifier (of the given type if specified) to the list of related event identifiers
+        """
+        return self.__adjacency_dict(self.o2e_rel, self.rel_object, self.object_ids,
+                                     self.relations_table[self.event_id_column], object_type)
+
+    def directly_follows_per_object(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Gets, for every couple of events directly following each other in the lifecycle of an object
+        (according to the order of the events table), the codes of the source event, of the target event
+        and of the object. The couples are sorted by target event.
+        """
+        in_table = self.rel_event[self.e2o_rel] < self.no_table_events
+        seq = self.e2o_rel[in_table]
+        seq_events = self.rel_event[seq]
+        seq_objects = self.rel_object[seq]
+        order = np.argsort(seq_objects, kind="stable")
+        same = seq_objects[order][1:] == seq_objects[order][:-1]
+        prev = order[:-1][same]
+        cur = order[1:][same]
+        cur_order = np.argsort(cur, kind="stable")
+        prev = prev[cur_order]
+        cur = cur[cur_order]
+        return seq_events[prev], seq_events[cur], seq_objects[cur]
+
+
+def build(ocel) -> OCELIndex:
+    """
+    Builds the index of an OCEL
+
+    Parameters
+    ---------------
+    ocel
+        Object-centric event log
+
+    Returns
+    ---------------
+    index
+        OCEL index
+    """
+    return OCELIndex(ocel)
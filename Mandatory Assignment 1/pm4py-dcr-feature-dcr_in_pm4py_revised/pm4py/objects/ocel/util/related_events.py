@@ -25,8 +25,8 @@ def related_events_dct(ocel: OCEL, parameters: Optional[Dict[Any, Any]] = None)
         parameters = {}
 
     object_types = pandas_utils.format_unique(ocel.relations[ocel.object_type_column].unique())
+    index = ocel.get_index()
     dct = {}
     for ot in object_types:
-        dct[ot] = ocel.relations[ocel.relations[ocel.object_type_column] == ot].groupby(ocel.object_id_column)[ocel.event_id_column].apply(
-            list).to_dict()
+        dct[ot] = index.object_to_events_dict(ot)
     return dct
@@ -25,10 +25,10 @@ def related_objects_dct_per_type(ocel: OCEL, parameters: Optional[Dict[Any, Any]
         parameters = {}
 
     object_types = pandas_utils.format_unique(ocel.relations[ocel.object_type_column].unique())
+    index = ocel.get_index()
     dct = {}
     for ot in object_types:
-        dct[ot] = ocel.relations[ocel.relations[ocel.object_type_column] == ot].groupby(ocel.event_id_column)[ocel.object_id_column].apply(
-            list).to_dict()
+        dct[ot] = index.event_to_objects_dict(ot)
     return dct
 
 
@@ -37,7 +37,7 @@ def related_objects_dct_overall(ocel: OCEL, parameters: Optional[Dict[Any, Any]]
         parameters = {}
 
     evids = pandas_utils.format_unique(ocel.events[ocel.event_id_column].unique())
-    dct = ocel.relations.groupby(ocel.event_id_column)[ocel.object_id_column].agg(list).to_dict()
+    dct = ocel.get_index().event_to_objects_dict()
 
     for evid in evids:
         if evid not in dct:
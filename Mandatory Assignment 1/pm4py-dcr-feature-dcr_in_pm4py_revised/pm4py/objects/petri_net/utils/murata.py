@@ -15,6 +15,8 @@
     along with PM4Py.  If not, see <https://www.gnu.org/licenses/>.
 '''
 
+from scipy import sparse
+
 from pm4py.util.lp import solver
 from pm4py.objects.petri_net.utils.petri_utils import remove_place
 from copy import copy
@@ -52,72 +54,82 @@ def apply_reduction(net: PetriNet, im: Marking, fm: Marking) -> Tuple[PetriNet,
     beq = []
     bub = []
     places = sorted(list(net.places), key=lambda x: x.name)
+    places_idx = {p: i for i, p in enumerate(places)}
+    num_variables = len(net.places) + 1
     redundant = set()
     for place in places:
+        # the constraints are accumulated (in sparse form) over the places
+        rows_eq = []
+        rows_ub = []
+
         # first constraint
-        constraint = [0] * (len(net.places) + 1)
+        constraint = [0] * num_variables
         for p2 in im:
             if p2 not in redundant:
                 if p2 == place:
-                    constraint[places.index(p2)] = im[p2]
+                    constraint[places_idx[p2]] = im[p2]
                 else:
-                    constraint[places.index(p2)] = -im[p2]
+                    constraint[places_idx[p2]] = -im[p2]
         constraint[-1] = -1
-        Aeq.append(constraint)
+        rows_eq.append(constraint)
         beq.append(0)
 
         # second constraints
         for trans in net.transitions:
-            constraint = [0] * (len(net.places) + 1)
+            constraint = [0] * num_variables
 
             for arc in trans.in_arcs:
                 p2 = arc.source
                 if p2 not in redundant:
                     if p2 == place:
-                        constraint[places.index(p2)] = arc.weight
+                        constraint[places_idx[p2]] = arc.weight
                     else:
-                        constraint[places.index(p2)] = -arc.weight
+                        constraint[places_idx[p2]] = -arc.weight
             constraint[-1] = -1
-            Aub.append(constraint)
+            rows_ub.append(constraint)
             bub.append(0)
 
         # third constraints
         for trans in net.transitions:
-            constraint = [0] * (len(net.places) + 1)
+            constraint = [0] * num_variables
 
             for arc in trans.out_arcs:
                 p2 = arc.target
                 if p2 not in redundant:
                     if p2 == place:
-                        constraint[places.index(p2)] = -arc.weight
+                        constraint[places_idx[p2]] = -arc.weight
                     else:
-                        constraint[places.index(p2)] = arc.weight
-            Aub.append(constraint)
+                        constraint[places_idx[p2]] = arc.weight
+            rows_ub.append(constraint)
             bub.append(0)
 
         # fourth constraint
         for p2 in net.places:
             if p2 not in redundant:
-                constraint = [0] * (len(net.places) + 1)
+                constraint = [0] * num_variables
 
-                constraint[places.index(p2)] = -1
+                constraint[places_idx[p2]] = -1
 
-                Aub.append(constraint)
+                rows_ub.append(constraint)
                 if p2 == place:
                     bub.append(-1)
                 else:
                     bub.append(0)
 
         # fifth constraint
-        constraint = [0] * (len(net.places) + 1)
+        constraint = [0] * num_variables
         constraint[-1] = -1
-        Aub.append(constraint)
+        rows_ub.append(constraint)
         bub.append(0)
 
-        c = [1] * (len(net.places) + 1)
-        integrality = [1] * (len(net.places) + 1)
+        Aeq.append(sparse.csr_matrix(rows_eq))
+        Aub.append(sparse.csr_matrix(rows_ub))
+
+        c = [1] * num_variables
+        integrality = [1] * num_variables
 
-        xx = solver.apply(c, Aub, bub, Aeq, beq, variant=solver.SCIPY, parameters={"integrality": integrality})
+        xx = solver.apply(c, sparse.vstack(Aub, format="csr"), bub, sparse.vstack(Aeq, format="csr"), beq,
+                          variant=solver.SCIPY, parameters={"integrality": integrality})
         if xx.success:
             redundant.add(place)
 
@@ -376,7 +376,11 @@ def read_ocel2_sqlite(file_path: str, variant_str: Optional[str] = None, encodin
         raise Exception("File does not exist")
 
     from pm4py.objects.ocel.importer.sqlite import importer as sqlite_importer
-    return sqlite_importer.apply(file_path, variant=sqlite_importer.Variants.OCEL20, parameters={"encoding": encoding})
+    variant = sqlite_importer.Variants.OCEL20
+    if variant_str == "ocel20_bulk":
+        variant = sqlite_importer.Variants.OCEL20_BULK
+
+    return sqlite_importer.apply(file_path, variant=variant, parameters={"encoding": encoding})
 
 
 def read_ocel2_xml(file_path: str, variant_str: Optional[str] = None, encoding: str = constants.DEFAULT_ENCODING) -> OCEL:
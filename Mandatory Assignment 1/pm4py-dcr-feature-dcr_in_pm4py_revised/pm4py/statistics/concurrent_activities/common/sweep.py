@@ -0,0 +1,84 @@
+'''
+    This file is part of PM4Py (More Info: https://pm4py.fit.fraunhofer.de).
+
+    PM4Py is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    PM4Py is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with PM4Py.  If not, see <https://www.gnu.org/licenses/>.
+'''
+from typing import Tuple
+
+import numpy as np
+
+
+def get_concurrent_couples(cases: np.ndarray, start_timestamps: np.ndarray, complete_timestamps: np.ndarray,
+                           strict: bool = False, stop_at_first_invalid: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Gets the couples of concurrent events (of the same case) with a sweep line on the start timestamps.
+
+    The events should be sorted by case and, inside a case, by start timestamp. Since the events of a case are sorted,
+    an event is concurrent to the events that follow it and start before its completion: these are found, for all
+    the events at once, with a binary search on the (case, start timestamp) keys, and only the couples of concurrent
+    events are enumerated.
+
+    Parameters
+    ---------------
+    cases
+        Integer codes of the cases of the events (non-decreasing)
+    start_timestamps
+        Start timestamps of the events
+    complete_timestamps
+        Complete timestamps of the events
+    strict
+        Gets only the couples that are strictly concurrent (i.e. the length of the intersection as real interval
+        is > 0)
+    stop_at_first_invalid
+        Stops the sweep of an event at the first following event starting after its completion (instead of just
+        discarding such events)
+
+    Returns
+    ---------------
+    first_events
+        Positions of the first events of the couples
+    second_events
+        Positions of the second events of the couples (following the first events)
+    """
+    num_events = len(cases)
+    if num_events == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+    # ranks of the timestamps, to compare them as integers
+    _, ranks = np.unique(np.concatenate([start_timestamps, complete_timestamps]), return_inverse=True)
+    ranks = ranks.ravel().astype(np.int64)
+    start_ranks = ranks[:num_events]
+    complete_ranks = ranks[num_events:]
+    width = len(ranks) + 1
+    cases = np.asarray(cases, dtype=np.int64)
+    start_keys = cases * width + start_ranks
+    complete_keys = cases * width + complete_ranks
+
+    positions = np.arange(num_events, dtype=np.int64)
+    invalid = start_ranks > complete_ranks
+    ends = np.searchsorted(start_keys, complete_keys, side="right")
+    if stop_at_first_invalid:
+        next_invalid = np.minimum.accumulate(np.where(invalid, positions, num_events)[::-1])[::-1]
+        ends = np.minimum(ends, np.append(next_invalid[1:], num_events))
+    counts = np.maximum(ends - positions - 1, 0)
+
+    first_events = np.repeat(positions, counts)
+    offsets = np.arange(len(first_events), dtype=np.int64) - np.repeat(np.cumsum(counts) - counts, counts)
+    second_events = first_events + 1 + offsets
+
+    keep = ~invalid[second_events]
+    if strict:
+        keep = keep & (start_ranks[second_events] < complete_ranks[first_events]) & (
+                start_ranks[second_events] < complete_ranks[second_events])
+    return first_events[keep], second_events[keep]
@@ -16,8 +16,11 @@
 '''
 from enum import Enum
 
+import numpy as np
+
 from pm4py.objects.conversion.log import converter
 from pm4py.objects.log.util import sorting
+from pm4py.statistics.concurrent_activities.common import sweep
 from pm4py.util import exec_utils, constants, xes_constants
 from typing import Optional, Dict, Any, Union, Tuple
 from pm4py.objects.log.obj import EventLog
@@ -64,29 +67,36 @@ def apply(interval_log: EventLog, parameters: Optional[Dict[Union[str, Parameter
                                                      xes_constants.DEFAULT_TIMESTAMP_KEY)
     strict = exec_utils.get_param_value(Parameters.STRICT, parameters, False)
 
+    cases = []
+    activities = []
+    start_timestamps = []
+    complete_timestamps = []
+    for index, trace in enumerate(interval_log):
+        for event in sorting.sort_timestamp_trace(trace, start_timestamp_key):
+            cases.append(index)
+            activities.append(event[activity_key])
+            start_timestamps.append(event[start_timestamp_key])
+            complete_timestamps.append(event[timestamp_key])
+
+    first_events, second_events = sweep.get_concurrent_couples(
+        np.array(cases, dtype=np.int64), np.fromiter(start_timestamps, dtype=object, count=len(start_timestamps)),
+        np.fromiter(complete_timestamps, dtype=object, count=len(complete_timestamps)), strict=strict,
+        stop_at_first_invalid=True)
+
+    # the codes of the activities follow their sorting, to avoid getting two entries for the same set of
+    # concurrent activities
+    labels = sorted(set(activities))
+    lookup = {act: i for i, act in enumerate(labels)}
+    codes = np.array([lookup[act] for act in activities], dtype=np.int64)
+    codes1 = codes[first_events]
+    codes2 = codes[second_events]
+    keys = np.minimum(codes1, codes2) * len(labels) + np.maximum(codes1, codes2)
+    _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+    counts = np.bincount(inverse.ravel(), minlength=len(first))
+    order = np.argsort(first, kind="stable")
+
     ret_dict = {}
-    for trace in interval_log:
-        sorted_trace = sorting.sort_timestamp_trace(trace, start_timestamp_key)
-        i = 0
-        while i < len(sorted_trace):
-            act1 = sorted_trace[i][activity_key]
-            ts1 = sorted_trace[i][start_timestamp_key]
-            tc1 = sorted_trace[i][timestamp_key]
-            j = i + 1
-            while j < len(sorted_trace):
-                ts2 = sorted_trace[j][start_timestamp_key]
-                tc2 = sorted_trace[j][timestamp_key]
-                act2 = sorted_trace[j][activity_key]
-                if max(ts1, ts2) <= min(tc1, tc2):
-                    if not strict or max(ts1, ts2) < min(tc1, tc2):
-                        # avoid getting two entries for the same set of concurrent activities
-                        tup = tuple(sorted((act1, act2)))
-                        if tup not in ret_dict:
-                            ret_dict[tup] = 0
-                        ret_dict[tup] = ret_dict[tup] + 1
-                else:
-                    break
-                j = j + 1
-            i = i + 1
+    for key, count in zip(keys[first[order]].tolist(), counts[order].tolist()):
+        ret_dict[(labels[key // len(labels)], labels[key % len(labels)])] = count
 
     return ret_dict
@@ -16,9 +16,10 @@
 '''
 from enum import Enum
 
-from pm4py.algo.discovery.dfg.adapters.pandas.df_statistics import get_concurrent_events_dataframe
+from pm4py.statistics.concurrent_activities.common import sweep
 from pm4py.util import exec_utils, constants, xes_constants
 from typing import Optional, Dict, Any, Union, Tuple
+import numpy as np
 import pandas as pd
 
 
@@ -63,18 +64,25 @@ def apply(dataframe: pd.DataFrame, parameters: Optional[Dict[Union[str, Paramete
     start_timestamp_key = exec_utils.get_param_value(Parameters.START_TIMESTAMP_KEY, parameters, None)
     strict = exec_utils.get_param_value(Parameters.STRICT, parameters, False)
 
-    concurrent_dataframe = get_concurrent_events_dataframe(dataframe, start_timestamp_key=start_timestamp_key,
-                                                           timestamp_key=timestamp_key, case_id_glue=case_id_glue,
-                                                           activity_key=activity_key, strict=strict)
+    if start_timestamp_key is None:
+        start_timestamp_key = timestamp_key
 
-    ret_dict0 = concurrent_dataframe.groupby([activity_key, activity_key + '_2']).size().to_dict()
+    columns = list(dict.fromkeys([case_id_glue, activity_key, start_timestamp_key, timestamp_key]))
+    dataframe = dataframe[columns].sort_values([case_id_glue, start_timestamp_key, timestamp_key]).dropna()
+
+    first_events, second_events = sweep.get_concurrent_couples(pd.factorize(dataframe[case_id_glue])[0],
+                                                               dataframe[start_timestamp_key].values,
+                                                               dataframe[timestamp_key].values, strict=strict)
+
+    labels, codes = np.unique(dataframe[activity_key].to_numpy(), return_inverse=True)
+    codes = codes.ravel()
+    keys, counts = np.unique(codes[first_events] * len(labels) + codes[second_events], return_counts=True)
     ret_dict = {}
 
     # assure to avoid problems with np.float64, by using the Python float type
-    for el in ret_dict0:
+    for key, count in zip(keys.tolist(), counts.tolist()):
         # avoid getting two entries for the same set of concurrent activities
-        el2 = tuple(sorted(el))
-        ret_dict[el2] = int(ret_dict0[el])
+        el2 = tuple(sorted((labels[key // len(labels)], labels[key % len(labels)])))
+        ret_dict[el2] = int(count)
 
     return ret_dict
-
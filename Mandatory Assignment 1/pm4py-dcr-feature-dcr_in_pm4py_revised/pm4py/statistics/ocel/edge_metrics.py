@@ -181,6 +181,33 @@ def aggregate_total_objects(edges: Dict[str, Dict[Tuple[str, str], Collection[An
     return ret
 
 
+def __find_associations_per_edge_from_index(index) -> Dict[str, Dict[Tuple[str, str], Collection[Any]]]:
+    """
+    Finds all the occurrences of the edges from the directly-follows couples of events in the
+    lifecycle of the objects, as stored in the index of the OCEL.
+    """
+    prev, cur, objs = index.directly_follows_per_object()
+    no_acts = len(index.activities)
+    keys = (index.object_type_codes[objs] * no_acts + index.event_activity_codes[prev]) * no_acts + \
+           index.event_activity_codes[cur]
+    order = np.argsort(keys, kind="stable")
+    keys = keys[order]
+    triples = list(zip(index.event_ids[prev[order]].tolist(), index.event_ids[cur[order]].tolist(),
+                       index.object_ids[objs[order]].tolist()))
+
+    edges = {}
+    boundaries = np.concatenate(([0], np.flatnonzero(keys[1:] != keys[:-1]) + 1, [len(keys)]))
+    for i in range(len(boundaries) - 1):
+        key = int(keys[boundaries[i]])
+        objtype = index.object_types[key // (no_acts * no_acts)]
+        acttup = (index.activities[(key // no_acts) % no_acts], index.activities[key % no_acts])
+        if objtype not in edges:
+            edges[objtype] = {}
+        edges[objtype][acttup] = triples[boundaries[i]:boundaries[i + 1]]
+
+    return edges
+
+
 def find_associations_per_edge(ocel: OCEL, parameters: Optional[Dict[Any, Any]] = None) -> Dict[
     str, Dict[Tuple[str, str], Collection[Any]]]:
     """
@@ -211,6 +238,12 @@ def find_associations_per_edge(ocel: OCEL, parameters: Optional[Dict[Any, Any]]
     object_id = exec_utils.get_param_value(Parameters.OBJECT_ID, parameters, ocel.object_id_column)
     object_type = exec_utils.get_param_value(Parameters.OBJECT_TYPE, parameters, ocel.object_type_column)
 
+    if event_activity == ocel.event_activity and event_id == ocel.event_id_column and \
+            object_id == ocel.object_id_column and object_type == ocel.object_type_column:
+        index = ocel.get_index()
+        if index.unique_events and index.unique_objects and np.all(index.objects_rows >= 0):
+            return __find_associations_per_edge_from_index(index)
+
     identifiers = ocel.events[event_id].to_numpy().tolist()
     activities = ocel.events.groupby(event_id)[event_activity].agg(list).to_dict()
     activities = {x: y[0] for x, y in activities.items()}
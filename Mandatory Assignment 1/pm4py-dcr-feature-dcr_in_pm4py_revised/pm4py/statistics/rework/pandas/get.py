@@ -20,6 +20,7 @@ from typing import Optional, Dict, Any, Union
 import pandas as pd
 
 from pm4py.util import constants, xes_constants, exec_utils
+from pm4py.objects.log.util import log_index
 
 
 class Parameters(Enum):
@@ -55,6 +56,10 @@ def apply(df: pd.DataFrame, parameters: Optional[Dict[Union[str, Parameters], An
     activity_key = exec_utils.get_param_value(Parameters.ACTIVITY_KEY, parameters, xes_constants.DEFAULT_NAME_KEY)
     case_id_key = exec_utils.get_param_value(Parameters.CASE_ID_KEY, parameters, constants.CASE_CONCEPT_NAME)
 
+    index = log_index.get(df, parameters=parameters)
+    if index is not None:
+        return index.get_rework_cases_per_activity()
+
     df = df.copy()
     df = df[list({activity_key, case_id_key})]
     df[INT_CASE_ACT_SIZE] = df.groupby([activity_key, case_id_key]).cumcount()
@@ -18,7 +18,7 @@ import pandas as pd
 from enum import Enum
 
 from pm4py.util import exec_utils, constants, xes_constants, pandas_utils
-from pm4py.util.business_hours import soj_time_business_hours_diff
+from pm4py.util.business_hours import BusinessCalendar
 from typing import Optional, Dict, Any, Union
 
 
@@ -83,8 +83,7 @@ def apply(dataframe: pd.DataFrame, parameters: Optional[Dict[Union[str, Paramete
                                                      parameters, "mean")
 
     if business_hours:
-        dataframe[DIFF_KEY] = dataframe.apply(
-            lambda x: soj_time_business_hours_diff(x[start_timestamp_key], x[timestamp_key], business_hours_slots, workcalendar), axis=1)
+        dataframe[DIFF_KEY] = BusinessCalendar(business_hours_slots, workcalendar).get_seconds(dataframe[start_timestamp_key], dataframe[timestamp_key])
     else:
         dataframe[DIFF_KEY] = pandas_utils.get_total_seconds(dataframe[timestamp_key] - dataframe[start_timestamp_key])
 
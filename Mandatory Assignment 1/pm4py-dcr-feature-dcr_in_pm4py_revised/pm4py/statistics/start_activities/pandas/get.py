@@ -18,6 +18,7 @@ from pm4py.util.constants import CASE_CONCEPT_NAME
 from pm4py.util.xes_constants import DEFAULT_NAME_KEY
 from pm4py.util.constants import GROUPED_DATAFRAME
 from pm4py.util import exec_utils
+from pm4py.objects.log.util import log_index
 from pm4py.util import constants
 from enum import Enum
 from typing import Optional, Dict, Any, Union
@@ -59,6 +60,11 @@ def get_start_activities(df: pd.DataFrame, parameters: Optional[Dict[Union[str,
     case_id_glue = exec_utils.get_param_value(Parameters.CASE_ID_KEY, parameters, CASE_CONCEPT_NAME)
     activity_key = exec_utils.get_param_value(Parameters.ACTIVITY_KEY, parameters, DEFAULT_NAME_KEY)
 
+    if GROUPED_DATAFRAME not in parameters:
+        index = log_index.get(df, parameters=parameters)
+        if index is not None:
+            return index.get_start_activities()
+
     grouped_df = parameters[GROUPED_DATAFRAME] if GROUPED_DATAFRAME in parameters else df.groupby(case_id_glue, sort=False)
 
     startact_dict = dict(Counter(grouped_df[activity_key].first().to_numpy().tolist()))
@@ -22,7 +22,7 @@ import pandas as pd
 from pm4py.statistics.traces.generic.common import case_duration as case_duration_commons
 from pm4py.util import exec_utils, constants, pandas_utils
 from pm4py.util import xes_constants as xes
-from pm4py.util.business_hours import soj_time_business_hours_diff
+from pm4py.util.business_hours import BusinessCalendar
 from pm4py.util.constants import CASE_CONCEPT_NAME
 from pm4py.util.xes_constants import DEFAULT_TIMESTAMP_KEY
 from collections import Counter
@@ -187,8 +187,7 @@ def get_cases_description(df: pd.DataFrame, parameters: Optional[Dict[Union[str,
         del stacked_df[case_id_glue + "_2"]
 
     if business_hours:
-        stacked_df['caseDuration'] = stacked_df.apply(
-            lambda x: soj_time_business_hours_diff(x[start_timestamp_key], x[timestamp_key + "_2"], business_hours_slots, workcalendar), axis=1)
+        stacked_df['caseDuration'] = BusinessCalendar(business_hours_slots, workcalendar).get_seconds(stacked_df[start_timestamp_key], stacked_df[timestamp_key + "_2"])
     else:
         stacked_df['caseDuration'] = stacked_df[timestamp_key + "_2"] - stacked_df[start_timestamp_key]
         stacked_df['caseDuration'] = pandas_utils.get_total_seconds(stacked_df['caseDuration'])
@@ -288,8 +287,7 @@ def get_variants_df_with_case_duration(df, parameters=None):
     stacked_df['caseDuration'] = stacked_df[timestamp_key + "_2"] - stacked_df[timestamp_key]
     stacked_df['caseDuration'] = pandas_utils.get_total_seconds(stacked_df['caseDuration'])
     if business_hours:
-        stacked_df['caseDuration'] = stacked_df.apply(
-            lambda x: soj_time_business_hours_diff(x[timestamp_key], x[timestamp_key + "_2"], business_hours_slots, workcalendar), axis=1)
+        stacked_df['caseDuration'] = BusinessCalendar(business_hours_slots, workcalendar).get_seconds(stacked_df[timestamp_key], stacked_df[timestamp_key + "_2"])
     else:
         stacked_df['caseDuration'] = stacked_df[timestamp_key + "_2"] - stacked_df[timestamp_key]
         stacked_df['caseDuration'] = pandas_utils.get_total_seconds(stacked_df['caseDuration'])
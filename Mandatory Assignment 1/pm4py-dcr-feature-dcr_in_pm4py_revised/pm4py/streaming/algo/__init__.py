@@ -14,4 +14,4 @@
     You should have received a copy of the GNU General Public License
     along with PM4Py.  If not, see <https://www.gnu.org/licenses/>.
 '''
-from pm4py.streaming.algo import conformance, discovery, interface
\ No newline at end of file
+from pm4py.streaming.algo import conformance, discovery, interface, partitioned
\ No newline at end of file
@@ -17,6 +17,7 @@
 from pm4py.util import constants, exec_utils, xes_constants, pandas_utils
 from pm4py.streaming.util.dictio import generator
 from pm4py.streaming.algo.interface import StreamingAlgorithm
+from pm4py.streaming.util import case_eviction
 import logging
 from copy import copy
 
@@ -47,7 +48,9 @@ class FootprintsStreamingConformance(StreamingAlgorithm):
         footprints
             Footprints
         parameters
-            Parameters of the algorithm
+            Parameters of the algorithm, including the parameters of the eviction of the cases
+            (see pm4py.streaming.util.case_eviction), i.e., max_cases, case_ttl and case_end_activities:
+            the finalized cases are terminated, and their outcome is aggregated in the eviction statistics
         """
         self.footprints = footprints
         self.case_id_key = exec_utils.get_param_value(Parameters.CASE_ID_KEY, parameters, constants.CASE_CONCEPT_NAME)
@@ -58,6 +61,8 @@ class FootprintsStreamingConformance(StreamingAlgorithm):
         self.activities = footprints[ACTIVITIES]
         self.all_fps = set(footprints[SEQUENCE]).union(set(footprints[PARALLEL]))
         self.build_dictionaries(parameters=parameters)
+        self.case_eviction = case_eviction.apply(parameters)
+        self.finalized_statistics = {"fit_cases": 0}
         StreamingAlgorithm.__init__(self)
 
     def build_dictionaries(self, parameters):
@@ -100,10 +105,41 @@ class FootprintsStreamingConformance(StreamingAlgorithm):
         case = event[self.case_id_key] if self.case_id_key in event else None
         activity = event[self.activity_key] if self.activity_key in event else None
         if case is not None and activity is not None:
-            self.verify_footprints(self.encode_str(case), self.encode_str(activity))
+            case = self.encode_str(case)
+            activity = self.encode_str(activity)
+            self.verify_footprints(case, activity)
+            for finalized_case in self.case_eviction.update(case, activity, event):
+                self.finalize_case(finalized_case)
         else:
             self.message_case_or_activity_not_in_event(event)
 
+    def finalize_case(self, case):
+        """
+        Finalizes a case (according to the eviction policies), terminating it and
+        aggregating its outcome in the eviction statistics
+
+        Parameters
+        ---------------
+        case
+            Case
+        """
+        if case in self.case_dict.keys():
+            if self.terminate(case):
+                self.finalized_statistics["fit_cases"] += 1
+        elif case in self.dev_dict:
+            # the case did not execute any activity of the footprints
+            del self.dev_dict[case]
+
+    def get_eviction_statistics(self):
+        """
+        Gets the counters of the cases evicted/finalized according to the eviction policies,
+        along with the number of fit cases among the finalized ones
+        """
+        with self._lock:
+            ret = self.case_eviction.get_statistics()
+            ret.update(self.finalized_statistics)
+            return ret
+
     def verify_footprints(self, case, activity):
         """
         Verify the event according to the footprints
@@ -205,6 +241,7 @@ class FootprintsStreamingConformance(StreamingAlgorithm):
             num_dev = int(self.dev_dict[case])
             del self.case_dict[case]
             del self.dev_dict[case]
+            self.case_eviction.remove(case)
             if num_dev == 0:
                 return True
             else:
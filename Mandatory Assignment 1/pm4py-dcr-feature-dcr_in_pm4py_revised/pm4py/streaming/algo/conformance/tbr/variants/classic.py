@@ -16,8 +16,11 @@
 '''
 from pm4py.util import constants, exec_utils, xes_constants
 from pm4py.streaming.util.dictio import generator
+from pm4py.streaming.util.marking_codec import MarkingCodec
+from pm4py.streaming.util import case_eviction
 import logging
-from pm4py.objects.petri_net.obj import PetriNet, Marking
+import traceback
+from pm4py.objects.petri_net.obj import PetriNet
 from pm4py.streaming.algo.interface import StreamingAlgorithm
 from pm4py.objects.petri_net import semantics
 from pm4py.util import pandas_utils, nx_utils
@@ -28,6 +31,7 @@ import sys
 class Parameters:
     DICT_VARIANT = "dict_variant"
     DICT_ID = "dict_id"
+    BINARY_VALUES = "binary_values"
     CASE_DICT_ID = "case_dict_id"
     MISSING_DICT_ID = "missing_dict_id"
     REMAINING_DICT_ID = "remaining_dict_id"
@@ -49,6 +53,10 @@ class TbrStreamingConformance(StreamingAlgorithm):
             Initial marking
         fm
             Final marking
+        parameters
+            Parameters of the algorithm, including the parameters of the eviction of the cases
+            (see pm4py.streaming.util.case_eviction), i.e., max_cases, case_ttl and case_end_activities:
+            the finalized cases are terminated, and their outcome is aggregated in the eviction statistics
         """
         if parameters is None:
             parameters = {}
@@ -61,9 +69,14 @@ class TbrStreamingConformance(StreamingAlgorithm):
         self.im = im
         self.fm = fm
         self.places_inv_dict = {x.name: x for x in net.places}
+        self.marking_codec = MarkingCodec(net.places)
         self.activities = list(set(x.label for x in self.net.transitions))
         self.dictio_spaths = self.get_paths_net()
         self.build_dictionaries(parameters=parameters)
+        self.case_eviction = case_eviction.apply(parameters)
+        self.finalized_statistics = {"fit_cases": 0, "missing_tokens": 0, "remaining_tokens": 0}
+        # cases evicted during the processing of a batch, whose state is not among the ones of the batch
+        self.batch_evicted_cases = None
         StreamingAlgorithm.__init__(self)
 
     def build_dictionaries(self, parameters):
@@ -85,8 +98,10 @@ class TbrStreamingConformance(StreamingAlgorithm):
         remaining_dict_id = exec_utils.get_param_value(Parameters.REMAINING_DICT_ID, parameters, 2)
         parameters_case_dict = copy(parameters)
         parameters_case_dict[Parameters.DICT_ID] = case_dict_id
+        # the markings are stored encoded by MarkingCodec
+        parameters_case_dict[Parameters.BINARY_VALUES] = True
         parameters_missing = copy(parameters)
-        parameters_case_dict[Parameters.DICT_ID] = missing_dict_id
+        parameters_missing[Parameters.DICT_ID] = missing_dict_id
         parameters_remaining = copy(parameters)
         parameters_remaining[Parameters.DICT_ID] = remaining_dict_id
         self.case_dict = generator.apply(variant=dict_variant, parameters=parameters_case_dict)
@@ -143,10 +158,83 @@ class TbrStreamingConformance(StreamingAlgorithm):
         case = event[self.case_id_key] if self.case_id_key in event else None
         activity = event[self.activity_key] if self.activity_key in event else None
         if case is not None and activity is not None:
-            self.verify_tbr(self.encode_str(case), activity)
+            case = self.encode_str(case)
+            self.verify_tbr(case, activity)
+            for finalized_case in self.case_eviction.update(case, activity, event):
+                self.finalize_case(finalized_case)
         else:
             self.message_case_or_activity_not_in_event(event)
 
+    def finalize_case(self, case):
+        """
+        Finalizes a case (according to the eviction policies), terminating it and
+        aggregating its outcome in the eviction statistics
+
+        Parameters
+        ---------------
+        case
+            Case
+        """
+        if case in self.case_dict:
+            ret = self.terminate(case)
+            self.finalized_statistics["fit_cases"] += 1 if ret["is_fit"] else 0
+            self.finalized_statistics["missing_tokens"] += ret["missing"]
+            self.finalized_statistics["remaining_tokens"] += ret["remaining"]
+        elif self.batch_evicted_cases is not None:
+            # the case is finalized after the processing of the batch
+            self.batch_evicted_cases.append(case)
+
+    def get_eviction_statistics(self):
+        """
+        Gets the counters of the cases evicted/finalized according to the eviction policies,
+        along with the aggregated outcome of the finalized cases (number of fit cases, missing and remaining tokens)
+        """
+        with self._lock:
+            ret = self.case_eviction.get_statistics()
+            ret.update(self.finalized_statistics)
+            return ret
+
+    def _process_batch(self, events):
+        """
+        Checks a batch of events according to the TBR.
+        The state of the cases of the batch is retrieved from the dictionaries (and written back)
+        with a single batched access per dictionary. The cases of previous batches evicted
+        during the batch are finalized after the state has been written back.
+
+        Parameters
+        ---------------
+        events
+            Batch of events
+        """
+        cases = list(set(self.encode_str(event[self.case_id_key]) for event in events if self.case_id_key in event))
+        dictionaries = (self.case_dict, self.missing, self.remaining)
+        local_dictionaries = []
+        for dictio in dictionaries:
+            values = generator.get_many(dictio, cases)
+            local_dictionaries.append({c: v for c, v in zip(cases, values) if v is not None})
+        self.case_dict, self.missing, self.remaining = local_dictionaries
+        self.batch_evicted_cases = []
+        try:
+            for event in events:
+                try:
+                    self._process(event)
+                except:
+                    traceback.print_exc()
+        finally:
+            self.case_dict, self.missing, self.remaining = dictionaries
+            evicted_cases, self.batch_evicted_cases = self.batch_evicted_cases, None
+        for dictio, local_dictio in zip(dictionaries, local_dictionaries):
+            generator.set_many(dictio, local_dictio)
+        # removes the cases finalized during the batch
+        for case in cases:
+            if case not in local_dictionaries[0] and case in self.case_dict:
+                for dictio in dictionaries:
+                    del dictio[case]
+        cases = set(cases)
+        for case in evicted_cases:
+            if case not in cases:
+                self.finalize_case(case)
+
     def encode_str(self, stru):
         """
         Encodes a string for storage in generic dictionaries
@@ -156,22 +244,16 @@ class TbrStreamingConformance(StreamingAlgorithm):
     def encode_marking(self, mark):
         """
         Encodes a marking for storage in generic dictionaries
+        (compact binary encoding, see MarkingCodec)
         """
-        em = {}
-        for pl in mark:
-            em[pl.name] = mark[pl]
-        return str(em)
+        return self.marking_codec.encode(mark)
 
     def decode_marking(self, ems):
         """
         Decodes a marking from a generic dictionary
         to a Marking object
         """
-        em = eval(ems)
-        mark = Marking()
-        for p in em:
-            mark[self.places_inv_dict[p]] = em[p]
-        return mark
+        return self.marking_codec.decode(ems)
 
     def verify_tbr(self, case, activity):
         """
@@ -294,7 +376,7 @@ class TbrStreamingConformance(StreamingAlgorithm):
         if case in self.case_dict:
             remaining = 0
             if not self.decode_marking(self.case_dict[case]) == self.fm:
-                new_marking = self.reach_fm_with_invisibles(self.case_dict[case])
+                new_marking = self.reach_fm_with_invisibles(self.decode_marking(self.case_dict[case]))
                 if new_marking is None:
                     new_marking = self.decode_marking(self.case_dict[case])
                 if not new_marking == self.fm:
@@ -314,6 +396,7 @@ class TbrStreamingConformance(StreamingAlgorithm):
             del self.case_dict[case]
             del self.missing[case]
             del self.remaining[case]
+            self.case_eviction.remove(case)
             return ret
         else:
             self.message_case_not_in_dictionary(case)
@@ -23,6 +23,7 @@ from typing import Optional, Dict, Any, Tuple
 from pm4py.objects.log.obj import Event
 from pm4py.streaming.algo.interface import StreamingAlgorithm
 from pm4py.streaming.util.dictio import generator
+from pm4py.streaming.util import case_eviction
 from pm4py.util import exec_utils, constants, xes_constants
 from pm4py.util import typing
 import json
@@ -62,6 +63,9 @@ class TemporalProfileStreamingConformance(StreamingAlgorithm):
              - Parameters.DICT_VARIANT => the variant of dictionary to use
              - Parameters.CASE_DICT_ID => the identifier of the case dictionary
              - Parameters.DEV_DICT_ID => the identifier of the deviations dictionary
+             - the parameters of the eviction of the cases (see pm4py.streaming.util.case_eviction), i.e.,
+             max_cases, case_ttl and case_end_activities: the finalized cases are removed from the dictionaries,
+             and their deviations are aggregated in the eviction statistics
         """
         if parameters is None:
             parameters = {}
@@ -84,6 +88,8 @@ class TemporalProfileStreamingConformance(StreamingAlgorithm):
         dev_dict_id = exec_utils.get_param_value(Parameters.DEV_DICT_ID, parameters, 1)
         parameters_dev[Parameters.DICT_ID] = dev_dict_id
         self.deviations_dict = generator.apply(variant=dict_variant, parameters=parameters_dev)
+        self.case_eviction = case_eviction.apply(parameters)
+        self.finalized_statistics = {"deviating_cases": 0, "deviations": 0}
         StreamingAlgorithm.__init__(self)
 
     def _process(self, event: Event):
@@ -110,6 +116,35 @@ class TemporalProfileStreamingConformance(StreamingAlgorithm):
             this_case = json.loads(self.case_dictionary[case])
             this_case.append(ev_red)
             self.case_dictionary[case] = json.dumps(this_case)
+            for finalized_case in self.case_eviction.update(case, activity, event):
+                self.finalize_case(finalized_case)
+
+    def finalize_case(self, case: str):
+        """
+        Finalizes a case (according to the eviction policies), removing it from the dictionaries
+        and aggregating its deviations in the eviction statistics
+
+        Parameters
+        ---------------
+        case
+            Case
+        """
+        deviations = json.loads(self.deviations_dict[case])
+        if deviations:
+            self.finalized_statistics["deviating_cases"] += 1
+            self.finalized_statistics["deviations"] += len(deviations)
+        del self.case_dictionary[case]
+        del self.deviations_dict[case]
+
+    def get_eviction_statistics(self) -> Dict[str, int]:
+        """
+        Gets the counters of the cases evicted/finalized according to the eviction policies,
+        along with the aggregated deviations of the finalized cases
+        """
+        with self._lock:
+            ret = self.case_eviction.get_statistics()
+            ret.update(self.finalized_statistics)
+            return ret
 
     def check_conformance(self, event: Tuple[str, float, float, str]):
         """
@@ -14,13 +14,14 @@
     You should have received a copy of the GNU General Public License
     along with PM4Py.  If not, see <https://www.gnu.org/licenses/>.
 '''
-from pm4py.streaming.algo.discovery.dfg.variants import frequency
+from pm4py.streaming.algo.discovery.dfg.variants import frequency, windowed
 from enum import Enum
 from pm4py.util import exec_utils
 
 
 class Variants(Enum):
     FREQUENCY = frequency
+    WINDOWED = windowed
 
 
 DEFAULT_VARIANT = Variants.FREQUENCY
@@ -33,7 +34,9 @@ def apply(variant=DEFAULT_VARIANT, parameters=None):
     Parameters
     --------------
     variant
-        Variant of the algorithm (default: Variants.FREQUENCY)
+        Variant of the algorithm (default: Variants.FREQUENCY), possible values:
+            - Variants.FREQUENCY: all-time frequency DFG
+            - Variants.WINDOWED: frequency and performance DFG over tumbling/sliding event-time windows
 
     Returns
     --------------
@@ -17,6 +17,7 @@
 from collections import Counter
 from pm4py.util import exec_utils, constants, xes_constants
 from pm4py.streaming.util.dictio import generator
+from pm4py.streaming.util import case_eviction
 from pm4py.streaming.algo.interface import StreamingAlgorithm
 from enum import Enum
 from copy import copy
@@ -30,6 +31,7 @@ class Parameters(Enum):
     DFG_DICT_ID = "dfg_dict_id"
     ACT_DICT_ID = "act_dict_id"
     START_ACT_DICT_ID = "start_act_dict_id"
+    END_ACT_DICT_ID = "end_act_dict_id"
     ACTIVITY_KEY = constants.PARAMETER_CONSTANT_ACTIVITY_KEY
     CASE_ID_KEY = constants.PARAMETER_CONSTANT_CASEID_KEY
 
@@ -44,6 +46,9 @@ class StreamingDfgDiscovery(StreamingAlgorithm):
         parameters of the algorithm, including:
          - Parameters.ACTIVITY_KEY: the key of the event to use as activity
          - Parameters.CASE_ID_KEY: the key of the event to use as case identifier
+         - the parameters of the eviction of the cases (see pm4py.streaming.util.case_eviction), i.e.,
+         max_cases, case_ttl and case_end_activities: the last activity of a finalized case
+         is counted among the end activities
         """
         if parameters is None:
             parameters = {}
@@ -54,6 +59,7 @@ class StreamingDfgDiscovery(StreamingAlgorithm):
         self.case_id_key = exec_utils.get_param_value(Parameters.CASE_ID_KEY, parameters,
                                                       constants.CASE_CONCEPT_NAME)
         self.build_dictionaries(parameters)
+        self.case_eviction = case_eviction.apply(parameters)
         StreamingAlgorithm.__init__(self)
 
     def build_dictionaries(self, parameters):
@@ -70,12 +76,15 @@ class StreamingDfgDiscovery(StreamingAlgorithm):
              - Parameters.DFG_DICT_ID: identifier of the DFG dictionary (1)
              - Parameters.ACT_ID: identifier of the dictionary hosting the count of the activities (2)
              - Parameters.START_ACT_DICT_ID: identifier of the dictionary hosting the count of the start activities (3)
+             - Parameters.END_ACT_DICT_ID: identifier of the dictionary hosting the count of the end activities
+              of the finalized cases (4)
         """
         dict_variant = exec_utils.get_param_value(Parameters.DICT_VARIANT, parameters, generator.Variants.THREAD_SAFE)
         case_dict_id = exec_utils.get_param_value(Parameters.CASE_DICT_ID, parameters, 0)
         dfg_dict_id = exec_utils.get_param_value(Parameters.DFG_DICT_ID, parameters, 1)
         act_dict_id = exec_utils.get_param_value(Parameters.ACT_DICT_ID, parameters, 2)
         start_act_dict_id = exec_utils.get_param_value(Parameters.START_ACT_DICT_ID, parameters, 3)
+        end_act_dict_id = exec_utils.get_param_value(Parameters.END_ACT_DICT_ID, parameters, 4)
         parameters_case_dict = copy(parameters)
         parameters_case_dict[Parameters.DICT_ID] = case_dict_id
         parameters_dfg = copy(parameters)
@@ -84,10 +93,13 @@ class StreamingDfgDiscovery(StreamingAlgorithm):
         parameters_activities[Parameters.DICT_ID] = act_dict_id
         parameters_start_activities = copy(parameters)
         parameters_start_activities[Parameters.DICT_ID] = start_act_dict_id
+        parameters_end_activities = copy(parameters)
+        parameters_end_activities[Parameters.DICT_ID] = end_act_dict_id
         self.case_dict = generator.apply(variant=dict_variant, parameters=parameters_case_dict)
         self.dfg = generator.apply(variant=dict_variant, parameters=parameters_dfg)
         self.activities = generator.apply(variant=dict_variant, parameters=parameters_activities)
         self.start_activities = generator.apply(variant=dict_variant, parameters=parameters_start_activities)
+        self.end_activities = generator.apply(variant=dict_variant, parameters=parameters_end_activities)
 
     def event_without_activity_or_case(self, event):
         """
@@ -142,9 +154,82 @@ class StreamingDfgDiscovery(StreamingAlgorithm):
             else:
                 self.activities[activity] = int(self.activities[activity]) + 1
             self.case_dict[case] = activity
+            for finalized_case in self.case_eviction.update(case, activity, event):
+                self.finalize_case(finalized_case)
         else:
             self.event_without_activity_or_case(event)
 
+    def finalize_case(self, case):
+        """
+        Finalizes a case (counting its last activity among the end activities),
+        removing it from the case dictionary
+
+        Parameters
+        ---------------
+        case
+            Case
+        """
+        activity = self.case_dict[case]
+        del self.case_dict[case]
+        if activity not in self.end_activities:
+            self.end_activities[activity] = 1
+        else:
+            self.end_activities[activity] = int(self.end_activities[activity]) + 1
+
+    def get_eviction_statistics(self):
+        """
+        Gets the counters of the cases evicted/finalized according to the eviction policies
+        """
+        with self._lock:
+            return self.case_eviction.get_statistics()
+
+    def _process_batch(self, events):
+        """
+        Receives a batch of events from the live event stream, aggregates their counts
+        and updates the dictionaries once per key
+
+        Parameters
+        ---------------
+        events
+            Batch of events
+        """
+        last_activity = {}
+        start_activities = Counter()
+        dfg = Counter()
+        activities = Counter()
+        end_activities = Counter()
+        for event in events:
+            if self.case_id_key in event and self.activity_key in event:
+                case = self.encode_str(event[self.case_id_key])
+                activity = self.encode_str(event[self.activity_key])
+                if case in last_activity:
+                    dfg[self.encode_tuple((last_activity[case], activity))] += 1
+                elif case in self.case_dict:
+                    dfg[self.encode_tuple((self.case_dict[case], activity))] += 1
+                else:
+                    start_activities[activity] += 1
+                activities[activity] += 1
+                last_activity[case] = activity
+                for finalized_case in self.case_eviction.update(case, activity, event):
+                    if finalized_case in last_activity:
+                        end_activities[last_activity.pop(finalized_case)] += 1
+                        if finalized_case in self.case_dict:
+                            del self.case_dict[finalized_case]
+                    else:
+                        self.finalize_case(finalized_case)
+            else:
+                self.event_without_activity_or_case(event)
+
+        for dictio, counter in [(self.start_activities, start_activities), (self.dfg, dfg),
+                                (self.activities, activities), (self.end_activities, end_activities)]:
+            for key, count in counter.items():
+                if key not in dictio:
+                    dictio[key] = count
+                else:
+                    dictio[key] = int(dictio[key]) + count
+        for case, activity in last_activity.items():
+            self.case_dict[case] = activity
+
     def _current_result(self):
         """
         Gets the current state of the DFG
@@ -163,7 +248,9 @@ class StreamingDfgDiscovery(StreamingAlgorithm):
         dfg = {eval(x): int(self.dfg[x]) for x in self.dfg}
         activities = {x: int(self.activities[x]) for x in self.activities}
         start_activities = {x: int(self.start_activities[x]) for x in self.start_activities}
-        end_activities = dict(Counter(self.case_dict[x] for x in self.case_dict))
+        end_activities = Counter({x: int(self.end_activities[x]) for x in self.end_activities})
+        end_activities.update(self.case_dict[x] for x in self.case_dict)
+        end_activities = dict(end_activities)
         return dfg, activities, start_activities, end_activities
 
 
@@ -0,0 +1,300 @@
+'''
+    This file is part of PM4Py (More Info: https://pm4py.fit.fraunhofer.de).
+
+    PM4Py is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    PM4Py is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with PM4Py.  If not, see <https://www.gnu.org/licenses/>.
+'''
+import logging
+import math
+from collections import Counter
+from enum import Enum
+from typing import Optional, Dict, Any, Tuple
+
+from pm4py.streaming.algo.interface import StreamingAlgorithm
+from pm4py.streaming.util import case_eviction
+from pm4py.streaming.util.quantile_sketch import QuantileSketch
+from pm4py.util import exec_utils, constants, xes_constants
+
+
+class Parameters(Enum):
+    ACTIVITY_KEY = constants.PARAMETER_CONSTANT_ACTIVITY_KEY
+    CASE_ID_KEY = constants.PARAMETER_CONSTANT_CASEID_KEY
+    TIMESTAMP_KEY = constants.PARAMETER_CONSTANT_TIMESTAMP_KEY
+    START_TIMESTAMP_KEY = constants.PARAMETER_CONSTANT_START_TIMESTAMP_KEY
+    WINDOW_SIZE = "window_size"
+    SLIDE = "slide"
+    QUANTILES = "quantiles"
+    RELATIVE_ACCURACY = "relative_accuracy"
+
+
+class WindowSlot(object):
+    """
+    Statistics of the events having their timestamp in a slot (of 'slide' seconds) of the window
+    """
+
+    def __init__(self, epoch: int):
+        self.epoch = epoch
+        self.dfg = Counter()
+        self.activities = Counter()
+        self.start_activities = Counter()
+        self.end_activities = Counter()
+        # for every directly-follows relation: [count, sum, min, max, sketch] of the durations
+        self.performance = {}
+
+
+class WindowedStreamingDfgDiscovery(StreamingAlgorithm):
+    def __init__(self, parameters: Optional[Dict[Any, Any]] = None):
+        """
+        Initialize the windowed streaming DFG discovery.
+
+        The event time is split in slots of 'slide' seconds, and the statistics of every slot (integer-coded
+        frequency of the directly-follows relations, activities, start/end activities, and count/sum/min/max and
+        quantile sketch of the durations of the directly-follows relations) are kept in a ring buffer containing
+        the slots of the last 'window_size' seconds. When the slide is equal to the window size (default), the
+        windows are tumbling; when it is smaller, the window slides by one slot at a time.
+        The current result is obtained merging the slots of the current window, hence it does not
+        depend on the number of events received.
+
+        A directly-follows relation (and the duration between the timestamp of the source event and the
+        start timestamp of the target event) is assigned to the slot of the target event. Events older than the
+        current window are not counted (late events), although they update the state of their case.
+
+        Parameters
+        ---------------
+        parameters
+            Parameters of the algorithm, including:
+            - Parameters.ACTIVITY_KEY => the key of the event to use as activity
+            - Parameters.CASE_ID_KEY => the key of the event to use as case identifier
+            - Parameters.TIMESTAMP_KEY => the key of the event to use as timestamp
+            - Parameters.START_TIMESTAMP_KEY => the key of the event to use as start timestamp (default: the timestamp)
+            - Parameters.WINDOW_SIZE => size of the window, in seconds (default: 900)
+            - Parameters.SLIDE => size of a slot of the window, in seconds (default: the window size)
+            - Parameters.QUANTILES => quantiles of the durations to estimate, besides the median (default: (0.9, 0.99))
+            - Parameters.RELATIVE_ACCURACY => relative accuracy of the quantile sketches (default: 0.01)
+            - the parameters of the eviction of the cases (see pm4py.streaming.util.case_eviction), i.e.,
+            max_cases, case_ttl and case_end_activities: the last activity of a finalized case is counted among the
+            end activities of the slot of its last event
+        """
+        if parameters is None:
+            parameters = {}
+
+        self.activity_key = exec_utils.get_param_value(Parameters.ACTIVITY_KEY, parameters,
+                                                       xes_constants.DEFAULT_NAME_KEY)
+        self.case_id_key = exec_utils.get_param_value(Parameters.CASE_ID_KEY, parameters, constants.CASE_CONCEPT_NAME)
+        self.timestamp_key = exec_utils.get_param_value(Parameters.TIMESTAMP_KEY, parameters,
+                                                        xes_constants.DEFAULT_TIMESTAMP_KEY)
+        self.start_timestamp_key = exec_utils.get_param_value(Parameters.START_TIMESTAMP_KEY, parameters,
+                                                              self.timestamp_key)
+        self.window_size = exec_utils.get_param_value(Parameters.WINDOW_SIZE, parameters, 900)
+        self.slide = exec_utils.get_param_value(Parameters.SLIDE, parameters, self.window_size)
+        self.quantiles = exec_utils.get_param_value(Parameters.QUANTILES, parameters, (0.9, 0.99))
+        self.relative_accuracy = exec_utils.get_param_value(Parameters.RELATIVE_ACCURACY, parameters, 0.01)
+        self.num_slots = max(1, int(math.ceil(self.window_size / self.slide)))
+        self.slots = [None] * self.num_slots
+        self.current_epoch = None
+        self.late_events = 0
+        self.activities_codes = {}
+        self.activities_labels = []
+        # for every open case: (code of the last activity, timestamp of the last event)
+        self.last_event = {}
+        self.case_eviction = case_eviction.apply(parameters)
+        StreamingAlgorithm.__init__(self)
+
+    def __get_timestamp(self, value) -> float:
+        return value.timestamp() if hasattr(value, "timestamp") else float(value)
+
+    def __get_activity_code(self, activity) -> int:
+        code = self.activities_codes.get(activity)
+        if code is None:
+            code = len(self.activities_labels)
+            self.activities_codes[activity] = code
+            self.activities_labels.append(activity)
+        return code
+
+    def __get_slot(self, epoch: int) -> Optional[WindowSlot]:
+        """
+        Gets the slot of the ring buffer associated to the given epoch (None if the epoch is older than the window)
+        """
+        if self.current_epoch is None or epoch > self.current_epoch:
+            self.current_epoch = epoch
+        elif epoch <= self.current_epoch - self.num_slots:
+            return None
+        idx = epoch % self.num_slots
+        slot = self.slots[idx]
+        if slot is None or slot.epoch != epoch:
+            slot = WindowSlot(epoch)
+            self.slots[idx] = slot
+        return slot
+
+    def event_without_activity_or_case(self, event):
+        """
+        Print an error message when an event is without the
+        activity, the case identifier or the timestamp
+
+        Parameters
+        ----------------
+        event
+            Event
+        """
+        logging.warning("event without activity, case or timestamp: " + str(event))
+
+    def _process(self, event):
+        """
+        Receives an event from the live event stream,
+        and updates the slot of the window associated to its timestamp
+
+        Parameters
+        ---------------
+        event
+            Event
+        """
+        if self.case_id_key not in event or self.activity_key not in event or self.timestamp_key not in event:
+            self.event_without_activity_or_case(event)
+            return
+        case = event[self.case_id_key]
+        activity = event[self.activity_key]
+        timestamp = self.__get_timestamp(event[self.timestamp_key])
+        start_timestamp = self.__get_timestamp(event[self.start_timestamp_key]) \
+            if self.start_timestamp_key in event else timestamp
+        code = self.__get_activity_code(activity)
+        prev = self.last_event.get(case)
+
+        slot = self.__get_slot(int(timestamp // self.slide))
+        if slot is not None:
+            slot.activities[code] += 1
+            if prev is None:
+                slot.start_activities[code] += 1
+            else:
+                df = (prev[0], code)
+                slot.dfg[df] += 1
+                duration = max(0.0, start_timestamp - prev[1])
+                perf = slot.performance.get(df)
+                if perf is None:
+                    perf = [0, 0.0, duration, duration, QuantileSketch(self.relative_accuracy)]
+                    slot.performance[df] = perf
+                perf[0] += 1
+                perf[1] += duration
+                perf[2] = min(perf[2], duration)
+                perf[3] = max(perf[3], duration)
+                perf[4].add(duration)
+        else:
+            self.late_events += 1
+        self.last_event[case] = (code, timestamp)
+
+        for finalized_case in self.case_eviction.update(case, activity, event):
+            self.finalize_case(finalized_case)
+
+    def finalize_case(self, case):
+        """
+        Finalizes a case (according to the eviction policies), counting its last activity among the end activities
+        of the slot of its last event
+
+        Parameters
+        ---------------
+        case
+            Case
+        """
+        code, timestamp = self.last_event.pop(case)
+        slot = self.__get_slot(int(timestamp // self.slide))
+        if slot is not None:
+            slot.end_activities[code] += 1
+
+    def get_window_bounds(self) -> Tuple[float, float]:
+        """
+        Gets the bounds (as POSIX timestamps) of the current window
+        """
+        with self._lock:
+            if self.current_epoch is None:
+                return None
+            return (self.current_epoch - self.num_slots + 1) * self.slide, (self.current_epoch + 1) * self.slide
+
+    def get_eviction_statistics(self) -> Dict[str, int]:
+        """
+        Gets the counters of the cases evicted/finalized according to the eviction policies,
+        along with the number of late events
+        """
+        with self._lock:
+            ret = self.case_eviction.get_statistics()
+            ret["late_events"] = self.late_events
+            return ret
+
+    def _current_result(self):
+        """
+        Gets the DFG of the current window, merging its slots
+
+        Returns
+        ----------------
+        dfg
+            Directly-Follows Graph
+        performance_dfg
+            Performance DFG (for every directly-follows relation: count, sum, mean, min, max, median
+            and the requested quantiles of the durations, in seconds)
+        activities
+            Activities
+        start_activities
+            Start activities
+        end_activities
+            End activities (of the finalized cases)
+        """
+        dfg = Counter()
+        activities = Counter()
+        start_activities = Counter()
+        end_activities = Counter()
+        performance = {}
+        if self.current_epoch is not None:
+            for slot in self.slots:
+                if slot is None or slot.epoch <= self.current_epoch - self.num_slots:
+                    continue
+                dfg.update(slot.dfg)
+                activities.update(slot.activities)
+                start_activities.update(slot.start_activities)
+                end_activities.update(slot.end_activities)
+                for df, perf in slot.performance.items():
+                    if df not in performance:
+                        performance[df] = [0, 0.0, perf[2], perf[3], QuantileSketch(self.relative_accuracy)]
+                    merged = performance[df]
+                    merged[0] += perf[0]
+                    merged[1] += perf[1]
+                    merged[2] = min(merged[2], perf[2])
+                    merged[3] = max(merged[3], perf[3])
+                    merged[4].merge(perf[4])
+
+        labels = self.activities_labels
+        performance_dfg = {}
+        for df, perf in performance.items():
+            stats = {"count": perf[0], "sum": perf[1], "mean": perf[1] / perf[0], "min": perf[2], "max": perf[3],
+                     "median": perf[4].quantile(0.5)}
+            for q in self.quantiles:
+                stats["p" + ("%g" % (100 * q))] = perf[4].quantile(q)
+            performance_dfg[(labels[df[0]], labels[df[1]])] = stats
+
+        dfg = {(labels[x[0]], labels[x[1]]): y for x, y in dfg.items()}
+        activities = {labels[x]: y for x, y in activities.items()}
+        start_activities = {labels[x]: y for x, y in start_activities.items()}
+        end_activities = {labels[x]: y for x, y in end_activities.items()}
+        return dfg, performance_dfg, activities, start_activities, end_activities
+
+
+def apply(parameters: Optional[Dict[Any, Any]] = None):
+    """
+    Creates a WindowedStreamingDfgDiscovery object
+
+    Parameters
+    --------------
+    parameters
+        Parameters of the algorithm
+    """
+    if parameters is None:
+        parameters = {}
+
+    return WindowedStreamingDfgDiscovery(parameters=parameters)
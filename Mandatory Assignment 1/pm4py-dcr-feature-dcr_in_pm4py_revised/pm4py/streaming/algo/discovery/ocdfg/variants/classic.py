@@ -0,0 +1,262 @@
+'''
+    This file is part of PM4Py (More Info: https://pm4py.fit.fraunhofer.de).
+
+    PM4Py is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    PM4Py is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with PM4Py.  If not, see <https://www.gnu.org/licenses/>.
+'''
+import datetime
+import logging
+from enum import Enum
+from typing import Optional, Dict, Any
+
+import numpy as np
+
+from pm4py.objects.ocel import constants as ocel_constants
+from pm4py.streaming.algo.interface import StreamingAlgorithm
+from pm4py.util import exec_utils
+
+
+class Parameters(Enum):
+    OCEL_EVENT_ID_KEY = ocel_constants.PARAM_EVENT_ID
+    OCEL_ACTIVITY_KEY = ocel_constants.PARAM_EVENT_ACTIVITY
+    OCEL_TIMESTAMP_KEY = ocel_constants.PARAM_EVENT_TIMESTAMP
+    OCEL_TYPE_PREFIX = ocel_constants.PARAM_OBJECT_TYPE_PREFIX_EXTENDED
+    COMPUTE_EDGES_PERFORMANCE = "compute_edges_performance"
+
+
+def _get_or_create(dictio, key, factory):
+    value = dictio.get(key)
+    if value is None:
+        value = factory()
+        dictio[key] = value
+    return value
+
+
+def _copy_sets(dictio):
+    return {x: set(y) for x, y in dictio.items()}
+
+
+def _copy_sets_ot(dictio):
+    return {ot: _copy_sets(y) for ot, y in dictio.items() if y}
+
+
+def _time_difference(timestamp1, timestamp2) -> float:
+    diff = timestamp2 - timestamp1
+    if isinstance(diff, np.timedelta64):
+        return diff / np.timedelta64(1, 's')
+    elif isinstance(diff, datetime.timedelta):
+        return diff.total_seconds()
+    return float(diff)
+
+
+class StreamingOcdfgDiscovery(StreamingAlgorithm):
+    def __init__(self, parameters: Optional[Dict[Any, Any]] = None):
+        """
+        Initialize the streaming discovery of the object-centric directly-follows graph.
+
+        The algorithm receives OCEL events (in the format produced by pm4py.objects.ocel.util.ocel_iterator, i.e.,
+        the related objects of every object type are listed under the key ocel:type:<object type>), and updates, in a
+        single pass over the related objects of the event, the last event of every object and the statistics of the
+        OC-DFG for all the object types (without flattening the event).
+
+        Parameters
+        ---------------
+        parameters
+            Parameters of the algorithm, including:
+            - Parameters.OCEL_EVENT_ID_KEY => the attribute in the OCEL event that is the identifier (default: ocel:eid)
+            - Parameters.OCEL_ACTIVITY_KEY => the attribute in the OCEL event that is the activity (default: ocel:activity)
+            - Parameters.OCEL_TIMESTAMP_KEY => the attribute in the OCEL event that is the timestamp (default: ocel:timestamp)
+            - Parameters.OCEL_TYPE_PREFIX => the prefix of the object types in the OCEL event (default: ocel:type:)
+            - Parameters.COMPUTE_EDGES_PERFORMANCE => (boolean) enables/disables the computation of the performance
+            on the edges (default: True)
+        """
+        if parameters is None:
+            parameters = {}
+
+        self.event_id_key = exec_utils.get_param_value(Parameters.OCEL_EVENT_ID_KEY, parameters,
+                                                       ocel_constants.DEFAULT_EVENT_ID)
+        self.activity_key = exec_utils.get_param_value(Parameters.OCEL_ACTIVITY_KEY, parameters,
+                                                       ocel_constants.DEFAULT_EVENT_ACTIVITY)
+        self.timestamp_key = exec_utils.get_param_value(Parameters.OCEL_TIMESTAMP_KEY, parameters,
+                                                        ocel_constants.DEFAULT_EVENT_TIMESTAMP)
+        self.ot_prefix = exec_utils.get_param_value(Parameters.OCEL_TYPE_PREFIX, parameters,
+                                                    ocel_constants.DEFAULT_OBJECT_TYPE_PREFIX_EXTENDED)
+        self.compute_edges_performance = exec_utils.get_param_value(Parameters.COMPUTE_EDGES_PERFORMANCE,
+                                                                    parameters, True)
+
+        # for every object: (last event identifier, last activity, last timestamp, object type)
+        self.last_event = {}
+        self.activities_events = {}
+        self.activities_objects = {}
+        self.activities_total = {}
+        self.ot_events = {}
+        self.ot_objects = {}
+        self.ot_total = {}
+        self.start_events = {}
+        self.start_objects = {}
+        self.start_total = {}
+        self.edges_couples = {}
+        self.edges_objects = {}
+        self.edges_total = {}
+        self.edges_couples_perf = {}
+        self.edges_total_perf = {}
+        StreamingAlgorithm.__init__(self)
+
+    def event_without_identifier_or_activity(self, event):
+        """
+        Print an error message when an event is without the
+        identifier or the activity
+
+        Parameters
+        ----------------
+        event
+            Event
+        """
+        logging.warning("OCEL event without identifier or activity: " + str(event))
+
+    def _process(self, event):
+        """
+        Receives an OCEL event and updates the OC-DFG
+
+        Parameters
+        ---------------
+        event
+            OCEL event
+        """
+        if self.event_id_key not in event or self.activity_key not in event:
+            self.event_without_identifier_or_activity(event)
+            return
+
+        eid = event[self.event_id_key]
+        act = event[self.activity_key]
+        timestamp = event[self.timestamp_key] if self.timestamp_key in event else None
+        prefix = self.ot_prefix
+        prefix_length = len(prefix)
+        last_event = self.last_event
+        compute_perf = self.compute_edges_performance and timestamp is not None
+
+        act_events = _get_or_create(self.activities_events, act, set)
+        act_objects = _get_or_create(self.activities_objects, act, set)
+        act_total = _get_or_create(self.activities_total, act, set)
+        act_events.add(eid)
+
+        for key, objects in event.items():
+            if not key.startswith(prefix) or not objects:
+                continue
+            ot = key[prefix_length:]
+            ot_events = _get_or_create(_get_or_create(self.ot_events, ot, dict), act, set)
+            ot_objects = _get_or_create(_get_or_create(self.ot_objects, ot, dict), act, set)
+            ot_total = _get_or_create(_get_or_create(self.ot_total, ot, dict), act, set)
+            ot_events.add(eid)
+            edges_couples = _get_or_create(self.edges_couples, ot, dict)
+            edges_objects = _get_or_create(self.edges_objects, ot, dict)
+            edges_total = _get_or_create(self.edges_total, ot, dict)
+            edges_couples_perf = _get_or_create(self.edges_couples_perf, ot, dict)
+            edges_total_perf = _get_or_create(self.edges_total_perf, ot, dict)
+
+            for obj in objects:
+                act_objects.add(obj)
+                act_total.add((eid, obj))
+                ot_objects.add(obj)
+                ot_total.add((eid, obj))
+                prev = last_event.get(obj)
+                if prev is None:
+                    _get_or_create(_get_or_create(self.start_events, ot, dict), act, set).add(eid)
+                    _get_or_create(_get_or_create(self.start_objects, ot, dict), act, set).add(obj)
+                    _get_or_create(_get_or_create(self.start_total, ot, dict), act, set).add((eid, obj))
+                else:
+                    edge = (prev[1], act)
+                    couples = _get_or_create(edges_couples, edge, set)
+                    couple = (prev[0], eid)
+                    new_couple = couple not in couples
+                    couples.add(couple)
+                    _get_or_create(edges_objects, edge, set).add(obj)
+                    _get_or_create(edges_total, edge, set).add((prev[0], eid, obj))
+                    if compute_perf and prev[2] is not None:
+                        diff = _time_difference(prev[2], timestamp)
+                        if new_couple:
+                            _get_or_create(edges_couples_perf, edge, list).append(diff)
+                        _get_or_create(edges_total_perf, edge, list).append(diff)
+                last_event[obj] = (eid, act, timestamp, ot)
+
+    def _current_result(self) -> Dict[str, Any]:
+        """
+        Gets the current OC-DFG
+
+        Returns
+        ----------------
+        ocdfg
+            Object-centric directly-follows graph, in the same format of pm4py.algo.discovery.ocel.ocdfg
+            (the end activities are the last activities of the objects observed so far)
+        """
+        ret = {}
+        ret["activities"] = set(self.activities_events)
+        ret["object_types"] = set(self.ot_events)
+
+        ret["edges"] = {}
+        ret["edges"]["event_couples"] = _copy_sets_ot(self.edges_couples)
+        ret["edges"]["unique_objects"] = _copy_sets_ot(self.edges_objects)
+        ret["edges"]["total_objects"] = _copy_sets_ot(self.edges_total)
+
+        ret["activities_indep"] = {}
+        ret["activities_indep"]["events"] = _copy_sets(self.activities_events)
+        ret["activities_indep"]["unique_objects"] = _copy_sets(self.activities_objects)
+        ret["activities_indep"]["total_objects"] = _copy_sets(self.activities_total)
+
+        ret["activities_ot"] = {}
+        ret["activities_ot"]["events"] = _copy_sets_ot(self.ot_events)
+        ret["activities_ot"]["unique_objects"] = _copy_sets_ot(self.ot_objects)
+        ret["activities_ot"]["total_objects"] = _copy_sets_ot(self.ot_total)
+
+        ret["start_activities"] = {}
+        ret["start_activities"]["events"] = _copy_sets_ot(self.start_events)
+        ret["start_activities"]["unique_objects"] = _copy_sets_ot(self.start_objects)
+        ret["start_activities"]["total_objects"] = _copy_sets_ot(self.start_total)
+
+        end_events = {}
+        end_objects = {}
+        end_total = {}
+        for obj, (eid, act, timestamp, ot) in self.last_event.items():
+            _get_or_create(_get_or_create(end_events, ot, dict), act, set).add(eid)
+            _get_or_create(_get_or_create(end_objects, ot, dict), act, set).add(obj)
+            _get_or_create(_get_or_create(end_total, ot, dict), act, set).add((eid, obj))
+        ret["end_activities"] = {}
+        ret["end_activities"]["events"] = end_events
+        ret["end_activities"]["unique_objects"] = end_objects
+        ret["end_activities"]["total_objects"] = end_total
+
+        ret["edges_performance"] = {}
+        ret["edges_performance"]["event_couples"] = {}
+        ret["edges_performance"]["total_objects"] = {}
+        if self.compute_edges_performance:
+            ret["edges_performance"]["event_couples"] = {ot: {x: sorted(y) for x, y in edges.items()} for ot, edges
+                                                         in self.edges_couples_perf.items() if edges}
+            ret["edges_performance"]["total_objects"] = {ot: {x: sorted(y) for x, y in edges.items()} for ot, edges
+                                                         in self.edges_total_perf.items() if edges}
+
+        return ret
+
+
+def apply(parameters: Optional[Dict[Any, Any]] = None):
+    """
+    Creates a StreamingOcdfgDiscovery object
+
+    Parameters
+    --------------
+    parameters
+        Parameters of the algorithm
+    """
+    if parameters is None:
+        parameters = {}
+
+    return StreamingOcdfgDiscovery(parameters=parameters)
@@ -48,3 +48,22 @@ class StreamingAlgorithm(abc.ABC):
         except:
             traceback.print_exc()
         self._lock.release()
+
+    def _process_batch(self, events):
+        """
+        Processes a batch of events (by default, processing them one by one).
+        Algorithms can override this method to process the batch at once.
+        """
+        for event in events:
+            try:
+                self._process(event)
+            except:
+                traceback.print_exc()
+
+    def receive_batch(self, events):
+        self._lock.acquire()
+        try:
+            self._process_batch(events)
+        except:
+            traceback.print_exc()
+        self._lock.release()
@@ -0,0 +1,272 @@
+'''
+    This file is part of PM4Py (More Info: https://pm4py.fit.fraunhofer.de).
+
+    PM4Py is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    PM4Py is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with PM4Py.  If not, see <https://www.gnu.org/licenses/>.
+'''
+import multiprocessing
+import os
+import traceback
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from enum import Enum
+from threading import Lock
+from typing import Optional, Dict, Any, Callable, List
+
+from pm4py.streaming.algo.interface import StreamingAlgorithm
+from pm4py.util import exec_utils, constants, pandas_utils
+
+
+class Parameters(Enum):
+    NUM_PARTITIONS = "num_partitions"
+    EXECUTOR = "executor"
+    MERGE_FUNCTION = "merge_function"
+    CASE_ID_KEY = constants.PARAMETER_CONSTANT_CASEID_KEY
+
+
+class Executors(Enum):
+    THREADS = "threads"
+    PROCESSES = "processes"
+
+
+class _ThreadShard(object):
+    """
+    Partition hosted by a dedicated worker thread
+    (the requests are executed in order of submission)
+    """
+
+    def __init__(self, factory: Callable[[], StreamingAlgorithm]):
+        self.algo = factory()
+        self.executor = ThreadPoolExecutor(max_workers=1)
+
+    def submit(self, method: str, *args):
+        self.executor.submit(getattr(self.algo, method), *args)
+
+    def call(self, method: str, *args):
+        return self.executor.submit(getattr(self.algo, method), *args).result()
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+
+
+def _process_shard_worker(factory: Callable[[], StreamingAlgorithm], requests, replies):
+    algo = factory()
+    while True:
+        request = requests.get()
+        if request is None:
+            break
+        method, args, want_reply = request
+        try:
+            ret = getattr(algo, method)(*args)
+        except:
+            traceback.print_exc()
+            ret = None
+        if want_reply:
+            replies.put(ret)
+
+
+class _ProcessShard(object):
+    """
+    Partition hosted by a dedicated worker process
+    (the requests are executed in order of submission)
+    """
+
+    def __init__(self, factory: Callable[[], StreamingAlgorithm]):
+        self.requests = multiprocessing.Queue()
+        self.replies = multiprocessing.Queue()
+        self.lock = Lock()
+        self.process = multiprocessing.Process(target=_process_shard_worker,
+                                               args=(factory, self.requests, self.replies), daemon=True)
+        self.process.start()
+
+    def submit(self, method: str, *args):
+        self.requests.put((method, args, False))
+
+    def call(self, method: str, *args):
+        with self.lock:
+            self.requests.put((method, args, True))
+            return self.replies.get()
+
+    def close(self):
+        self.requests.put(None)
+        self.process.join()
+
+
+def merge_dfg(results: List[Any]):
+    """
+    Merges the results of the partitions of the streaming DFG discovery (the counts are summed)
+    """
+    merged = [Counter(), Counter(), Counter(), Counter()]
+    for res in results:
+        for i in range(4):
+            merged[i].update(res[i])
+    return tuple(dict(x) for x in merged)
+
+
+def merge_diagnostics(results: List[Any]):
+    """
+    Merges the diagnostics dataframes of the partitions of the streaming conformance checking
+    (token-based replay, footprints) by taking the union of the per-case statuses
+    """
+    results = [x for x in results if x is not None and len(x) > 0]
+    if not results:
+        return pandas_utils.instantiate_dataframe([])
+    return pandas_utils.concat(results, ignore_index=True)
+
+
+def merge_dicts(results: List[Any]):
+    """
+    Merges per-case dictionaries (e.g., the deviations of the temporal profile streaming conformance)
+    by taking their union
+    """
+    merged = {}
+    for res in results:
+        merged.update(res)
+    return merged
+
+
+def merge_results(results: List[Any]):
+    """
+    Merges the results of the partitions, choosing the merge function on the basis of the type of the results
+    """
+    results = [x for x in results if x is not None]
+    if not results:
+        return None
+    if isinstance(results[0], tuple):
+        return merge_dfg(results)
+    if isinstance(results[0], dict):
+        return merge_dicts(results)
+    return merge_diagnostics(results)
+
+
+class PartitionedStreamingAlgorithm(StreamingAlgorithm):
+    def __init__(self, factory: Callable[[], StreamingAlgorithm], parameters: Optional[Dict[Any, Any]] = None):
+        """
+        Executes a streaming algorithm, whose state is partitionable by case identifier,
+        on several partitions. Each partition owns an independent instance of the algorithm (created by
+        the provided factory) and is hosted by a dedicated worker thread or process.
+        The events are sharded by the hash of their case identifier, hence the events of a case
+        are processed by the same instance, in order of arrival.
+
+        Parameters
+        ---------------
+        factory
+            Callable without arguments returning a new instance of the streaming algorithm
+            (when processes are used, it should be picklable, e.g., a functools.partial of the apply method of the algorithm)
+        parameters
+            Parameters of the wrapper, including:
+             - Parameters.NUM_PARTITIONS => number of partitions (default: number of CPUs)
+             - Parameters.EXECUTOR => Executors.THREADS (default) or Executors.PROCESSES
+             - Parameters.MERGE_FUNCTION => function merging the list of results of the partitions
+              (default: merge_results, which sums the DFG counts and takes the union of the per-case statuses)
+             - Parameters.CASE_ID_KEY => the key of the event to use as case identifier
+        """
+        if parameters is None:
+            parameters = {}
+
+        self.num_partitions = exec_utils.get_param_value(Parameters.NUM_PARTITIONS, parameters, os.cpu_count() or 1)
+        self.case_id_key = exec_utils.get_param_value(Parameters.CASE_ID_KEY, parameters, constants.CASE_CONCEPT_NAME)
+        self.merge_function = exec_utils.get_param_value(Parameters.MERGE_FUNCTION, parameters, merge_results)
+        executor = exec_utils.get_param_value(Parameters.EXECUTOR, parameters, Executors.THREADS)
+        if isinstance(executor, Executors):
+            executor = executor.value
+        shard_class = _ProcessShard if executor == Executors.PROCESSES.value else _ThreadShard
+        self.shards = [shard_class(factory) for i in range(self.num_partitions)]
+        StreamingAlgorithm.__init__(self)
+
+    def get_partition(self, case) -> int:
+        """
+        Gets the index of the partition hosting the given case
+        """
+        return hash(str(case)) % self.num_partitions
+
+    def _process(self, event):
+        """
+        Sends the event to the partition hosting its case
+
+        Parameters
+        ---------------
+        event
+            Event
+        """
+        case = event[self.case_id_key] if self.case_id_key in event else None
+        self.shards[self.get_partition(case)].submit("receive_batch", [event])
+
+    def _process_batch(self, events):
+        """
+        Splits a batch of events by partition, and sends each sub-batch to its partition
+
+        Parameters
+        ---------------
+        events
+            Batch of events
+        """
+        batches = {}
+        for event in events:
+            case = event[self.case_id_key] if self.case_id_key in event else None
+            p = self.get_partition(case)
+            if p not in batches:
+                batches[p] = []
+            batches[p].append(event)
+        for p, batch in batches.items():
+            self.shards[p].submit("receive_batch", batch)
+
+    def _current_result(self):
+        """
+        Gets the current result, merging the results of the partitions
+        (after all the events received so far have been processed)
+        """
+        return self.merge_function([shard.call("get") for shard in self.shards])
+
+    def get_status(self, case):
+        """
+        Gets the status of a case from the partition hosting it
+        """
+        return self.shards[self.get_partition(case)].call("get_status", case)
+
+    def terminate(self, case):
+        """
+        Terminates a case in the partition hosting it
+        """
+        return self.shards[self.get_partition(case)].call("terminate", case)
+
+    def terminate_all(self):
+        """
+        Terminates all the open cases in all the partitions
+        """
+        for shard in self.shards:
+            shard.call("terminate_all")
+
+    def close(self):
+        """
+        Stops the workers hosting the partitions
+        """
+        for shard in self.shards:
+            shard.close()
+
+
+def apply(factory: Callable[[], StreamingAlgorithm], parameters: Optional[Dict[Any, Any]] = None):
+    """
+    Creates a PartitionedStreamingAlgorithm object
+
+    Parameters
+    --------------
+    factory
+        Callable without arguments returning a new instance of the streaming algorithm
+    parameters
+        Parameters of the wrapper
+    """
+    if parameters is None:
+        parameters = {}
+
+    return PartitionedStreamingAlgorithm(factory, parameters=parameters)
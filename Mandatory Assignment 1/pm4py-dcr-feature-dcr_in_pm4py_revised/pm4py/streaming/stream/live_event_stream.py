@@ -16,6 +16,7 @@
 '''
 import collections
 import threading
+import time
 from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
 from pm4py.util import exec_utils
@@ -29,23 +30,54 @@ class StreamState(Enum):
 
 class Parameters(Enum):
     THREAD_POOL_SIZE = "thread_pool_size"
+    BATCH_SIZE = "batch_size"
+    MAX_QUEUE_SIZE = "max_queue_size"
 
 
 class LiveEventStream:
 
     def __init__(self, parameters=None):
+        """
+        Instantiates a live event stream, distributing the appended events to the registered algorithms.
+
+        Parameters
+        ---------------
+        parameters
+            Parameters of the stream, including:
+            - Parameters.THREAD_POOL_SIZE => size of the thread pool used to deliver the events (default: 6)
+            - Parameters.BATCH_SIZE => if provided, the events are drained from the queue in micro-batches of (at most)
+            the given size, and delivered using the receive_batch method of the algorithms. Every algorithm receives
+            the batches in order. If not provided, the events are delivered one by one (default: None)
+            - Parameters.MAX_QUEUE_SIZE => if provided, bounds the size of the queue: when the queue is full,
+            append blocks until some events have been delivered (default: None)
+        """
         self._dq = collections.deque()
+        self._dq_times = collections.deque()
         self._state = StreamState.INACTIVE
         self._lock = threading.Lock()
         self._cond = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
         self._observers = set()
         self._mail_man = None
         self._tp = ThreadPoolExecutor(exec_utils.get_param_value(Parameters.THREAD_POOL_SIZE, parameters, 6))
+        self._batch_size = exec_utils.get_param_value(Parameters.BATCH_SIZE, parameters, None)
+        self._max_queue_size = exec_utils.get_param_value(Parameters.MAX_QUEUE_SIZE, parameters, None)
+        self._in_flight = False
+        self._appended = 0
+        self._delivered = 0
+        self._batches = 0
+        self._start_time = None
 
     def append(self, event):
         self._cond.acquire()
+        if self._max_queue_size is not None:
+            # back-pressure: waits for the delivery of some events (only when the stream is consumed)
+            while len(self._dq) >= self._max_queue_size and self._state == StreamState.ACTIVE:
+                self._not_full.wait()
         if self._state != StreamState.FINISHED:
             self._dq.append(event)
+            self._dq_times.append(time.monotonic())
+            self._appended += 1
             self._cond.notify()
         self._cond.release()
 
@@ -59,26 +91,51 @@ class LiveEventStream:
                 else:
                     self._cond.release()
                     return
-            event = self._dq.popleft()
-            for algo in self._observers:
-                self._tp.submit(algo.receive, event)
-            self._cond.release()
+            if self._batch_size is None:
+                event = self._dq.popleft()
+                self._dq_times.popleft()
+                for algo in self._observers:
+                    self._tp.submit(algo.receive, event)
+                self._delivered += 1
+                self._batches += 1
+                self._not_full.notify()
+                self._cond.release()
+            else:
+                batch = [self._dq.popleft() for _ in range(min(len(self._dq), self._batch_size))]
+                for _ in range(len(batch)):
+                    self._dq_times.popleft()
+                observers = list(self._observers)
+                self._in_flight = True
+                self._not_full.notify_all()
+                self._cond.release()
+
+                futures = [self._tp.submit(algo.receive_batch, batch) for algo in observers]
+                for future in futures:
+                    future.result()
+
+                self._cond.acquire()
+                self._in_flight = False
+                self._delivered += len(batch)
+                self._batches += 1
+                self._cond.release()
 
     def start(self):
         self._cond.acquire()
         self._state = StreamState.ACTIVE
+        self._start_time = time.monotonic()
         self._mail_man = threading.Thread(target=self._deliver)
         self._mail_man.start()
         self._cond.release()
 
     def stop(self):
         self._cond.acquire()
-        while len(self._dq) > 0:
+        while len(self._dq) > 0 or self._in_flight:
             self._cond.wait()
         self._tp.shutdown()
         if self._state == StreamState.ACTIVE:
             self._state = StreamState.FINISHED
             self._cond.notify()
+            self._not_full.notify_all()
         self._cond.release()
 
     def register(self, algo):
@@ -91,9 +148,32 @@ class LiveEventStream:
         self._observers.remove(algo)
         self._cond.release()
 
+    def get_metrics(self):
+        """
+        Gets the metrics of the stream
+
+        Returns
+        ---------------
+        metrics
+            Dictionary containing:
+            - appended_events => number of events appended to the stream
+            - delivered_events => number of events delivered to the algorithms
+            - delivered_batches => number of (micro-)batches delivered to the algorithms
+            - queue_size => number of events waiting to be delivered
+            - throughput => delivered events per second (since the start of the stream)
+            - lag => seconds elapsed since the oldest event waiting to be delivered has been appended
+        """
+        self._cond.acquire()
+        now = time.monotonic()
+        elapsed = now - self._start_time if self._start_time is not None else 0.0
+        ret = {"appended_events": self._appended, "delivered_events": self._delivered,
+               "delivered_batches": self._batches, "queue_size": len(self._dq),
+               "throughput": self._delivered / elapsed if elapsed > 0 else 0.0,
+               "lag": now - self._dq_times[0] if self._dq_times else 0.0}
+        self._cond.release()
+        return ret
+
     def _get_state(self):
         return self._state
 
     state = property(_get_state)
-
-
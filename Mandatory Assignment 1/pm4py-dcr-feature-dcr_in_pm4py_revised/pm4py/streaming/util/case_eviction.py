@@ -0,0 +1,154 @@
+'''
+    This file is part of PM4Py (More Info: https://pm4py.fit.fraunhofer.de).
+
+    PM4Py is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    PM4Py is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with PM4Py.  If not, see <https://www.gnu.org/licenses/>.
+'''
+from collections import OrderedDict
+from enum import Enum
+from typing import Optional, Dict, Any, List
+
+from pm4py.util import exec_utils, constants, xes_constants
+
+
+class Parameters(Enum):
+    MAX_CASES = "max_cases"
+    CASE_TTL = "case_ttl"
+    CASE_END_ACTIVITIES = "case_end_activities"
+    TIMESTAMP_KEY = constants.PARAMETER_CONSTANT_TIMESTAMP_KEY
+
+
+class CaseEviction(object):
+    def __init__(self, parameters: Optional[Dict[Any, Any]] = None):
+        """
+        Tracks the open cases of a streaming algorithm, and decides which cases should be finalized
+        (removing their state from the dictionaries of the algorithm) according to the following policies:
+        - end-activity detection: a case is finalized as soon as one of the given end activities is received.
+        - idle TTL (by event time): a case is evicted when no event has been received for it in the last
+        'case_ttl' seconds, with respect to the maximum timestamp received so far on the stream.
+        - LRU: when the number of open cases exceeds 'max_cases', the least recently updated cases are evicted.
+
+        When no policy is configured, the cases are not tracked at all.
+
+        Parameters
+        ---------------
+        parameters
+            Parameters, including:
+            - Parameters.MAX_CASES => maximum number of open cases (default: None)
+            - Parameters.CASE_TTL => maximum idle time of a case, in seconds of event time (default: None)
+            - Parameters.CASE_END_ACTIVITIES => activities closing a case (default: None)
+            - Parameters.TIMESTAMP_KEY => the attribute of the event to use as timestamp
+        """
+        if parameters is None:
+            parameters = {}
+
+        self.max_cases = exec_utils.get_param_value(Parameters.MAX_CASES, parameters, None)
+        self.case_ttl = exec_utils.get_param_value(Parameters.CASE_TTL, parameters, None)
+        end_activities = exec_utils.get_param_value(Parameters.CASE_END_ACTIVITIES, parameters, None)
+        self.end_activities = set(end_activities) if end_activities is not None else None
+        self.timestamp_key = exec_utils.get_param_value(Parameters.TIMESTAMP_KEY, parameters,
+                                                        xes_constants.DEFAULT_TIMESTAMP_KEY)
+        self.enabled = self.max_cases is not None or self.case_ttl is not None or self.end_activities is not None
+        self.last_seen = OrderedDict()
+        self.watermark = None
+        self.evicted_cases = 0
+        self.ended_cases = 0
+
+    def __get_timestamp(self, event) -> Optional[float]:
+        if self.timestamp_key not in event:
+            return None
+        timestamp = event[self.timestamp_key]
+        return timestamp.timestamp() if hasattr(timestamp, "timestamp") else float(timestamp)
+
+    def update(self, case, activity, event) -> List[Any]:
+        """
+        Updates the status of the cases after an event has been processed by the algorithm
+
+        Parameters
+        ---------------
+        case
+            Case (as stored in the dictionaries of the algorithm)
+        activity
+            Activity of the event
+        event
+            Event
+
+        Returns
+        ---------------
+        finalized_cases
+            Cases that should be finalized by the algorithm
+        """
+        if not self.enabled:
+            return []
+
+        if self.end_activities is not None and activity in self.end_activities:
+            self.last_seen.pop(case, None)
+            self.ended_cases += 1
+            ret = [case]
+        else:
+            timestamp = self.__get_timestamp(event) if self.case_ttl is not None else None
+            if timestamp is not None and (self.watermark is None or timestamp > self.watermark):
+                self.watermark = timestamp
+            self.last_seen[case] = timestamp
+            self.last_seen.move_to_end(case)
+            ret = []
+
+        if self.case_ttl is not None and self.watermark is not None:
+            while self.last_seen:
+                first_case, first_timestamp = next(iter(self.last_seen.items()))
+                if first_timestamp is None or first_timestamp >= self.watermark - self.case_ttl:
+                    break
+                self.last_seen.popitem(last=False)
+                ret.append(first_case)
+                self.evicted_cases += 1
+
+        if self.max_cases is not None:
+            while len(self.last_seen) > self.max_cases:
+                ret.append(self.last_seen.popitem(last=False)[0])
+                self.evicted_cases += 1
+
+        return ret
+
+    def remove(self, case):
+        """
+        Stops tracking a case (e.g., because it has been terminated explicitly)
+        """
+        self.last_seen.pop(case, None)
+
+    def get_statistics(self) -> Dict[str, int]:
+        """
+        Gets the counters of the evicted and finalized cases
+
+        Returns
+        ---------------
+        statistics
+            Dictionary containing:
+            - open_cases => number of cases currently tracked
+            - evicted_cases => number of cases evicted because of the TTL or LRU policies
+            - ended_cases => number of cases finalized because an end activity was received
+            - finalized_cases => total number of cases finalized into the aggregate results
+        """
+        return {"open_cases": len(self.last_seen), "evicted_cases": self.evicted_cases,
+                "ended_cases": self.ended_cases, "finalized_cases": self.evicted_cases + self.ended_cases}
+
+
+def apply(parameters: Optional[Dict[Any, Any]] = None) -> CaseEviction:
+    """
+    Creates a CaseEviction object
+
+    Parameters
+    ---------------
+    parameters
+        Parameters of the eviction policies
+    """
+    return CaseEviction(parameters=parameters)
@@ -18,6 +18,7 @@ from enum import Enum
 
 from pm4py.streaming.util.dictio.versions import classic, thread_safe, redis
 from pm4py.util import exec_utils
+from typing import Any, Collection, Dict, List
 
 
 class Variants(Enum):
@@ -47,3 +48,44 @@ def apply(variant=DEFAULT_VARIANT, parameters=None):
         Dictionary
     """
     return exec_utils.get_variant(variant).apply(parameters=parameters)
+
+
+def get_many(dictio, keys: Collection[Any]) -> List[Any]:
+    """
+    Gets the values associated to the given keys in a dictionary generated by this module
+    (None for the keys that are not in the dictionary), using the batched access of the dictionary if available
+
+    Parameters
+    ----------------
+    dictio
+        Dictionary
+    keys
+        Keys
+
+    Returns
+    -----------------
+    values
+        List of values
+    """
+    keys = list(keys)
+    if hasattr(dictio, "get_many"):
+        return dictio.get_many(keys)
+    return [dictio.get(key) for key in keys]
+
+
+def set_many(dictio, mapping: Dict[Any, Any]):
+    """
+    Sets the values of the keys contained in the given mapping in a dictionary generated by this module,
+    using the batched access of the dictionary if available
+
+    Parameters
+    ----------------
+    dictio
+        Dictionary
+    mapping
+        Mapping between keys and values
+    """
+    if hasattr(dictio, "set_many"):
+        dictio.set_many(mapping)
+    else:
+        dictio.update(mapping)
@@ -16,7 +16,7 @@
 '''
 from enum import Enum
 from threading import Lock
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Collection, List
 
 from pm4py.util import exec_utils
 
@@ -25,14 +25,23 @@ class Parameters(Enum):
     HOSTNAME = "hostname"
     PORT = "port"
     DICT_ID = "dict_id"
+    BINARY_VALUES = "binary_values"
 
 
 class ThreadSafeRedisDict(dict):
-    def __init__(self, redis_connection, *args, **kw):
+    def __init__(self, redis_connection, *args, binary_values=False, **kw):
         super(ThreadSafeRedisDict, self).__init__(*args, **kw)
         self.redis_connection = redis_connection
+        # the connection does not decode the responses: the values read from Redis are decoded as strings,
+        # unless the dictionary hosts binary values (e.g., the markings encoded by MarkingCodec)
+        self.binary_values = binary_values
         self.lock = Lock()
 
+    def __decode_value(self, value):
+        if not self.binary_values and isinstance(value, bytes):
+            return value.decode("utf-8")
+        return value
+
     def __setitem__(self, key, value):
         # TODO: what should happen to the order if
         #       the key is already in the dict
@@ -41,18 +50,77 @@ class ThreadSafeRedisDict(dict):
         super(ThreadSafeRedisDict, self).__setitem__(key, value)
         self.lock.release()
 
+    def __getitem__(self, key):
+        # read-through: the keys which are not cached locally are retrieved from Redis
+        try:
+            return super(ThreadSafeRedisDict, self).__getitem__(key)
+        except KeyError:
+            self.lock.acquire()
+            value = self.__decode_value(self.redis_connection.get(key))
+            if value is not None:
+                super(ThreadSafeRedisDict, self).__setitem__(key, value)
+            self.lock.release()
+            if value is None:
+                raise
+            return value
+
+    def __contains__(self, key):
+        return super(ThreadSafeRedisDict, self).__contains__(key) or bool(self.redis_connection.exists(key))
+
+    def __delitem__(self, key):
+        self.lock.acquire()
+        del self.redis_connection[key]
+        if super(ThreadSafeRedisDict, self).__contains__(key):
+            super(ThreadSafeRedisDict, self).__delitem__(key)
+        self.lock.release()
+
     def __iter__(self):
         self.lock.acquire()
-        ret = iter(list(self.redis_connection.keys()))
+        ret = iter(self.__decoded_keys())
         self.lock.release()
         return ret
 
+    def __decoded_keys(self):
+        # the connection does not decode the responses (the values can be binary),
+        # while the keys are always strings
+        return [x.decode("utf-8") if isinstance(x, bytes) else x for x in self.redis_connection.keys()]
+
     def keys(self):
         self.lock.acquire()
-        ret = list(self.redis_connection.keys())
+        ret = self.__decoded_keys()
+        self.lock.release()
+        return ret
+
+    def get_many(self, keys: Collection[Any]) -> List[Any]:
+        """
+        Gets the values associated to the given keys (None for the keys that are not in the dictionary).
+        The keys that are not cached locally are retrieved from Redis with a single MGET request
+        (in that case, the values are decoded as strings, unless the dictionary hosts binary values).
+        """
+        self.lock.acquire()
+        ret = [super(ThreadSafeRedisDict, self).get(key) for key in keys]
+        missing = [i for i, key in enumerate(keys) if ret[i] is None]
+        if missing:
+            values = self.redis_connection.mget([keys[i] for i in missing])
+            for i, value in zip(missing, values):
+                if value is not None:
+                    value = self.__decode_value(value)
+                    ret[i] = value
+                    super(ThreadSafeRedisDict, self).__setitem__(keys[i], value)
         self.lock.release()
         return ret
 
+    def set_many(self, mapping: Dict[Any, Any]):
+        """
+        Sets the values of the keys contained in the given mapping, with a single MSET request to Redis
+        """
+        if not mapping:
+            return
+        self.lock.acquire()
+        self.redis_connection.mset(mapping)
+        self.update(mapping)
+        self.lock.release()
+
     def values(self):
         self.lock.acquire()
         ret = self.redis_connection.values()
@@ -89,6 +157,8 @@ def apply(parameters: Optional[Dict[Any, Any]] = None):
         - Parameters.HOSTNAME => hostname of the connection to Redis (default: 127.0.0.1)
         - Parameters.PORT => port of the connection to Redis (default: 6379)
         - Parameters.DICT_ID => integer identifier of the specific dictionary in Redis (default: 0)
+        - Parameters.BINARY_VALUES => the values of the dictionary are binary (bytes) and shall not be decoded
+                                        as strings when read from Redis (default: False)
 
     Returns
     --------------
@@ -103,7 +173,8 @@ def apply(parameters: Optional[Dict[Any, Any]] = None):
     hostname = exec_utils.get_param_value(Parameters.HOSTNAME, parameters, "127.0.0.1")
     port = exec_utils.get_param_value(Parameters.PORT, parameters, 6379)
     dict_id = exec_utils.get_param_value(Parameters.DICT_ID, parameters, 0)
+    binary_values = exec_utils.get_param_value(Parameters.BINARY_VALUES, parameters, False)
 
-    r = redis.StrictRedis(host=hostname, port=port, db=dict_id, decode_responses=True)
+    r = redis.StrictRedis(host=hostname, port=port, db=dict_id)
 
-    return ThreadSafeRedisDict(r)
+    return ThreadSafeRedisDict(r, binary_values=binary_values)
@@ -15,7 +15,7 @@
     along with PM4Py.  If not, see <https://www.gnu.org/licenses/>.
 '''
 from threading import Lock
-from typing import Optional, Dict, Any, Union
+from typing import Optional, Dict, Any, Union, Collection, List
 
 
 class ThreadSafeDict(dict):
@@ -55,6 +55,23 @@ class ThreadSafeDict(dict):
         self.lock.release()
         return ret
 
+    def get_many(self, keys: Collection[Any]) -> List[Any]:
+        """
+        Gets the values associated to the given keys (None for the keys that are not in the dictionary)
+        """
+        self.lock.acquire()
+        ret = [self.get(key) for key in keys]
+        self.lock.release()
+        return ret
+
+    def set_many(self, mapping: Dict[Any, Any]):
+        """
+        Sets the values of the keys contained in the given mapping
+        """
+        self.lock.acquire()
+        self.update(mapping)
+        self.lock.release()
+
 
 def apply(parameters: Optional[Dict[Any, Any]] = None):
     return ThreadSafeDict()
@@ -0,0 +1,63 @@
+'''
+    This file is part of PM4Py (More Info: https://pm4py.fit.fraunhofer.de).
+
+    PM4Py is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    PM4Py is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with PM4Py.  If not, see <https://www.gnu.org/licenses/>.
+'''
+import sys
+from array import array
+from typing import Collection
+
+from pm4py.objects.petri_net.obj import PetriNet, Marking
+
+
+class MarkingCodec(object):
+    """
+    Compact binary codec for the markings of a Petri net.
+
+    A marking is encoded as a sequence of unsigned 32-bit integers (little-endian), alternating
+    the index of a marked place and its number of tokens. The index of a place is its position in the list
+    of the places sorted by name, hence the encoding is stable across processes sharing the same net.
+    The encoded markings are bytes objects, which can be stored in any of the dictio backends.
+    """
+
+    def __init__(self, places: Collection[PetriNet.Place]):
+        self.places = sorted(places, key=lambda x: x.name)
+        self.places_idx = {p: i for i, p in enumerate(self.places)}
+
+    def encode(self, marking: Marking) -> bytes:
+        """
+        Encodes a marking
+        """
+        places_idx = self.places_idx
+        values = array("I")
+        for p, n in marking.items():
+            values.append(places_idx[p])
+            values.append(n)
+        if sys.byteorder == "big":
+            values.byteswap()
+        return values.tobytes()
+
+    def decode(self, encoded: bytes) -> Marking:
+        """
+        Decodes a marking
+        """
+        values = array("I")
+        values.frombytes(encoded)
+        if sys.byteorder == "big":
+            values.byteswap()
+        places = self.places
+        mark = Marking()
+        for i in range(0, len(values), 2):
+            mark[places[values[i]]] = values[i + 1]
+        return mark
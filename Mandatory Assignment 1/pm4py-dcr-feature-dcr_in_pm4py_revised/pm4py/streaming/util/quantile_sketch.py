@@ -0,0 +1,71 @@
+'''
+    This file is part of PM4Py (More Info: https://pm4py.fit.fraunhofer.de).
+
+    PM4Py is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    PM4Py is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with PM4Py.  If not, see <https://www.gnu.org/licenses/>.
+'''
+import math
+from collections import Counter
+
+
+class QuantileSketch(object):
+    """
+    Mergeable sketch of a distribution of non-negative values (e.g., durations), with
+    relative-error guarantees on the quantiles (logarithmic bucketing, as in DDSketch).
+
+    The values are inserted in buckets of geometrically increasing size: every quantile is estimated
+    with a relative error of at most 'relative_accuracy'. The memory is logarithmic in the range of the values,
+    and two sketches having the same accuracy can be merged by summing their buckets.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1.0 + relative_accuracy) / (1.0 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.buckets = Counter()
+        self.zero_count = 0
+        self.count = 0
+
+    def add(self, value: float):
+        """
+        Inserts a value in the sketch
+        """
+        self.count += 1
+        if value <= 0:
+            self.zero_count += 1
+        else:
+            self.buckets[math.ceil(math.log(value) / self.log_gamma)] += 1
+
+    def merge(self, other: "QuantileSketch"):
+        """
+        Merges another sketch (having the same relative accuracy) into the current one
+        """
+        self.count += other.count
+        self.zero_count += other.zero_count
+        self.buckets.update(other.buckets)
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimates the given quantile (0 <= q <= 1) of the inserted values
+        """
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        if rank < self.zero_count:
+            return 0.0
+        cumulative = self.zero_count
+        for idx in sorted(self.buckets):
+            cumulative += self.buckets[idx]
+            if cumulative > rank:
+                return 2.0 * self.gamma ** idx / (self.gamma + 1.0)
+        return 2.0 * self.gamma ** max(self.buckets) / (self.gamma + 1.0)
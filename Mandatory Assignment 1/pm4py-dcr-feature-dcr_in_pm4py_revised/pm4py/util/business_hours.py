@@ -18,6 +18,9 @@ import math
 from datetime import timedelta, datetime, time
 from typing import List, Tuple
 
+import numpy as np
+import pandas as pd
+
 from pm4py.util import constants
 from pm4py.util.dt_parsing.variants import strpfromiso
 
@@ -114,3 +117,175 @@ class BusinessHours:
                 sum += overlapping_time
 
         return sum
+
+
+DAY_NS = 24 * 60 * 60 * 10**9
+WEEK_NS = 7 * DAY_NS
+# 1970-01-01 is a Thursday: the week of the epoch starts three days before
+EPOCH_WEEK_SHIFT_NS = 3 * DAY_NS
+
+
+def unify_business_hour_slots(business_hour_slots: List[Tuple[int]]) -> List[List[int]]:
+    """
+    Unifies the business hour slots in order to avoid overlapping business hours
+    (slots that are closer than one second are merged as well)
+
+    Parameters
+    -----------------
+    business_hour_slots
+        Business hour slots (tuples of start/end times given in seconds since week start)
+
+    Returns
+    -----------------
+    unified_slots
+        Sorted and non-overlapping business hour slots
+    """
+    unified = []
+    for begin, end in sorted(business_hour_slots):
+        if unified and unified[-1][1] >= begin - 1:
+            unified[-1][1] = max(unified[-1][1], end)
+        else:
+            unified.append([begin, end])
+    return unified
+
+
+class BusinessCalendar:
+    def __init__(self, business_hour_slots: List[Tuple[int]] = None, work_calendar=constants.DEFAULT_BUSINESS_HOURS_WORKCALENDAR):
+        """
+        Business calendar computing the business hours between arrays of (start, end) timestamps.
+
+        The working seconds elapsed since the epoch are a piecewise-linear function of the timestamp, which is the
+        sum of the working seconds of the complete weeks and of the working seconds of the current week (obtained
+        through a binary search in the business hour slots). The days that are not working days according to the
+        work calendar are removed using a table of the non-working days in the time range of the provided timestamps.
+        The business hours between two timestamps are the difference of the values of the function.
+
+        Parameters
+        -----------------
+        business_hour_slots
+            work schedule of the company, provided as a list of tuples where each tuple represents one time slot of
+            business hours (start and end time given in seconds since week start; default:
+            constants.DEFAULT_BUSINESS_HOUR_SLOTS)
+        work_calendar
+            work calendar (an object providing the is_working_day(date) method, such as the calendars of the
+            workalendar package). The days that are not working days do not contain business hours.
+        """
+        if business_hour_slots is None:
+            business_hour_slots = constants.DEFAULT_BUSINESS_HOUR_SLOTS
+
+        self.business_hour_slots = business_hour_slots
+        self.work_calendar = work_calendar
+        self.__working_days = {}
+
+        slots = []
+        for begin, end in unify_business_hour_slots(business_hour_slots):
+            begin = int(round(begin * 10**9))
+            end = int(round(end * 10**9))
+            if end <= begin:
+                continue
+            shift = (begin // WEEK_NS) * WEEK_NS
+            begin, end = begin - shift, end - shift
+            if end - begin >= WEEK_NS:
+                slots.append((0, WEEK_NS))
+            elif end > WEEK_NS:
+                # the slot continues in the following week
+                slots.append((begin, WEEK_NS))
+                slots.append((0, end - WEEK_NS))
+            else:
+                slots.append((begin, end))
+        slots = unify_business_hour_slots(slots)
+
+        self.slots_start = np.array([x[0] for x in slots], dtype=np.int64)
+        self.slots_length = np.array([x[1] - x[0] for x in slots], dtype=np.int64)
+        self.slots_cumulative = np.concatenate([np.zeros(1, dtype=np.int64), np.cumsum(self.slots_length)])
+        self.week_working_ns = int(self.slots_cumulative[-1])
+
+    def __is_working_day(self, day) -> bool:
+        if day not in self.__working_days:
+            self.__working_days[day] = bool(self.work_calendar.is_working_day(day))
+        return self.__working_days[day]
+
+    def __weekly_cumulative(self, ns: np.ndarray) -> np.ndarray:
+        """
+        Working nanoseconds elapsed since the epoch (without considering the work calendar)
+        """
+        shifted = ns + EPOCH_WEEK_SHIFT_NS
+        weeks = np.floor_divide(shifted, WEEK_NS)
+        in_week = shifted - weeks * WEEK_NS
+        ret = weeks * self.week_working_ns
+        if len(self.slots_start):
+            idx = np.searchsorted(self.slots_start, in_week, side="right") - 1
+            valid = idx >= 0
+            idx = np.maximum(idx, 0)
+            ret = ret + np.where(valid, self.slots_cumulative[idx] + np.minimum(in_week - self.slots_start[idx], self.slots_length[idx]), 0)
+        return ret
+
+    def __cumulative(self, ns: np.ndarray) -> np.ndarray:
+        """
+        Working nanoseconds elapsed since the epoch, removing the non-working days (of the work calendar) contained
+        in the range of the provided timestamps
+        """
+        ret = self.__weekly_cumulative(ns)
+        if self.work_calendar is None or not len(ns):
+            return ret
+
+        first_day = np.floor_divide(ns.min(), DAY_NS)
+        last_day = np.floor_divide(ns.max(), DAY_NS)
+        days = np.arange(first_day, last_day + 1, dtype=np.int64)
+        dates = pd.to_datetime(days * DAY_NS).date
+        holidays = days[[not self.__is_working_day(d) for d in dates]] * DAY_NS
+        if not len(holidays):
+            return ret
+
+        holidays_end = holidays + DAY_NS
+        holidays_cumulative_end = self.__weekly_cumulative(holidays_end)
+        removed = np.concatenate([np.zeros(1, dtype=np.int64), np.cumsum(holidays_cumulative_end - self.__weekly_cumulative(holidays))])
+        # number of non-working days starting before the timestamp
+        idx = np.searchsorted(holidays, ns, side="right")
+        last = np.maximum(idx - 1, 0)
+        # the last one of such days could be not completed at the timestamp
+        not_completed = np.where(idx > 0, holidays_cumulative_end[last] - self.__weekly_cumulative(np.minimum(ns, holidays_end[last])), 0)
+        return ret - (removed[idx] - not_completed)
+
+    def get_seconds(self, start_timestamps, end_timestamps) -> np.ndarray:
+        """
+        Calculates the business hours (in seconds) between the provided arrays of timestamps
+
+        Parameters
+        -----------------
+        start_timestamps
+            Start timestamps (Pandas series, NumPy array or list of datetimes)
+        end_timestamps
+            End timestamps (Pandas series, NumPy array or list of datetimes)
+
+        Returns
+        -----------------
+        diff
+            NumPy array containing, for every couple of timestamps, the business hours between them
+            (0 if the end timestamp is before the start timestamp; NaN if one of the timestamps is missing)
+        """
+        start = _to_naive_ns(start_timestamps)
+        end = _to_naive_ns(end_timestamps)
+        missing = np.isnat(start) | np.isnat(end)
+        start = start.view(np.int64)
+        end = end.view(np.int64)
+        if missing.any():
+            start = np.where(missing, 0, start)
+            end = np.where(missing, 0, end)
+
+        cumulative = self.__cumulative(np.concatenate([start[~missing], end[~missing]]))
+        ret = np.full(len(start), np.nan)
+        num_valid = len(cumulative) // 2
+        ret[~missing] = np.maximum(cumulative[num_valid:] - cumulative[:num_valid], 0) / 10**9
+        return ret
+
+
+def _to_naive_ns(timestamps) -> np.ndarray:
+    """
+    Converts the provided timestamps to a NumPy array of naive datetimes (in nanoseconds), keeping the wall time
+    of timezone-aware timestamps
+    """
+    timestamps = pd.DatetimeIndex(timestamps)
+    if timestamps.tz is not None:
+        timestamps = timestamps.tz_localize(None)
+    return timestamps.as_unit("ns").to_numpy()
@@ -181,16 +181,7 @@ def discover_dfg(log: Union[UCL, MCL], index: int = 0) -> DFG:
 
 
 def discover_dfg_uvcl(log: UVCL) -> DFG:
-    dfg = DFG()
-    [dfg.graph.update({(t[i], t[i + 1]): log[t]}) for t in log for i in range(0, len(t) - 1) if len(t)]
-    for a in get_alphabet(log):
-        for t in log:
-            if len(t) > 0:
-                if t[0] == a:
-                    dfg.start_activities.update({a: log[t]})
-                if t[len(t) - 1] == a:
-                    dfg.end_activities.update({a: log[t]})
-    return dfg
+    return discover_dfg_encoded(*encode_uvcl(log))
 
 
 def get_start_activities(log: Union[UCL, MCL, UVCL], index: int = 0) -> TCounter[Any]:
@@ -218,6 +209,103 @@ def get_variants(log: Union[UCL, MCL], index: int = 0) -> UVCL:
     return Counter(map(lambda t: tuple(t), log))
 
 
+def encode_uvcl(log: UVCL) -> Tuple[ULT, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Encodes a UVCL in a compact integer form (e.g., to ship it to another process)
+
+    :rtype: ``Tuple[List[Any], np.ndarray, np.ndarray, np.ndarray]``
+    :param log: univariate variant compressed log
+    :return: lookup table of the activities, concatenated activity codes of the variants, lengths of the variants
+        and counts of the variants (in the iteration order of the log)
+    """
+    lookup = sorted(set(e for t in log for e in t))
+    codes = {a: i for i, a in enumerate(lookup)}
+    encoded = np.fromiter((codes[e] for t in log for e in t), dtype=np.int32)
+    lengths = np.fromiter((len(t) for t in log), dtype=np.int64, count=len(log))
+    counts = np.fromiter((log[t] for t in log), dtype=np.int64, count=len(log))
+    return lookup, encoded, lengths, counts
+
+
+def decode_uvcl(lookup: ULT, encoded: np.ndarray, lengths: np.ndarray, counts: np.ndarray) -> UVCL:
+    """
+    Decodes a UVCL from the compact integer form produced by encode_uvcl (keeping the order of the variants)
+
+    :rtype: ``UVCL``
+    :param lookup: lookup table of the activities
+    :param encoded: concatenated activity codes of the variants
+    :param lengths: lengths of the variants
+    :param counts: counts of the variants
+    """
+    values = [lookup[c] for c in encoded.tolist()]
+    offsets = np.concatenate(([0], np.cumsum(lengths))).tolist()
+    return Counter({tuple(values[offsets[i]:offsets[i + 1]]): c for i, c in enumerate(counts.tolist())})
+
+
+def uvcl_from_encoded(lookup: ULT, encoded: np.ndarray, lengths: np.ndarray, counts: np.ndarray,
+                      accumulate: bool = True) -> Tuple[UVCL, Tuple[ULT, np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    Builds the UVCL of a sequence of (possibly repeated) variants in the compact integer form produced by encode_uvcl,
+    e.g., the variants obtained masking the events of another encoded UVCL, along with its compact integer form
+    (without repeated variants)
+
+    :rtype: ``Tuple[UVCL, Tuple[List[Any], np.ndarray, np.ndarray, np.ndarray]]``
+    :param lookup: lookup table of the activities
+    :param encoded: concatenated activity codes of the variants
+    :param lengths: lengths of the variants
+    :param counts: counts of the variants
+    :param accumulate: if True, the counts of the repeated variants are summed; otherwise, the last count is kept
+    """
+    values = [lookup[c] for c in encoded.tolist()]
+    offsets = np.concatenate(([0], np.cumsum(lengths))).tolist()
+    log = Counter()
+    keep = np.zeros(len(lengths), dtype=bool)
+    for i, c in enumerate(counts.tolist()):
+        t = tuple(values[offsets[i]:offsets[i + 1]])
+        if t not in log:
+            keep[i] = True
+            log[t] = c
+        elif accumulate:
+            log[t] += c
+        else:
+            log[t] = c
+    counts = np.fromiter(log.values(), dtype=np.int64, count=len(log))
+    return log, (lookup, encoded[np.repeat(keep, lengths)], lengths[keep], counts)
+
+
+def discover_dfg_encoded(lookup: ULT, encoded: np.ndarray, lengths: np.ndarray, counts: np.ndarray) -> DFG:
+    """
+    Discovers the DFG of a UVCL from its compact integer form (see encode_uvcl). The directly-follows relations are
+    inserted in the order of their first occurrence, and the start/end activities in the order of the lookup table.
+
+    :rtype: ``DFG``
+    :param lookup: lookup table of the activities
+    :param encoded: concatenated activity codes of the variants
+    :param lengths: lengths of the variants
+    :param counts: counts of the variants
+    """
+    dfg = DFG()
+    n = len(lookup)
+    ends = np.cumsum(lengths)
+    nonempty = lengths > 0
+    event_counts = np.repeat(counts, lengths)
+    # events that are followed by another event of the same variant
+    follows = np.ones(len(encoded), dtype=bool)
+    follows[ends[nonempty] - 1] = False
+    src = np.flatnonzero(follows)
+    if len(src):
+        pairs = encoded[src].astype(np.int64) * n + encoded[src + 1]
+        pairs, first, inverse = np.unique(pairs, return_index=True, return_inverse=True)
+        weights = np.bincount(inverse.ravel(), weights=event_counts[src], minlength=len(pairs)).astype(np.int64)
+        for i in np.argsort(first, kind="stable").tolist():
+            dfg.graph[(lookup[pairs[i] // n], lookup[pairs[i] % n])] = int(weights[i])
+    for target, positions in ((dfg.start_activities, ends[nonempty] - lengths[nonempty]),
+                              (dfg.end_activities, ends[nonempty] - 1)):
+        weights = np.bincount(encoded[positions], weights=counts[nonempty], minlength=n).astype(np.int64)
+        for c in np.flatnonzero(weights).tolist():
+            target[lookup[c]] = int(weights[c])
+    return dfg
+
+
 def _map_log_to_single_index(log: Union[UCL, MCL, UVCL], i: int):
     return [list(map(lambda v: v[i], t)) for t in log] if type(log) is MCL else log
 
@@ -70,6 +70,54 @@ class AlgorithmTest(unittest.TestCase):
         generalization = generalization_evaluation.apply(log, net, im, fm,
                                                          variant=generalization_evaluation.Variants.GENERALIZATION_TOKEN)
 
+    def test_tokenreplay_vectorized(self):
+        log = xes_importer.apply(os.path.join("input_data", "roadtraffic100traces.xes"))
+        from pm4py.algo.discovery.alpha import algorithm as alpha_miner
+        net, im, fm = alpha_miner.apply(log)
+        from pm4py.algo.conformance.tokenreplay import algorithm as token_replay
+        classic = token_replay.apply(log, net, im, fm, variant=token_replay.Variants.TOKEN_REPLAY)
+        vectorized = token_replay.apply(log, net, im, fm, variant=token_replay.Variants.VECTORIZED)
+        for key in ["trace_is_fit", "trace_fitness", "missing_tokens", "consumed_tokens", "remaining_tokens",
+                    "produced_tokens", "activated_transitions", "reached_marking"]:
+            self.assertEqual([x[key] for x in classic], [x[key] for x in vectorized])
+
+    def test_tokenreplay_vectorized_invisibles(self):
+        from pm4py.algo.discovery.inductive import algorithm as inductive_miner
+        from pm4py.algo.discovery.heuristics import algorithm as heuristics_miner
+        from pm4py.algo.conformance.tokenreplay import algorithm as token_replay
+        for log_name in ["helpdesk.xes.gz", "roadtraffic100traces.xes"]:
+            log = xes_importer.apply(os.path.join("input_data", log_name))
+            nets = [process_tree_converter.apply(inductive_miner.apply(log)),
+                    process_tree_converter.apply(inductive_miner.apply(log, parameters={"noise_threshold": 0.2},
+                                                                       variant=inductive_miner.Variants.IMf)),
+                    heuristics_miner.apply(log)]
+            for net, im, fm in nets:
+                self.assertTrue(any(t.label is None for t in net.transitions))
+                classic = token_replay.apply(log, net, im, fm, variant=token_replay.Variants.TOKEN_REPLAY)
+                vectorized = token_replay.apply(log, net, im, fm, variant=token_replay.Variants.VECTORIZED)
+                for key in ["trace_is_fit", "trace_fitness", "missing_tokens", "consumed_tokens",
+                            "remaining_tokens", "produced_tokens", "activated_transitions", "reached_marking",
+                            "transitions_with_problems"]:
+                    self.assertEqual([x[key] for x in classic], [x[key] for x in vectorized])
+
+    def test_declare_conformance_vectorized(self):
+        log = xes_importer.apply(os.path.join("input_data", "roadtraffic100traces.xes"))
+        from pm4py.algo.discovery.declare import algorithm as declare_discovery
+        model = declare_discovery.apply(log, parameters={"min_support_ratio": 0.1, "min_confidence_ratio": 0.1})
+        from pm4py.algo.conformance.declare import algorithm as declare_conformance
+        classic = declare_conformance.apply(log, model, variant=declare_conformance.Variants.CLASSIC)
+        vectorized = declare_conformance.apply(log, model, variant=declare_conformance.Variants.VECTORIZED)
+        self.assertEqual(classic, vectorized)
+
+    def test_declare_discovery_vectorized(self):
+        log = xes_importer.apply(os.path.join("input_data", "running-example.xes"))
+        from pm4py.algo.discovery.declare import algorithm as declare_discovery
+        for parameters in [{}, {"min_support_ratio": 0.2, "min_confidence_ratio": 0.5}]:
+            classic = declare_discovery.apply(log, variant=declare_discovery.Variants.CLASSIC, parameters=parameters)
+            vectorized = declare_discovery.apply(log, variant=declare_discovery.Variants.VECTORIZED,
+                                                 parameters=parameters)
+            self.assertEqual(classic, vectorized)
+
     def test_evaluation(self):
         log = xes_importer.apply(os.path.join("input_data", "running-example.xes"))
         from pm4py.algo.discovery.alpha import algorithm as alpha_miner
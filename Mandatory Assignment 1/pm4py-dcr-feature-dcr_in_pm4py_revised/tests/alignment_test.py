@@ -101,6 +101,19 @@ class AlignmentTest(unittest.TestCase):
         net, im, fm = pm4py.discover_petri_net_inductive(log)
         align_alg.apply(log, net, im, fm, variant=align_alg.Variants.VERSION_TWEAKED_STATE_EQUATION_A_STAR)
 
+    def test_variant_prefix_sharing_dijkstra(self):
+        import pm4py
+        log = pm4py.read_xes("input_data/running-example.xes")
+        net, im, fm = pm4py.discover_petri_net_inductive(log, noise_threshold=0.3)
+        aligned_traces = align_alg.apply(log, net, im, fm, variant=align_alg.Variants.VERSION_PREFIX_SHARING_DIJKSTRA)
+        reference = align_alg.apply(log, net, im, fm, variant=align_alg.Variants.VERSION_DIJKSTRA_NO_HEURISTICS)
+        self.assertEqual([x["cost"] for x in aligned_traces], [x["cost"] for x in reference])
+        self.assertEqual([x["fitness"] for x in aligned_traces], [x["fitness"] for x in reference])
+        # exhausting the budget of the shared search makes the variants fall back to the per-trace alignment
+        fallback = align_alg.apply(log, net, im, fm, variant=align_alg.Variants.VERSION_PREFIX_SHARING_DIJKSTRA,
+                                   parameters={align_alg.Parameters.MAX_SHARED_STATES: 5})
+        self.assertEqual([x["cost"] for x in fallback], [x["cost"] for x in reference])
+
 
 
 if __name__ == "__main__":
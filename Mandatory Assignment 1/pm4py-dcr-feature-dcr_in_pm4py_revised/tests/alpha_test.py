@@ -109,6 +109,55 @@ class AlphaMinerTest(unittest.TestCase):
         aligned_traces = token_replay.apply(log, net, marking, fmarking)
         self.assertEqual(aligned_traces, aligned_traces)
 
+    def test_alphaMinerMaximalPairs(self):
+        from pm4py.algo.discovery.alpha.variants import classic, plus
+        from pm4py.objects.log.obj import EventLog, Trace, Event
+        log = EventLog()
+        for x in ["a", "b", "c"]:
+            for y in ["d", "e"]:
+                log.append(Trace([Event({"concept:name": z}) for z in ["s", x, y, y, "f"]]))
+        net, im, fm = classic.apply(log)
+        places = {(frozenset(a.source.name for a in p.in_arcs), frozenset(a.target.name for a in p.out_arcs)) for p in
+                  net.places if p not in im and p not in fm}
+        # the activities with a loop of length one are not connected by the classic alpha miner
+        self.assertEqual(places, {(frozenset({"s"}), frozenset({"a", "b", "c"}))})
+        filtered_log, loop_one_list, A, B, _, _ = plus.preprocessing(log)
+        self.assertEqual(loop_one_list, ["d", "e"])
+        self.assertEqual([list(t) for t in filtered_log][0], ["artificial_start", "s", "a", "f", "artificial_end"])
+        # as in the original implementation, the last activity before the loop of length one is kept
+        self.assertEqual(A, {"d": {"c"}, "e": {"c"}})
+        self.assertEqual(B, {"d": {"f"}, "e": {"f"}})
+        causal, parallel, follows = plus.get_relations(filtered_log)
+        self.assertEqual(causal["s"], {"a", "b", "c"})
+        net, im, fm, pairs = plus.processing(filtered_log, causal, follows)
+        self.assertIn(({"a", "b", "c"}, {"f"}), pairs)
+        plus.apply(log)
+
+    def test_alphaPlusCompletePairs(self):
+        from pm4py.algo.discovery.alpha.variants import plus
+        from pm4py.algo.evaluation.replay_fitness import algorithm as replay_fitness
+        from pm4py.objects.log.obj import EventLog, Trace, Event
+        from pm4py.objects.petri_net.utils.check_soundness import check_easy_soundness_net_in_fin_marking
+        log = EventLog()
+        for x in ["a", "b", "c"]:
+            for y in ["d", "e"]:
+                for n in range(1, 4):
+                    log.append(Trace([Event({"concept:name": z}) for z in ["s", x] + [y] * n + ["f"]]))
+        parameters = {plus.Parameters.COMPLETE_PAIRS: True}
+        _, _, A, _, _, _ = plus.preprocessing(log, parameters=parameters)
+        self.assertEqual(A, {"d": {"a", "b", "c"}, "e": {"a", "b", "c"}})
+        net, im, fm = plus.apply(log, parameters=parameters)
+        # the loops are connected to the existing place of the pair ({a, b, c}, {f}), hence they are not dead
+        for t in net.transitions:
+            if t.label in ["d", "e"]:
+                self.assertEqual(len(t.in_arcs), 1)
+                place = list(t.in_arcs)[0].source
+                self.assertEqual({x.source.label for x in place.in_arcs}, {"a", "b", "c", "d", "e"})
+                self.assertEqual({x.target.label for x in place.out_arcs}, {"d", "e", "f"})
+        self.assertTrue(check_easy_soundness_net_in_fin_marking(net, im, fm))
+        fitness = replay_fitness.apply(log, net, im, fm, variant=replay_fitness.Variants.TOKEN_BASED)
+        self.assertEqual(fitness["log_fitness"], 1.0)
+
 
 if __name__ == "__main__":
     unittest.main()
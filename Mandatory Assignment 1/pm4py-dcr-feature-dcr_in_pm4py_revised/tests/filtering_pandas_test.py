@@ -162,6 +162,39 @@ class DataframePrefilteringTest(unittest.TestCase):
         df = dataframe_utils.convert_timestamp_columns_in_df(df, timest_format=constants.DEFAULT_TIMESTAMP_PARSE_FORMAT)
         filtered_df = filter.apply(df, "Sara", parameters={constants.PARAMETER_CONSTANT_ATTRIBUTE_KEY: "org:resource"})
 
+    def test_lazy_filter(self):
+        import pm4py
+        from pm4py.algo.filtering.pandas.lazy import lazy_filter
+        df = pm4py.read_xes(os.path.join("input_data", "running-example.xes"))
+        filtered_df = pm4py.filter_start_activities(df, ["register request"])
+        filtered_df = pm4py.filter_case_size(filtered_df, 5, 9)
+        filtered_df = pm4py.filter_time_range(filtered_df, "2010-12-30 00:00:00", "2011-01-10 00:00:00", mode="events")
+        filtered_df = pm4py.filter_variants_top_k(filtered_df, 2)
+        lazy_df = lazy_filter.apply(df).filter_start_activities(["register request"]).filter_case_size(5, 9) \
+            .filter_time_range("2010-12-30 00:00:00", "2011-01-10 00:00:00", mode="events") \
+            .filter_variants_top_k(2).collect()
+        self.assertTrue(filtered_df.equals(lazy_df))
+        filtered_df = pm4py.filter_directly_follows_relation(df, [("check ticket", "decide")])
+        filtered_df = pm4py.filter_end_activities(filtered_df, ["reject request"], retain=False)
+        lazy_df = lazy_filter.apply(df).filter_directly_follows_relation([("check ticket", "decide")]) \
+            .filter_end_activities(["reject request"], retain=False).collect()
+        self.assertTrue(filtered_df.equals(lazy_df))
+
+
+    def test_ltl_variant_level(self):
+        import pm4py
+        from pm4py.objects.log.util import log_index
+        df = pm4py.read_xes(os.path.join("input_data", "running-example.xes"))
+        case_level = ltl_checker.eventually_follows(df, ["check ticket", "decide", "pay compensation"])
+        abc_case_level = ltl_checker.A_next_B_next_C(df, "examine casually", "check ticket", "decide")
+        timed = ltl_checker.eventually_follows(df, ["check ticket", "decide", "pay compensation"], parameters={
+            ltl_checker.Parameters.TIMESTAMP_DIFF_BOUNDARIES: [(0, 86400 * 2), (0, 86400 * 7)]})
+        self.assertEqual(set(timed["case:concept:name"]), {"3"})
+        log_index.apply(df)
+        self.assertTrue(case_level.equals(ltl_checker.eventually_follows(df, ["check ticket", "decide", "pay compensation"])))
+        self.assertTrue(abc_case_level.equals(ltl_checker.A_next_B_next_C(df, "examine casually", "check ticket", "decide")))
+        self.assertEqual(set(abc_case_level["case:concept:name"]), {"3", "5", "6"})
+
 
 if __name__ == "__main__":
     unittest.main()
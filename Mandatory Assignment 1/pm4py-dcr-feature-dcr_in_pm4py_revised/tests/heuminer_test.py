@@ -61,6 +61,36 @@ class HeuMinerTest(unittest.TestCase):
         net, im, fm = heuristics_miner.apply(log, variant=heuristics_miner.Variants.PLUSPLUS)
         gviz = pn_vis.apply(net, im, fm)
 
+    def test_heuminer_matrix(self):
+        from pm4py.algo.discovery.dfg.variants import native, freq_triples
+        from pm4py.algo.discovery.heuristics.variants import classic
+        from pm4py.statistics.concurrent_activities.log import get as conc_act_get
+        log = xes_importer.apply(os.path.join(INPUT_DATA_DIR, "running-example.xes"))
+        dfg, dfg_window_2, triples = classic.discover_windows_log(log)
+        self.assertEqual(dfg, native.apply(log))
+        self.assertEqual(dfg_window_2, native.apply(log, parameters={"window": 2}))
+        self.assertEqual(triples, freq_triples.apply(log))
+        heu_net = classic.apply_heu(log, parameters={"and_measure_thresh": 0.0})
+        for name, node in heu_net.nodes.items():
+            out_nodes = sorted(x.node_name for x in node.output_connections)
+            for i, n1 in enumerate(out_nodes):
+                for n2 in out_nodes[i + 1:]:
+                    value = (dfg.get((n1, n2), 0) + dfg.get((n2, n1), 0)) / (
+                            dfg.get((name, n1), 0) + dfg.get((name, n2), 0) + 1)
+                    self.assertEqual(node.and_measures_out[n1][n2], value)
+        log = xes_importer.apply(os.path.join(INPUT_DATA_DIR, "interval_event_log.xes"))
+        expected = {}
+        for trace in log:
+            for i in range(len(trace)):
+                for j in range(i + 1, len(trace)):
+                    ev1, ev2 = trace[i], trace[j]
+                    if max(ev1["start_timestamp"], ev2["start_timestamp"]) <= min(ev1["time:timestamp"],
+                                                                                  ev2["time:timestamp"]):
+                        tup = tuple(sorted((ev1["concept:name"], ev2["concept:name"])))
+                        expected[tup] = expected.get(tup, 0) + 1
+        self.assertEqual(conc_act_get.apply(log, parameters={"pm4py:param:start_timestamp_key": "start_timestamp"}),
+                         expected)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -166,6 +166,56 @@ class InductiveMinerTest(unittest.TestCase):
 
         tree = imfuvcl.apply(IMDataStructureUVCL(uvcl), parameters=parameters)
 
+    def test_inductive_miner_parallel_recursion(self):
+        import pm4py
+        from pm4py.util.compression import util as comut
+        log = pm4py.read_xes("input_data/running-example.xes")
+        uvcl = comut.get_variants(comut.project_univariate(log))
+        self.assertEqual(list(comut.decode_uvcl(*comut.encode_uvcl(uvcl)).items()), list(uvcl.items()))
+        for variant in [inductive_miner.Variants.IM, inductive_miner.Variants.IMf]:
+            tree = inductive_miner.apply(log, variant=variant, parameters={"noise_threshold": 0.2})
+            parallel_tree = inductive_miner.apply(log, variant=variant, parameters={"noise_threshold": 0.2, "recursion_multiprocessing": True, "recursion_cores": 2, "recursion_min_size": 1})
+            self.assertEqual(str(tree), str(parallel_tree))
+
+    def test_inductive_miner_bit_matrix(self):
+        import pm4py
+        from pm4py.algo.discovery.inductive.cuts.sequence import SequenceCut
+        from pm4py.algo.discovery.inductive.dtypes.im_bitmatrix import IMBitMatrix
+        from pm4py.objects.dfg import util as dfu
+        from pm4py.objects.dfg.obj import DFG
+        log = pm4py.read_xes("input_data/running-example.xes")
+        dfg = DFG(*pm4py.discover_dfg(log))
+        matrix = IMBitMatrix.from_dfg(dfg)
+        trans_pred, trans_succ = dfu.get_transitive_relations(dfg)
+        succ = matrix.transitive_successors
+        for a in matrix.vertices:
+            self.assertEqual(matrix.activities(succ[matrix.index[a]].nonzero()[0]), trans_succ[a])
+            self.assertEqual(matrix.activities(succ[:, matrix.index[a]].nonzero()[0]), trans_pred[a])
+        groups = SequenceCut.merge_groups([{a} for a in matrix.vertices], trans_succ)
+        components = matrix.components((succ & succ.T) | ~(succ | succ.T))
+        self.assertEqual(sorted(map(sorted, groups)), sorted(sorted(matrix.activities(c)) for c in components))
+        group = set(matrix.activities(components[-1]))
+        sub_dfg = DFG({x: y for x, y in dfg.graph.items() if x[0] in group and x[1] in group},
+                      {x: y for x, y in dfg.start_activities.items() if x in group},
+                      {x: y for x, y in dfg.end_activities.items() if x in group})
+        projected, sub_matrix = matrix.project(sub_dfg), IMBitMatrix.from_dfg(sub_dfg)
+        self.assertEqual(projected.vertices, sub_matrix.vertices)
+        self.assertTrue((projected.adjacency == sub_matrix.adjacency).all())
+
+    def test_inductive_miner_encoded_projection(self):
+        from collections import Counter
+        from pm4py.algo.discovery.inductive.cuts.loop import LoopCutUVCL
+        from pm4py.algo.discovery.inductive.cuts.sequence import SequenceCutUVCL
+        from pm4py.algo.discovery.inductive.dtypes.im_ds import IMDataStructureUVCL
+        obj = IMDataStructureUVCL(Counter({("a", "b", "c", "a"): 2, ("a", "x", "a", "b", "c", "a"): 1}))
+        self.assertEqual(dict(obj.dfg.graph), {("a", "b"): 3, ("b", "c"): 3, ("c", "a"): 3, ("a", "x"): 1, ("x", "a"): 1})
+        self.assertEqual(dict(obj.dfg.start_activities), {"a": 3})
+        children = LoopCutUVCL.project(obj, [{"a"}, {"b", "c"}, {"x"}])
+        self.assertEqual([c.data_structure for c in children], [Counter({("a",): 7}), Counter({("b", "c"): 3}), Counter({("x",): 1})])
+        self.assertEqual(dict(children[1].dfg.graph), {("b", "c"): 3})
+        obj = IMDataStructureUVCL(Counter({("a", "b", "c"): 3, ("b", "a", "c"): 1}))
+        children = SequenceCutUVCL.project(obj, [{"a", "b"}, {"c"}])
+        self.assertEqual([c.data_structure for c in children], [Counter({("a", "b"): 3, ("b", "a"): 1}), Counter({("c",): 4})])
 
 
 if __name__ == "__main__":
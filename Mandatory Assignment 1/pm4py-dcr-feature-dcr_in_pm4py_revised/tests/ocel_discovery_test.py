@@ -100,6 +100,35 @@ class OcelDiscoveryTest(unittest.TestCase):
         ocel = pm4py.read_ocel(os.path.join("input_data", "ocel", "example_log.jsonocel"))
         saw_nets_disc.apply(ocel)
 
+    def test_streaming_ocdfg(self):
+        from pm4py.objects.ocel.util import ocel_iterator
+        from pm4py.streaming.algo.discovery.ocdfg import algorithm as streaming_ocdfg
+        ocel = pm4py.read_ocel(os.path.join("input_data", "ocel", "example_log.jsonocel"))
+        ocdfg = pm4py.discover_ocdfg(ocel)
+        streaming = streaming_ocdfg.apply()
+        for ev in ocel_iterator.apply(ocel):
+            streaming.receive(ev)
+        streaming_result = streaming.get()
+        self.assertEqual(streaming_result["edges"], ocdfg["edges"])
+        self.assertEqual(streaming_result["edges_performance"], ocdfg["edges_performance"])
+        for key in ["activities_ot", "start_activities", "end_activities"]:
+            self.assertEqual(streaming_result[key]["events"], ocdfg[key]["events"])
+            self.assertEqual(streaming_result[key]["unique_objects"], ocdfg[key]["unique_objects"])
+            self.assertEqual(streaming_result[key]["total_objects"],
+                             {ot: {act: set(y) for act, y in x.items()} for ot, x in ocdfg[key]["total_objects"].items()})
+        self.assertEqual(streaming_result["activities_indep"]["events"], ocdfg["activities_indep"]["events"])
+
+    def test_ocdfg_vectorized(self):
+        from pm4py.algo.discovery.ocel.ocdfg import algorithm as ocdfg_discovery
+        for log in ["example_log.jsonocel", "ocel20_example.sqlite"]:
+            if log.endswith(".sqlite"):
+                ocel = pm4py.read_ocel2_sqlite(os.path.join("input_data", "ocel", log))
+            else:
+                ocel = pm4py.read_ocel(os.path.join("input_data", "ocel", log))
+            ocdfg = ocdfg_discovery.apply(ocel, variant=ocdfg_discovery.Variants.CLASSIC)
+            ocdfg_vect = ocdfg_discovery.apply(ocel, variant=ocdfg_discovery.Variants.VECTORIZED)
+            self.assertEqual(ocdfg, ocdfg_vect)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -114,6 +114,20 @@ class OcelFilteringTest(unittest.TestCase):
         ocel = pm4py.read_ocel(input_path)
         pm4py.filter_ocel_events_timestamp(ocel, "1981-01-01 00:00:00", "1982-01-01 00:00:00")
 
+    def test_ocel_index(self):
+        input_path = os.path.join("input_data", "ocel", "example_log.jsonocel")
+        ocel = pm4py.read_ocel(input_path)
+        index = ocel.get_index()
+        self.assertIs(index, ocel.get_index())
+        self.assertEqual(index.event_to_objects_dict(),
+                         ocel.relations.groupby(ocel.event_id_column)[ocel.object_id_column].agg(list).to_dict())
+        self.assertEqual(index.object_to_events_dict("order"),
+                         ocel.relations[ocel.relations[ocel.object_type_column] == "order"].groupby(
+                             ocel.object_id_column)[ocel.event_id_column].agg(list).to_dict())
+        ocel.relations = ocel.relations[ocel.relations[ocel.object_type_column] == "order"]
+        self.assertIsNot(index, ocel.get_index())
+        self.assertEqual(set(ocel.get_index().event_to_objects_dict("element")), set())
+
 
 if __name__ == "__main__":
     unittest.main()
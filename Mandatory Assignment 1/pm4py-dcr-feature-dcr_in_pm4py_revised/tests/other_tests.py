@@ -21,6 +21,25 @@ from pm4py.util import constants, pandas_utils
 from pm4py.objects.conversion.process_tree import converter as process_tree_converter
 
 
+class FakeRedis(dict):
+    # local stand-in of a Redis connection (storing bytes and not decoding the responses)
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value if isinstance(value, bytes) else str(value).encode("utf-8"))
+
+    def keys(self):
+        return [x.encode("utf-8") for x in super().keys()]
+
+    def exists(self, key):
+        return int(super().__contains__(key))
+
+    def mget(self, keys):
+        return [dict.get(self, key) for key in keys]
+
+    def mset(self, mapping):
+        for key, value in mapping.items():
+            self[key] = value
+
+
 class OtherPartsTests(unittest.TestCase):
     def test_emd_1(self):
         if importlib.util.find_spec("pyemd"):
@@ -340,6 +359,19 @@ class OtherPartsTests(unittest.TestCase):
         from pm4py.algo.transformation.ocel.features.objects import algorithm as ocel_fea
         res = ocel_fea.apply(ocel)
 
+    def test_ocel_object_features_parallel(self):
+        import pm4py
+        ocel = pm4py.read_ocel("input_data/ocel/example_log.jsonocel")
+        from pm4py.algo.transformation.ocel.features.objects import algorithm as ocel_fea
+        params = {"enable_object_work_in_progress": True, "enable_object_lifecycle_paths": True}
+        data, feature_names = ocel_fea.apply(ocel, parameters=dict(params, enable_shared_structures=False))
+        data_par, feature_names_par = ocel_fea.apply(ocel, parameters=dict(params, cores=4))
+        self.assertEqual(feature_names, feature_names_par)
+        self.assertEqual(data, data_par)
+        matrix, _ = ocel_fea.apply(ocel, parameters=dict(params, return_numpy=True))
+        self.assertEqual(matrix.shape, (len(ocel.objects), len(feature_names)))
+        self.assertEqual(matrix.tolist(), data)
+
     def test_ocel_event_features_non_simpl_interface(self):
         import pm4py
         ocel = pm4py.read_ocel("input_data/ocel/example_log.jsonocel")
@@ -388,6 +420,222 @@ class OtherPartsTests(unittest.TestCase):
         from pm4py.algo.transformation.ocel.description.variants import variant1
         variant1.apply(ocel)
 
+    def test_live_event_stream_batches(self):
+        import pm4py
+        from pm4py.streaming.stream.live_event_stream import LiveEventStream
+        from pm4py.streaming.algo.discovery.dfg import algorithm as streaming_dfg_discovery
+        log = xes_importer.apply(os.path.join("input_data", "running-example.xes"))
+        live_stream = LiveEventStream(parameters={"batch_size": 4, "max_queue_size": 8})
+        streaming_dfg = streaming_dfg_discovery.apply()
+        live_stream.register(streaming_dfg)
+        live_stream.start()
+        for event in pm4py.convert_to_event_stream(log):
+            live_stream.append(event)
+        live_stream.stop()
+        dfg, activities, sa, ea = streaming_dfg.get()
+        self.assertEqual(dfg, dict(dfg_discovery.apply(log)))
+        self.assertEqual(sa, start_activities.get_start_activities(log))
+        metrics = live_stream.get_metrics()
+        self.assertEqual(metrics["delivered_events"], sum(len(trace) for trace in log))
+        self.assertEqual(metrics["queue_size"], 0)
+
+    def test_partitioned_streaming(self):
+        import pm4py
+        from functools import partial
+        from pm4py.streaming.algo import partitioned
+        from pm4py.streaming.algo.discovery.dfg import algorithm as streaming_dfg_discovery
+        from pm4py.streaming.algo.conformance.tbr import algorithm as streaming_tbr
+        log = xes_importer.apply(os.path.join("input_data", "running-example.xes"))
+        stream = pm4py.convert_to_event_stream(log)
+        for executor in [partitioned.Executors.THREADS, partitioned.Executors.PROCESSES]:
+            streaming_dfg = partitioned.apply(partial(streaming_dfg_discovery.apply),
+                                              parameters={"num_partitions": 3, "executor": executor})
+            streaming_dfg.receive_batch(list(stream)[:20])
+            for event in list(stream)[20:]:
+                streaming_dfg.receive(event)
+            dfg, activities, sa, ea = streaming_dfg.get()
+            streaming_dfg.close()
+            self.assertEqual(dfg, dict(dfg_discovery.apply(log)))
+            self.assertEqual(sa, start_activities.get_start_activities(log))
+            self.assertEqual(ea, end_activities.get_end_activities(log))
+        net, im, fm = process_tree_converter.apply(inductive_miner.apply(log))
+        streaming_conf = partitioned.apply(partial(streaming_tbr.apply, net, im, fm),
+                                           parameters={"num_partitions": 2})
+        streaming_conf.receive_batch(list(stream))
+        diagn = streaming_conf.get()
+        streaming_conf.close()
+        self.assertEqual(set(diagn["case"]), set(trace.attributes["concept:name"] for trace in log))
+        self.assertTrue(diagn["is_fit"].all())
+
+    def test_streaming_tbr_binary_state(self):
+        import pm4py
+        from pm4py.streaming.algo.conformance.tbr import algorithm as streaming_tbr
+        from pm4py.streaming.util.dictio.versions.redis import ThreadSafeRedisDict
+
+        log = xes_importer.apply(os.path.join("input_data", "roadtraffic100traces.xes"))
+        net, im, fm = pm4py.discover_petri_net_inductive(log, noise_threshold=0.2)
+        stream = list(pm4py.convert_to_event_stream(log))
+        conf = streaming_tbr.apply(net, im, fm)
+        for event in stream:
+            conf.receive(event)
+        expected = conf.get().sort_values("case").reset_index(drop=True)
+        self.assertEqual(conf.decode_marking(conf.encode_marking(fm)), fm)
+        stores = [FakeRedis(), FakeRedis(), FakeRedis()]
+        for part in [stream[:len(stream) // 2], stream[len(stream) // 2:]]:
+            # the second instance resumes from the state stored by the first one
+            conf = streaming_tbr.apply(net, im, fm)
+            conf.case_dict = ThreadSafeRedisDict(stores[0], binary_values=True)
+            conf.missing, conf.remaining = [ThreadSafeRedisDict(store) for store in stores[1:]]
+            for i in range(0, len(part), 50):
+                conf.receive_batch(part[i:i + 50])
+        self.assertTrue(all(isinstance(x, bytes) for x in stores[0].values()))
+        self.assertTrue(expected.equals(conf.get().sort_values("case").reset_index(drop=True)))
+
+    def test_streaming_redis_dict_values(self):
+        import json
+        from pm4py.objects.petri_net.obj import PetriNet, Marking
+        from pm4py.streaming.util.dictio import generator
+        from pm4py.streaming.util.dictio.versions.redis import ThreadSafeRedisDict
+        from pm4py.streaming.util.marking_codec import MarkingCodec
+
+        # plain string values (e.g., the last activity of the streaming DFG, or JSON payloads)
+        store = FakeRedis()
+        payload = json.dumps({"A": [1.0, 2.0]})
+        ThreadSafeRedisDict(store)["case1"] = "register request"
+        generator.set_many(ThreadSafeRedisDict(store), {"case2": payload})
+        # a new dictionary on the same store reads the values from Redis
+        self.assertEqual(ThreadSafeRedisDict(store)["case1"], "register request")
+        self.assertEqual(generator.get_many(ThreadSafeRedisDict(store), ["case1", "case2", "case3"]),
+                         ["register request", payload, None])
+        self.assertEqual(set(ThreadSafeRedisDict(store).keys()), {"case1", "case2"})
+
+        # binary values (markings encoded by MarkingCodec)
+        places = [PetriNet.Place("p%d" % i) for i in range(300)]
+        codec = MarkingCodec(places)
+        markings = {"case1": Marking({places[10]: 1, places[200]: 3}), "case2": Marking({places[0]: 1})}
+        store = FakeRedis()
+        ThreadSafeRedisDict(store, binary_values=True)["case1"] = codec.encode(markings["case1"])
+        generator.set_many(ThreadSafeRedisDict(store, binary_values=True), {"case2": codec.encode(markings["case2"])})
+        self.assertEqual(codec.decode(ThreadSafeRedisDict(store, binary_values=True)["case1"]), markings["case1"])
+        values = generator.get_many(ThreadSafeRedisDict(store, binary_values=True), ["case1", "case2"])
+        self.assertEqual([codec.decode(x) for x in values], [markings["case1"], markings["case2"]])
+
+    def test_streaming_case_eviction(self):
+        import pm4py
+        from pm4py.streaming.algo.discovery.dfg import algorithm as streaming_dfg_discovery
+        from pm4py.streaming.algo.conformance.tbr import algorithm as streaming_tbr
+        from pm4py.streaming.algo.conformance.temporal import algorithm as streaming_temporal
+        log = xes_importer.apply(os.path.join("input_data", "running-example.xes"))
+        stream = list(pm4py.convert_to_event_stream(log))
+        streaming_dfg = streaming_dfg_discovery.apply(parameters={"max_cases": 1})
+        for event in stream:
+            streaming_dfg.receive(event)
+        dfg, activities, sa, ea = streaming_dfg.get()
+        self.assertEqual(dfg, dict(dfg_discovery.apply(log)))
+        self.assertEqual(ea, end_activities.get_end_activities(log))
+        stats = streaming_dfg.get_eviction_statistics()
+        self.assertEqual((stats["open_cases"], stats["evicted_cases"]), (1, len(log) - 1))
+        stream = sorted(stream, key=lambda x: x["time:timestamp"])
+        end_acts = set(end_activities.get_end_activities(log))
+        net, im, fm = pm4py.discover_petri_net_alpha(log)
+        conf = streaming_tbr.apply(net, im, fm)
+        conf.receive_batch(stream)
+        expected_fit = sum(conf.terminate(trace.attributes["concept:name"])["is_fit"] for trace in log)
+        conf = streaming_tbr.apply(net, im, fm, parameters={"case_end_activities": end_acts})
+        conf.receive_batch(stream)
+        stats = conf.get_eviction_statistics()
+        self.assertEqual(len(conf.get()), 0)
+        self.assertEqual((stats["ended_cases"], stats["fit_cases"]), (len(log), expected_fit))
+        temporal_profile = pm4py.discover_temporal_profile(log)
+        conf = streaming_temporal.apply(temporal_profile, parameters={"zeta": 0.5})
+        for event in stream:
+            conf.receive(event)
+        expected_dev = conf.get()
+        conf = streaming_temporal.apply(temporal_profile, parameters={"zeta": 0.5, "case_end_activities": end_acts})
+        for event in stream:
+            conf.receive(event)
+        stats = conf.get_eviction_statistics()
+        self.assertEqual(conf.get(), {})
+        self.assertEqual(stats["deviating_cases"], len(expected_dev))
+        self.assertEqual(stats["deviations"], sum(len(x) for x in expected_dev.values()))
+
+    def test_streaming_tbr_batch_eviction(self):
+        import pm4py
+        from pm4py.streaming.algo.conformance.tbr import algorithm as streaming_tbr
+        log = xes_importer.apply(os.path.join("input_data", "running-example.xes"))
+        stream = list(pm4py.convert_to_event_stream(log))
+        net, im, fm = pm4py.discover_petri_net_alpha(log)
+        conf = streaming_tbr.apply(net, im, fm, parameters={"max_cases": 2})
+        for event in stream:
+            conf.receive(event)
+        expected = conf.get_eviction_statistics()
+        # the cases evicted in a batch are (in general) not among the cases of the batch
+        conf = streaming_tbr.apply(net, im, fm, parameters={"max_cases": 2})
+        for i in range(0, len(stream), 5):
+            conf.receive_batch(stream[i:i + 5])
+        self.assertEqual(len(conf.get()), 2)
+        self.assertEqual(conf.get_eviction_statistics(), expected)
+        self.assertEqual(expected["fit_cases"], 4)
+
+    def test_streaming_windowed_dfg(self):
+        import pm4py
+        from collections import Counter
+        from pm4py.streaming.algo.discovery.dfg import algorithm as streaming_dfg_discovery
+        log = xes_importer.apply(os.path.join("input_data", "running-example.xes"))
+        stream = sorted(pm4py.convert_to_event_stream(log), key=lambda x: x["time:timestamp"])
+        streaming_dfg = streaming_dfg_discovery.apply(variant=streaming_dfg_discovery.Variants.WINDOWED,
+                                                      parameters={"window_size": 10 ** 10})
+        for event in stream:
+            streaming_dfg.receive(event)
+        dfg, performance_dfg, activities, sa, ea = streaming_dfg.get()
+        self.assertEqual(dfg, dict(dfg_discovery.apply(log)))
+        self.assertEqual(sa, start_activities.get_start_activities(log))
+        expected_perf = pm4py.discover_performance_dfg(log)[0]
+        durations = {}
+        for trace in log:
+            for i in range(1, len(trace)):
+                durations.setdefault((trace[i - 1]["concept:name"], trace[i]["concept:name"]), []).append(
+                    (trace[i]["time:timestamp"] - trace[i - 1]["time:timestamp"]).total_seconds())
+        for df in dfg:
+            self.assertAlmostEqual(performance_dfg[df]["mean"], expected_perf[df]["mean"])
+            self.assertAlmostEqual(performance_dfg[df]["max"], expected_perf[df]["max"])
+            for q, key in [(0.5, "median"), (0.9, "p90")]:
+                expected_q = sorted(durations[df])[int(q * (len(durations[df]) - 1))]
+                self.assertLessEqual(abs(performance_dfg[df][key] - expected_q), 0.01 * expected_q + 1e-9)
+        # sliding window of 5 days, moving by one day
+        streaming_dfg = streaming_dfg_discovery.apply(variant=streaming_dfg_discovery.Variants.WINDOWED,
+                                                      parameters={"window_size": 5 * 86400, "slide": 86400})
+        for event in stream:
+            streaming_dfg.receive(event)
+        dfg = streaming_dfg.get()[0]
+        lower, upper = streaming_dfg.get_window_bounds()
+        expected = Counter()
+        for trace in log:
+            for i in range(1, len(trace)):
+                if lower <= trace[i]["time:timestamp"].timestamp() < upper:
+                    expected[(trace[i - 1]["concept:name"], trace[i]["concept:name"])] += 1
+        self.assertEqual(dfg, dict(expected))
+        self.assertGreater(len(expected), 0)
+
+
+    def test_business_calendar(self):
+        import pandas as pd
+        from pm4py.util.business_hours import BusinessHours, BusinessCalendar
+
+        class ChristmasCalendar:
+            def is_working_day(self, day):
+                return not (day.month == 12 and day.day == 25)
+
+        start = pd.Series(pd.to_datetime(["2023-12-20 10:30:00", "2023-12-22 18:00:00", "2024-01-05 08:00:00", "2024-01-01 09:00:00"]))
+        end = pd.Series(pd.to_datetime(["2023-12-20 15:45:30", "2023-12-27 09:00:00", "2024-01-03 08:00:00", None]))
+        durations = BusinessCalendar().get_seconds(start, end)
+        for i in range(3):
+            self.assertAlmostEqual(durations[i], BusinessHours(start[i], end[i]).get_seconds())
+        self.assertTrue(pd.isna(durations[3]))
+        # Monday 25 December is not a working day
+        durations = BusinessCalendar(work_calendar=ChristmasCalendar()).get_seconds(start[:2], end[:2])
+        self.assertAlmostEqual(durations[1], BusinessHours(start[1], end[1]).get_seconds() - 10 * 3600)
+
 
 if __name__ == "__main__":
     unittest.main()
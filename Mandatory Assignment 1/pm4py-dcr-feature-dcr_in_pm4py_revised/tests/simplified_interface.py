@@ -1121,6 +1121,95 @@ class SimplifiedInterfaceTest(unittest.TestCase):
         pm4py.write_ocel2(ocel, "test_output_data/ocel20_example.sqlite")
         os.remove("test_output_data/ocel20_example.sqlite")
 
+    def test_ocel2_sqlite_bulk(self):
+        ocel = pm4py.read_ocel2_sqlite("input_data/ocel/ocel20_example.sqlite")
+        ocel_bulk = pm4py.read_ocel2_sqlite("input_data/ocel/ocel20_example.sqlite", variant_str="ocel20_bulk")
+        from pm4py.objects.ocel.importer.sqlite.variants import ocel20_bulk
+        ocel_chunks = ocel20_bulk.apply("input_data/ocel/ocel20_example.sqlite", parameters={"chunksize": 5, "max_compound_select": 2})
+        for tab in ["events", "objects", "relations", "object_changes", "o2o"]:
+            self.assertTrue(getattr(ocel, tab).equals(getattr(ocel_bulk, tab)))
+            self.assertTrue(getattr(ocel, tab).equals(getattr(ocel_chunks, tab)))
+
+    def test_ocel2_sqlite_append(self):
+        import copy
+        from pm4py.objects.ocel.exporter.sqlite import exporter as sqlite_exporter
+        from pm4py.objects.ocel.util import filtering_utils
+        from pm4py.objects.ocel.validation import ocel20_rel_validation
+        ocel = pm4py.read_ocel2_sqlite("input_data/ocel/ocel20_example.sqlite")
+        timestamp = ocel.events["ocel:timestamp"].sort_values().iloc[len(ocel.events) // 2]
+        for first_part in [True, False]:
+            part = copy.deepcopy(ocel)
+            part.events = part.events[(part.events["ocel:timestamp"] < timestamp) == first_part]
+            part = filtering_utils.propagate_event_filtering(part)
+            part.object_changes = part.object_changes[(part.object_changes["ocel:timestamp"] < timestamp) == first_part]
+            # appending the same part twice does not alter the database
+            for i in range(2):
+                sqlite_exporter.apply(part, "test_output_data/ocel20_append.sqlite", variant=sqlite_exporter.Variants.OCEL20_APPEND)
+        self.assertFalse(ocel20_rel_validation.apply("test_output_data/ocel20_append.sqlite")[1])
+        ocel2 = pm4py.read_ocel2_sqlite("test_output_data/ocel20_append.sqlite")
+        os.remove("test_output_data/ocel20_append.sqlite")
+        for f in ["test_output_data/ocel20_append.sqlite-wal", "test_output_data/ocel20_append.sqlite-shm"]:
+            if os.path.exists(f):
+                os.remove(f)
+        self.assertTrue(ocel.events.reset_index(drop=True).equals(ocel2.events.reset_index(drop=True)))
+        self.assertTrue(ocel.relations.reset_index(drop=True).equals(ocel2.relations.reset_index(drop=True)))
+        self.assertEqual(set(ocel.objects["ocel:oid"]), set(ocel2.objects["ocel:oid"]))
+        self.assertEqual(len(ocel.object_changes), len(ocel2.object_changes))
+        self.assertEqual(len(ocel.o2o), len(ocel2.o2o))
+
+    def test_ocel2_sqlite_append_relations(self):
+        import copy
+        from pm4py.objects.ocel.exporter.sqlite import exporter as sqlite_exporter
+        ocel = pm4py.read_ocel2_sqlite("input_data/ocel/ocel20_example.sqlite")
+        part = copy.deepcopy(ocel)
+        part.relations = part.relations.iloc[::2]
+        sqlite_exporter.apply(part, "test_output_data/ocel20_append_rel.sqlite", variant=sqlite_exporter.Variants.OCEL20_APPEND)
+        # the new relationships of the existing events are appended (and the existing ones are not duplicated)
+        sqlite_exporter.apply(ocel, "test_output_data/ocel20_append_rel.sqlite", variant=sqlite_exporter.Variants.OCEL20_APPEND)
+        ocel2 = pm4py.read_ocel2_sqlite("test_output_data/ocel20_append_rel.sqlite")
+        for f in ["test_output_data/ocel20_append_rel.sqlite", "test_output_data/ocel20_append_rel.sqlite-wal", "test_output_data/ocel20_append_rel.sqlite-shm"]:
+            if os.path.exists(f):
+                os.remove(f)
+        self.assertEqual(len(ocel.relations), len(ocel2.relations))
+        keys = ["ocel:eid", "ocel:oid", "ocel:qualifier"]
+        self.assertTrue(ocel.relations[keys].sort_values(keys).reset_index(drop=True).equals(ocel2.relations[keys].sort_values(keys).reset_index(drop=True)))
+
+    def test_log_index(self):
+        from pm4py.objects.log.util import log_index
+        dataframe = pm4py.read_xes("input_data/running-example.xes")
+
+        def compute():
+            return [pm4py.get_variants(dataframe), pm4py.get_start_activities(dataframe),
+                    pm4py.get_end_activities(dataframe), pm4py.get_rework_cases_per_activity(dataframe),
+                    pm4py.filter_variants_top_k(dataframe, 2),
+                    pm4py.filter_directly_follows_relation(dataframe, [("check ticket", "decide")]),
+                    pm4py.filter_between(dataframe, "register request", "decide")]
+
+        expected = compute()
+        log_index.apply(dataframe)
+        self.assertIsNotNone(log_index.get(dataframe))
+        for res, exp in zip(compute(), expected):
+            if isinstance(exp, dict):
+                self.assertEqual(res, exp)
+            else:
+                self.assertTrue(res.equals(exp))
+        log_index.invalidate(dataframe)
+        self.assertIsNone(log_index.get(dataframe))
+
+    def test_log_index_stale(self):
+        from pm4py.objects.log.util import log_index
+        dataframe = pm4py.read_xes("input_data/running-example.xes")
+        log_index.apply(dataframe)
+        # re-assignment of the activity column
+        dataframe["concept:name"] = dataframe["concept:name"].str.upper()
+        self.assertIsNone(log_index.get(dataframe))
+        self.assertEqual(pm4py.get_start_activities(dataframe), {"REGISTER REQUEST": 6})
+        # in-place sorting of the dataframe
+        log_index.apply(dataframe)
+        dataframe.sort_values(["case:concept:name", "time:timestamp"], ascending=[True, False], inplace=True)
+        self.assertIsNone(log_index.get(dataframe))
+        self.assertEqual(pm4py.get_end_activities(dataframe), {"REGISTER REQUEST": 6})
+
 
 if __name__ == "__main__":
     unittest.main()
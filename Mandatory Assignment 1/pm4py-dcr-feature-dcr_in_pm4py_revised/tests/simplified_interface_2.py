@@ -81,6 +81,14 @@ class SimplifiedInterface2Test(unittest.TestCase):
             log = pm4py.read_xes("input_data/running-example.xes", return_legacy_log_object=legacy_obj)
             pm4py.discover_petri_net_ilp(log)
 
+    def test_ilp_miner_multiprocessing(self):
+        from pm4py.algo.discovery.ilp import algorithm as ilp_miner
+        log = pm4py.read_xes("input_data/running-example.xes")
+        net, im, fm = ilp_miner.apply(log, parameters={"multiprocessing": False})
+        net2, im2, fm2 = ilp_miner.apply(log, parameters={"multiprocessing": True, "cores": 2})
+        places = lambda n: sorted((sorted(str(a.source) for a in p.in_arcs), sorted(str(a.target) for a in p.out_arcs)) for p in n.places)
+        self.assertEqual(places(net), places(net2))
+
 
 if __name__ == "__main__":
     unittest.main()